@@ -0,0 +1,75 @@
+"""Measures the CPU cost of parsing a file event page into a :class:`py42.response.Py42Response`
+and serializing it back to ``text`` with each available JSON codec.
+
+Usage:
+    python benchmarks/bench_json.py [--events N] [--repeat N]
+"""
+import argparse
+import json
+import time
+
+from requests import Response
+
+from py42.exceptions import Py42Error
+from py42.jsoncodec import get_codec
+from py42.response import Py42Response
+
+
+def _make_page(event_count):
+    events = [
+        {
+            "@timestamp": "2022-01-01T00:00:00.000Z",
+            "event": {"id": f"event-{i}", "action": "file-modified"},
+            "file": {
+                "name": f"file-{i}.txt",
+                "directory": "/Users/someone/Documents/",
+                "sizeInBytes": i,
+                "hash": {"sha256": "a" * 64, "md5": "b" * 32},
+            },
+            "user": {"email": "someone@example.com", "deviceUid": str(i)},
+        }
+        for i in range(event_count)
+    ]
+    page = {"fileEvents": events, "totalCount": event_count, "nextPgToken": None}
+    return json.dumps(page).encode("utf-8")
+
+
+def _make_response(body):
+    response = Response()
+    response.status_code = 200
+    response._content = body
+    response.encoding = "utf-8"
+    return response
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    body = _make_page(args.events)
+    print(f"{args.events} events per page ({len(body)} bytes), {args.repeat} pages")
+    for name in ("json", "ujson", "orjson"):
+        try:
+            codec = get_codec(name)
+        except Py42Error:
+            print(f"{name:<7} not installed")
+            continue
+        parse_time = text_time = 0.0
+        for _ in range(args.repeat):
+            response = Py42Response(_make_response(body), json_codec=codec)
+            start = time.process_time()
+            response.data
+            parse_time += time.process_time() - start
+            start = time.process_time()
+            response.text
+            text_time += time.process_time() - start
+        print(
+            f"{name:<7} parse {parse_time / args.repeat * 1000:8.2f}ms/page  "
+            f"text {text_time / args.repeat * 1000:8.2f}ms/page"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Measures the CPU cost of a :class:`py42.services._connection.Connection` request at each
+py42 debug level.
+
+The HTTP layer is replaced with an in-memory session that returns a canned JSON body, so
+the numbers reflect only py42's own request/response handling (including logging).
+
+Usage:
+    python benchmarks/bench_logging.py [--requests N] [--items N]
+"""
+import argparse
+import json
+import logging
+import os
+import time
+
+from requests import Response
+from requests import Session
+
+from py42.services._connection import Connection
+from py42.services._connection import KnownUrlHostResolver
+from py42.settings import debug
+
+
+class _CannedSession(Session):
+    def __init__(self, body):
+        super().__init__()
+        self._body = body
+
+    def send(self, request, **kwargs):
+        response = Response()
+        response.status_code = 200
+        response.url = request.url
+        response.headers["Content-Type"] = "application/json"
+        response._content = self._body
+        return response
+
+
+def _make_body(item_count):
+    items = [
+        {"guid": str(i), "name": f"device-{i}", "osHostname": f"host-{i}"}
+        for i in range(item_count)
+    ]
+    return json.dumps({"computers": items}).encode("utf-8")
+
+
+def _time_requests(connection, count):
+    start = time.process_time()
+    for _ in range(count):
+        connection.get("/api/v1/Computer", params={"pgNum": 1, "pgSize": 500})
+    return time.process_time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--items", type=int, default=500)
+    args = parser.parse_args()
+
+    connection = Connection(
+        KnownUrlHostResolver("https://example.com"),
+        session=_CannedSession(_make_body(args.items)),
+    )
+
+    # Keep the benchmark output readable; log records still get formatted and written.
+    original_handlers = debug.logger.handlers[:]
+    with open(os.devnull, "w") as devnull:
+        debug.logger.handlers = [logging.StreamHandler(devnull)]
+        try:
+            print(f"{args.requests} requests, {args.items} items per response")
+            for name in ("NONE", "INFO", "DEBUG"):
+                debug.level = getattr(debug, name)
+                elapsed = _time_requests(connection, args.requests)
+                per_request = elapsed / args.requests * 1e6
+                print(f"{name:<6} {elapsed:8.3f}s CPU  {per_request:10.1f}us/request")
+        finally:
+            debug.level = debug.NONE
+            debug.logger.handlers = original_handlers
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Measures the memory retained by a 100-page device export with and without
+``py42.settings.compact_responses``.
+
+Each mode runs in its own subprocess so the resident set sizes are not affected by the
+other run. The HTTP layer is replaced with an in-memory session that returns canned pages,
+and every page returned by ``DeviceService.get_all()`` is kept, as a caller collecting an
+export would.
+
+Usage:
+    python benchmarks/bench_memory.py [--pages N] [--items N]
+"""
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import tracemalloc
+from urllib.parse import parse_qs
+from urllib.parse import urlparse
+
+from requests import Response
+from requests import Session
+
+from py42 import settings
+from py42.services._connection import Connection
+from py42.services._connection import KnownUrlHostResolver
+from py42.services.devices import DeviceService
+
+
+class _PagedSession(Session):
+    def __init__(self, page_count, item_count):
+        super().__init__()
+        self._page_count = page_count
+        self._item_count = item_count
+
+    def send(self, request, **kwargs):
+        page_num = int(parse_qs(urlparse(request.url).query)["pgNum"][0])
+        response = Response()
+        response.status_code = 200
+        response.url = request.url
+        response.encoding = "utf-8"
+        response.headers["Content-Type"] = "application/json"
+        count = self._item_count if page_num <= self._page_count else 0
+        response._content = _make_body(page_num, count)
+        return response
+
+
+def _make_body(page_num, item_count):
+    start = (page_num - 1) * item_count
+    devices = [
+        {
+            "computerId": start + i,
+            "guid": str(900000000000000000 + start + i),
+            "name": f"device-{start + i}",
+            "osHostname": f"host-{start + i}.example.com",
+            "osName": "win64",
+            "version": 1525200006882,
+            "productVersion": "8.8.1",
+            "active": True,
+            "alertState": 0,
+            "orgUid": "890854247383106706",
+            "userUid": f"{start + i:018d}",
+            "lastConnected": "2022-06-14T19:26:24.193Z",
+            "creationDate": "2021-03-02T17:01:15.913Z",
+        }
+        for i in range(item_count)
+    ]
+    return json.dumps({"data": {"computers": devices}}).encode("utf-8")
+
+
+def _rss_bytes():
+    try:
+        with open("/proc/self/statm") as statm:
+            resident_pages = int(statm.read().split()[1])
+    except OSError:
+        import resource
+
+        # Peak rather than current RSS, in KiB on Linux and bytes on macOS.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def _run_export(page_count, item_count, compact):
+    settings.compact_responses = compact
+    settings.items_per_page = item_count
+    connection = Connection(
+        KnownUrlHostResolver("https://example.com"),
+        session=_PagedSession(page_count, item_count),
+    )
+    service = DeviceService(connection)
+
+    gc.collect()
+    rss_before = _rss_bytes()
+    tracemalloc.start()
+    pages = []
+    item_total = 0
+    for page in service.get_all():
+        item_total += len(page["computers"])
+        pages.append(page)
+    gc.collect()
+    traced, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = _rss_bytes()
+    return {
+        "pages": len(pages),
+        "items": item_total,
+        "retained": traced,
+        "peak": peak,
+        "rss": rss_after - rss_before,
+    }
+
+
+def _run_in_subprocess(args, compact):
+    command = [
+        sys.executable,
+        __file__,
+        "--pages",
+        str(args.pages),
+        "--items",
+        str(args.items),
+        "--child",
+        "compact" if compact else "default",
+    ]
+    output = subprocess.run(command, check=True, capture_output=True, text=True)
+    return json.loads(output.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument(
+        "--child", choices=("default", "compact"), help=argparse.SUPPRESS
+    )
+    args = parser.parse_args()
+
+    if args.child:
+        result = _run_export(args.pages, args.items, args.child == "compact")
+        print(json.dumps(result))
+        return
+
+    mib = 1024 * 1024
+    print(f"{args.pages} pages, {args.items} devices per page")
+    print(f"{'mode':<8} {'retained':>12} {'peak':>12} {'RSS growth':>12}")
+    for compact in (False, True):
+        result = _run_in_subprocess(args, compact)
+        name = "compact" if compact else "default"
+        print(
+            f"{name:<8} {result['retained'] / mib:10.1f}MB {result['peak'] / mib:10.1f}MB "
+            f"{result['rss'] / mib:10.1f}MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""Measures the throughput, request latency and peak memory of the SDK's main pagination,
+export and restore paths against a local stub of a Code42 instance.
+
+``stubserver.py`` is started in a subprocess on a free port, so that its own memory use and
+CPU time are not counted, and an SDK client signs in to it with an API client. Each
+scenario is run twice: once to time it, with a request hook that records the duration of
+every request, and once under ``tracemalloc`` to find the most memory it allocates at once.
+The latencies are those of the individual requests, including any retries.
+
+With ``--record``, the requests and responses are also saved to a cassette (see
+``py42.cassette``). With ``--replay``, the stub server is not started and the responses come
+from such a cassette instead, at once or after their recorded latency multiplied by
+``--latency-scale``, so that the SDK's own CPU cost can be profiled and compared between
+releases. A cassette must be replayed with the same scenarios and options it was recorded
+with.
+
+Usage:
+    python benchmarks/bench_sdk.py [--latency MS] [--padding N] [--page-size N]
+        [--devices N] [--users N] [--events N] [--audit-events N] [--restores N]
+        [--restore-size N] [--scenario NAME ...]
+        [--record PATH | --replay PATH [--latency-scale N]]
+"""
+import argparse
+import gc
+import math
+import os
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+import warnings
+from urllib.parse import urlsplit
+
+from stubserver import create_parser
+from stubserver import EVENT_EPOCH_MS
+from stubserver import EVENT_INTERVAL_MS
+from stubserver import RESTORE_PATH
+
+import py42.sdk
+from py42 import settings
+from py42.cassette import Cassette
+from py42.cassette import RecordingAdapter
+from py42.cassette import ReplayAdapter
+from py42.instrumentation import RequestHook
+from py42.sdk.queries.fileevents.v2.file_event_query import FileEventQuery
+
+_DEVICE_GUID = "900000000000000000"
+
+
+class _RequestRecorder(RequestHook):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.durations = []
+            self.bytes_received = 0
+
+    def request_finished(self, context, metrics):
+        with self._lock:
+            self.durations.append(metrics.duration)
+            self.bytes_received += metrics.bytes_received or 0
+
+
+def _create_sdk(args):
+    return py42.sdk.from_api_client(
+        args.url,
+        "client-id",
+        "secret",
+        http_adapter=args.adapter,
+        request_hooks=[args.recorder],
+    )
+
+
+def _sign_in(sdk, args):
+    sdk = _create_sdk(args)
+    # Look up every microservice's host, as the first use of each service would.
+    connections = set(sdk._services.connections.values())
+    for connection in connections:
+        connection.host_address
+    return len(connections)
+
+
+def _get_all_devices(sdk, args):
+    return sum(len(page["computers"]) for page in sdk.devices.get_all())
+
+
+def _iter_devices_streamed(sdk, args):
+    return sum(1 for _ in sdk.devices.iter_items(stream=True))
+
+
+def _get_all_users(sdk, args):
+    return sum(len(page["users"]) for page in sdk.users.get_all())
+
+
+def _iter_file_events(sdk, args):
+    return sum(1 for _ in sdk.securitydata.iter_file_events(FileEventQuery()))
+
+
+def _export_file_events(sdk, args):
+    start = EVENT_EPOCH_MS / 1000
+    end = (EVENT_EPOCH_MS + (args.events - 1) * EVENT_INTERVAL_MS) / 1000
+    events = sdk.securitydata.export_file_events(
+        FileEventQuery(), start, end, concurrency=4, max_window_events=args.page_size
+    )
+    return sum(1 for _ in events)
+
+
+def _get_all_audit_logs(sdk, args):
+    return sum(len(page["events"]) for page in sdk.auditlogs.get_all())
+
+
+def _stream_from_backup(sdk, args):
+    for _ in range(args.restores):
+        response = sdk.archive.stream_from_backup(RESTORE_PATH, _DEVICE_GUID)
+        for _ in response.iter_content(chunk_size=64 * 1024):
+            pass
+    return args.restores
+
+
+_SCENARIOS = {
+    "sign-in": _sign_in,
+    "devices": _get_all_devices,
+    "devices-streamed": _iter_devices_streamed,
+    "users": _get_all_users,
+    "file-events": _iter_file_events,
+    "file-event-export": _export_file_events,
+    "audit-logs": _get_all_audit_logs,
+    "restore": _stream_from_backup,
+}
+
+
+def _start_stub_server(args):
+    stub = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stubserver.py")
+    command = [
+        sys.executable,
+        stub,
+        "--latency",
+        str(args.latency),
+        "--padding",
+        str(args.padding),
+        "--devices",
+        str(args.devices),
+        "--users",
+        str(args.users),
+        "--events",
+        str(args.events),
+        "--audit-events",
+        str(args.audit_events),
+        "--restore-size",
+        str(args.restore_size),
+    ]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    url = process.stdout.readline().strip()
+    if not url:
+        process.kill()
+        raise RuntimeError("The stub server did not start.")
+    return process, url
+
+
+def _get_percentile(durations, percentile):
+    # The nearest-rank percentile.
+    ordered = sorted(durations)
+    return ordered[max(0, math.ceil(percentile / 100 * len(ordered)) - 1)]
+
+
+def _run_scenario(scenario, sdk, args):
+    args.recorder.reset()
+    started = time.perf_counter()
+    items = scenario(sdk, args)
+    elapsed = time.perf_counter() - started
+    durations = args.recorder.durations
+    bytes_received = args.recorder.bytes_received
+
+    args.recorder.reset()
+    gc.collect()
+    tracemalloc.start()
+    scenario(sdk, args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "items": items,
+        "seconds": elapsed,
+        "requests": len(durations),
+        "bytes": bytes_received,
+        "p50": _get_percentile(durations, 50),
+        "p99": _get_percentile(durations, 99),
+        "peak": peak,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0], parents=[create_parser()]
+    )
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--restores", type=int, default=5)
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=list(_SCENARIOS),
+        help="a scenario to run; may be repeated (default: all)",
+    )
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument("--record", metavar="PATH")
+    cassette_group.add_argument("--replay", metavar="PATH")
+    parser.add_argument("--latency-scale", type=float, default=0)
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore", DeprecationWarning)
+    settings.items_per_page = args.page_size
+    args.recorder = _RequestRecorder()
+    process = None
+    if args.replay:
+        cassette = Cassette.load(args.replay)
+        url = urlsplit(cassette.exchanges[0].url)
+        args.url = f"{url.scheme}://{url.netloc}"
+        args.adapter = ReplayAdapter(cassette, latency_scale=args.latency_scale)
+    else:
+        process, args.url = _start_stub_server(args)
+        args.adapter = RecordingAdapter() if args.record else None
+    try:
+        sdk = _create_sdk(args)
+        mib = 1024 * 1024
+        print(
+            f"{args.latency:g}ms latency, {args.padding} bytes of padding per item, "
+            f"{args.page_size} items per page"
+        )
+        print(
+            f"{'scenario':<18} {'items':>8} {'items/s':>10} {'MB/s':>8} "
+            f"{'requests':>8} {'p50':>9} {'p99':>9} {'peak':>10}"
+        )
+        for name in args.scenario or _SCENARIOS:
+            result = _run_scenario(_SCENARIOS[name], sdk, args)
+            print(
+                f"{name:<18} {result['items']:>8} "
+                f"{result['items'] / result['seconds']:>10.0f} "
+                f"{result['bytes'] / mib / result['seconds']:>8.1f} "
+                f"{result['requests']:>8} {result['p50'] * 1000:>7.2f}ms "
+                f"{result['p99'] * 1000:>7.2f}ms {result['peak'] / mib:>8.1f}MB"
+            )
+        if args.record:
+            args.adapter.cassette.save(args.record)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+"""A local HTTP server that stands in for a Code42 instance, so that the SDK can be
+benchmarked without network access or an account.
+
+The server answers the requests the SDK sends for:
+
+* signing in with an API client (``/api/v3/oauth/token``) and looking up the microservice
+  hosts (``/api/v1/ServerEnv`` and the key-value store's ``/v1/<key>``). Every
+  microservice is served from the stub's own address.
+* pages of devices and users (``/api/v1/Computer`` and ``/api/v1/User``), by ``pgNum``.
+* file event searches (``/forensic-search/queryservice/api/<version>/fileevent``), by
+  ``pgToken``. Event ``i`` has an ``@timestamp`` of ``EVENT_EPOCH_MS + i *
+  EVENT_INTERVAL_MS``, and searches with ``@timestamp`` range filters only return the
+  events in the range, as the windows of ``export_file_events()`` expect.
+* audit log searches (``/rpc/search/search-audit-log``), by ``page``.
+* web restores of ``RESTORE_PATH`` from any device (``/api/v1/DataKeyToken``,
+  ``/api/v1/WebRestoreInfo``, ``/api/v1/WebRestoreSession``, ``/api/v1/WebRestoreTreeNode``,
+  ``/api/v1/WebRestoreFileSizePolling``, ``/api/v9/restore/web``,
+  ``/api/v1/WebRestoreJob`` and ``/api/v1/WebRestoreJobResult``). Restore jobs finish at
+  once.
+
+Every response is delayed by ``--latency`` milliseconds, and every device, user, file event
+and audit log event is padded with ``--padding`` bytes. The server prints the address it
+listens on as the first line of its output.
+
+Usage:
+    python benchmarks/stubserver.py [--port N] [--latency MS] [--padding N]
+        [--devices N] [--users N] [--events N] [--audit-events N] [--restore-size N]
+"""
+import argparse
+import itertools
+import json
+import re
+import time
+from datetime import datetime
+from datetime import timezone
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from urllib.parse import parse_qs
+from urllib.parse import urlparse
+
+# The timestamp of the first file event and the time between events, in milliseconds.
+EVENT_EPOCH_MS = 1640995200000
+EVENT_INTERVAL_MS = 1000
+
+# The only file that web restores find in a device's archive.
+RESTORE_PATH = "/Users/benchmark/Documents/export.zip"
+
+_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+_RESTORE_CHUNK_SIZE = 64 * 1024
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, options):
+        super().__init__(address, _StubHandler)
+        self.options = options
+        self.url = f"http://{self.server_address[0]}:{self.server_address[1]}"
+        self._job_ids = itertools.count(1)
+
+    def next_job_id(self):
+        return f"job-{next(self._job_ids)}"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    # Keep connections open between requests, as Code42 servers do, and send responses
+    # without waiting for the client to acknowledge their headers.
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def log_message(self, format, *args):
+        pass
+
+    def _dispatch(self, method):
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else {}
+
+        options = self.server.options
+        if options.latency:
+            time.sleep(options.latency / 1000)
+        for route_method, pattern, handler in _ROUTES:
+            match = pattern.fullmatch(url.path)
+            if route_method == method and match:
+                handler(self, params, body, *match.groups())
+                return
+        self._send_json({"error": [{"error": "NOT_FOUND"}]}, status=404)
+
+    def _send_json(self, payload, status=200):
+        self._send(json.dumps(payload).encode("utf-8"), "application/json", status)
+
+    def _send(self, content, content_type, status=200):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _get_oauth_token(self, params, body):
+        self._send_json(
+            {
+                "access_token": "benchmark-token",
+                "token_type": "bearer",
+                "expires_in": 3600,
+            }
+        )
+
+    def _get_server_env(self, params, body):
+        self._send_json({"stsBaseUrl": self.server.url})
+
+    def _get_stored_value(self, params, body, key):
+        self._send(self.server.url.encode("utf-8"), "text/plain")
+
+    def _get_devices(self, params, body):
+        options = self.server.options
+        start, stop = _get_page_range(params, options.devices)
+        devices = [_make_device(i, options.padding) for i in range(start, stop)]
+        self._send_json({"data": {"totalCount": options.devices, "computers": devices}})
+
+    def _get_device(self, params, body, guid):
+        device = _make_device(0, 0)
+        device["guid"] = guid
+        device["backupUsage"] = [
+            {"targetComputerGuid": "42", "targetComputerName": "Code42 Cloud"}
+        ]
+        self._send_json({"data": device})
+
+    def _get_users(self, params, body):
+        options = self.server.options
+        start, stop = _get_page_range(params, options.users)
+        users = [_make_user(i, options.padding) for i in range(start, stop)]
+        self._send_json({"data": {"totalCount": options.users, "users": users}})
+
+    def _search_file_events(self, params, body, version):
+        options = self.server.options
+        first, stop = _get_event_range(body, options.events)
+        start = int(body.get("pgToken") or first)
+        end = min(stop, start + int(body.get("pgSize") or 10000))
+        events = [_make_file_event(i, options.padding) for i in range(start, end)]
+        self._send_json(
+            {
+                "fileEvents": events,
+                "nextPgToken": str(end) if end < stop else None,
+                "problems": None,
+                "totalCount": stop - first,
+            }
+        )
+
+    def _search_audit_log(self, params, body):
+        options = self.server.options
+        page_size = int(body.get("pageSize") or 500)
+        start = int(body.get("page") or 0) * page_size
+        end = min(options.audit_events, start + page_size)
+        events = [_make_audit_event(i, options.padding) for i in range(start, end)]
+        self._send_json({"events": events, "totalResultCount": options.audit_events})
+
+    def _get_data_key_token(self, params, body):
+        self._send_json({"data": {"dataKeyToken": "benchmark-data-key-token"}})
+
+    def _get_web_restore_info(self, params, body):
+        self._send_json({"data": {"serverUrl": self.server.url, "nodeGuid": "43"}})
+
+    def _create_restore_session(self, params, body):
+        self._send_json({"data": {"webRestoreSessionId": "benchmark-session"}})
+
+    def _get_backup_sets(self, params, body, device_guid, destination_guid):
+        self._send_json(
+            {"data": {"backupSets": [{"backupSetId": "1", "name": "BackupSet"}]}}
+        )
+
+    def _get_tree_node(self, params, body):
+        # Node i of the tree is the ith directory of RESTORE_PATH, and its children are
+        # node i + 1 and a few siblings that are never restored.
+        parts = RESTORE_PATH.split("/")
+        depth = int(params["fileId"]) + 1 if "fileId" in params else 0
+        path = "/".join(parts[: depth + 1]) or "/"
+        file_type = "file" if depth == len(parts) - 1 else "directory"
+        nodes = [{"id": str(depth), "path": path, "type": file_type}]
+        if depth:
+            parent = path.rsplit("/", 1)[0]
+            nodes.extend(
+                {"id": f"{depth}-{i}", "path": f"{parent}/sibling-{i}", "type": "file"}
+                for i in range(10)
+            )
+        self._send_json({"data": nodes})
+
+    def _create_file_size_job(self, params, body):
+        self._send_json({"data": {"jobId": self.server.next_job_id()}})
+
+    def _get_file_size_job(self, params, body):
+        size = self.server.options.restore_size
+        self._send_json(
+            {"data": {"status": "DONE", "numFiles": 1, "numDirs": 0, "size": size}}
+        )
+
+    def _start_web_restore(self, params, body):
+        self._send_json({"data": {"jobId": self.server.next_job_id()}})
+
+    def _get_restore_job(self, params, body, job_id):
+        self._send_json({"data": {"jobId": job_id, "done": True, "status": "DONE"}})
+
+    def _stream_restore_result(self, params, body, job_id):
+        size = self.server.options.restore_size
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(size))
+        self.end_headers()
+        chunk = b"\0" * _RESTORE_CHUNK_SIZE
+        for offset in range(0, size, _RESTORE_CHUNK_SIZE):
+            self.wfile.write(chunk[: size - offset])
+
+
+_ROUTES = [
+    (method, re.compile(path), handler)
+    for method, path, handler in [
+        ("POST", "/api/v3/oauth/token", _StubHandler._get_oauth_token),
+        ("GET", "/api/v1/ServerEnv", _StubHandler._get_server_env),
+        ("GET", "/v1/([^/]+)", _StubHandler._get_stored_value),
+        ("GET", "/api/v1/Computer", _StubHandler._get_devices),
+        ("GET", "/api/v1/Computer/([^/]+)", _StubHandler._get_device),
+        ("GET", "/api/v1/User", _StubHandler._get_users),
+        (
+            "POST",
+            "/forensic-search/queryservice/api/(v[12])/fileevent",
+            _StubHandler._search_file_events,
+        ),
+        ("POST", "/rpc/search/search-audit-log", _StubHandler._search_audit_log),
+        ("POST", "/api/v1/DataKeyToken", _StubHandler._get_data_key_token),
+        ("GET", "/api/v1/WebRestoreInfo", _StubHandler._get_web_restore_info),
+        ("POST", "/api/v1/WebRestoreSession", _StubHandler._create_restore_session),
+        ("GET", "/api/v3/BackupSets/([^/]+)/([^/]+)", _StubHandler._get_backup_sets),
+        ("GET", "/api/v1/WebRestoreTreeNode", _StubHandler._get_tree_node),
+        (
+            "POST",
+            "/api/v1/WebRestoreFileSizePolling",
+            _StubHandler._create_file_size_job,
+        ),
+        ("GET", "/api/v1/WebRestoreFileSizePolling", _StubHandler._get_file_size_job),
+        ("POST", "/api/v9/restore/web", _StubHandler._start_web_restore),
+        ("GET", "/api/v1/WebRestoreJob/([^/]+)", _StubHandler._get_restore_job),
+        (
+            "GET",
+            "/api/v1/WebRestoreJobResult/([^/]+)",
+            _StubHandler._stream_restore_result,
+        ),
+    ]
+]
+
+
+def _get_page_range(params, total):
+    page_size = int(params.get("pgSize") or 500)
+    start = (int(params.get("pgNum") or 1) - 1) * page_size
+    return min(start, total), min(start + page_size, total)
+
+
+def _get_event_range(query, total):
+    # The indexes of the events within the query's @timestamp filters.
+    start, stop = 0, total
+    for group in query.get("groups") or []:
+        for query_filter in group.get("filters") or []:
+            if query_filter.get("term") != "@timestamp":
+                continue
+            offset = _parse_timestamp(query_filter["value"]) - EVENT_EPOCH_MS
+            if query_filter["operator"] == "ON_OR_AFTER":
+                start = max(start, -(-offset // EVENT_INTERVAL_MS))
+            elif query_filter["operator"] == "ON_OR_BEFORE":
+                stop = min(stop, offset // EVENT_INTERVAL_MS + 1)
+    stop = max(stop, 0)
+    return min(start, stop), stop
+
+
+def _parse_timestamp(value):
+    date = datetime.strptime(value, _TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+    return round(date.timestamp() * 1000)
+
+
+def _format_timestamp(milliseconds):
+    date = datetime.fromtimestamp(milliseconds / 1000, timezone.utc)
+    return date.strftime(_TIMESTAMP_FORMAT)[:-4] + "Z"
+
+
+def _make_device(i, padding):
+    return {
+        "computerId": i,
+        "guid": str(900000000000000000 + i),
+        "name": f"device-{i}",
+        "osHostname": f"host-{i}.example.com",
+        "osName": "win64",
+        "version": 1525200006882,
+        "productVersion": "8.8.1",
+        "active": True,
+        "alertState": 0,
+        "orgUid": "890854247383106706",
+        "userUid": f"{i:018d}",
+        "lastConnected": "2022-06-14T19:26:24.193Z",
+        "creationDate": "2021-03-02T17:01:15.913Z",
+        "padding": "x" * padding,
+    }
+
+
+def _make_user(i, padding):
+    return {
+        "userId": i,
+        "userUid": f"{i:018d}",
+        "status": "Active",
+        "username": f"user-{i}@example.com",
+        "email": f"user-{i}@example.com",
+        "firstName": "Bench",
+        "lastName": f"User {i}",
+        "orgUid": "890854247383106706",
+        "active": True,
+        "blocked": False,
+        "creationDate": "2021-03-02T17:01:15.913Z",
+        "padding": "x" * padding,
+    }
+
+
+def _make_file_event(i, padding):
+    return {
+        "@timestamp": _format_timestamp(EVENT_EPOCH_MS + i * EVENT_INTERVAL_MS),
+        "event": {"id": f"event-{i}", "action": "file-modified"},
+        "file": {
+            "name": f"file-{i}.txt",
+            "directory": "/Users/someone/Documents/",
+            "sizeInBytes": i,
+            "hash": {"sha256": "a" * 64, "md5": "b" * 32},
+        },
+        "user": {"email": "someone@example.com", "deviceUid": str(i)},
+        "padding": "x" * padding,
+    }
+
+
+def _make_audit_event(i, padding):
+    return {
+        "type$": "audit_log::logged_in/1",
+        "actorId": f"{i:018d}",
+        "actorName": f"user-{i}@example.com",
+        "actorIpAddress": "127.0.0.1",
+        "timestamp": _format_timestamp(EVENT_EPOCH_MS + i * EVENT_INTERVAL_MS),
+        "padding": "x" * padding,
+    }
+
+
+def create_parser():
+    """Returns the parser of the stub server's options, which ``bench_sdk.py`` shares."""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--latency", type=float, default=0, help="milliseconds")
+    parser.add_argument("--padding", type=int, default=0, help="bytes per item")
+    parser.add_argument("--devices", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--audit-events", type=int, default=10000)
+    parser.add_argument("--restore-size", type=int, default=10 * 1024 * 1024)
+    return parser
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0], parents=[create_parser()]
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    args = parser.parse_args()
+
+    server = StubServer((args.host, args.port), args)
+    print(server.url, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -35,6 +35,10 @@ setup(
         "requests>=2.25.0",
     ],
     extras_require={
+        "async": ["aiohttp>=3.8"],
+        "arrow": ["pyarrow>=7.0"],
+        "numpy": ["numpy>=1.20"],
+        "opentelemetry": ["opentelemetry-api>=1.12"],
         "dev": [
             "flake8==3.9.2",
             "pytest==6.2.4",
@@ -0,0 +1,157 @@
+"""Incremental parsing of a single list inside a JSON document, so that the items of a large
+response can be used as the body is read instead of after it has all been buffered."""
+import codecs
+import json
+import re
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DELIMITERS = ",]} \t\n\r"
+_DECODER = json.JSONDecoder()
+
+
+def iter_array_items(chunks, key=None, fields=None):
+    """Yields the items of the list stored under ``key`` in the JSON object read from
+    ``chunks``, parsing each item as soon as enough of the body has arrived.
+
+    As with :class:`py42.response.Py42Response`, when the object has a ``data`` member, the
+    list is looked for inside of it. When ``key`` is None, the document (or its ``data``
+    member) must itself be the list.
+
+    Args:
+        chunks (iterable): The body as ``bytes`` (UTF-8) or ``str`` chunks, for example from
+            ``requests.Response.iter_content()``.
+        key (str, optional): The name of the list. Defaults to None.
+        fields (dict, optional): When given, it is filled with the object's other members
+            once the whole body has been read.
+
+    Raises:
+        KeyError: The document has no list under ``key``.
+        json.JSONDecodeError: The body is not valid JSON.
+    """
+    reader = _Reader(chunks)
+    fields = {} if fields is None else fields
+    if key is None and reader.peek() == "[":
+        yield from _iter_array(reader)
+        found = True
+    else:
+        found = yield from _iter_object(reader, key, fields, unwrap_data=True)
+    if reader.peek():
+        reader.fail("Extra data")
+    if not found:
+        raise KeyError(key)
+
+
+def _iter_object(reader, key, fields, unwrap_data):
+    reader.expect("{")
+    found = False
+    data_fields = None
+    if reader.peek() == "}":
+        reader.pos += 1
+        return False
+
+    while True:
+        name = reader.value()
+        reader.expect(":")
+        next_char = reader.peek()
+        if name == key and next_char == "[":
+            yield from _iter_array(reader)
+            found = True
+        elif unwrap_data and name == "data" and next_char == "{":
+            data_fields = {}
+            found = yield from _iter_object(reader, key, data_fields, False)
+        elif unwrap_data and name == "data" and next_char == "[" and key is None:
+            yield from _iter_array(reader)
+            found = True
+            data_fields = {}
+        else:
+            fields[name] = reader.value()
+
+        next_char = reader.peek()
+        reader.pos += 1
+        if next_char == "}":
+            break
+        if next_char != ",":
+            reader.fail("Expecting ',' delimiter")
+
+    if data_fields is not None:
+        fields.clear()
+        fields.update(data_fields)
+    return found  # noqa: B901
+
+
+def _iter_array(reader):
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+
+    while True:
+        yield reader.value()
+        next_char = reader.peek()
+        reader.pos += 1
+        if next_char == "]":
+            return
+        if next_char != ",":
+            reader.fail("Expecting ',' delimiter")
+
+
+class _Reader:
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decode = codecs.getincrementaldecoder("utf-8")().decode
+        self._eof = False
+        self.buffer = ""
+        self.pos = 0
+
+    def peek(self):
+        """Skips whitespace and returns the next character, or "" at the end of the body."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._read():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            self.fail(f"Expecting '{char}'")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                obj, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._read():
+                    continue
+                raise
+            # A number cut off by the end of the buffer (e.g. "12" of "12.5e3") may
+            # continue in the next chunk.
+            cut_off = end == len(self.buffer) or (
+                isinstance(obj, (int, float)) and self.buffer[end] not in _DELIMITERS
+            )
+            if cut_off and self._read():
+                continue
+            self.pos = end
+            return obj
+
+    def fail(self, message):
+        raise json.JSONDecodeError(message, self.buffer, self.pos)
+
+    def _read(self):
+        """Appends the next non-empty chunk to the buffer. Returns False at the end of the
+        body."""
+        if self._eof:
+            return False
+        # Drop what has already been parsed so the buffer stays about one item long.
+        start, self.pos = self.pos, 0
+        self.buffer = self.buffer[start:]
+        for chunk in self._chunks:
+            text = self._decode(chunk) if isinstance(chunk, bytes) else chunk
+            if text:
+                self.buffer += text
+                return True
+        self.buffer += self._decode(b"", final=True)
+        self._eof = True
+        return False
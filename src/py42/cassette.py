@@ -0,0 +1,370 @@
+"""Recording of the requests an SDK client sends, and replaying of them without a server.
+
+A :class:`RecordingAdapter` sends requests with another adapter and records each request
+and its response in a :class:`Cassette`, with credentials redacted. A
+:class:`ReplayAdapter` answers requests with the responses in a cassette instead of sending
+them, either at once or after their recorded latency multiplied by ``latency_scale``. Pass
+either adapter to ``py42.sdk.from_api_client()``, ``from_local_account()`` or
+``from_jwt_provider()`` (``http_adapter=``), for example::
+
+    recorder = RecordingAdapter()
+    sdk = py42.sdk.from_api_client(host, client_id, secret, http_adapter=recorder)
+    pages = list(sdk.devices.get_all())
+    recorder.cassette.save("devices.cassette")
+
+    replayer = ReplayAdapter(Cassette.load("devices.cassette"))
+    sdk = py42.sdk.from_api_client(host, client_id, secret, http_adapter=replayer)
+    pages = list(sdk.devices.get_all())
+
+Making the same calls against a replayed cassette gets the same responses, so the CPU cost
+of building requests and parsing responses can be profiled, and compared between releases,
+on real traffic without network access.
+
+Request headers are not recorded, and the values of ``redacted_fields`` are replaced in
+URL query strings and JSON request and response bodies, so that tokens and passwords are
+not written to disk. Cassettes are saved as gzip-compressed JSON lines.
+"""
+import base64
+import gzip
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import parse_qsl
+from urllib.parse import urlencode
+from urllib.parse import urlsplit
+from urllib.parse import urlunsplit
+
+from requests.adapters import BaseAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.response import HTTPResponse
+
+from py42.connectionpool import PoolingHTTPAdapter
+from py42.exceptions import Py42Error
+
+# The version of the cassette file format.
+CASSETTE_VERSION = 1
+
+# The JSON keys and query parameters whose values are credentials.
+DEFAULT_REDACTED_FIELDS = frozenset(
+    {
+        "access_token",
+        "refresh_token",
+        "v3_user_token",
+        "password",
+        "privatePassword",
+        "encryptionKey",
+        "dataKeyToken",
+    }
+)
+
+# The response headers that are not recorded.
+DEFAULT_REDACTED_HEADERS = frozenset({"Set-Cookie"})
+
+# Replaces the value of each redacted field.
+REDACTED = "REDACTED"
+
+# Headers that describe the body as it was sent, rather than the decoded body recorded.
+_TRANSFER_HEADERS = frozenset(
+    {"content-encoding", "content-length", "transfer-encoding"}
+)
+
+Exchange = namedtuple(
+    "Exchange",
+    [
+        "method",
+        "url",
+        "request_body",
+        "status_code",
+        "reason",
+        "headers",
+        "body",
+        "elapsed",
+    ],
+)
+Exchange.__doc__ = """A recorded request and its response.
+
+Attributes:
+    method (str): The HTTP method.
+    url (str): The URL, with redacted query parameters.
+    request_body (str): The request body, with redacted fields, or None.
+    status_code (int): The response status.
+    reason (str): The response status text.
+    headers (dict): The response headers, without redacted headers.
+    body (bytes): The decoded response body, with redacted fields.
+    elapsed (float): The seconds from sending the request until its response headers
+        were received.
+"""
+
+
+class Cassette:
+    """The exchanges recorded by a :class:`RecordingAdapter`.
+
+    Args:
+        exchanges (list, optional): :class:`Exchange` objects. Defaults to None.
+        redacted_fields (iterable, optional): The JSON keys and query parameters whose
+            values were redacted. Defaults to :data:`DEFAULT_REDACTED_FIELDS`.
+    """
+
+    def __init__(self, exchanges=None, redacted_fields=DEFAULT_REDACTED_FIELDS):
+        self.exchanges = list(exchanges or [])
+        self.redacted_fields = frozenset(redacted_fields)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.exchanges)
+
+    def append(self, exchange):
+        """Adds an :class:`Exchange` to the cassette."""
+        with self._lock:
+            self.exchanges.append(exchange)
+
+    def save(self, path):
+        """Writes the cassette to ``path``, replacing the file if it exists."""
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as temp_file, gzip.GzipFile(
+                fileobj=temp_file, mode="wb"
+            ) as gzip_file:
+                header = {
+                    "version": CASSETTE_VERSION,
+                    "redacted_fields": sorted(self.redacted_fields),
+                }
+                gzip_file.write(_dump_line(header))
+                with self._lock:
+                    exchanges = list(self.exchanges)
+                for exchange in exchanges:
+                    gzip_file.write(_dump_line(_exchange_to_dict(exchange)))
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        """Reads a cassette written by :meth:`save`.
+
+        Returns:
+            :class:`Cassette`
+        """
+        with gzip.open(path, "rt", encoding="utf-8") as cassette_file:
+            try:
+                header = json.loads(cassette_file.readline())
+            except (OSError, ValueError):
+                header = None
+            if (
+                not isinstance(header, dict)
+                or header.get("version") != CASSETTE_VERSION
+            ):
+                raise Py42Error(f"{path} is not a py42 cassette.")
+            exchanges = [
+                _exchange_from_dict(json.loads(line)) for line in cassette_file
+            ]
+        return cls(exchanges, redacted_fields=header["redacted_fields"])
+
+
+class RecordingAdapter(BaseAdapter):
+    """Sends requests with another adapter and records them, and their responses, in a
+    :class:`Cassette`. Streamed responses are read in full to record them.
+
+    Args:
+        adapter (:class:`requests.adapters.BaseAdapter`, optional): The adapter that sends
+            the requests. Defaults to a new
+            :class:`py42.connectionpool.PoolingHTTPAdapter`.
+        cassette (:class:`Cassette`, optional): The cassette to record to. Defaults to a new
+            cassette that redacts ``redacted_fields``.
+        redacted_fields (iterable, optional): The JSON keys and query parameters whose
+            values are replaced by ``"REDACTED"`` in a new cassette. Defaults to
+            :data:`DEFAULT_REDACTED_FIELDS`.
+        redacted_headers (iterable, optional): The response headers that are not recorded.
+            Defaults to :data:`DEFAULT_REDACTED_HEADERS`.
+    """
+
+    def __init__(
+        self,
+        adapter=None,
+        cassette=None,
+        redacted_fields=DEFAULT_REDACTED_FIELDS,
+        redacted_headers=DEFAULT_REDACTED_HEADERS,
+    ):
+        super().__init__()
+        self._adapter = adapter or PoolingHTTPAdapter()
+        if cassette is None:
+            cassette = Cassette(redacted_fields=redacted_fields)
+        self.cassette = cassette
+        self._skipped_headers = _TRANSFER_HEADERS | {
+            header.lower() for header in redacted_headers
+        }
+
+    def send(self, request, **kwargs):
+        response = self._adapter.send(request, **kwargs)
+        fields = self.cassette.redacted_fields
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name.lower() not in self._skipped_headers
+        }
+        exchange = Exchange(
+            request.method,
+            redact_url(request.url, fields),
+            _redact_request_body(request.body, fields),
+            response.status_code,
+            response.reason,
+            headers,
+            redact_body(response.content, fields),
+            response.elapsed.total_seconds(),
+        )
+        self.cassette.append(exchange)
+        return response
+
+    def close(self):
+        self._adapter.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """Answers requests with the responses recorded in a :class:`Cassette`, without sending
+    them.
+
+    A request gets the response recorded for the request with the same method, URL and body.
+    Requests that were recorded more than once get their responses in the order they were
+    recorded, and then the last one again.
+
+    Args:
+        cassette (:class:`Cassette`): The recorded exchanges.
+        latency_scale (float, optional): What to multiply each response's recorded latency
+            by to get how many seconds to wait before returning it. 1 reproduces the
+            recorded timings. Defaults to 0, which returns responses at once.
+    """
+
+    def __init__(self, cassette, latency_scale=0):
+        super().__init__()
+        self._redacted_fields = cassette.redacted_fields
+        self._latency_scale = latency_scale
+        self._exchanges = {}
+        for exchange in cassette.exchanges:
+            key = (exchange.method, exchange.url, exchange.request_body)
+            self._exchanges.setdefault(key, []).append(exchange)
+        self._replayed = {}
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        fields = self._redacted_fields
+        url = redact_url(request.url, fields)
+        key = (request.method, url, _redact_request_body(request.body, fields))
+        exchanges = self._exchanges.get(key)
+        if not exchanges:
+            raise Py42Error(f"The cassette has no response to {request.method} {url}.")
+        with self._lock:
+            count = self._replayed.get(key, 0)
+            self._replayed[key] = count + 1
+        exchange = exchanges[min(count, len(exchanges) - 1)]
+
+        delay = exchange.elapsed * self._latency_scale
+        if delay > 0:
+            time.sleep(delay)
+        return self._build_response(request, exchange)
+
+    def close(self):
+        pass
+
+    def _build_response(self, request, exchange):
+        headers = CaseInsensitiveDict(exchange.headers)
+        headers["Content-Length"] = str(len(exchange.body))
+        response = Response()
+        response.status_code = exchange.status_code
+        response.reason = exchange.reason
+        response.headers = headers
+        response.encoding = get_encoding_from_headers(headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.raw = HTTPResponse(
+            body=io.BytesIO(exchange.body),
+            headers=headers,
+            status=exchange.status_code,
+            preload_content=False,
+        )
+        return response
+
+
+def redact_url(url, fields=DEFAULT_REDACTED_FIELDS):
+    """Returns ``url`` with the values of the query parameters in ``fields`` replaced by
+    ``"REDACTED"``."""
+    parts = urlsplit(url)
+    if not parts.query or not any(field in parts.query for field in fields):
+        return url
+    params = [
+        (name, REDACTED if name in fields else value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+    ]
+    return urlunsplit(parts._replace(query=urlencode(params)))
+
+
+def redact_body(body, fields=DEFAULT_REDACTED_FIELDS):
+    """Returns a JSON ``body`` (bytes) with the values of the keys in ``fields`` replaced by
+    ``"REDACTED"``. Other bodies are returned unchanged."""
+    # Most bodies hold no credentials, so only parse those that might.
+    if not body or not any(field.encode("utf-8") in body for field in fields):
+        return body
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return body
+    if not _redact(data, fields):
+        return body
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def _redact(data, fields):
+    # Redacts ``data`` in place and returns whether anything was redacted.
+    redacted = False
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if key in fields:
+                data[key] = REDACTED
+                redacted = True
+            else:
+                redacted = _redact(value, fields) or redacted
+    elif isinstance(data, list):
+        for item in data:
+            redacted = _redact(item, fields) or redacted
+    return redacted
+
+
+def _redact_request_body(body, fields):
+    if body is None:
+        return None
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    elif not isinstance(body, bytes):
+        # A file or generator, which would be consumed by reading it here.
+        return None
+    return redact_body(body, fields).decode("utf-8", "replace")
+
+
+def _dump_line(data):
+    return json.dumps(data, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def _exchange_to_dict(exchange):
+    values = exchange._asdict()
+    try:
+        values["body"] = exchange.body.decode("utf-8")
+    except UnicodeDecodeError:
+        del values["body"]
+        values["body_base64"] = base64.b64encode(exchange.body).decode("ascii")
+    return values
+
+
+def _exchange_from_dict(values):
+    if "body_base64" in values:
+        values["body"] = base64.b64decode(values.pop("body_base64"))
+    else:
+        values["body"] = values["body"].encode("utf-8")
+    return Exchange(**values)
@@ -0,0 +1,141 @@
+"""Fail fast on requests to hosts that are failing.
+
+A :class:`CircuitBreaker` counts the consecutive failures of requests to each host: failed
+connections, timeouts and server (5xx) errors. Once a host reaches ``failure_threshold`` of
+them its circuit opens, and requests to it raise
+:class:`py42.exceptions.Py42CircuitOpenError` at once instead of waiting for the host to
+time out. After ``recovery_timeout`` seconds the circuit is half-open: a single request is
+sent to probe the host. If it gets a response that isn't a server error, the circuit closes
+and requests resume. If it fails, the circuit opens again for twice as long, up to
+``max_recovery_timeout`` seconds.
+
+Pass a breaker to ``py42.sdk.from_api_client()``, ``from_local_account()`` or
+``from_jwt_provider()`` to use it for all of an SDK client's requests, for example::
+
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=10)
+    sdk = py42.sdk.from_api_client(host, client_id, secret, circuit_breaker=breaker)
+    ...
+    print(breaker.get_states())
+"""
+import threading
+import time
+
+from py42.exceptions import Py42CircuitOpenError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Pauses requests to each host that fails ``failure_threshold`` requests in a row.
+
+    Args:
+        failure_threshold (int, optional): The number of consecutive failed requests that
+            opens a host's circuit. Defaults to 5.
+        recovery_timeout (float, optional): How many seconds a circuit stays open before a
+            request probes the host. Defaults to 30.
+        max_recovery_timeout (float, optional): The longest a circuit stays open, in
+            seconds, after its probes keep failing. Defaults to 300.
+    """
+
+    def __init__(
+        self, failure_threshold=5, recovery_timeout=30, max_recovery_timeout=300
+    ):
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._max_recovery_timeout = max(max_recovery_timeout, recovery_timeout)
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    def before_request(self, host):
+        """Raises :class:`py42.exceptions.Py42CircuitOpenError` if a request to ``host``
+        should not be sent now. When the host's circuit is due a probe, the request is let
+        through as the probe."""
+        with self._lock:
+            circuit = self._get_circuit(host)
+            if circuit.state == CLOSED:
+                return
+            now = time.monotonic()
+            if circuit.state == OPEN and now >= circuit.retry_at:
+                circuit.state = HALF_OPEN
+                circuit.probe_until = now + circuit.timeout
+                return
+            if circuit.state == HALF_OPEN:
+                # Only one probe at a time, unless the last one never finished.
+                if now >= circuit.probe_until:
+                    circuit.probe_until = now + circuit.timeout
+                    return
+                retry_after = circuit.probe_until - now
+            else:
+                retry_after = circuit.retry_at - now
+        raise Py42CircuitOpenError(host, retry_after)
+
+    def on_success(self, host):
+        """Records that ``host`` responded without a server error, closing its circuit."""
+        with self._lock:
+            circuit = self._get_circuit(host)
+            circuit.state = CLOSED
+            circuit.failures = 0
+            circuit.timeout = self._recovery_timeout
+
+    def on_failure(self, host):
+        """Records that a request to ``host`` failed."""
+        with self._lock:
+            circuit = self._get_circuit(host)
+            circuit.failures += 1
+            if circuit.state == HALF_OPEN:
+                circuit.timeout = min(self._max_recovery_timeout, circuit.timeout * 2)
+                self._open(circuit)
+            elif (
+                circuit.state == CLOSED and circuit.failures >= self._failure_threshold
+            ):
+                self._open(circuit)
+
+    def get_states(self):
+        """Returns the circuit of each host that requests have been sent to, keyed by host.
+
+        Each value is a dict with the circuit's ``state`` (``"closed"``, ``"open"`` or
+        ``"half_open"``), its ``consecutive_failures``, how many times it has ``opened``
+        and, for an open circuit, the seconds until the next probe (``retry_after``).
+
+        Returns:
+            dict
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                host: {
+                    "state": circuit.state,
+                    "consecutive_failures": circuit.failures,
+                    "opened": circuit.opened,
+                    "retry_after": max(0.0, circuit.retry_at - now)
+                    if circuit.state == OPEN
+                    else 0.0,
+                }
+                for host, circuit in self._circuits.items()
+            }
+
+    def _get_circuit(self, host):
+        # Must be called while holding the lock.
+        circuit = self._circuits.get(host)
+        if circuit is None:
+            circuit = self._circuits[host] = _Circuit(self._recovery_timeout)
+        return circuit
+
+    def _open(self, circuit):
+        circuit.state = OPEN
+        circuit.retry_at = time.monotonic() + circuit.timeout
+        circuit.opened += 1
+
+
+class _Circuit:
+    __slots__ = ("state", "failures", "opened", "timeout", "retry_at", "probe_until")
+
+    def __init__(self, timeout):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened = 0
+        self.timeout = timeout
+        self.retry_at = 0.0
+        self.probe_until = 0.0
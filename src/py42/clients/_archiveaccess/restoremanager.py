@@ -1,3 +1,4 @@
+import logging
 import time
 
 from py42.services.storage.restore import PushRestoreExistingFiles
@@ -169,7 +170,8 @@ class RestoreJobManager(_RestorePoller):
             "status": response.data.get("status"),
             "percentComplete": response["percentComplete"] if not is_done else 100,
         }
-        debug.logger.debug(format_dict(percentage_dict))
+        if debug.logger.isEnabledFor(logging.DEBUG):
+            debug.logger.debug(format_dict(percentage_dict))
         return is_done
 
     def _start_web_restore(self, backup_set_id, file_selections, show_deleted):
@@ -208,4 +210,5 @@ def _create_size_dict(job_id, size_response):
 
 
 def _print_file_size(size_dict):
-    debug.logger.debug(format_dict(size_dict))
+    if debug.logger.isEnabledFor(logging.DEBUG):
+        debug.logger.debug(format_dict(size_dict))
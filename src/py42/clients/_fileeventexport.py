@@ -0,0 +1,164 @@
+"""Exports file events by splitting a time range into windows whose page token chains are
+walked in parallel, then merging the windows back into a single stream ordered by
+``@timestamp``."""
+import copy
+from collections import deque
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from datetime import timezone
+from itertools import islice
+
+from py42.exceptions import Py42Error
+from py42.sdk.queries.query_filter import create_in_range_filter_group
+from py42.services.util import escape_quote_chars
+from py42.util import convert_datetime_to_timestamp_str
+from py42.util import DATE_STR_FORMAT
+
+# The most events that a single (non-paged) file event search returns.
+DEFAULT_MAX_WINDOW_EVENTS = 10000
+
+_TIMESTAMP_TERM = "@timestamp"
+
+# A window of event timestamps, in milliseconds since the epoch. Both ends are inclusive.
+_Window = namedtuple("_Window", ["start", "end"])
+
+
+def export_file_events(
+    search, query, start, end, concurrency, max_window_events=DEFAULT_MAX_WINDOW_EVENTS
+):
+    """Returns a generator of the file events matching ``query`` with an ``@timestamp``
+    between ``start`` and ``end`` (inclusive).
+
+    The range is first split into ``concurrency`` equal windows. A window whose first page
+    reports more than ``max_window_events`` events is split in half (down to a single
+    millisecond) instead of being paged through, so that dense periods are spread across
+    more parallel searches. Each window's events are collected on a thread pool and the
+    windows are yielded in time order. Events are sorted by ``@timestamp``, and an event
+    seen more than once is only yielded the first time.
+
+    Args:
+        search (callable): A function that runs a file event query and returns a
+            :class:`py42.response.Py42Response`, such as
+            :meth:`py42.services.fileevent.FileEventService.search`.
+        query (:class:`py42.sdk.queries.fileevents.v2.file_event_query.FileEventQuery`):
+            The query that all of the events must match.
+        start (str or int or float or datetime): The start of the time range.
+        end (str or int or float or datetime): The end of the time range.
+        concurrency (int): The most windows to search at once.
+        max_window_events (int, optional): The most events a window may contain before it
+            is split. Defaults to 10,000.
+
+    Returns:
+        generator: An object that iterates over file event dicts.
+    """
+    if isinstance(query, str) or getattr(query, "version", None) != "v2":
+        raise Py42Error("Only V2 FileEventQuery objects can be exported.")
+    if query._group_clause != "AND":
+        raise Py42Error(
+            "Only queries that match all of their filter groups can be exported."
+        )
+    window = _Window(_to_epoch_milliseconds(start), _to_epoch_milliseconds(end))
+    if window.end < window.start:
+        raise Py42Error("The end of the time range must not be before its start.")
+    return _iter_events(search, query, window, concurrency, max_window_events)
+
+
+def _iter_events(search, query, window, concurrency, max_window_events):
+    # Each task is a [window, future] pair, kept in time order. Only the first
+    # `concurrency` tasks are submitted, so later windows are not searched (and their
+    # events are not buffered) until the ones ahead of them have been yielded.
+    tasks = deque([w, None] for w in _split(window, concurrency))
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    last_timestamp = None
+    seen_ids = set()
+
+    try:
+        while tasks:
+            for task in islice(tasks, concurrency):
+                if task[1] is None:
+                    task[1] = executor.submit(
+                        _search_window, search, query, task[0], max_window_events
+                    )
+            _, future = tasks.popleft()
+            events, sub_windows = future.result()
+            if sub_windows:
+                tasks.extendleft([w, None] for w in reversed(sub_windows))
+                continue
+
+            for event in events:
+                # Events are in timestamp order, so a repeated event can only turn up
+                # among those that share its timestamp.
+                timestamp = event.get(_TIMESTAMP_TERM)
+                if timestamp != last_timestamp:
+                    last_timestamp = timestamp
+                    seen_ids.clear()
+                event_id = (event.get("event") or {}).get("id")
+                if event_id is not None:
+                    if event_id in seen_ids:
+                        continue
+                    seen_ids.add(event_id)
+                yield event
+            events = future = None
+    finally:
+        for _, future in tasks:
+            if future is not None:
+                future.cancel()
+        executor.shutdown(wait=False)
+
+
+def _search_window(search, query, window, max_window_events):
+    """Returns the window's events, or None and the two halves of the window when it holds
+    more than ``max_window_events`` events."""
+    window_query = _create_window_query(query, window)
+    response = search(window_query)
+    total = response.data.get("totalCount")
+    if total is not None and total > max_window_events and window.end > window.start:
+        return None, _split(window, 2)
+
+    events = list(response["fileEvents"])
+    page_token = response.data.get("nextPgToken")
+    while page_token:
+        window_query.page_token = escape_quote_chars(page_token)
+        response = search(window_query)
+        events.extend(response["fileEvents"])
+        page_token = response.data.get("nextPgToken")
+    return events, None
+
+
+def _create_window_query(query, window):
+    window_query = copy.copy(query)
+    window_query._filter_group_list = query._filter_group_list + [
+        create_in_range_filter_group(
+            _TIMESTAMP_TERM,
+            _to_timestamp_str(window.start),
+            _to_timestamp_str(window.end),
+        )
+    ]
+    window_query.sort_key = _TIMESTAMP_TERM
+    window_query.sort_direction = "asc"
+    window_query.page_token = ""
+    return window_query
+
+
+def _split(window, count):
+    span = window.end - window.start + 1
+    count = max(1, min(count, span))
+    bounds = [window.start + span * i // count for i in range(count + 1)]
+    return [_Window(bounds[i], bounds[i + 1] - 1) for i in range(count)]
+
+
+def _to_epoch_milliseconds(value):
+    if isinstance(value, str):
+        value = datetime.strptime(value, DATE_STR_FORMAT)
+    if isinstance(value, datetime):
+        # Naive datetimes are treated as UTC, as the timestamp filters do.
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        value = value.timestamp()
+    return int(round(value * 1000))
+
+
+def _to_timestamp_str(milliseconds):
+    date = datetime.fromtimestamp(milliseconds / 1000, timezone.utc)
+    return convert_datetime_to_timestamp_str(date)
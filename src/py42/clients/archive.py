@@ -42,6 +42,20 @@ class ArchiveClient:
             device_guid, "backupSourceGuid"
         )
 
+    def iter_by_device_guid(self, device_guid):
+        """Gets archive information for a device, one archive at a time. Each page is
+        released as soon as its archives have been read from it.
+
+        Args:
+            device_guid (str): The GUID for the device.
+
+        Returns:
+            generator: An object that iterates over archive dicts.
+        """
+        return self._archive_service.iter_archives_from_value(
+            device_guid, "backupSourceGuid"
+        )
+
     def stream_from_backup(
         self,
         file_paths,
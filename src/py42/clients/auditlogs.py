@@ -114,3 +114,46 @@ class AuditLogsClient:
             affected_usernames=affected_usernames,
             **kwargs
         )
+
+    def iter_items(
+        self,
+        begin_time=None,
+        end_time=None,
+        event_types=None,
+        user_ids=None,
+        usernames=None,
+        user_ip_addresses=None,
+        affected_user_ids=None,
+        affected_usernames=None,
+        stream=False,
+        **kwargs
+    ):
+        """Retrieve audit logs one event at a time, filtered based on given arguments.
+        Accepts the same arguments as :meth:`get_all`. Each page is released as soon as its
+        events have been read from it.
+
+        Args:
+            stream (bool, optional): When True, each page is streamed and its events are
+                parsed as they arrive, so memory use does not grow with the page size.
+                Defaults to False.
+
+        Returns:
+            generator: An object that iterates over audit log event dicts.
+        """
+        warn(
+            "Incydr functionality is deprecated. Use the Incydr SDK instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return self._audit_log_service.iter_items(
+            begin_time=begin_time,
+            end_time=end_time,
+            event_types=event_types,
+            user_ids=user_ids,
+            usernames=usernames,
+            user_ip_addresses=user_ip_addresses,
+            affected_user_ids=affected_user_ids,
+            affected_usernames=affected_usernames,
+            stream=stream,
+            **kwargs
+        )
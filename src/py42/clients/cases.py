@@ -194,6 +194,49 @@ class CasesClient:
             **kwargs,
         )
 
+    def iter_items(
+        self,
+        name=None,
+        status=None,
+        min_create_time=None,
+        max_create_time=None,
+        min_update_time=None,
+        max_update_time=None,
+        subject=None,
+        assignee=None,
+        page_size=100,
+        sort_direction="asc",
+        sort_key="number",
+        **kwargs,
+    ):
+        """Gets all cases, one case at a time. Accepts the same arguments as :meth:`get_all`.
+        Each page is released as soon as its cases have been read from it.
+
+        Returns:
+            generator: An object that iterates over case dicts.
+        """
+        warn(
+            "Incydr functionality is deprecated. Use the Incydr SDK instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+
+        created_at = _make_range(min_create_time, max_create_time)
+        updated_at = _make_range(min_update_time, max_update_time)
+
+        return self._cases_service.iter_items(
+            name=name,
+            status=status,
+            created_at=created_at,
+            updated_at=updated_at,
+            subject=subject,
+            assignee=assignee,
+            page_size=page_size,
+            sort_direction=sort_direction,
+            sort_key=sort_key,
+            **kwargs,
+        )
+
     def get(self, case_number):
         """Retrieve case details by case number.
         `Rest documentation <https://developer.code42.com/api/#operation/getCaseUsingGET>`__
@@ -0,0 +1,341 @@
+"""Resumable file event cursors and the checkpoint stores that persist their position."""
+import copy
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from py42.exceptions import Py42Error
+from py42.exceptions import Py42InvalidPageTokenError
+from py42.sdk.queries.query_filter import create_on_or_after_filter_group
+from py42.services.util import escape_quote_chars
+from py42.tokenstore import _lock_file
+
+_TIMESTAMP_TERM = "@timestamp"
+
+
+class FileCheckpointStore:
+    """Stores cursor checkpoints in a JSON file, keyed by cursor name. The file is replaced
+    atomically on every save, so a crash never leaves it half-written, and changes are
+    made under an exclusive lock on a ``.lock`` file next to it, so processes sharing the
+    file do not overwrite each other's checkpoints. Each cursor name should still only be
+    resumed by one process at a time.
+
+    Args:
+        path (str): The path of the checkpoint file. It is created on the first save.
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._lock_path = f"{path}.lock"
+        self._thread_lock = threading.Lock()
+
+    def load(self, name):
+        """Returns the checkpoint saved under ``name``, or None."""
+        with self._locked():
+            return self._read().get(name)
+
+    def save(self, name, checkpoint):
+        """Saves the ``checkpoint`` dict under ``name``."""
+        with self._locked():
+            checkpoints = self._read()
+            checkpoints[name] = checkpoint
+            self._write(checkpoints)
+
+    def delete(self, name):
+        """Removes the checkpoint saved under ``name``, if there is one."""
+        with self._locked():
+            checkpoints = self._read()
+            if checkpoints.pop(name, None) is not None:
+                self._write(checkpoints)
+
+    @contextmanager
+    def _locked(self):
+        with self._thread_lock:
+            fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                _lock_file(fd)
+                yield
+            finally:
+                # Closing the file releases the lock.
+                os.close(fd)
+
+    def _read(self):
+        try:
+            with open(self._path, encoding="utf-8") as checkpoint_file:
+                return json.load(checkpoint_file)
+        except FileNotFoundError:
+            return {}
+
+    def _write(self, checkpoints):
+        directory = os.path.dirname(os.path.abspath(self._path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as temp_file:
+                json.dump(checkpoints, temp_file)
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+            os.replace(temp_path, self._path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+class SQLiteCheckpointStore:
+    """Stores cursor checkpoints in a SQLite database, keyed by cursor name. Useful when
+    many cursors share one store, since saving one checkpoint does not rewrite the others.
+
+    Args:
+        path (str): The path of the database file. It is created if it does not exist.
+    """
+
+    def __init__(self, path):
+        self._path = path
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS py42_checkpoints "
+                "(name TEXT PRIMARY KEY, checkpoint TEXT NOT NULL)"
+            )
+
+    def load(self, name):
+        """Returns the checkpoint saved under ``name``, or None."""
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT checkpoint FROM py42_checkpoints WHERE name = ?", (name,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save(self, name, checkpoint):
+        """Saves the ``checkpoint`` dict under ``name``."""
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO py42_checkpoints (name, checkpoint) VALUES (?, ?)",
+                (name, json.dumps(checkpoint)),
+            )
+
+    def delete(self, name):
+        """Removes the checkpoint saved under ``name``, if there is one."""
+        with self._connect() as connection:
+            connection.execute("DELETE FROM py42_checkpoints WHERE name = ?", (name,))
+
+    def _connect(self):
+        # A connection per operation keeps the store usable from any thread. Used as a
+        # context manager, the connection commits (or rolls back) the transaction.
+        return _ClosingConnection(sqlite3.connect(self._path))
+
+
+class _ClosingConnection:
+    def __init__(self, connection):
+        self._connection = connection
+
+    def __enter__(self):
+        return self._connection.__enter__()
+
+    def __exit__(self, *args):
+        try:
+            return self._connection.__exit__(*args)
+        finally:
+            self._connection.close()
+
+
+class FileEventCursor:
+    """Iterates over the events matching a V2 file event query, saving its position to a
+    checkpoint store so that a new cursor with the same name picks up where the last one
+    stopped, for example after a crash.
+
+    The position is saved after each page of events and when iteration stops early. Call
+    :meth:`save` to save it after every event instead. Events are returned in
+    ``@timestamp`` order. Once the last page has been read, iterating again (or using
+    :meth:`follow`) only searches for events at or after the latest ``@timestamp`` seen,
+    skipping those already returned.
+
+    Args:
+        search (callable): A function that runs a file event query and returns a
+            :class:`py42.response.Py42Response`, such as
+            :meth:`py42.services.fileevent.FileEventService.search`.
+        query (:class:`py42.sdk.queries.fileevents.v2.file_event_query.FileEventQuery`):
+            The query to search with. It must match all of its filter groups (the
+            default).
+        store (:class:`FileCheckpointStore` or :class:`SQLiteCheckpointStore`): Where to
+            save the cursor's position.
+        name (str, optional): The name of the checkpoint in ``store``. Defaults to
+            ``"default"``.
+
+    Raises:
+        :class:`py42.exceptions.Py42Error`: The checkpoint in ``store`` was saved for a
+            different query.
+    """
+
+    def __init__(self, search, query, store, name="default"):
+        if isinstance(query, str) or getattr(query, "version", None) != "v2":
+            raise Py42Error("File event cursors require a V2 FileEventQuery.")
+        if query._group_clause != "AND":
+            raise Py42Error(
+                "File event cursors require a query that matches all of its filter groups."
+            )
+        self._search = search
+        self._query = query
+        self._store = store
+        self._name = name
+        self._fingerprint = get_query_fingerprint(query)
+        self._checkpoint = self._load_checkpoint()
+
+    @property
+    def name(self):
+        """The name of the cursor's checkpoint."""
+        return self._name
+
+    @property
+    def checkpoint(self):
+        """A copy of the cursor's current position: the query fingerprint, the page token
+        and offset within that page, and the latest ``@timestamp`` returned along with the
+        IDs of the events at that timestamp."""
+        return copy.deepcopy(self._checkpoint)
+
+    @property
+    def high_water_timestamp(self):
+        """The ``@timestamp`` of the latest event returned, or None."""
+        return self._checkpoint["high_water_timestamp"]
+
+    def __iter__(self):
+        return self._iter_events()
+
+    def follow(self, poll_interval=60):
+        """Returns the events matching the query and then keeps polling for new ones,
+        waiting ``poll_interval`` seconds after each search that reaches the last page.
+
+        Args:
+            poll_interval (int or float, optional): Seconds to wait between polls. Defaults
+                to 60.
+
+        Returns:
+            generator: An object that iterates over file event dicts without end.
+        """
+        while True:
+            yield from self._iter_events()
+            time.sleep(poll_interval)
+
+    def save(self):
+        """Saves the cursor's current position to its store."""
+        self._store.save(self._name, self._checkpoint)
+
+    def reset(self):
+        """Deletes the cursor's checkpoint so that it starts over from the first event."""
+        self._store.delete(self._name)
+        self._checkpoint = _create_checkpoint(self._fingerprint)
+
+    def _load_checkpoint(self):
+        checkpoint = self._store.load(self._name)
+        if checkpoint is None:
+            return _create_checkpoint(self._fingerprint)
+        if checkpoint.get("query_fingerprint") != self._fingerprint:
+            raise Py42Error(
+                f"The checkpoint '{self._name}' was saved for a different query. Use "
+                "another name, or reset the cursor to start over."
+            )
+        return checkpoint
+
+    def _iter_events(self):
+        checkpoint = self._checkpoint
+        try:
+            while True:
+                if checkpoint["page_token"] is None:
+                    # Start a new chain of pages from the latest event seen.
+                    checkpoint["chain_start"] = checkpoint["high_water_timestamp"]
+                    checkpoint["page_token"] = ""
+                    checkpoint["offset"] = 0
+
+                try:
+                    response = self._search(self._create_query())
+                except Py42InvalidPageTokenError:
+                    if not checkpoint["page_token"]:
+                        raise
+                    # The token has expired; the high-water mark still says where to
+                    # continue from.
+                    checkpoint["page_token"] = None
+                    continue
+
+                events = response["fileEvents"]
+                offset = checkpoint["offset"]
+                for event in events[offset:]:
+                    checkpoint["offset"] += 1
+                    if self._advance_high_water(event):
+                        yield event
+
+                next_page_token = response.data.get("nextPgToken")
+                checkpoint["page_token"] = next_page_token or None
+                checkpoint["offset"] = 0
+                response = events = None
+                self.save()
+                if not next_page_token:
+                    return
+        finally:
+            self.save()
+
+    def _create_query(self):
+        checkpoint = self._checkpoint
+        query = copy.copy(self._query)
+        if checkpoint["chain_start"] is not None:
+            query._filter_group_list = query._filter_group_list + [
+                create_on_or_after_filter_group(
+                    _TIMESTAMP_TERM, checkpoint["chain_start"]
+                )
+            ]
+        query.sort_key = _TIMESTAMP_TERM
+        query.sort_direction = "asc"
+        query.page_token = escape_quote_chars(checkpoint["page_token"])
+        return query
+
+    def _advance_high_water(self, event):
+        """Records ``event`` as returned. Returns False if it was returned already."""
+        checkpoint = self._checkpoint
+        timestamp = event.get(_TIMESTAMP_TERM)
+        event_id = (event.get("event") or {}).get("id")
+        high_water = checkpoint["high_water_timestamp"]
+        if high_water is not None and timestamp is not None:
+            if timestamp < high_water:
+                return False
+            if timestamp == high_water:
+                if event_id in checkpoint["high_water_ids"]:
+                    return False
+                checkpoint["high_water_ids"].append(event_id)
+                return True
+        checkpoint["high_water_timestamp"] = timestamp
+        checkpoint["high_water_ids"] = [event_id]
+        return True
+
+
+def get_query_fingerprint(query):
+    """Returns a hash of the filters of a file event query, ignoring its paging and sort
+    settings.
+
+    Args:
+        query (:class:`py42.sdk.queries.fileevents.v2.file_event_query.FileEventQuery`):
+            The query.
+
+    Returns:
+        str: A hex digest.
+    """
+    query_dict = dict(query)
+    filters = {
+        "version": query.version,
+        "groupClause": query_dict["groupClause"],
+        "groups": query_dict["groups"],
+    }
+    serialized = json.dumps(filters, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+def _create_checkpoint(fingerprint):
+    return {
+        "query_fingerprint": fingerprint,
+        "page_token": None,
+        "offset": 0,
+        "chain_start": None,
+        "high_water_timestamp": None,
+        "high_water_ids": [],
+    }
@@ -0,0 +1,437 @@
+"""Sinks that write V2 file events to NDJSON, Parquet or Arrow files, and a helper that
+collects them into NumPy-backed column batches.
+
+Events are flattened into columns named after the terms of the V2 file event filter
+classes (for example ``file.hash.md5`` or ``risk.indicators.name``), so the columns line up
+with the fields used to build a
+:class:`~py42.sdk.queries.fileevents.v2.file_event_query.FileEventQuery`. The columnar sinks
+buffer at most one row group of events at a time.
+
+The Parquet and Arrow sinks require ``pyarrow`` (``pip install py42[arrow]``) and
+:func:`iter_numpy_batches` requires ``numpy`` (``pip install py42[numpy]``).
+
+Usage example::
+
+    query = FileEventQuery.all(Category.is_in([Category.DOCUMENT]))
+    with ParquetFileEventSink("events.parquet") as sink:
+        sink.write_pages(sdk.securitydata.export_file_events(query, start, end))
+"""
+import inspect
+import json
+
+from py42.exceptions import Py42Error
+from py42.response import Py42Response
+from py42.sdk.queries.fileevents.v2.filters import destination
+from py42.sdk.queries.fileevents.v2.filters import event
+from py42.sdk.queries.fileevents.v2.filters import file
+from py42.sdk.queries.fileevents.v2.filters import process
+from py42.sdk.queries.fileevents.v2.filters import risk
+from py42.sdk.queries.fileevents.v2.filters import source
+from py42.sdk.queries.fileevents.v2.filters import timestamp
+from py42.sdk.queries.fileevents.v2.filters import user
+
+DEFAULT_ROW_GROUP_SIZE = 10000
+
+STRING = "string"
+INT = "int"
+FLOAT = "float"
+BOOL = "bool"
+STRING_LIST = "string_list"
+INT_LIST = "int_list"
+
+_FILTER_MODULES = (timestamp, event, user, file, source, destination, process, risk)
+
+# Columns that are not strings. Fields nested in a list of objects, such as the names of
+# the risk indicators, become a list of values.
+_COLUMN_TYPES = {
+    "file.sizeInBytes": INT,
+    "source.removableMedia.capacity": INT,
+    "destination.removableMedia.capacity": INT,
+    "source.privateIp": STRING_LIST,
+    "destination.privateIp": STRING_LIST,
+    "source.tabs.title": STRING_LIST,
+    "source.tabs.titleError": STRING_LIST,
+    "source.tabs.url": STRING_LIST,
+    "source.tabs.urlError": STRING_LIST,
+    "destination.tabs.title": STRING_LIST,
+    "destination.tabs.titleError": STRING_LIST,
+    "destination.tabs.url": STRING_LIST,
+    "destination.tabs.urlError": STRING_LIST,
+    "destination.email.recipients": STRING_LIST,
+    "file.classifications": STRING_LIST,
+    "risk.indicators.name": STRING_LIST,
+    "risk.indicators.weight": INT_LIST,
+    "risk.score": INT,
+    "risk.trusted": BOOL,
+}
+
+
+def _get_filter_terms(modules):
+    terms = []
+    for module in modules:
+        for _, cls in inspect.getmembers(module, inspect.isclass):
+            term = getattr(cls, "_term", None)
+            if cls.__module__ == module.__name__ and term and term not in terms:
+                terms.append(term)
+    return terms
+
+
+FILE_EVENT_COLUMNS = _get_filter_terms(_FILTER_MODULES)
+"""The default columns, in order: ``@timestamp`` and the terms of the ``event``,
+``user``, ``file``, ``source``, ``destination``, ``process`` and ``risk`` filter
+modules."""
+
+
+def get_column_type(column):
+    """Returns the type of a flattened column: one of ``"string"``, ``"int"``,
+    ``"float"``, ``"bool"``, ``"string_list"`` or ``"int_list"``."""
+    return _COLUMN_TYPES.get(column, STRING)
+
+
+def flatten_file_event(event_dict, columns=None):
+    """Flattens a V2 file event into a dict keyed by column name, such as
+    ``{"file.name": "report.docx", "risk.indicators.name": ["Zip"], ...}``.
+
+    Missing fields are None. Values are converted to the column's type (see
+    :func:`get_column_type`); objects in a string column are serialized to JSON.
+
+    Args:
+        event_dict (dict): A file event, as returned in ``fileEvents``.
+        columns (list, optional): The columns to include. Defaults to
+            :data:`FILE_EVENT_COLUMNS`.
+
+    Returns:
+        dict
+    """
+    columns = columns or FILE_EVENT_COLUMNS
+    return {
+        column: _convert(_get_path(event_dict, column), get_column_type(column))
+        for column in columns
+    }
+
+
+class NdjsonFileEventSink:
+    """Writes file events to a newline-delimited JSON file, one event per line, as they
+    are received.
+
+    Args:
+        path_or_file (str or file): A path to write to, or a text file object.
+        flatten (bool, optional): Whether to write flattened events (see
+            :func:`flatten_file_event`) instead of the events as received. Defaults to
+            False.
+        columns (list, optional): The columns to write when ``flatten`` is True. Defaults
+            to :data:`FILE_EVENT_COLUMNS`.
+    """
+
+    def __init__(self, path_or_file, flatten=False, columns=None):
+        if isinstance(path_or_file, str):
+            self._file = open(path_or_file, "w", encoding="utf-8")
+            self._owns_file = True
+        else:
+            self._file = path_or_file
+            self._owns_file = False
+        self._flatten = flatten
+        self._columns = columns
+        self.event_count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def write(self, events):
+        """Writes a page of file events.
+
+        Args:
+            events (:class:`py42.response.Py42Response` or dict or iterable): A file event
+                search response or its parsed body, or any iterable of events.
+        """
+        for event_dict in _iter_events(events):
+            if self._flatten:
+                event_dict = flatten_file_event(event_dict, self._columns)
+            self._file.write(json.dumps(event_dict))
+            self._file.write("\n")
+            self.event_count += 1
+
+    def write_pages(self, pages):
+        """Writes every page (or event) of an iterable of pages, such as the responses of
+        successive searches."""
+        _write_pages(self, pages)
+
+    def close(self):
+        """Flushes the file, closing it if the sink opened it."""
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+
+class _ColumnarFileEventSink:
+    def __init__(self, row_group_size=DEFAULT_ROW_GROUP_SIZE, columns=None):
+        self._row_group_size = row_group_size
+        self._columns = columns or FILE_EVENT_COLUMNS
+        self._buffer = _ColumnBuffer(self._columns)
+        self.event_count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def write(self, events):
+        """Writes a page of file events, flushing a row group each time
+        ``row_group_size`` events have been buffered.
+
+        Args:
+            events (:class:`py42.response.Py42Response` or dict or iterable): A file event
+                search response or its parsed body, or any iterable of events.
+        """
+        for event_dict in _iter_events(events):
+            self._buffer.append(event_dict)
+            self.event_count += 1
+            if len(self._buffer) >= self._row_group_size:
+                self._flush()
+
+    def write_pages(self, pages):
+        """Writes every page (or event) of an iterable of pages, such as the responses of
+        successive searches."""
+        _write_pages(self, pages)
+
+    def close(self):
+        """Writes any buffered events and closes the file."""
+        self._flush()
+        self._close_writer()
+
+    def _flush(self):
+        if len(self._buffer):
+            self._write_batch(self._buffer.to_arrow(_import_pyarrow()))
+            self._buffer = _ColumnBuffer(self._columns)
+
+    def _write_batch(self, batch):
+        raise NotImplementedError()
+
+    def _close_writer(self):
+        raise NotImplementedError()
+
+
+class ParquetFileEventSink(_ColumnarFileEventSink):
+    """Writes flattened file events to a Parquet file, one row group per
+    ``row_group_size`` events. Requires ``pyarrow``.
+
+    Args:
+        path (str): The path of the Parquet file.
+        row_group_size (int, optional): The number of events per row group, which is also
+            the most events held in memory. Defaults to 10,000.
+        columns (list, optional): The columns to write. Defaults to
+            :data:`FILE_EVENT_COLUMNS`.
+        compression (str, optional): The Parquet compression codec. Defaults to
+            ``"snappy"``.
+    """
+
+    def __init__(
+        self,
+        path,
+        row_group_size=DEFAULT_ROW_GROUP_SIZE,
+        columns=None,
+        compression="snappy",
+    ):
+        super().__init__(row_group_size=row_group_size, columns=columns)
+        pa = _import_pyarrow()
+        import pyarrow.parquet as pq
+
+        self._writer = pq.ParquetWriter(
+            path, _get_arrow_schema(pa, self._columns), compression=compression
+        )
+
+    def _write_batch(self, batch):
+        self._writer.write_batch(batch, row_group_size=self._row_group_size)
+
+    def _close_writer(self):
+        self._writer.close()
+
+
+class ArrowFileEventSink(_ColumnarFileEventSink):
+    """Writes flattened file events to an Arrow IPC file (readable with
+    ``pyarrow.ipc.open_file()``), one record batch per ``row_group_size`` events. Requires
+    ``pyarrow``.
+
+    Args:
+        path (str): The path of the Arrow file.
+        row_group_size (int, optional): The number of events per record batch, which is
+            also the most events held in memory. Defaults to 10,000.
+        columns (list, optional): The columns to write. Defaults to
+            :data:`FILE_EVENT_COLUMNS`.
+    """
+
+    def __init__(self, path, row_group_size=DEFAULT_ROW_GROUP_SIZE, columns=None):
+        super().__init__(row_group_size=row_group_size, columns=columns)
+        pa = _import_pyarrow()
+        self._sink = pa.OSFile(path, "wb")
+        self._writer = pa.ipc.new_file(self._sink, _get_arrow_schema(pa, self._columns))
+
+    def _write_batch(self, batch):
+        self._writer.write_batch(batch)
+
+    def _close_writer(self):
+        self._writer.close()
+        self._sink.close()
+
+
+def iter_numpy_batches(pages, batch_size=DEFAULT_ROW_GROUP_SIZE, columns=None):
+    """Collects file events into batches of NumPy arrays, one array per column, for
+    in-process analysis. Requires ``numpy``.
+
+    ``"int"`` and ``"float"`` columns are ``float64`` arrays with NaN for missing values,
+    and all other columns are ``object`` arrays.
+
+    Args:
+        pages (iterable): File event search responses, ``fileEvents`` lists, or events.
+        batch_size (int, optional): The most events per batch. Defaults to 10,000.
+        columns (list, optional): The columns to include. Defaults to
+            :data:`FILE_EVENT_COLUMNS`.
+
+    Returns:
+        generator: An object that iterates over dicts mapping each column name to an
+        array of ``batch_size`` (or, for the last batch, fewer) values.
+    """
+    np = _import_numpy()
+    columns = columns or FILE_EVENT_COLUMNS
+    buffer = _ColumnBuffer(columns)
+    for events in pages:
+        for event_dict in _iter_events(events):
+            buffer.append(event_dict)
+            if len(buffer) >= batch_size:
+                yield buffer.to_numpy(np)
+                buffer = _ColumnBuffer(columns)
+    if len(buffer):
+        yield buffer.to_numpy(np)
+
+
+class _ColumnBuffer:
+    """Flattened events, stored column by column."""
+
+    def __init__(self, columns):
+        self._columns = columns
+        self._values = {column: [] for column in columns}
+        self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    def append(self, event_dict):
+        for column, value in flatten_file_event(event_dict, self._columns).items():
+            self._values[column].append(value)
+        self._length += 1
+
+    def to_arrow(self, pa):
+        schema = _get_arrow_schema(pa, self._columns)
+        arrays = [
+            pa.array(self._values[field.name], type=field.type) for field in schema
+        ]
+        return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+    def to_numpy(self, np):
+        batch = {}
+        for column in self._columns:
+            values = self._values[column]
+            if get_column_type(column) in (INT, FLOAT):
+                values = [np.nan if v is None else v for v in values]
+                batch[column] = np.array(values, dtype=np.float64)
+            else:
+                array = np.empty(len(values), dtype=object)
+                array[:] = values
+                batch[column] = array
+        return batch
+
+
+def _iter_events(events):
+    if isinstance(events, (dict, Py42Response)):
+        return iter(events["fileEvents"])
+    return iter(events)
+
+
+def _write_pages(sink, pages):
+    for page in pages:
+        if isinstance(page, dict) and "fileEvents" not in page:
+            # An iterable of events rather than of pages.
+            sink.write([page])
+        else:
+            sink.write(page)
+
+
+def _get_path(value, path):
+    names = path.split(".")
+    for index, name in enumerate(names):
+        if isinstance(value, list):
+            # A list of objects: collect the rest of the path from each of them.
+            rest = ".".join(names[index:])
+            return [_get_path(item, rest) for item in value]
+        if not isinstance(value, dict):
+            return None
+        value = value.get(name)
+    return value
+
+
+def _convert(value, column_type):
+    if value is None:
+        return None
+    if column_type in (STRING_LIST, INT_LIST):
+        item_type = STRING if column_type == STRING_LIST else INT
+        items = value if isinstance(value, list) else [value]
+        return [_convert(item, item_type) for item in items]
+    if isinstance(value, list) and column_type != STRING:
+        value = value[0] if value else None
+        return _convert(value, column_type)
+    try:
+        if column_type == INT:
+            return int(value)
+        if column_type == FLOAT:
+            return float(value)
+        if column_type == BOOL:
+            return bool(value)
+    except (TypeError, ValueError):
+        return None
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+
+def _get_arrow_schema(pa, columns):
+    arrow_types = {
+        STRING: pa.string(),
+        INT: pa.int64(),
+        FLOAT: pa.float64(),
+        BOOL: pa.bool_(),
+        STRING_LIST: pa.list_(pa.string()),
+        INT_LIST: pa.list_(pa.int64()),
+    }
+    return pa.schema(
+        [pa.field(column, arrow_types[get_column_type(column)]) for column in columns]
+    )
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+    except ImportError:
+        raise Py42Error(
+            "Parquet and Arrow file event sinks require the 'pyarrow' package. "
+            "Install it with `pip install py42[arrow]`."
+        )
+    return pyarrow
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise Py42Error(
+            "NumPy file event batches require the 'numpy' package. "
+            "Install it with `pip install py42[numpy]`."
+        )
+    return numpy
@@ -1,6 +1,14 @@
+import os
 import re
+import threading
+from concurrent.futures import as_completed
+from concurrent.futures import ThreadPoolExecutor
 from warnings import warn
 
+from py42 import settings
+from py42.clients._fileeventexport import DEFAULT_MAX_WINDOW_EVENTS
+from py42.clients._fileeventexport import export_file_events
+from py42.clients.fileeventcursor import FileEventCursor
 from py42.exceptions import Py42ChecksumNotFoundError
 from py42.exceptions import Py42Error
 from py42.sdk.queries.fileevents.v2.file_event_query import FileEventQuery
@@ -10,6 +18,10 @@ from py42.services.util import escape_quote_chars
 
 # Incydr functionality is deprecated as of 2025-03.
 
+# The number of hashes looked up by each search of a bulk download.
+DEFAULT_HASH_CHUNK_SIZE = 100
+_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 class SecurityDataClient:
     def __init__(
@@ -77,6 +89,116 @@ class SecurityDataClient:
         response = self._file_event_service.search(query)
         return response
 
+    def iter_file_events(self, query, stream=True):
+        """Searches for all file events, following ``nextPgToken`` from page to page and
+        returning one event at a time.
+
+        Args:
+            query (:class:`py42.sdk.queries.fileevents.v2.file_event_query.FileEventQuery`):
+                The file event query to filter search results.
+            stream (bool, optional): When True, each page is streamed and its events are
+                parsed as they arrive, so memory use does not grow with the page size.
+                Defaults to True.
+
+        Returns:
+            generator: An object that iterates over file event dicts.
+        """
+        warn(
+            "Incydr functionality is deprecated. Use the Incydr SDK instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return self._iter_file_events(query, stream)
+
+    def _iter_file_events(self, query, stream):
+        page_token = ""
+        while True:
+            query.page_token = escape_quote_chars(page_token)
+            response = self._file_event_service.search(query, stream=stream)
+            yield from response.iter_items("fileEvents")
+            page_token = response["nextPgToken"]
+            if not page_token:
+                return
+
+    def export_file_events(
+        self,
+        query,
+        start,
+        end,
+        concurrency=4,
+        max_window_events=DEFAULT_MAX_WINDOW_EVENTS,
+    ):
+        """Searches for all file events in a time range, splitting the range into windows
+        that are searched in parallel, and returns them one at a time ordered by
+        ``@timestamp``.
+
+        Windows that hold more than ``max_window_events`` events are split in half until
+        they no longer do, so that busy periods are spread across more searches. Each
+        window's page tokens are followed to the end, so there is no limit on the number of
+        events returned. An event that appears in more than one page is only returned once
+        (based on ``event.id``).
+
+        Args:
+            query (:class:`py42.sdk.queries.fileevents.v2.file_event_query.FileEventQuery`):
+                The file event query to filter search results. It must match all of its
+                filter groups (the default), since the window's time range is added to it.
+            start (str or int or float or datetime): The start of the time range. A str
+                must be in the format ``"%Y-%m-%d %H:%M:%S"``, and ints and floats are POSIX
+                timestamps.
+            end (str or int or float or datetime): The end of the time range (inclusive).
+            concurrency (int, optional): The most windows to search at once. Defaults to 4.
+            max_window_events (int, optional): The most events a window may hold before it
+                is split. Defaults to 10,000.
+
+        Returns:
+            generator: An object that iterates over file event dicts.
+        """
+        warn(
+            "Incydr functionality is deprecated. Use the Incydr SDK instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return export_file_events(
+            self._file_event_service.search,
+            query,
+            start,
+            end,
+            concurrency,
+            max_window_events=max_window_events,
+        )
+
+    def get_file_event_cursor(self, query, store, name="default"):
+        """Gets a resumable cursor over the file events matching a query. The cursor saves
+        its position (the page token, the latest ``@timestamp`` returned and a fingerprint
+        of the query) to ``store``, so a cursor created later with the same ``store`` and
+        ``name`` continues from where the last one stopped. Use its ``follow()`` method to
+        keep polling for new events.
+
+        Usage example::
+
+            store = SQLiteCheckpointStore("checkpoints.db")
+            cursor = sdk.securitydata.get_file_event_cursor(query, store, name="exfil")
+            for event in cursor:
+                handle(event)
+
+        Args:
+            query (:class:`py42.sdk.queries.fileevents.v2.file_event_query.FileEventQuery`):
+                The file event query to filter search results.
+            store (:class:`py42.clients.fileeventcursor.FileCheckpointStore` or :class:`py42.clients.fileeventcursor.SQLiteCheckpointStore`):
+                Where to save the cursor's position.
+            name (str, optional): The name of the cursor's checkpoint in ``store``.
+                Defaults to ``"default"``.
+
+        Returns:
+            :class:`py42.clients.fileeventcursor.FileEventCursor`
+        """
+        warn(
+            "Incydr functionality is deprecated. Use the Incydr SDK instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return FileEventCursor(self._file_event_service.search, query, store, name=name)
+
     def stream_file_by_sha256(self, checksum):
         """Stream file based on SHA256 checksum.
 
@@ -119,6 +241,169 @@ class SecurityDataClient:
             raise Py42ChecksumNotFoundError(response, "MD5", checksum)
         return self._stream_file(checksum, info)
 
+    def download_files_by_sha256(
+        self,
+        checksums,
+        directory,
+        max_workers=8,
+        chunk_size=DEFAULT_HASH_CHUNK_SIZE,
+    ):
+        """Downloads the files with the given SHA256 checksums to ``directory``, naming
+        each file after its checksum.
+
+        Unlike calling :meth:`stream_file_by_sha256` for each checksum, the checksums are
+        looked up ``chunk_size`` at a time with ``SHA256.is_in()`` searches, and the
+        searches, version lookups and downloads all run on a pool of ``max_workers``
+        threads.
+
+        Args:
+            checksums (iterable): The SHA256 hashes of the files.
+            directory (str): The directory to write the files to. It must exist.
+            max_workers (int, optional): The most requests to have in flight at once.
+                Defaults to 8.
+            chunk_size (int, optional): The number of checksums per search. Defaults to
+                100.
+
+        Returns:
+            dict: Maps each checksum to the path of its downloaded file or, if it could not
+            be downloaded, to the exception raised for it, such as
+            :class:`py42.exceptions.Py42ChecksumNotFoundError`.
+        """
+        warn(
+            "Incydr functionality is deprecated. Use the Incydr SDK instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return self._download_files_by_hash(
+            checksums, directory, SHA256, max_workers, chunk_size
+        )
+
+    def download_files_by_md5(
+        self,
+        checksums,
+        directory,
+        max_workers=8,
+        chunk_size=DEFAULT_HASH_CHUNK_SIZE,
+    ):
+        """Downloads the files with the given MD5 checksums to ``directory``, naming each
+        file after its checksum. See :meth:`download_files_by_sha256`.
+
+        Args:
+            checksums (iterable): The MD5 hashes of the files.
+            directory (str): The directory to write the files to. It must exist.
+            max_workers (int, optional): The most requests to have in flight at once.
+                Defaults to 8.
+            chunk_size (int, optional): The number of checksums per search. Defaults to
+                100.
+
+        Returns:
+            dict: Maps each checksum to the path of its downloaded file or, if it could not
+            be downloaded, to the exception raised for it.
+        """
+        warn(
+            "Incydr functionality is deprecated. Use the Incydr SDK instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return self._download_files_by_hash(
+            checksums, directory, MD5, max_workers, chunk_size
+        )
+
+    def _download_files_by_hash(
+        self, checksums, directory, checksum_type, max_workers, chunk_size
+    ):
+        checksums = list(dict.fromkeys(checksums))
+        chunks = []
+        for start in range(0, len(checksums), chunk_size):
+            end = start + chunk_size
+            chunks.append(checksums[start:end])
+        results = dict.fromkeys(checksums)
+        eds_cache = _ExfiltratedDataServiceCache(self._storage_service_factory)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            searches = {
+                executor.submit(self._search_by_hashes, chunk, checksum_type): chunk
+                for chunk in chunks
+            }
+            downloads = {}
+            for search in as_completed(searches):
+                chunk = searches[search]
+                try:
+                    response, lookup_info = search.result()
+                except Exception as err:
+                    results.update(dict.fromkeys(chunk, err))
+                    continue
+                for checksum in chunk:
+                    info = lookup_info.get(checksum.lower())
+                    if info is None:
+                        results[checksum] = Py42ChecksumNotFoundError(
+                            response, checksum_type.__name__, checksum
+                        )
+                        continue
+                    download = executor.submit(
+                        self._download_file, checksum, info, directory, eds_cache
+                    )
+                    downloads[download] = checksum
+
+            for download in as_completed(downloads):
+                checksum = downloads[download]
+                try:
+                    results[checksum] = download.result()
+                except Exception as err:
+                    results[checksum] = err
+        return results
+
+    def _search_by_hashes(self, checksums, checksum_type):
+        """Returns the last search response and the version lookup info of each checksum
+        found, keyed by lowercase checksum. Stops after one page per checksum, as many
+        searches as looking each one up alone would take, so checksums without events do
+        not make it read every page of the others."""
+        query = FileEventQuery.all(checksum_type.is_in(checksums))
+        query.sort_key = "@timestamp"
+        query.sort_direction = "desc"
+        query.page_size = settings.security_events_per_page
+        term = "sha256" if checksum_type is SHA256 else "md5"
+        remaining = {checksum.lower() for checksum in checksums}
+        lookup_info = {}
+        page_token = ""
+        for _ in range(len(checksums)):
+            query.page_token = escape_quote_chars(page_token)
+            response = self._file_event_service.search(query)
+            for event in response["fileEvents"]:
+                checksum = ((event.get("file") or {}).get("hash") or {}).get(term)
+                checksum = checksum.lower() if checksum else None
+                if checksum in remaining:
+                    info = _get_version_lookup_info([event])
+                    if info:
+                        lookup_info[checksum] = info
+                        remaining.discard(checksum)
+            page_token = response.data.get("nextPgToken")
+            if not remaining or not page_token:
+                break
+        return response, lookup_info
+
+    def _download_file(self, checksum, version_info, directory, eds_cache):
+        (device_guid, md5_hash, sha256_hash, path) = version_info
+        version = self._get_file_version_for_stream(
+            device_guid, md5_hash, sha256_hash, path
+        )
+        if not version:
+            raise Py42Error(f"No file with hash {checksum} available for download.")
+        response = self._get_file_stream(version, eds_cache)
+
+        file_path = os.path.join(directory, checksum)
+        partial_path = f"{file_path}.part"
+        try:
+            with open(partial_path, "wb") as target:
+                for chunk in response.iter_content(chunk_size=_DOWNLOAD_CHUNK_SIZE):
+                    if chunk:
+                        target.write(chunk)
+            os.replace(partial_path, file_path)
+        except BaseException:
+            os.unlink(partial_path)
+            raise
+        return file_path
+
     def _search_by_hash(self, checksum, checksum_type):
         query = FileEventQuery.all(checksum_type.eq(checksum))
         query.sort_key = "@timestamp"
@@ -142,20 +427,42 @@ class SecurityDataClient:
         )
         return response.data.get("match")
 
-    def _get_file_stream(self, version):
+    def _get_file_stream(self, version, eds_cache=None):
         if version.get("downloadTokenRequest"):
-            return self._get_exfiltrated_file(version)
+            return self._get_exfiltrated_file(version, eds_cache)
 
         raise Py42Error(f"Unable to download file from version {version}")
 
-    def _get_exfiltrated_file(self, version):
+    def _get_exfiltrated_file(self, version, eds_cache=None):
         downloadTokenRequest = version.get("downloadTokenRequest")
         edsUrl = re.match(r"(https?://[^/]+)((/.*)|$)", downloadTokenRequest).group(1)
-        eds = self._storage_service_factory.create_exfiltrated_data_service(edsUrl)
+        if eds_cache is not None:
+            eds = eds_cache.get(edsUrl)
+        else:
+            eds = self._storage_service_factory.create_exfiltrated_data_service(edsUrl)
         token_response = eds.get_download_token(downloadTokenRequest)
         return eds.get_file(token_response.text)
 
 
+class _ExfiltratedDataServiceCache:
+    """Shares one exfiltrated data service (and its connections) per host across the
+    threads of a bulk download."""
+
+    def __init__(self, storage_service_factory):
+        self._storage_service_factory = storage_service_factory
+        self._services = {}
+        self._lock = threading.Lock()
+
+    def get(self, eds_url):
+        with self._lock:
+            if eds_url not in self._services:
+                factory = self._storage_service_factory
+                self._services[eds_url] = factory.create_exfiltrated_data_service(
+                    eds_url
+                )
+            return self._services[eds_url]
+
+
 def _parse_file_location_response(locations):
     devices = {}
     for location in locations:
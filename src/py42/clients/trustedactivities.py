@@ -44,6 +44,21 @@ class TrustedActivitiesClient:
         )
         return self._trusted_activities_service.get_all(type, page_size)
 
+    def iter_items(self, type=None, page_size=None):
+        """Gets all trusted activities, one activity at a time. Accepts the same arguments as
+        :meth:`get_all`. Each page is released as soon as its activities have been read from
+        it.
+
+        Returns:
+            generator: An object that iterates over trusted activity dicts.
+        """
+        warn(
+            "Incydr functionality is deprecated. Use the Incydr SDK instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return self._trusted_activities_service.iter_items(type, page_size)
+
     def create(self, type, value, description=None):
         """Gets all trusted activities with the given type.
         `Rest documentation <https://developer.code42.com/api>`__
@@ -185,6 +185,45 @@ class UserRiskProfileClient:
             support_user,
         )
 
+    def iter_items(
+        self,
+        manager_id=None,
+        title=None,
+        division=None,
+        department=None,
+        employment_type=None,
+        country=None,
+        region=None,
+        locality=None,
+        active=None,
+        deleted=None,
+        support_user=None,
+    ):
+        """Get all user risk profiles, one profile at a time. Accepts the same arguments as
+        :meth:`get_all`. Each page is released as soon as its profiles have been read from it.
+
+        Returns:
+                generator: An object that iterates over user risk profile dicts.
+        """
+        warn(
+            "Incydr functionality is deprecated. Use the Incydr SDK instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return self._user_risk_profile_service.iter_items(
+            manager_id,
+            title,
+            division,
+            department,
+            employment_type,
+            country,
+            region,
+            locality,
+            active,
+            deleted,
+            support_user,
+        )
+
     def add_cloud_aliases(self, user_id, cloud_alias):
         """Add cloud aliases to a user risk profile.
 
@@ -86,6 +86,20 @@ class WatchlistsClient:
         )
         return self._watchlists_service.get_all()
 
+    def iter_items(self):
+        """Get all watchlists, one watchlist at a time. Each page is released as soon as its
+        watchlists have been read from it.
+
+        Returns:
+                generator: An object that iterates over watchlist dicts.
+        """
+        warn(
+            "Incydr functionality is deprecated. Use the Incydr SDK instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return self._watchlists_service.iter_items()
+
     def create(self, watchlist_type, title=None, description=None):
         """Create a new watchlist.
 
@@ -124,6 +138,22 @@ class WatchlistsClient:
         )
         return self._watchlists_service.get_all_included_users(watchlist_id)
 
+    def iter_included_users(self, watchlist_id):
+        """Get all users explicitly included on a watchlist, one user at a time.
+
+        Args:
+                watchlist_id (str): A unique watchlist ID.
+
+        Returns:
+                generator: An object that iterates over included user dicts.
+        """
+        warn(
+            "Incydr functionality is deprecated. Use the Incydr SDK instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return self._watchlists_service.iter_included_users(watchlist_id)
+
     def add_included_users_by_watchlist_id(self, user_ids, watchlist_id):
         """Explicitly include users on a watchlist.
 
@@ -224,6 +254,22 @@ class WatchlistsClient:
         )
         return self._watchlists_service.get_all_watchlist_members(watchlist_id)
 
+    def iter_watchlist_members(self, watchlist_id):
+        """Get all members of a watchlist, one member at a time.
+
+        Args:
+                watchlist_id (str): A unique watchlist ID.
+
+        Returns:
+                generator: An object that iterates over watchlist member dicts.
+        """
+        warn(
+            "Incydr functionality is deprecated. Use the Incydr SDK instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return self._watchlists_service.iter_watchlist_members(watchlist_id)
+
     def get_watchlist_member(self, watchlist_id, user_id):
         """Get a member of a watchlist.
 
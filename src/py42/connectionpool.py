@@ -0,0 +1,263 @@
+"""Connection pool sizing and statistics for the HTTP sessions used by py42.
+
+Each SDK client owns its own HTTP session, whose :class:`PoolingHTTPAdapter` keeps up to
+``py42.settings.pool_maxsize`` connections (4 unless changed) open to each host. Requests
+beyond that wait for a connection to be returned. To size the pools of an SDK client
+differently, pass an adapter to ``py42.sdk.from_api_client()``, ``from_local_account()`` or
+``from_jwt_provider()``, for example::
+
+    adapter = PoolingHTTPAdapter(
+        maxsize=8, host_maxsize={"*forensic*": 32}, autoscale_maxsize=64
+    )
+    sdk = py42.sdk.from_api_client(host, client_id, secret, http_adapter=adapter)
+    ...
+    print(sdk.connection_pool_stats)
+
+Connections are never shared with a forked child process: on Python 3.7 and later, each
+adapter starts with new, empty pools in the child.
+"""
+import fnmatch
+import os
+import threading
+import time
+import weakref
+
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.connectionpool import HTTPSConnectionPool
+
+import py42.settings as settings
+
+# A checkout that waits longer than this, in seconds, grows an auto-scaling pool.
+DEFAULT_AUTOSCALE_WAIT = 0.05
+
+# Every adapter in the process, so that their pools can be replaced after a fork.
+_ADAPTERS = weakref.WeakSet()
+
+# The time each thread has waited for connections, for measuring requests.
+_thread_waits = threading.local()
+
+
+def take_pool_wait():
+    """Returns the seconds the current thread has waited for pooled connections since the
+    last call, and starts counting again from zero."""
+    seconds = getattr(_thread_waits, "seconds", 0.0)
+    _thread_waits.seconds = 0.0
+    return seconds
+
+
+class PoolingHTTPAdapter(HTTPAdapter):
+    """An :class:`requests.adapters.HTTPAdapter` whose connection pools can be sized per host,
+    can grow when requests queue for connections, and record how busy they are.
+
+    Args:
+        maxsize (int, optional): The most connections to keep open to each host. Defaults
+            to None, which uses ``py42.settings.pool_maxsize`` when a pool is created.
+        host_maxsize (dict, optional): Pool sizes for particular hosts, keyed by host name
+            or by a pattern such as ``"*.us.code42.com"``. The first matching key is used.
+            Defaults to None.
+        autoscale_maxsize (int, optional): When set, a pool whose requests wait longer than
+            ``autoscale_wait`` seconds for a connection doubles in size, up to this many
+            connections. Defaults to None, which keeps pools at a fixed size.
+        autoscale_wait (float, optional): How long a request may wait for a connection
+            before its pool grows. Defaults to 0.05.
+        block (bool, optional): Whether requests wait for a connection when a pool is at its
+            size (True), or open a temporary extra connection (False). Defaults to True.
+        pool_connections (int, optional): The most hosts to keep pools for. Defaults to 200.
+        **kwargs: Passed to :class:`requests.adapters.HTTPAdapter`, such as
+            ``max_retries``.
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + [
+        "_host_maxsize",
+        "_autoscale_maxsize",
+        "_autoscale_wait",
+    ]
+
+    def __init__(
+        self,
+        maxsize=None,
+        host_maxsize=None,
+        autoscale_maxsize=None,
+        autoscale_wait=DEFAULT_AUTOSCALE_WAIT,
+        block=True,
+        pool_connections=200,
+        **kwargs,
+    ):
+        self._host_maxsize = dict(host_maxsize or {})
+        self._autoscale_maxsize = autoscale_maxsize
+        self._autoscale_wait = autoscale_wait
+        self._init_stats()
+        super().__init__(
+            pool_connections=pool_connections,
+            pool_maxsize=maxsize,
+            pool_block=block,
+            **kwargs,
+        )
+        _ADAPTERS.add(self)
+
+    def __setstate__(self, state):
+        self._init_stats()
+        super().__setstate__(state)
+        _ADAPTERS.add(self)
+
+    def _init_stats(self):
+        self._stats_lock = threading.Lock()
+        self._stats = {}
+        adapter = self
+        self._pool_classes = {
+            "http": type(
+                "PoolingHTTPConnectionPool",
+                (_PoolingMixin, HTTPConnectionPool),
+                {"_adapter": adapter},
+            ),
+            "https": type(
+                "PoolingHTTPSConnectionPool",
+                (_PoolingMixin, HTTPSConnectionPool),
+                {"_adapter": adapter},
+            ),
+        }
+
+    def _reset_after_fork(self):
+        # The parent's sockets, and any locks held by its other threads, are copied into
+        # the child. Dropping the pools, rather than closing them, leaves the parent's
+        # connections open.
+        self._init_stats()
+        self.proxy_manager = {}
+        self.init_poolmanager(
+            self._pool_connections, self._pool_maxsize, block=self._pool_block
+        )
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = self._pool_classes
+
+    def proxy_manager_for(self, *args, **kwargs):
+        manager = super().proxy_manager_for(*args, **kwargs)
+        manager.pool_classes_by_scheme = self._pool_classes
+        return manager
+
+    def get_pool_size(self, host):
+        """Returns the size that a new pool for ``host`` starts at."""
+        for pattern, size in self._host_maxsize.items():
+            if host == pattern or fnmatch.fnmatch(host, pattern):
+                return size
+        if self._pool_maxsize is None:
+            return settings.pool_maxsize
+        return self._pool_maxsize
+
+    def get_stats(self):
+        """Returns statistics for each host's connection pool, keyed by host name.
+
+        Each value is a dict with the pool's current ``maxsize``, the connections
+        ``in_use`` now and at most (``max_in_use``), the total ``checkouts``, how many of
+        those ``waits`` had to wait for a connection and how long (``total_wait_seconds``
+        and ``max_wait_seconds``), the number of times the pool was ``grown`` and its
+        ``utilization`` (``in_use`` divided by ``maxsize``).
+
+        Returns:
+            dict
+        """
+        with self._stats_lock:
+            stats = {host: dict(host_stats) for host, host_stats in self._stats.items()}
+        for host_stats in stats.values():
+            host_stats["utilization"] = host_stats["in_use"] / host_stats["maxsize"]
+        return stats
+
+    def _get_host_stats(self, host, maxsize):
+        # Must be called while holding the stats lock.
+        host_stats = self._stats.get(host)
+        if host_stats is None:
+            host_stats = self._stats[host] = {
+                "maxsize": maxsize,
+                "in_use": 0,
+                "max_in_use": 0,
+                "checkouts": 0,
+                "waits": 0,
+                "total_wait_seconds": 0.0,
+                "max_wait_seconds": 0.0,
+                "grown": 0,
+            }
+        return host_stats
+
+    def _record_checkout(self, pool, waited, wait_seconds):
+        if waited:
+            _thread_waits.seconds = (
+                getattr(_thread_waits, "seconds", 0.0) + wait_seconds
+            )
+        if pool.pool is None:
+            return
+        with self._stats_lock:
+            host_stats = self._get_host_stats(pool.host, pool.pool.maxsize)
+            host_stats["checkouts"] += 1
+            host_stats["in_use"] += 1
+            host_stats["max_in_use"] = max(
+                host_stats["max_in_use"], host_stats["in_use"]
+            )
+            if waited:
+                host_stats["waits"] += 1
+                host_stats["total_wait_seconds"] += wait_seconds
+                host_stats["max_wait_seconds"] = max(
+                    host_stats["max_wait_seconds"], wait_seconds
+                )
+            if (
+                self._autoscale_maxsize is not None
+                and wait_seconds > self._autoscale_wait
+                and pool.pool.maxsize < self._autoscale_maxsize
+            ):
+                new_size = min(pool.pool.maxsize * 2, self._autoscale_maxsize)
+                _grow_pool(pool, new_size)
+                host_stats["maxsize"] = new_size
+                host_stats["grown"] += 1
+
+    def _record_return(self, pool):
+        with self._stats_lock:
+            host_stats = self._get_host_stats(pool.host, pool.pool.maxsize)
+            host_stats["in_use"] = max(0, host_stats["in_use"] - 1)
+
+
+class _PoolingMixin:
+    """Sizes a urllib3 connection pool from its adapter and reports checkouts to it."""
+
+    _adapter = None
+
+    def __init__(self, host, port=None, **kwargs):
+        kwargs["maxsize"] = self._adapter.get_pool_size(host)
+        super().__init__(host, port, **kwargs)
+
+    def _get_conn(self, timeout=None):
+        queue = self.pool
+        # An empty queue means every connection is in use, so the checkout will wait.
+        waited = queue is not None and self.block and queue.empty()
+        start = time.perf_counter()
+        conn = super()._get_conn(timeout=timeout)
+        self._adapter._record_checkout(self, waited, time.perf_counter() - start)
+        return conn
+
+    def _put_conn(self, conn):
+        try:
+            super()._put_conn(conn)
+        finally:
+            if self.pool is not None:
+                self._adapter._record_return(self)
+
+
+def _grow_pool(pool, new_size):
+    # urllib3 fills a new pool's queue with `maxsize` placeholders, each of which a
+    # checkout turns into a connection. Raising the queue's limit and adding placeholders
+    # grows the pool in place, and wakes any requests waiting for a connection.
+    queue = pool.pool
+    with queue.mutex:
+        added = new_size - queue.maxsize
+        queue.maxsize = new_size
+    for _ in range(added):
+        queue.put(None, block=False)
+
+
+def _reset_adapters_after_fork():
+    for adapter in list(_ADAPTERS):
+        adapter._reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_adapters_after_fork)
@@ -138,6 +138,30 @@ class Py42SessionInitializationError(Py42Error):
         super().__init__(exception, message)
 
 
+class Py42CircuitOpenError(Py42Error):
+    """An exception raised instead of sending a request when recent requests to the same
+    host have failed, so its :class:`py42.circuitbreaker.CircuitBreaker` is open."""
+
+    def __init__(self, host, retry_after):
+        message = (
+            f"Recent requests to {host} failed, so requests to it are paused for "
+            f"{retry_after:.1f} more seconds."
+        )
+        super().__init__(message, host, retry_after)
+        self._host = host
+        self._retry_after = retry_after
+
+    @property
+    def host(self):
+        """The host whose requests are paused."""
+        return self._host
+
+    @property
+    def retry_after(self):
+        """The number of seconds until a request to the host is tried again."""
+        return self._retry_after
+
+
 class Py42BadRequestError(Py42HTTPError):
     """A wrapper to represent an HTTP 400 error."""
 
@@ -0,0 +1,78 @@
+"""An on-disk cache of microservice host addresses, so that short-lived processes can skip
+host discovery.
+
+The SDK finds the host of each microservice (alerts, file events, cases and so on) with a
+request to the key-value store service, which is itself found with a request to
+``/api/v1/ServerEnv``. Pass a cache to ``py42.sdk.from_api_client()``,
+``from_local_account()`` or ``from_jwt_provider()`` (``host_cache=``) to reuse the
+addresses found by earlier processes until they are ``ttl`` seconds old.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+
+# Microservice hosts rarely change, so a day is a safe default lifetime.
+DEFAULT_HOST_CACHE_TTL = 86400
+
+
+class FileHostCache:
+    """Caches host addresses in a JSON file, keyed by Code42 instance and microservice.
+
+    Args:
+        path (str): The path of the cache file. It is created on the first save.
+        ttl (int or float, optional): How many seconds a cached address is used for.
+            Defaults to 86400 (one day).
+    """
+
+    def __init__(self, path, ttl=DEFAULT_HOST_CACHE_TTL):
+        self._path = path
+        self._ttl = ttl
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Returns the host address cached under ``key``, or None if there is none or it has
+        expired."""
+        with self._lock:
+            entry = self._read().get(key)
+        if not entry or time.time() >= entry.get("expires_at", 0):
+            return None
+        return entry.get("host")
+
+    def set(self, key, host):
+        """Caches ``host`` under ``key`` for the cache's TTL."""
+        with self._lock:
+            entries = self._read()
+            entries[key] = {"host": host, "expires_at": time.time() + self._ttl}
+            self._write(entries)
+
+    def clear(self):
+        """Removes every cached host address."""
+        with self._lock:
+            try:
+                os.remove(self._path)
+            except FileNotFoundError:
+                pass
+
+    def _read(self):
+        try:
+            with open(self._path, encoding="utf-8") as cache_file:
+                return json.load(cache_file)
+        except (FileNotFoundError, ValueError):
+            # A missing or corrupt cache only costs a lookup.
+            return {}
+
+    def _write(self, entries):
+        # Processes that save at the same time may drop each other's new entries, which
+        # only costs them a lookup next time. The file is replaced atomically, so it is
+        # never read half-written.
+        directory = os.path.dirname(os.path.abspath(self._path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as temp_file:
+                json.dump(entries, temp_file)
+            os.replace(temp_path, self._path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
@@ -0,0 +1,312 @@
+"""Hooks for measuring the requests py42 sends.
+
+Pass hooks to ``py42.sdk.from_api_client()``, ``from_local_account()`` or
+``from_jwt_provider()`` (``request_hooks=``) to have them called for every request the SDK
+client sends. Each hook receives a :class:`RequestMetrics` when a request finishes. URLs are
+reduced to templates with IDs replaced by ``{id}``, such as
+``/api/v1/Computer/{id}``, so that requests to the same endpoint are grouped together.
+
+:class:`LatencyHistogram` aggregates the requests to each endpoint in memory, and
+:class:`OpenTelemetryHook` records a span, and optionally a duration metric, for each
+request with OpenTelemetry. For example::
+
+    histogram = LatencyHistogram()
+    sdk = py42.sdk.from_api_client(host, client_id, secret, request_hooks=[histogram])
+    ...
+    for endpoint, stats in histogram.get_stats().items():
+        print(endpoint, stats["count"], stats["p99_seconds"])
+
+When no hooks are given, requests are not measured at all.
+"""
+import bisect
+import re
+import threading
+from collections import namedtuple
+from functools import lru_cache
+from urllib.parse import urlparse
+
+from py42.exceptions import Py42Error
+
+RequestMetrics = namedtuple(
+    "RequestMetrics",
+    [
+        "method",
+        "uri_template",
+        "host",
+        "status_code",
+        "bytes_sent",
+        "bytes_received",
+        "time_to_first_byte",
+        "duration",
+        "retries",
+        "pool_wait",
+        "error",
+    ],
+)
+RequestMetrics.__doc__ = """The measurements of one request, including its retries.
+
+Attributes:
+    method (str): The HTTP method.
+    uri_template (str): The request's path with IDs replaced by ``{id}``.
+    host (str): The host the request was sent to.
+    status_code (int): The status of the last response, or None if there was none.
+    bytes_sent (int): The size of the request bodies sent.
+    bytes_received (int): The size of the last response body, or None for a streamed
+        response without a ``Content-Length``.
+    time_to_first_byte (float): The seconds from sending the last attempt until its
+        response headers were received, or None if there was no response.
+    duration (float): The seconds from the start of the request until it returned or
+        raised, including retries.
+    retries (int): How many times the request was sent again.
+    pool_wait (float): The seconds spent waiting for a pooled connection.
+    error (Exception): The exception the request raised, or None.
+"""
+
+# Path segments that are IDs: numbers, UUIDs and long hexadecimal values such as checksums.
+_ID_SEGMENT = re.compile(
+    r"^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+    r"|[0-9a-fA-F]{16,})$"
+)
+
+# Upper bounds, in seconds, of the latency histogram's buckets.
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+    60,
+    180,
+)
+
+
+@lru_cache(maxsize=4096)
+def get_uri_template(url):
+    """Returns the path of ``url`` with each segment that is an ID replaced by ``{id}``."""
+    path = urlparse(url).path
+    return "/".join(
+        "{id}" if _ID_SEGMENT.match(segment) else segment for segment in path.split("/")
+    )
+
+
+class RequestHook:
+    """The base class of request hooks. Subclasses override either or both methods."""
+
+    def request_started(self, method, uri_template):
+        """Called before a request is sent. The value returned is passed to
+        :meth:`request_finished` for the same request.
+
+        Args:
+            method (str): The HTTP method.
+            uri_template (str): The request's path with IDs replaced by ``{id}``.
+        """
+        return None
+
+    def request_finished(self, context, metrics):
+        """Called when a request returns or raises.
+
+        Args:
+            context: The value returned by :meth:`request_started` for the request.
+            metrics (:class:`RequestMetrics`): The measurements of the request.
+        """
+
+
+class LatencyHistogram(RequestHook):
+    """Aggregates the requests to each endpoint in memory, with a histogram of their
+    durations.
+
+    Args:
+        buckets (tuple, optional): The upper bounds, in seconds, of the histogram's buckets,
+            in increasing order. Defaults to :data:`DEFAULT_BUCKETS`.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self._buckets = tuple(buckets)
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def request_finished(self, context, metrics):
+        key = f"{metrics.method} {metrics.uri_template}"
+        with self._lock:
+            endpoint = self._endpoints.get(key)
+            if endpoint is None:
+                endpoint = self._endpoints[key] = _EndpointStats(len(self._buckets))
+            endpoint.add(metrics, bisect.bisect_left(self._buckets, metrics.duration))
+
+    def get_stats(self):
+        """Returns the statistics of each endpoint, keyed by method and URI template, such
+        as ``"GET /api/v1/Computer/{id}"``.
+
+        Each value is a dict with the number of requests (``count``) and of those that
+        failed (``errors``), the ``total_seconds``, ``mean_seconds``, ``max_seconds`` and
+        the ``p50_seconds``, ``p90_seconds`` and ``p99_seconds`` estimated from the
+        histogram, the ``mean_time_to_first_byte``, the total ``bytes_sent``,
+        ``bytes_received``, ``retries`` and ``pool_wait_seconds``, and the request count in
+        each bucket (``buckets``, keyed by upper bound).
+
+        Returns:
+            dict
+        """
+        with self._lock:
+            return {
+                key: endpoint.to_dict(self._buckets)
+                for key, endpoint in self._endpoints.items()
+            }
+
+    def reset(self):
+        """Discards the statistics recorded so far."""
+        with self._lock:
+            self._endpoints = {}
+
+
+class _EndpointStats:
+    __slots__ = (
+        "count",
+        "errors",
+        "total_seconds",
+        "max_seconds",
+        "ttfb_count",
+        "ttfb_seconds",
+        "bytes_sent",
+        "bytes_received",
+        "retries",
+        "pool_wait_seconds",
+        "bucket_counts",
+    )
+
+    def __init__(self, bucket_count):
+        self.count = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.ttfb_count = 0
+        self.ttfb_seconds = 0.0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.retries = 0
+        self.pool_wait_seconds = 0.0
+        # One count per bucket, plus one for durations beyond the last bucket.
+        self.bucket_counts = [0] * (bucket_count + 1)
+
+    def add(self, metrics, bucket):
+        self.count += 1
+        if metrics.error is not None or (metrics.status_code or 0) >= 400:
+            self.errors += 1
+        self.total_seconds += metrics.duration
+        self.max_seconds = max(self.max_seconds, metrics.duration)
+        if metrics.time_to_first_byte is not None:
+            self.ttfb_count += 1
+            self.ttfb_seconds += metrics.time_to_first_byte
+        self.bytes_sent += metrics.bytes_sent
+        self.bytes_received += metrics.bytes_received or 0
+        self.retries += metrics.retries
+        self.pool_wait_seconds += metrics.pool_wait
+        self.bucket_counts[bucket] += 1
+
+    def get_quantile(self, buckets, quantile):
+        # The upper bound of the bucket holding the quantile, capped by the slowest request.
+        rank = quantile * self.count
+        seen = 0
+        for index, bound in enumerate(buckets):
+            seen += self.bucket_counts[index]
+            if seen >= rank:
+                return min(bound, self.max_seconds)
+        return self.max_seconds
+
+    def to_dict(self, buckets):
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_seconds": self.total_seconds,
+            "mean_seconds": self.total_seconds / self.count,
+            "max_seconds": self.max_seconds,
+            "p50_seconds": self.get_quantile(buckets, 0.5),
+            "p90_seconds": self.get_quantile(buckets, 0.9),
+            "p99_seconds": self.get_quantile(buckets, 0.99),
+            "mean_time_to_first_byte": self.ttfb_seconds / self.ttfb_count
+            if self.ttfb_count
+            else None,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "retries": self.retries,
+            "pool_wait_seconds": self.pool_wait_seconds,
+            "buckets": {
+                bound: self.bucket_counts[index]
+                for index, bound in enumerate(buckets + (float("inf"),))
+            },
+        }
+
+
+class OpenTelemetryHook(RequestHook):
+    """Records an OpenTelemetry client span for each request, and, when given a meter, the
+    ``http.client.request.duration`` histogram. Attributes follow the OpenTelemetry HTTP
+    semantic conventions. Install OpenTelemetry with ``pip install py42[opentelemetry]``.
+
+    Args:
+        tracer (:class:`opentelemetry.trace.Tracer`, optional): The tracer that creates the
+            spans. Defaults to None, which uses the global tracer provider's tracer for py42.
+        meter (:class:`opentelemetry.metrics.Meter`, optional): The meter that records the
+            request duration histogram. Defaults to None, which records no metrics.
+    """
+
+    def __init__(self, tracer=None, meter=None):
+        trace = _import_opentelemetry_trace()
+        self._span_kind = trace.SpanKind.CLIENT
+        self._status_error = trace.StatusCode.ERROR
+        self._tracer = tracer or trace.get_tracer("py42")
+        self._duration = None
+        if meter is not None:
+            self._duration = meter.create_histogram(
+                "http.client.request.duration",
+                unit="s",
+                description="Duration of HTTP client requests.",
+            )
+
+    def request_started(self, method, uri_template):
+        return self._tracer.start_span(
+            f"{method} {uri_template}",
+            kind=self._span_kind,
+            attributes={"http.request.method": method, "url.template": uri_template},
+        )
+
+    def request_finished(self, span, metrics):
+        attributes = {
+            "http.request.method": metrics.method,
+            "url.template": metrics.uri_template,
+            "server.address": metrics.host,
+        }
+        if metrics.status_code is not None:
+            attributes["http.response.status_code"] = metrics.status_code
+        error_type = None
+        if metrics.error is not None:
+            error_type = type(metrics.error).__name__
+            span.record_exception(metrics.error)
+        elif metrics.status_code is not None and metrics.status_code >= 400:
+            error_type = str(metrics.status_code)
+        if error_type is not None:
+            attributes["error.type"] = error_type
+            span.set_status(self._status_error)
+        span.set_attributes(attributes)
+        if metrics.retries:
+            span.set_attribute("http.request.resend_count", metrics.retries)
+        span.end()
+        if self._duration is not None:
+            self._duration.record(metrics.duration, attributes)
+
+
+def _import_opentelemetry_trace():
+    try:
+        from opentelemetry import trace
+    except ImportError:
+        raise Py42Error(
+            "OpenTelemetryHook requires the opentelemetry-api package. "
+            "Install it with `pip install py42[opentelemetry]`."
+        )
+    return trace
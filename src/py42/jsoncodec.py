@@ -0,0 +1,134 @@
+"""JSON codecs used by py42 to parse response bodies and to encode ``json=`` request bodies.
+
+A codec is chosen per SDK client, for example
+``py42.sdk.from_api_client(host, client_id, secret, json_codec="orjson")``. The ``orjson``
+and ``ujson`` codecs require the corresponding package to be installed.
+"""
+import importlib
+import json
+
+from py42.exceptions import Py42Error
+
+
+class JsonCodec:
+    """The default codec, backed by the standard library :mod:`json` module. Other codecs
+    subclass it and override :meth:`loads`, :meth:`dumps` and :meth:`dumps_bytes`."""
+
+    name = "json"
+
+    def loads(self, s):
+        """Parses a JSON document from ``bytes`` or ``str``."""
+        return json.loads(s)
+
+    def dumps(self, obj):
+        """Serializes ``obj`` to a JSON ``str``."""
+        return json.dumps(obj)
+
+    def dumps_bytes(self, obj):
+        """Serializes ``obj`` to UTF-8 encoded JSON ``bytes``."""
+        return self.dumps(obj).encode("utf-8")
+
+
+class OrjsonCodec(JsonCodec):
+    """A codec backed by `orjson <https://github.com/ijl/orjson>`__."""
+
+    name = "orjson"
+
+    def __init__(self):
+        self._orjson = _import_codec_module("orjson")
+        self._options = self._orjson.OPT_NON_STR_KEYS
+
+    def loads(self, s):
+        return self._orjson.loads(s)
+
+    def dumps(self, obj):
+        return self.dumps_bytes(obj).decode("utf-8")
+
+    def dumps_bytes(self, obj):
+        return self._orjson.dumps(obj, option=self._options)
+
+
+class UjsonCodec(JsonCodec):
+    """A codec backed by `ujson <https://github.com/ultrajson/ultrajson>`__."""
+
+    name = "ujson"
+
+    def __init__(self):
+        self._ujson = _import_codec_module("ujson")
+
+    def loads(self, s):
+        return self._ujson.loads(s)
+
+    def dumps(self, obj):
+        return self._ujson.dumps(obj, escape_forward_slashes=False)
+
+
+class EncodedJson(dict):
+    """A JSON object request body whose encoding is already known. Connections send
+    :attr:`encoded` as the body instead of serializing the dict again, whatever their
+    codec. The dict holds the same data, for code that inspects the request, and cannot
+    be changed, so that the two do not disagree.
+
+    Args:
+        data (dict): The JSON object.
+        encoded (bytes): ``data`` encoded as UTF-8 JSON.
+    """
+
+    __slots__ = ("encoded",)
+
+    def __init__(self, data, encoded):
+        super().__init__(data)
+        self.encoded = encoded
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(f"{type(self).__name__} objects cannot be changed.")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return type(self), (dict(self), self.encoded)
+
+
+STDLIB = JsonCodec()
+
+_CODEC_TYPES = {
+    JsonCodec.name: JsonCodec,
+    OrjsonCodec.name: OrjsonCodec,
+    UjsonCodec.name: UjsonCodec,
+}
+_codecs = {JsonCodec.name: STDLIB}
+
+
+def get_codec(codec=None):
+    """Resolves a codec name or instance to a :class:`JsonCodec`.
+
+    Args:
+        codec (str or :class:`JsonCodec`, optional): One of ``"json"``, ``"orjson"`` or
+            ``"ujson"``, or a codec object such as a :class:`JsonCodec` instance. Defaults to
+            None, which is the standard library codec.
+
+    Returns:
+        :class:`JsonCodec`
+    """
+    if codec is None:
+        return STDLIB
+    if not isinstance(codec, str):
+        # Any object with the same methods as JsonCodec will do.
+        return codec
+    if codec not in _CODEC_TYPES:
+        names = ", ".join(_CODEC_TYPES)
+        raise Py42Error(f"Unknown JSON codec '{codec}'. Expected one of: {names}.")
+    if codec not in _codecs:
+        _codecs[codec] = _CODEC_TYPES[codec]()
+    return _codecs[codec]
+
+
+def _import_codec_module(name):
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        raise Py42Error(
+            f"The '{name}' JSON codec requires the {name} package. "
+            f"Install it with `pip install {name}`."
+        )
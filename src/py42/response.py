@@ -1,13 +1,40 @@
-import json
 import reprlib
 
+from py42 import settings
+from py42._jsonstream import iter_array_items
 from py42.exceptions import Py42Error
+from py42.jsoncodec import get_codec
+
+# The value of Py42Response._data until the body has been parsed, which may give None.
+_UNPARSED = object()
 
 
 class Py42Response:
-    def __init__(self, requests_response):
+    """Wraps a :class:`requests.Response` whose body is usually a JSON document.
+
+    In compact mode (see ``py42.settings.compact_responses``), the wrapped response is
+    released as soon as the body has been parsed, so only the parsed data (or, for a body
+    that is not JSON, its text) is kept in memory. The status code, headers, URL and encoding remain available, but
+    :attr:`content`, :attr:`raw_text` and :meth:`iter_content` raise :class:`Py42Error`.
+    """
+
+    __slots__ = (
+        "_response",
+        "_json_codec",
+        "_compact",
+        "_data",
+        "_status_code",
+        "_headers",
+        "_url",
+        "_encoding",
+        "__weakref__",
+    )
+
+    def __init__(self, requests_response, json_codec=None, compact=None):
         self._response = requests_response
-        self._data = None
+        self._json_codec = get_codec(json_codec)
+        self._compact = settings.compact_responses if compact is None else compact
+        self._data = _UNPARSED
 
     def __getitem__(self, key):
         try:
@@ -38,11 +65,15 @@ class Py42Response:
     @property
     def encoding(self):
         """The encoding used to decode the response text."""
+        if self._response is None:
+            return self._encoding
         return self._response.encoding
 
     @property
     def headers(self):
         """A case-insensitive dictionary of response headers."""
+        if self._response is None:
+            return self._headers
         return self._response.headers
 
     def iter_content(self, chunk_size=1, decode_unicode=False):
@@ -58,48 +89,82 @@ class Py42Response:
             decode_unicode (bool, optional): If True, content will be decoded using the best
                 available encoding based on the response. Defaults to False.
         """
-        return self._response.iter_content(
+        return self._raw_response.iter_content(
             chunk_size=chunk_size, decode_unicode=decode_unicode
         )
 
+    def iter_items(self, key=None, chunk_size=65536):
+        """Iterates over the items of the list stored under ``key`` in the response body (or
+        of the body itself, when ``key`` is None).
+
+        When the request was made with ``stream=True``, the items are parsed incrementally
+        as the body is read, so memory use stays about the size of one item no matter how
+        large the response is. Once iteration finishes, the body's other fields, such as
+        ``nextPgToken``, can be read from the response as usual; the list itself is not
+        kept. Responses that were not streamed return the items of the already-parsed body.
+
+        Args:
+            key (str, optional): The name of the list, e.g. ``"fileEvents"``. Defaults to
+                None.
+            chunk_size (int, optional): The number of bytes to read at a time when
+                streaming. Defaults to 65536.
+
+        Returns:
+            generator: An object that iterates over the items of the list.
+        """
+        if self._data is not _UNPARSED or getattr(
+            self._response, "_content_consumed", True
+        ):
+            yield from self[key] if key else self.data
+            return
+
+        fields = {}
+        chunks = self._response.iter_content(chunk_size=chunk_size)
+        yield from iter_array_items(chunks, key, fields)
+        self._data = fields
+        if self._compact:
+            self._release_response()
+
     @property
     def raw_text(self):
         """The ``response.Response.text`` property. It contains raw metadata that is not included in
         the Py42Response.text property."""
-        return self._response.text
+        return self._raw_response.text
 
     @property
     def text(self):
         """The more useful parts of the HTTP response dumped into a dictionary."""
-        return (
-            json.dumps(self._data_root)
-            if type(self._data_root) != str
-            else self._data_root
-        )
+        if type(self._data_root) == str:
+            return self._data_root
+        return self._json_codec.dumps(self._data_root)
 
     @property
     def url(self):
         """The final URL location of response."""
+        if self._response is None:
+            return self._url
         return self._response.url
 
     @property
     def status_code(self):
         """An integer code of the response HTTP Status, e.g. 404 or 200."""
+        if self._response is None:
+            return self._status_code
         return self._response.status_code
 
     def __str__(self):
         return str(self._data_root)
 
     def __repr__(self):
-        if not self._response._content_consumed:
+        if self._data is _UNPARSED and not self._response._content_consumed:
             data = "<streamed>"
         else:
             data = self._data_root
-        return f"<{self.__class__.__name__} [status={self._response.status_code}, data={reprlib.repr(data)}]>"
+        return f"<{self.__class__.__name__} [status={self.status_code}, data={reprlib.repr(data)}]>"
 
     @property
     def content(self):
-        return self._response.content
+        return self._raw_response.content
 
     @property
     def data(self):
@@ -107,17 +172,43 @@ class Py42Response:
 
     @property
     def _data_root(self):
+        if self._data is not _UNPARSED:
+            return self._data
         try:
-            if not self._data:
-                response_dict = json.loads(self._response.text)
-                if type(response_dict) == dict:
-                    if "data" in response_dict:
-                        self._data = response_dict["data"]
-                    else:
-                        self._data = response_dict
+            response_dict = self._json_codec.loads(self._get_body())
+            if type(response_dict) == dict:
+                if "data" in response_dict:
+                    self._data = response_dict["data"]
                 else:
                     self._data = response_dict
+            else:
+                self._data = response_dict
         except ValueError:
             self._data = self._response.text or ""
-
+        if self._compact:
+            self._release_response()
         return self._data
+
+    @property
+    def _raw_response(self):
+        if self._response is None:
+            raise Py42Error(
+                "The raw body of a compact Py42Response is released once it has been "
+                "parsed. Set py42.settings.compact_responses to False to keep it."
+            )
+        return self._response
+
+    def _release_response(self):
+        response = self._response
+        self._status_code = response.status_code
+        self._headers = response.headers
+        self._url = response.url
+        self._encoding = response.encoding
+        self._response = None
+
+    def _get_body(self):
+        # Parse straight from the bytes when available to skip decoding them to str first.
+        content = self._response.content
+        if isinstance(content, (bytes, bytearray)):
+            return content
+        return self._response.text
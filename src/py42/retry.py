@@ -0,0 +1,234 @@
+"""Retrying of throttled and failed requests, and client-side rate limiting.
+
+Every request py42 sends follows a :class:`RetryPolicy`. By default, requests that are
+throttled (429) or fail because a server is unavailable (502, 503 or 504) are sent again up
+to 3 times. The delay comes from the response's ``Retry-After`` header when it has one and
+is a jittered exponential backoff otherwise. Only requests that are safe to repeat are
+retried after a server error or a failed connection, while throttled requests, which the
+server did not process, are retried whatever their method.
+
+To send requests no faster than a server allows, rather than waiting to be throttled, pass
+a :class:`RateLimiter` to ``py42.sdk.from_api_client()``, ``from_local_account()`` or
+``from_jwt_provider()``, for example::
+
+    policy = RetryPolicy(max_retries=5)
+    limiter = RateLimiter(rate=20, host_rates={"*forensic*": 5})
+    sdk = py42.sdk.from_api_client(
+        host, client_id, secret, retry_policy=policy, rate_limiter=limiter
+    )
+"""
+import fnmatch
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+# Statuses that mean a request was throttled or that the server is briefly unavailable.
+DEFAULT_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+# Methods whose requests have the same effect whether they are sent once or many times.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+
+
+class RetryPolicy:
+    """Decides whether a failed request is sent again, and after how long.
+
+    Args:
+        max_retries (int, optional): The most times a request is sent again. Defaults to 3.
+        backoff_factor (float, optional): The delay, in seconds, before the first retry of a
+            response without a ``Retry-After`` header. Each later retry doubles it.
+            Defaults to 0.5.
+        max_backoff (float, optional): The longest backoff delay, in seconds. Defaults to
+            30.
+        jitter (bool, optional): Whether to wait a random time between 0 and the backoff
+            delay, so that many clients throttled at once don't retry at once. Defaults to
+            True.
+        retry_statuses (iterable, optional): The response statuses to retry. Defaults to
+            429, 502, 503 and 504.
+        idempotent_methods (iterable, optional): The HTTP methods whose requests are retried
+            after a server error or a failed connection. Throttled (429) requests are
+            retried for any method. Defaults to GET, HEAD, OPTIONS, PUT, DELETE and TRACE.
+        max_retry_after (float, optional): The longest ``Retry-After`` delay, in seconds,
+            to wait for. When a response asks for a longer one, its error is raised
+            instead. Defaults to 300.
+    """
+
+    def __init__(
+        self,
+        max_retries=3,
+        backoff_factor=0.5,
+        max_backoff=30,
+        jitter=True,
+        retry_statuses=DEFAULT_RETRY_STATUSES,
+        idempotent_methods=IDEMPOTENT_METHODS,
+        max_retry_after=300,
+    ):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self.idempotent_methods = frozenset(m.upper() for m in idempotent_methods)
+        self.max_retry_after = max_retry_after
+
+    def is_idempotent(self, method):
+        """Returns True if requests with ``method`` may be sent more than once."""
+        return method.upper() in self.idempotent_methods
+
+    def get_response_delay(self, method, response, retries):
+        """Returns how many seconds to wait before sending again a request that received
+        ``response``, or None if it should not be retried.
+
+        Args:
+            method (str): The request's HTTP method.
+            response (:class:`requests.Response`): The response received.
+            retries (int): How many times the request has already been retried.
+
+        Returns:
+            float or None
+        """
+        status = response.status_code
+        if retries >= self.max_retries or status not in self.retry_statuses:
+            return None
+        if status != 429 and not self.is_idempotent(method):
+            return None
+        retry_after = get_retry_after(response)
+        if retry_after is None:
+            return self.get_backoff(retries)
+        if retry_after > self.max_retry_after:
+            return None
+        return retry_after
+
+    def get_error_delay(self, method, retries):
+        """Returns how many seconds to wait before sending again a request whose connection
+        failed, or None if it should not be retried."""
+        if retries >= self.max_retries or not self.is_idempotent(method):
+            return None
+        return self.get_backoff(retries)
+
+    def get_backoff(self, retries):
+        """Returns the backoff delay, in seconds, before retry number ``retries + 1``."""
+        backoff = min(self.max_backoff, self.backoff_factor * 2**retries)
+        return random.uniform(0, backoff) if self.jitter else backoff
+
+
+def get_retry_after(response):
+    """Returns the number of seconds in a response's ``Retry-After`` header, which is
+    either a number of seconds or an HTTP date, or None if it has none."""
+    value = response.headers.get("Retry-After") if response.headers else None
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class RateLimiter:
+    """Limits the rate of requests to each host with a token bucket per host.
+
+    A request waits until its host's bucket has a token. Buckets refill at ``rate`` tokens a
+    second and hold up to ``burst`` tokens. When ``adaptive``, a throttled (429) response
+    halves its host's rate, down to ``min_rate``, and each successful response raises it
+    again by a twentieth of the configured rate, so bulk jobs settle near the fastest rate
+    the server accepts rather than alternating between bursts and throttling.
+
+    Args:
+        rate (float): The most requests a second to send to each host.
+        burst (int, optional): The most requests to send at once after a quiet period.
+            Defaults to ``rate``, and to at least 1.
+        host_rates (dict, optional): Rates for particular hosts, keyed by host name or by a
+            pattern such as ``"*forensic*"``. The first matching key is used. Defaults to
+            None.
+        adaptive (bool, optional): Whether to lower a host's rate when it throttles requests.
+            Defaults to True.
+        min_rate (float, optional): The lowest rate adaptive limiting lowers a host to.
+            Defaults to 1.
+    """
+
+    def __init__(self, rate, burst=None, host_rates=None, adaptive=True, min_rate=1.0):
+        self._rate = rate
+        self._burst = burst
+        self._host_rates = dict(host_rates or {})
+        self._adaptive = adaptive
+        self._min_rate = min_rate
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, host):
+        """Waits until a request may be sent to ``host``."""
+        delay = self._get_bucket(host).reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def on_success(self, host):
+        """Records that ``host`` accepted a request."""
+        if self._adaptive:
+            self._get_bucket(host).increase()
+
+    def on_throttle(self, host):
+        """Records that ``host`` throttled a request."""
+        if self._adaptive:
+            self._get_bucket(host).decrease()
+
+    def get_rates(self):
+        """Returns the current rate, in requests a second, of each host's bucket.
+
+        Returns:
+            dict
+        """
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {host: bucket.rate for host, bucket in buckets.items()}
+
+    def _get_host_rate(self, host):
+        for pattern, rate in self._host_rates.items():
+            if host == pattern or fnmatch.fnmatch(host, pattern):
+                return rate
+        return self._rate
+
+    def _get_bucket(self, host):
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(host)
+                if bucket is None:
+                    rate = self._get_host_rate(host)
+                    burst = self._burst or max(1, int(rate))
+                    min_rate = min(self._min_rate, rate)
+                    bucket = self._buckets[host] = _TokenBucket(rate, burst, min_rate)
+        return bucket
+
+
+class _TokenBucket:
+    def __init__(self, rate, burst, min_rate):
+        self.rate = rate
+        self._max_rate = rate
+        self._min_rate = min_rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        # Takes a token now, going into debt when there is none, and returns how long the
+        # caller must wait for that token. Requests are spaced out in the order they come.
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated_at
+            self._tokens = min(self._burst, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def increase(self):
+        with self._lock:
+            self.rate = min(self._max_rate, self.rate + self._max_rate / 20)
+
+    def decrease(self):
+        with self._lock:
+            self.rate = max(self._min_rate, self.rate / 2)
@@ -1,20 +1,39 @@
 import warnings
+from concurrent.futures import as_completed
+from concurrent.futures import ThreadPoolExecutor
+from threading import RLock
 
 from requests.auth import HTTPBasicAuth
 
 from py42.exceptions import Py42Error
 from py42.exceptions import Py42UnauthorizedError
+from py42.services import Services
 from py42.services._auth import ApiClientAuth
 from py42.services._auth import BearerAuth
+from py42.services._auth import C42RenewableAuth
 from py42.services._auth import CustomJWTAuth
 from py42.services._connection import Connection
+from py42.services._connection import create_session
+from py42.services._connection import get_pool_stats
 from py42.usercontext import UserContext
 
 warnings.simplefilter("always", DeprecationWarning)
 warnings.simplefilter("always", UserWarning)
 
 
-def from_api_client(host_address, client_id, secret):
+def from_api_client(
+    host_address,
+    client_id,
+    secret,
+    json_codec=None,
+    token_store=None,
+    host_cache=None,
+    http_adapter=None,
+    retry_policy=None,
+    rate_limiter=None,
+    circuit_breaker=None,
+    request_hooks=None,
+):
     """Creates a :class:`~py42.sdk.SDKClient` object for accessing the Code42 REST APIs using
     an API client ID and secret.
 
@@ -23,15 +42,65 @@ def from_api_client(host_address, client_id, secret):
             console.us.code42.com
         client_id (str): The client ID of the API client to authenticate with.
         secret (str): The secret of the API client to authenticate with.
+        json_codec (str or :class:`py42.jsoncodec.JsonCodec`, optional): The JSON codec used
+            to parse responses and encode request bodies: ``"json"``, ``"orjson"`` or ``"ujson"``.
+            Defaults to None, which uses the standard library.
+        token_store (:class:`py42.tokenstore.FileTokenStore` or :class:`py42.tokenstore.SQLiteTokenStore`, optional):
+            A store to share the token with other processes on this host that use the same
+            store and account, so that only one of them requests a new token at a time.
+            Defaults to None.
+        host_cache (:class:`py42.hostcache.FileHostCache`, optional): A cache of microservice
+            host addresses, so that processes using it skip looking them up. Defaults to
+            None.
+        http_adapter (:class:`py42.connectionpool.PoolingHTTPAdapter`, optional): The adapter
+            that sends the SDK's requests, to size its connection pools. Defaults to None,
+            which uses a new adapter sized by ``py42.settings.pool_maxsize``.
+        retry_policy (:class:`py42.retry.RetryPolicy`, optional): When and how often to
+            retry throttled and failed requests. Defaults to None, which retries throttled
+            requests and server unavailable errors up to 3 times.
+        rate_limiter (:class:`py42.retry.RateLimiter`, optional): Limits the rate of
+            requests to each host. Defaults to None, which does not limit requests.
+        circuit_breaker (:class:`py42.circuitbreaker.CircuitBreaker`, optional): Pauses
+            requests to hosts whose recent requests failed, raising
+            :class:`py42.exceptions.Py42CircuitOpenError` instead of waiting for them.
+            Defaults to None.
+        request_hooks (list, optional): :class:`py42.instrumentation.RequestHook` objects,
+            such as a :class:`py42.instrumentation.LatencyHistogram`, to call with the
+            measurements of each request. Defaults to None.
 
     Returns:
         :class:`py42.sdk.SDKClient`
     """
 
-    return SDKClient.from_api_client(host_address, client_id, secret)
+    return SDKClient.from_api_client(
+        host_address,
+        client_id,
+        secret,
+        json_codec=json_codec,
+        token_store=token_store,
+        host_cache=host_cache,
+        http_adapter=http_adapter,
+        retry_policy=retry_policy,
+        rate_limiter=rate_limiter,
+        circuit_breaker=circuit_breaker,
+        request_hooks=request_hooks,
+    )
 
 
-def from_local_account(host_address, username, password, totp=None):
+def from_local_account(
+    host_address,
+    username,
+    password,
+    totp=None,
+    json_codec=None,
+    token_store=None,
+    host_cache=None,
+    http_adapter=None,
+    retry_policy=None,
+    rate_limiter=None,
+    circuit_breaker=None,
+    request_hooks=None,
+):
     """Creates a :class:`~py42.sdk.SDKClient` object for accessing the Code42 REST APIs using the
     supplied credentials. This method supports only accounts created within the Code42 console or using the
     APIs (including py42). Username/passwords that are based on Active Directory,
@@ -44,11 +113,49 @@ def from_local_account(host_address, username, password, totp=None):
         password (str): The password of the authenticating account.
         totp (callable or str, optional): The time-based one-time password of the authenticating account. Include only
             if the account uses Code42's two-factor authentication. Defaults to None.
+        json_codec (str or :class:`py42.jsoncodec.JsonCodec`, optional): The JSON codec used
+            to parse responses and encode request bodies: ``"json"``, ``"orjson"`` or ``"ujson"``.
+            Defaults to None, which uses the standard library.
+        token_store (:class:`py42.tokenstore.FileTokenStore` or :class:`py42.tokenstore.SQLiteTokenStore`, optional):
+            A store to share the token with other processes on this host that use the same
+            store and account, so that only one of them requests a new token at a time.
+            Defaults to None.
+        host_cache (:class:`py42.hostcache.FileHostCache`, optional): A cache of microservice
+            host addresses, so that processes using it skip looking them up. Defaults to
+            None.
+        http_adapter (:class:`py42.connectionpool.PoolingHTTPAdapter`, optional): The adapter
+            that sends the SDK's requests, to size its connection pools. Defaults to None,
+            which uses a new adapter sized by ``py42.settings.pool_maxsize``.
+        retry_policy (:class:`py42.retry.RetryPolicy`, optional): When and how often to
+            retry throttled and failed requests. Defaults to None, which retries throttled
+            requests and server unavailable errors up to 3 times.
+        rate_limiter (:class:`py42.retry.RateLimiter`, optional): Limits the rate of
+            requests to each host. Defaults to None, which does not limit requests.
+        circuit_breaker (:class:`py42.circuitbreaker.CircuitBreaker`, optional): Pauses
+            requests to hosts whose recent requests failed, raising
+            :class:`py42.exceptions.Py42CircuitOpenError` instead of waiting for them.
+            Defaults to None.
+        request_hooks (list, optional): :class:`py42.instrumentation.RequestHook` objects,
+            such as a :class:`py42.instrumentation.LatencyHistogram`, to call with the
+            measurements of each request. Defaults to None.
 
     Returns:
         :class:`py42.sdk.SDKClient`
     """
-    client = SDKClient.from_local_account(host_address, username, password, totp)
+    client = SDKClient.from_local_account(
+        host_address,
+        username,
+        password,
+        totp,
+        json_codec=json_codec,
+        token_store=token_store,
+        host_cache=host_cache,
+        http_adapter=http_adapter,
+        retry_policy=retry_policy,
+        rate_limiter=rate_limiter,
+        circuit_breaker=circuit_breaker,
+        request_hooks=request_hooks,
+    )
 
     # test credentials
     try:
@@ -63,7 +170,17 @@ def from_local_account(host_address, username, password, totp=None):
     return client
 
 
-def from_jwt_provider(host_address, jwt_provider):
+def from_jwt_provider(
+    host_address,
+    jwt_provider,
+    json_codec=None,
+    host_cache=None,
+    http_adapter=None,
+    retry_policy=None,
+    rate_limiter=None,
+    circuit_breaker=None,
+    request_hooks=None,
+):
     """Creates a :class:`~py42.sdk.SDKClient` object for accessing the Code42 REST APIs using a custom
     auth mechanism. User can use any authentication mechanism like that returns a JSON Web token on authentication
     which would then be used for all subsequent requests.
@@ -72,25 +189,73 @@ def from_jwt_provider(host_address, jwt_provider):
         host_address (str): The domain name of the Code42 instance being authenticated to, e.g.
             console.us.code42.com
         jwt_provider (function): A function that accepts no parameters and on execution returns a JSON web token string.
+        json_codec (str or :class:`py42.jsoncodec.JsonCodec`, optional): The JSON codec used
+            to parse responses and encode request bodies: ``"json"``, ``"orjson"`` or ``"ujson"``.
+            Defaults to None, which uses the standard library.
+        host_cache (:class:`py42.hostcache.FileHostCache`, optional): A cache of microservice
+            host addresses, so that processes using it skip looking them up. Defaults to
+            None.
+        http_adapter (:class:`py42.connectionpool.PoolingHTTPAdapter`, optional): The adapter
+            that sends the SDK's requests, to size its connection pools. Defaults to None,
+            which uses a new adapter sized by ``py42.settings.pool_maxsize``.
+        retry_policy (:class:`py42.retry.RetryPolicy`, optional): When and how often to
+            retry throttled and failed requests. Defaults to None, which retries throttled
+            requests and server unavailable errors up to 3 times.
+        rate_limiter (:class:`py42.retry.RateLimiter`, optional): Limits the rate of
+            requests to each host. Defaults to None, which does not limit requests.
+        circuit_breaker (:class:`py42.circuitbreaker.CircuitBreaker`, optional): Pauses
+            requests to hosts whose recent requests failed, raising
+            :class:`py42.exceptions.Py42CircuitOpenError` instead of waiting for them.
+            Defaults to None.
+        request_hooks (list, optional): :class:`py42.instrumentation.RequestHook` objects,
+            such as a :class:`py42.instrumentation.LatencyHistogram`, to call with the
+            measurements of each request. Defaults to None.
 
     Returns:
         :class:`py42.sdk.SDKClient`
     """
 
-    client = SDKClient.from_jwt_provider(host_address, jwt_provider)
+    client = SDKClient.from_jwt_provider(
+        host_address,
+        jwt_provider,
+        json_codec=json_codec,
+        host_cache=host_cache,
+        http_adapter=http_adapter,
+        retry_policy=retry_policy,
+        rate_limiter=rate_limiter,
+        circuit_breaker=circuit_breaker,
+        request_hooks=request_hooks,
+    )
     client.usercontext.get_current_tenant_id()
     return client
 
 
 class SDKClient:
-    def __init__(self, main_connection, auth, auth_flag=None):
-        services, user_ctx = _init_services(main_connection, auth, auth_flag)
+    def __init__(self, main_connection, auth, auth_flag=None, host_cache=None):
+        # Services and clients are created (and their modules imported) on first use.
+        services = _init_services(
+            main_connection, auth, auth_flag, host_cache=host_cache
+        )
+        self._services = services
         self._clients = _init_clients(services, main_connection)
-        self._user_ctx = user_ctx
         self._auth_flag = auth_flag
+        self._auth = auth
 
     @classmethod
-    def from_api_client(cls, host_address, client_id, secret):
+    def from_api_client(
+        cls,
+        host_address,
+        client_id,
+        secret,
+        json_codec=None,
+        token_store=None,
+        host_cache=None,
+        http_adapter=None,
+        retry_policy=None,
+        rate_limiter=None,
+        circuit_breaker=None,
+        request_hooks=None,
+    ):
         """Creates a :class:`~py42.sdk.SDKClient` object for accessing the Code42 REST APIs using
         an API client ID and secret.
 
@@ -99,22 +264,75 @@ class SDKClient:
                 console.us.code42.com
             client_id (str): The client ID of the API client to authenticate with.
             secret (str): The secret of the API client to authenticate with.
+            json_codec (str or :class:`py42.jsoncodec.JsonCodec`, optional): The JSON codec
+                used to parse responses and encode request bodies: ``"json"``, ``"orjson"`` or
+                ``"ujson"``. Defaults to None, which uses the standard library.
+            token_store (:class:`py42.tokenstore.FileTokenStore` or :class:`py42.tokenstore.SQLiteTokenStore`, optional):
+                A store to share the token with other processes on this host that use the
+                same store and account. Defaults to None.
+            host_cache (:class:`py42.hostcache.FileHostCache`, optional): A cache of
+                microservice host addresses, so that processes using it skip looking them
+                up. Defaults to None.
+            http_adapter (:class:`py42.connectionpool.PoolingHTTPAdapter`, optional): The
+                adapter that sends the SDK's requests, to size its connection pools.
+                Defaults to None, which uses a new adapter sized by
+                ``py42.settings.pool_maxsize``.
+            retry_policy (:class:`py42.retry.RetryPolicy`, optional): When and how often
+                to retry throttled and failed requests. Defaults to None, which retries
+                throttled requests and server unavailable errors up to 3 times.
+            rate_limiter (:class:`py42.retry.RateLimiter`, optional): Limits the rate of
+                requests to each host. Defaults to None, which does not limit requests.
+            circuit_breaker (:class:`py42.circuitbreaker.CircuitBreaker`, optional):
+                Pauses requests to hosts whose recent requests failed, raising
+                :class:`py42.exceptions.Py42CircuitOpenError` instead of waiting for them.
+                Defaults to None.
+            request_hooks (list, optional): :class:`py42.instrumentation.RequestHook`
+                objects, such as a :class:`py42.instrumentation.LatencyHistogram`, to call
+                with the measurements of each request. Defaults to None.
 
         Returns:
             :class:`py42.sdk.SDKClient`
         """
 
+        connection_kwargs = _get_connection_kwargs(
+            http_adapter,
+            json_codec,
+            retry_policy,
+            rate_limiter,
+            circuit_breaker,
+            request_hooks,
+        )
         basic_auth = HTTPBasicAuth(client_id, secret)
-        auth_connection = Connection.from_host_address(host_address, auth=basic_auth)
-        api_client_auth = ApiClientAuth(auth_connection)
+        auth_connection = Connection.from_host_address(
+            host_address, auth=basic_auth, **connection_kwargs
+        )
+        api_client_auth = ApiClientAuth(
+            auth_connection,
+            token_store=token_store,
+            token_key=_get_token_key("api-client", host_address, client_id),
+        )
         main_connection = Connection.from_host_address(
-            host_address, auth=api_client_auth
+            host_address, auth=api_client_auth, **connection_kwargs
         )
         api_client_auth.get_credentials()
-        return cls(main_connection, api_client_auth, auth_flag=1)
+        return cls(main_connection, api_client_auth, auth_flag=1, host_cache=host_cache)
 
     @classmethod
-    def from_local_account(cls, host_address, username, password, totp=None):
+    def from_local_account(
+        cls,
+        host_address,
+        username,
+        password,
+        totp=None,
+        json_codec=None,
+        token_store=None,
+        host_cache=None,
+        http_adapter=None,
+        retry_policy=None,
+        rate_limiter=None,
+        circuit_breaker=None,
+        request_hooks=None,
+    ):
         """Creates a :class:`~py42.sdk.SDKClient` object for accessing the Code42 REST APIs using
         the supplied credentials. This method supports only accounts created within the Code42 console or
         using the APIs (including py42). Username/passwords that are based on Active
@@ -127,20 +345,73 @@ class SDKClient:
             password (str): The password of the authenticating account.
             totp (callable or str, optional): The time-based one-time password of the authenticating account. Include only
                 if the account uses Code42's two-factor authentication. Defaults to None.
+            json_codec (str or :class:`py42.jsoncodec.JsonCodec`, optional): The JSON codec
+                used to parse responses and encode request bodies: ``"json"``, ``"orjson"`` or
+                ``"ujson"``. Defaults to None, which uses the standard library.
+            token_store (:class:`py42.tokenstore.FileTokenStore` or :class:`py42.tokenstore.SQLiteTokenStore`, optional):
+                A store to share the token with other processes on this host that use the
+                same store and account. Defaults to None.
+            host_cache (:class:`py42.hostcache.FileHostCache`, optional): A cache of
+                microservice host addresses, so that processes using it skip looking them
+                up. Defaults to None.
+            http_adapter (:class:`py42.connectionpool.PoolingHTTPAdapter`, optional): The
+                adapter that sends the SDK's requests, to size its connection pools.
+                Defaults to None, which uses a new adapter sized by
+                ``py42.settings.pool_maxsize``.
+            retry_policy (:class:`py42.retry.RetryPolicy`, optional): When and how often
+                to retry throttled and failed requests. Defaults to None, which retries
+                throttled requests and server unavailable errors up to 3 times.
+            rate_limiter (:class:`py42.retry.RateLimiter`, optional): Limits the rate of
+                requests to each host. Defaults to None, which does not limit requests.
+            circuit_breaker (:class:`py42.circuitbreaker.CircuitBreaker`, optional):
+                Pauses requests to hosts whose recent requests failed, raising
+                :class:`py42.exceptions.Py42CircuitOpenError` instead of waiting for them.
+                Defaults to None.
+            request_hooks (list, optional): :class:`py42.instrumentation.RequestHook`
+                objects, such as a :class:`py42.instrumentation.LatencyHistogram`, to call
+                with the measurements of each request. Defaults to None.
         Returns:
             :class:`py42.sdk.SDKClient`
         """
+        connection_kwargs = _get_connection_kwargs(
+            http_adapter,
+            json_codec,
+            retry_policy,
+            rate_limiter,
+            circuit_breaker,
+            request_hooks,
+        )
         basic_auth = None
         if username and password:
             basic_auth = HTTPBasicAuth(username, password)
-        auth_connection = Connection.from_host_address(host_address, auth=basic_auth)
-        bearer_auth = BearerAuth(auth_connection, totp)
-        main_connection = Connection.from_host_address(host_address, auth=bearer_auth)
+        auth_connection = Connection.from_host_address(
+            host_address, auth=basic_auth, **connection_kwargs
+        )
+        bearer_auth = BearerAuth(
+            auth_connection,
+            totp,
+            token_store=token_store,
+            token_key=_get_token_key("user", host_address, username),
+        )
+        main_connection = Connection.from_host_address(
+            host_address, auth=bearer_auth, **connection_kwargs
+        )
 
-        return cls(main_connection, bearer_auth)
+        return cls(main_connection, bearer_auth, host_cache=host_cache)
 
     @classmethod
-    def from_jwt_provider(cls, host_address, jwt_provider):
+    def from_jwt_provider(
+        cls,
+        host_address,
+        jwt_provider,
+        json_codec=None,
+        host_cache=None,
+        http_adapter=None,
+        retry_policy=None,
+        rate_limiter=None,
+        circuit_breaker=None,
+        request_hooks=None,
+    ):
         """Creates a :class:`~py42.sdk.SDKClient` object for accessing the Code42 REST APIs using a custom
             auth mechanism. User can use any authentication mechanism like that returns a JSON Web token
             on authentication which would then be used for all subsequent requests.
@@ -150,14 +421,47 @@ class SDKClient:
                 console.us.code42.com
             jwt_provider (function): A function that accepts no parameters and on execution returns a
             JSON web token string.
+            json_codec (str or :class:`py42.jsoncodec.JsonCodec`, optional): The JSON codec
+                used to parse responses and encode request bodies: ``"json"``, ``"orjson"`` or
+                ``"ujson"``. Defaults to None, which uses the standard library.
+            host_cache (:class:`py42.hostcache.FileHostCache`, optional): A cache of
+                microservice host addresses, so that processes using it skip looking them
+                up. Defaults to None.
+            http_adapter (:class:`py42.connectionpool.PoolingHTTPAdapter`, optional): The
+                adapter that sends the SDK's requests, to size its connection pools.
+                Defaults to None, which uses a new adapter sized by
+                ``py42.settings.pool_maxsize``.
+            retry_policy (:class:`py42.retry.RetryPolicy`, optional): When and how often
+                to retry throttled and failed requests. Defaults to None, which retries
+                throttled requests and server unavailable errors up to 3 times.
+            rate_limiter (:class:`py42.retry.RateLimiter`, optional): Limits the rate of
+                requests to each host. Defaults to None, which does not limit requests.
+            circuit_breaker (:class:`py42.circuitbreaker.CircuitBreaker`, optional):
+                Pauses requests to hosts whose recent requests failed, raising
+                :class:`py42.exceptions.Py42CircuitOpenError` instead of waiting for them.
+                Defaults to None.
+            request_hooks (list, optional): :class:`py42.instrumentation.RequestHook`
+                objects, such as a :class:`py42.instrumentation.LatencyHistogram`, to call
+                with the measurements of each request. Defaults to None.
 
         Returns:
             :class:`py42.sdk.SDKClient`
         """
         custom_auth = CustomJWTAuth(jwt_provider)
-        main_connection = Connection.from_host_address(host_address, auth=custom_auth)
+        main_connection = Connection.from_host_address(
+            host_address,
+            auth=custom_auth,
+            **_get_connection_kwargs(
+                http_adapter,
+                json_codec,
+                retry_policy,
+                rate_limiter,
+                circuit_breaker,
+                request_hooks,
+            ),
+        )
         custom_auth.get_credentials()
-        return cls(main_connection, custom_auth)
+        return cls(main_connection, custom_auth, host_cache=host_cache)
 
     @property
     def loginconfig(self):
@@ -237,7 +541,7 @@ class SDKClient:
         Returns:
             :class:`py42.usercontext.UserContext`
         """
-        return self._user_ctx
+        return self._services.usercontext
 
     @property
     def securitydata(self):
@@ -305,151 +609,381 @@ class SDKClient:
         """
         return self._clients.watchlists
 
+    def warm_up(self, max_workers=None):
+        """Looks up the hosts of all of the microservices used by the SDK at once, rather than
+        each one the first time it is used.
 
-def _init_services(main_connection, main_auth, auth_flag=None):
-    # services are imported within function to prevent circular imports when a service
-    # imports anything from py42.sdk.queries
-    from py42.services import Services
-    from py42.services._keyvaluestore import KeyValueStoreService
-    from py42.services.administration import AdministrationService
-    from py42.services.alertrules import AlertRulesService
-    from py42.services.alerts import AlertService
-    from py42.services.archive import ArchiveService
-    from py42.services.auditlogs import AuditLogsService
-    from py42.services.cases import CasesService
-    from py42.services.casesfileevents import CasesFileEventsService
-    from py42.services.devices import DeviceService
-    from py42.services.fileevent import FileEventService
-    from py42.services.legalhold import LegalHoldService
-    from py42.services.legalholdapiclient import LegalHoldApiClientService
-    from py42.services.orgs import OrgService
-    from py42.services.preservationdata import PreservationDataService
-    from py42.services.savedsearch import SavedSearchService
-    from py42.services.trustedactivities import TrustedActivitiesService
-    from py42.services.users import UserService
-    from py42.services.watchlists import WatchlistsService
-    from py42.services.userriskprofile import UserRiskProfileService
-
-    alert_rules_key = "FedObserver-API_URL"
-    alerts_key = "AlertService-API_URL"
-    file_events_key = "FORENSIC_SEARCH-API_URL"
-    preservation_data_key = "EXFILTRATED-DATA-SERVICE_API-URL"
-    kv_prefix = "simple-key-value-store"
-    audit_logs_key = "AUDIT-LOG_API-URL"
-    cases_key = "CASES_API-URL"
-    trusted_activities_key = "TRUSTED-DOMAINS_API-URL"
-    watchlists_key = "watchlists-API_URL"
-
-    kv_connection = Connection.from_microservice_prefix(main_connection, kv_prefix)
-    kv_service = KeyValueStoreService(kv_connection)
-
-    alert_rules_conn = Connection.from_microservice_key(
-        kv_service, alert_rules_key, auth=main_auth
-    )
-    alerts_conn = Connection.from_microservice_key(
-        kv_service, alerts_key, auth=main_auth
-    )
-    file_events_conn = Connection.from_microservice_key(
-        kv_service, file_events_key, auth=main_auth
-    )
-    pds_conn = Connection.from_microservice_key(
-        kv_service, preservation_data_key, auth=main_auth
-    )
-    audit_logs_conn = Connection.from_microservice_key(
-        kv_service, audit_logs_key, auth=main_auth
-    )
-    administration_svc = AdministrationService(main_connection)
-    file_event_svc = FileEventService(file_events_conn)
-    user_ctx = UserContext(administration_svc)
-    cases_conn = Connection.from_microservice_key(kv_service, cases_key, auth=main_auth)
-    trusted_activities_conn = Connection.from_microservice_key(
-        kv_service, trusted_activities_key, auth=main_auth
-    )
-    watchlists_conn = Connection.from_microservice_key(
-        kv_service, watchlists_key, auth=main_auth
-    )
-    user_risk_profile_svc = UserRiskProfileService(watchlists_conn)
+        Args:
+            max_workers (int, optional): The most lookups to run at once. Defaults to None,
+                which runs them all at once.
 
-    services = Services(
-        administration=administration_svc,
-        archive=ArchiveService(main_connection),
-        devices=DeviceService(main_connection),
-        # Only use updated legal hold client if initialized with API Client authorization
-        legalhold=LegalHoldApiClientService(main_connection)
-        if auth_flag
-        else LegalHoldService(main_connection),
-        orgs=OrgService(main_connection),
-        users=UserService(main_connection),
-        alertrules=AlertRulesService(alert_rules_conn, user_ctx, user_risk_profile_svc),
-        alerts=AlertService(alerts_conn, user_ctx),
-        fileevents=file_event_svc,
-        savedsearch=SavedSearchService(file_events_conn, file_event_svc),
-        preservationdata=PreservationDataService(pds_conn),
-        auditlogs=AuditLogsService(audit_logs_conn),
-        cases=CasesService(cases_conn),
-        casesfileevents=CasesFileEventsService(cases_conn),
-        trustedactivities=TrustedActivitiesService(trusted_activities_conn),
-        userriskprofile=user_risk_profile_svc,
-        watchlists=WatchlistsService(watchlists_conn),
-    )
+        Returns:
+            dict: The host address of each service, keyed by the name of the service, or
+            the error raised while looking it up. For example, a service that is not
+            available to the tenant maps to a
+            :class:`py42.exceptions.Py42FeatureUnavailableError`.
+        """
+        service_names = {}
+        for name, connection in self._services.connections.items():
+            service_names.setdefault(connection, []).append(name)
+
+        hosts = {}
+        with ThreadPoolExecutor(
+            max_workers=max_workers or len(service_names) or 1
+        ) as executor:
+            futures = {
+                executor.submit(_get_host_address, connection): names
+                for connection, names in service_names.items()
+            }
+            for future in as_completed(futures):
+                for name in futures[future]:
+                    hosts[name] = future.result()
+        return hosts
+
+    @property
+    def connection_pool_stats(self):
+        """Statistics for the connection pool of each host the SDK has sent requests to,
+        keyed by host name: the pool's size, how many connections are in use, and how many
+        requests had to wait for a connection and for how long. See
+        :meth:`py42.connectionpool.PoolingHTTPAdapter.get_stats`.
 
-    return services, user_ctx
+        Returns:
+            dict
+        """
+        sessions = {
+            id(connection.session): connection.session
+            for connection in self._services.connections.values()
+        }
+        stats = {}
+        for session in sessions.values():
+            stats.update(get_pool_stats(session))
+        return stats
+
+    @property
+    def auth_metrics(self):
+        """Counters describing how often the SDK's credentials have been renewed and how long
+        renewing them took, or an empty dict if the SDK's credentials are not renewable.
+
+        Returns:
+            dict
+        """
+        if isinstance(self._auth, C42RenewableAuth):
+            return self._auth.metrics
+        return {}
+
+
+def _get_token_key(account_type, host_address, account):
+    return f"{account_type}|{host_address}|{account}"
+
+
+def _get_connection_kwargs(
+    http_adapter, json_codec, retry_policy, rate_limiter, circuit_breaker, request_hooks
+):
+    # The settings shared by all of an SDK client's connections.
+    return {
+        "session": create_session(http_adapter),
+        "json_codec": json_codec,
+        "retry_policy": retry_policy,
+        "rate_limiter": rate_limiter,
+        "circuit_breaker": circuit_breaker,
+        "request_hooks": request_hooks,
+    }
+
+
+def _get_host_address(connection):
+    try:
+        return connection.host_address
+    except Exception as err:
+        return err
+
+
+def _get_cache_kwargs(host_cache, main_connection, key):
+    if host_cache is None:
+        return {}
+    cache_key = f"{main_connection.host_address}|{key}"
+    return {"host_cache": host_cache, "cache_key": cache_key}
+
+
+# The key-value store keys of the hosts of each service that uses a microservice.
+_SERVICE_KEYS = {
+    "alertrules": "FedObserver-API_URL",
+    "alerts": "AlertService-API_URL",
+    "fileevents": "FORENSIC_SEARCH-API_URL",
+    "savedsearch": "FORENSIC_SEARCH-API_URL",
+    "preservationdata": "EXFILTRATED-DATA-SERVICE_API-URL",
+    "auditlogs": "AUDIT-LOG_API-URL",
+    "cases": "CASES_API-URL",
+    "casesfileevents": "CASES_API-URL",
+    "trustedactivities": "TRUSTED-DOMAINS_API-URL",
+    "userriskprofile": "watchlists-API_URL",
+    "watchlists": "watchlists-API_URL",
+}
+_KV_PREFIX = "simple-key-value-store"
+
+
+def _init_services(main_connection, main_auth, auth_flag=None, host_cache=None):
+    return _LazyServices(main_connection, main_auth, auth_flag, host_cache)
 
 
 def _init_clients(services, connection):
-    # clients are imported within function to prevent circular imports when a client
-    # imports anything from py42.sdk.queries
-    from py42.clients import Clients
-    from py42.clients._archiveaccess.accessorfactory import ArchiveAccessorFactory
-    from py42.clients.alertrules import AlertRulesClient
-    from py42.clients.alerts import AlertsClient
-    from py42.clients.archive import ArchiveClient
-    from py42.clients.auditlogs import AuditLogsClient
-    from py42.clients.authority import AuthorityClient
-    from py42.clients.cases import CasesClient
-    from py42.clients.loginconfig import LoginConfigurationClient
-    from py42.clients.securitydata import SecurityDataClient
-    from py42.clients.trustedactivities import TrustedActivitiesClient
-    from py42.services.storage._service_factory import StorageServiceFactory
-    from py42.clients.userriskprofile import UserRiskProfileClient
-    from py42.clients.watchlists import WatchlistsClient
-
-    authority = AuthorityClient(
-        administration=services.administration,
-        archive=services.archive,
-        devices=services.devices,
-        legalhold=services.legalhold,
-        orgs=services.orgs,
-        users=services.users,
-    )
-    storage_service_factory = StorageServiceFactory(connection, services.devices)
-    alertrules = AlertRulesClient(services.alerts, services.alertrules)
-    securitydata = SecurityDataClient(
-        services.fileevents,
-        services.preservationdata,
-        services.savedsearch,
-        storage_service_factory,
-    )
-    alerts = AlertsClient(services.alerts, alertrules)
-    archive_accessor_factory = ArchiveAccessorFactory(
-        services.archive, storage_service_factory
-    )
-    archive = ArchiveClient(archive_accessor_factory, services.archive)
-    auditlogs = AuditLogsClient(services.auditlogs)
-    loginconfig = LoginConfigurationClient(connection)
-    trustedactivities = TrustedActivitiesClient(services.trustedactivities)
-    userriskprofile = UserRiskProfileClient(services.userriskprofile, services.users)
-    watchlists = WatchlistsClient(services.watchlists)
-    clients = Clients(
-        authority=authority,
-        alerts=alerts,
-        securitydata=securitydata,
-        archive=archive,
-        auditlogs=auditlogs,
-        cases=CasesClient(services.cases, services.casesfileevents),
-        loginconfig=loginconfig,
-        trustedactivities=trustedactivities,
-        userriskprofile=userriskprofile,
-        watchlists=watchlists,
-    )
-    return clients
+    return _LazyClients(services, connection)
+
+
+class _LazyContainer:
+    """Creates each member the first time it is accessed, by calling the ``_create_<name>``
+    method, which imports the member's module at that point. Only the modules of the
+    services and clients that are used get imported."""
+
+    def __init__(self):
+        self._members = {}
+        # Creating a member may create the members it depends on.
+        self._create_lock = RLock()
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        members = self.__dict__.get("_members")
+        if members is None:
+            raise AttributeError(name)
+        member = members.get(name)
+        if member is not None:
+            return member
+        create = getattr(type(self), f"_create_{name}", None)
+        if create is None:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+        with self._create_lock:
+            if name not in members:
+                members[name] = create(self)
+            return members[name]
+
+
+class _LazyServices(_LazyContainer):
+    # services are imported within methods to prevent circular imports when a service
+    # imports anything from py42.sdk.queries, and so that unused services are not imported
+
+    def __init__(self, main_connection, main_auth, auth_flag=None, host_cache=None):
+        from py42.services._keyvaluestore import KeyValueStoreService
+
+        super().__init__()
+        self._main_connection = main_connection
+        self._auth_flag = auth_flag
+
+        connection_kwargs = {
+            "session": main_connection.session,
+            "json_codec": main_connection.json_codec,
+            "retry_policy": main_connection.retry_policy,
+            "rate_limiter": main_connection.rate_limiter,
+            "circuit_breaker": main_connection.circuit_breaker,
+            "request_hooks": main_connection.request_hooks,
+        }
+        kv_connection = Connection.from_microservice_prefix(
+            main_connection,
+            _KV_PREFIX,
+            **connection_kwargs,
+            **_get_cache_kwargs(host_cache, main_connection, _KV_PREFIX),
+        )
+        kv_service = KeyValueStoreService(kv_connection)
+
+        # Connections are cheap to create, since they look up their hosts on first use.
+        key_connections = {}
+        for key in set(_SERVICE_KEYS.values()):
+            key_connections[key] = Connection.from_microservice_key(
+                kv_service,
+                key,
+                auth=main_auth,
+                **connection_kwargs,
+                **_get_cache_kwargs(host_cache, main_connection, key),
+            )
+        self.connections = {
+            name: key_connections[_SERVICE_KEYS[name]]
+            if name in _SERVICE_KEYS
+            else main_connection
+            for name in Services._fields
+        }
+
+    def _create_usercontext(self):
+        return UserContext(self.administration)
+
+    def _create_administration(self):
+        from py42.services.administration import AdministrationService
+
+        return AdministrationService(self._main_connection)
+
+    def _create_archive(self):
+        from py42.services.archive import ArchiveService
+
+        return ArchiveService(self._main_connection)
+
+    def _create_devices(self):
+        from py42.services.devices import DeviceService
+
+        return DeviceService(self._main_connection)
+
+    def _create_legalhold(self):
+        # Only use updated legal hold client if initialized with API Client authorization
+        if self._auth_flag:
+            from py42.services.legalholdapiclient import LegalHoldApiClientService
+
+            return LegalHoldApiClientService(self._main_connection)
+
+        from py42.services.legalhold import LegalHoldService
+
+        return LegalHoldService(self._main_connection)
+
+    def _create_orgs(self):
+        from py42.services.orgs import OrgService
+
+        return OrgService(self._main_connection)
+
+    def _create_users(self):
+        from py42.services.users import UserService
+
+        return UserService(self._main_connection)
+
+    def _create_alertrules(self):
+        from py42.services.alertrules import AlertRulesService
+
+        return AlertRulesService(
+            self.connections["alertrules"], self.usercontext, self.userriskprofile
+        )
+
+    def _create_alerts(self):
+        from py42.services.alerts import AlertService
+
+        return AlertService(self.connections["alerts"], self.usercontext)
+
+    def _create_fileevents(self):
+        from py42.services.fileevent import FileEventService
+
+        return FileEventService(self.connections["fileevents"])
+
+    def _create_savedsearch(self):
+        from py42.services.savedsearch import SavedSearchService
+
+        return SavedSearchService(self.connections["savedsearch"], self.fileevents)
+
+    def _create_preservationdata(self):
+        from py42.services.preservationdata import PreservationDataService
+
+        return PreservationDataService(self.connections["preservationdata"])
+
+    def _create_auditlogs(self):
+        from py42.services.auditlogs import AuditLogsService
+
+        return AuditLogsService(self.connections["auditlogs"])
+
+    def _create_cases(self):
+        from py42.services.cases import CasesService
+
+        return CasesService(self.connections["cases"])
+
+    def _create_casesfileevents(self):
+        from py42.services.casesfileevents import CasesFileEventsService
+
+        return CasesFileEventsService(self.connections["casesfileevents"])
+
+    def _create_trustedactivities(self):
+        from py42.services.trustedactivities import TrustedActivitiesService
+
+        return TrustedActivitiesService(self.connections["trustedactivities"])
+
+    def _create_userriskprofile(self):
+        from py42.services.userriskprofile import UserRiskProfileService
+
+        return UserRiskProfileService(self.connections["userriskprofile"])
+
+    def _create_watchlists(self):
+        from py42.services.watchlists import WatchlistsService
+
+        return WatchlistsService(self.connections["watchlists"])
+
+
+class _LazyClients(_LazyContainer):
+    # clients are imported within methods to prevent circular imports when a client
+    # imports anything from py42.sdk.queries, and so that unused clients are not imported
+
+    def __init__(self, services, connection):
+        super().__init__()
+        self._services = services
+        self._connection = connection
+
+    def _create_storage_service_factory(self):
+        from py42.services.storage._service_factory import StorageServiceFactory
+
+        return StorageServiceFactory(self._connection, self._services.devices)
+
+    def _create_authority(self):
+        from py42.clients.authority import AuthorityClient
+
+        services = self._services
+        return AuthorityClient(
+            administration=services.administration,
+            archive=services.archive,
+            devices=services.devices,
+            legalhold=services.legalhold,
+            orgs=services.orgs,
+            users=services.users,
+        )
+
+    def _create_alertrules(self):
+        from py42.clients.alertrules import AlertRulesClient
+
+        return AlertRulesClient(self._services.alerts, self._services.alertrules)
+
+    def _create_alerts(self):
+        from py42.clients.alerts import AlertsClient
+
+        return AlertsClient(self._services.alerts, self.alertrules)
+
+    def _create_securitydata(self):
+        from py42.clients.securitydata import SecurityDataClient
+
+        return SecurityDataClient(
+            self._services.fileevents,
+            self._services.preservationdata,
+            self._services.savedsearch,
+            self.storage_service_factory,
+        )
+
+    def _create_archive(self):
+        from py42.clients._archiveaccess.accessorfactory import ArchiveAccessorFactory
+        from py42.clients.archive import ArchiveClient
+
+        archive_accessor_factory = ArchiveAccessorFactory(
+            self._services.archive, self.storage_service_factory
+        )
+        return ArchiveClient(archive_accessor_factory, self._services.archive)
+
+    def _create_auditlogs(self):
+        from py42.clients.auditlogs import AuditLogsClient
+
+        return AuditLogsClient(self._services.auditlogs)
+
+    def _create_cases(self):
+        from py42.clients.cases import CasesClient
+
+        return CasesClient(self._services.cases, self._services.casesfileevents)
+
+    def _create_loginconfig(self):
+        from py42.clients.loginconfig import LoginConfigurationClient
+
+        return LoginConfigurationClient(self._connection)
+
+    def _create_trustedactivities(self):
+        from py42.clients.trustedactivities import TrustedActivitiesClient
+
+        return TrustedActivitiesClient(self._services.trustedactivities)
+
+    def _create_userriskprofile(self):
+        from py42.clients.userriskprofile import UserRiskProfileClient
+
+        return UserRiskProfileClient(
+            self._services.userriskprofile, self._services.users
+        )
+
+    def _create_watchlists(self):
+        from py42.clients.watchlists import WatchlistsClient
+
+        return WatchlistsClient(self._services.watchlists)
@@ -1,6 +1,12 @@
+import json
+
 from py42 import settings
+from py42.jsoncodec import EncodedJson
 from py42.sdk.queries.query_filter import FilterGroup
 
+# The request fields that change from page to page of a search.
+_PAGING_FIELDS = ("pgNum", "pgToken", "pgSize")
+
 
 class BaseQuery:
     def __init__(self, *args, **kwargs):
@@ -26,3 +32,78 @@ class BaseQuery:
     @classmethod
     def all(cls, *args):
         return cls(*args)
+
+    def compile(self, **fields):
+        """Returns a :class:`CompiledQuery` of the query's current filters, sort order and
+        page size, for requesting many of its pages. The same object is returned until one
+        of them changes.
+
+        Args:
+            **fields: Values for fields that the query leaves missing or None, such as
+                ``tenantId``.
+
+        Returns:
+            :class:`CompiledQuery`
+        """
+        key = (
+            self._group_clause,
+            tuple(str(group_item) for group_item in self._filter_group_list),
+            self.sort_key,
+            self.sort_direction,
+            self.page_size,
+            tuple(sorted(fields.items())),
+        )
+        compiled = getattr(self, "_compiled", None)
+        if compiled is None or compiled[0] != key:
+            compiled = (key, CompiledQuery(self, **fields))
+            self._compiled = compiled
+        return compiled[1]
+
+
+class CompiledQuery:
+    """A query whose filter groups are serialized once, for requesting many of its pages.
+    :meth:`page` returns the request body for one page by adding only the paging fields
+    to the serialized query.
+
+    Args:
+        query (:class:`BaseQuery`): The query.
+        **fields: Values for fields that the query leaves missing or None, such as
+            ``tenantId``.
+    """
+
+    def __init__(self, query, **fields):
+        query_dict = dict(query)
+        for name, value in fields.items():
+            if query_dict.get(name) is None:
+                query_dict[name] = value
+        for field in _PAGING_FIELDS:
+            query_dict.pop(field, None)
+        self.version = getattr(query, "version", None)
+        self.page_size = query.page_size
+        self._fields = query_dict
+        # The serialized query without its closing brace, ready for the paging fields.
+        prefix = json.dumps(query_dict, separators=(",", ":"))[:-1]
+        self._prefix = (prefix + "," if query_dict else prefix).encode("utf-8")
+
+    def page(self, page_number=None, page_token=None, page_size=None):
+        """Returns the request body for one page of the query.
+
+        Args:
+            page_number (int, optional): The page number. Ignored when ``page_token`` is
+                given. Defaults to None.
+            page_token (str, optional): The token of the page. Defaults to None.
+            page_size (int, optional): The number of results per page. Defaults to None,
+                which is the query's page size.
+
+        Returns:
+            :class:`py42.jsoncodec.EncodedJson`: The request body, which must not be
+            changed.
+        """
+        paging = {"pgSize": self.page_size if page_size is None else page_size}
+        if page_token is not None:
+            paging["pgToken"] = page_token
+        elif page_number is not None:
+            paging["pgNum"] = page_number
+        encoded_paging = json.dumps(paging, separators=(",", ":"))[1:]
+        encoded = self._prefix + encoded_paging.encode("utf-8")
+        return EncodedJson({**self._fields, **paging}, encoded)
@@ -1,4 +1,5 @@
 from datetime import datetime
+from weakref import WeakValueDictionary
 
 from py42.util import convert_datetime_to_epoch
 from py42.util import convert_datetime_to_timestamp_str
@@ -377,14 +378,41 @@ class QueryFilter:
     into the Python `dict` equivalent of their JSON representation. This can be useful
     for programmatically manipulating a :class:`~py42.sdk.queries.query_filter.QueryFilter`
     after it's been created.
-    """
 
-    _term = None
+    :class:`~py42.sdk.queries.query_filter.QueryFilter` objects are immutable, and
+    creating a filter equal to one that already exists returns the existing object, so
+    each filter's JSON is only formatted once however many queries and pages it is used
+    in.
+    """
 
-    def __init__(self, term, operator, value=None):
-        self._term = term
-        self._operator = operator
-        self._value = value
+    __slots__ = ("_term", "_operator", "_value", "_str", "_hash", "__weakref__")
+
+    # The existing filters, by class, term, operator, and type and value of the value.
+    _interned = WeakValueDictionary()
+
+    def __new__(cls, term, operator, value=None):
+        key = (cls, term, operator, type(value), value)
+        try:
+            instance = cls._interned.get(key)
+        except TypeError:
+            # An unhashable value; such filters are not shared.
+            key = instance = None
+        if instance is not None:
+            return instance
+
+        instance = super().__new__(cls)
+        formatted_value = "null" if value is None else f'"{value}"'
+        json = (
+            f'{{"operator":"{operator}", "term":"{term}", "value":{formatted_value}}}'
+        )
+        object.__setattr__(instance, "_term", term)
+        object.__setattr__(instance, "_operator", operator)
+        object.__setattr__(instance, "_value", value)
+        object.__setattr__(instance, "_str", json)
+        object.__setattr__(instance, "_hash", hash(json))
+        if key is not None:
+            instance = cls._interned.setdefault(key, instance)
+        return instance
 
     @classmethod
     def from_dict(cls, _dict):
@@ -419,31 +447,41 @@ class QueryFilter:
 
         return self._value
 
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} objects are immutable.")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} objects are immutable.")
+
+    def __reduce__(self):
+        return type(self), (self._term, self._operator, self._value)
+
     def __str__(self):
-        value = "null" if self._value is None else f'"{self._value}"'
-        return (
-            f'{{"operator":"{self._operator}", "term":"{self._term}", "value":{value}}}'
-        )
+        return self._str
 
     def __iter__(self):
-        output_dict = {
-            "operator": self._operator,
-            "term": self._term,
-            "value": self._value,
-        }
-        for key in output_dict:
-            yield key, output_dict[key]
+        yield "operator", self._operator
+        yield "term", self._term
+        yield "value", self._value
 
     def __eq__(self, other):
-        if isinstance(other, (QueryFilter, tuple, list)):
+        if other is self:
+            return True
+        elif isinstance(other, QueryFilter):
+            return (self._operator, self._term, self._value) == (
+                other._operator,
+                other._term,
+                other._value,
+            )
+        elif isinstance(other, (tuple, list)):
             return tuple(self) == tuple(other)
         elif isinstance(other, str):
-            return str(self) == other
+            return self._str == other
         else:
             return False
 
     def __hash__(self):
-        return hash(str(self))
+        return self._hash
 
 
 class FilterGroup:
@@ -459,11 +497,27 @@ class FilterGroup:
     instance, the combined filter items are transformed into the Python `dict` equivalent
     of their JSON representation. This can be useful for programmatically manipulating a
     :class:`~py42.sdk.queries.query_filter.FilterGroup` after it's been created.
+
+    The sorted filters and the JSON string are computed the first time they are needed
+    and then reused until ``filter_list`` or ``filter_clause`` is changed.
     """
 
+    __slots__ = (
+        "_filter_list",
+        "_filter_clause",
+        "_sorted_from",
+        "_sorted_filters",
+        "_str",
+    )
+
     def __init__(self, filter_list, filter_clause="AND"):
+        if not isinstance(filter_list, (list, tuple)):
+            filter_list = list(filter_list)
         self._filter_list = filter_list
         self._filter_clause = filter_clause
+        self._sorted_from = None
+        self._sorted_filters = None
+        self._str = None
 
     @classmethod
     def from_dict(cls, _dict):
@@ -498,22 +552,28 @@ class FilterGroup:
         """The clause joining the filters, such as ``AND`` or ``OR``."""
 
         self._filter_clause = value
+        self._str = None
 
     @property
     def _filter_set(self):
-        return sorted(list(set(self.filter_list)), key=str)
+        # The list may have been changed in place since the filters were sorted. Comparing
+        # it with a copy only checks the identity of each filter when it has not.
+        if self._sorted_filters is None or self._filter_list != self._sorted_from:
+            self._sorted_from = self._filter_list[:]
+            self._sorted_filters = tuple(sorted(set(self._filter_list), key=str))
+            self._str = None
+        return self._sorted_filters
 
     def __str__(self):
-        filters_string = ",".join(str(filter_item) for filter_item in self._filter_set)
-        return (
-            f'{{"filterClause":"{self._filter_clause}", "filters":[{filters_string}]}}'
-        )
+        filter_set = self._filter_set
+        if self._str is None:
+            filters_string = ",".join(str(filter_item) for filter_item in filter_set)
+            self._str = f'{{"filterClause":"{self._filter_clause}", "filters":[{filters_string}]}}'
+        return self._str
 
     def __iter__(self):
-        filter_list = [dict(item) for item in self._filter_set]
-        output_dict = {"filterClause": self._filter_clause, "filters": filter_list}
-        for key in output_dict:
-            yield key, output_dict[key]
+        yield "filterClause", self._filter_clause
+        yield "filters", [dict(item) for item in self._filter_set]
 
     def __eq__(self, other):
         if isinstance(other, FilterGroup):
@@ -1,36 +1,215 @@
+import base64
+import json
+import time
 from threading import Lock
+from threading import Thread
 
 from requests.auth import AuthBase
 
+import py42.settings as settings
+import py42.settings.debug as debug
+from py42.exceptions import Py42Error
+
+# Credentials are treated as expired this many seconds early, to allow for clock skew and
+# for the time a request takes to reach the server.
+_EXPIRY_SKEW = 5
+
+# How long to wait before trying another background refresh after one fails.
+_BACKGROUND_RETRY_DELAY = 10
+
 
 class C42RenewableAuth(AuthBase):
-    def __init__(self):
+    """Retrieves credentials on first use and renews them when they are cleared (after a
+    401) or, when their expiration is known, shortly before they expire.
+
+    Within ``py42.settings.token_refresh_margin`` seconds of the expiration, requests keep
+    using the current credentials while a single background thread retrieves new ones. Only
+    once the credentials have actually expired do requests wait for the renewal, and then
+    only one of them retrieves the credentials while the others wait for it.
+
+    With a ``token_store`` (see :mod:`py42.tokenstore`), credentials are shared with the
+    other processes that use the store and the same ``token_key``: a renewal first checks
+    the store for credentials that another process has already retrieved.
+    """
+
+    def __init__(self, token_store=None, token_key=None):
+        if token_store is not None and not token_key:
+            raise Py42Error("A token_key is required to use a token_store.")
+        self._token_store = token_store
+        self._token_key = token_key
+        self._rejected_credentials = None
         self._auth_lock = Lock()
+        self._background_lock = Lock()
         self._credentials = None
+        self._expires_at = None
+        self._background_retry_at = 0
+        self._metrics = {
+            "refreshes": 0,
+            "background_refreshes": 0,
+            "refresh_failures": 0,
+            "shared_tokens": 0,
+            "unauthorized_renewals": 0,
+            "last_refresh_seconds": None,
+            "total_refresh_seconds": 0.0,
+        }
 
     def __call__(self, r):
         r.headers["Authorization"] = self.get_credentials()
         return r
 
-    def clear_credentials(self):
+    @property
+    def expires_at(self):
+        """The POSIX time at which the current credentials expire, or None if unknown."""
+        return self._expires_at
+
+    @property
+    def metrics(self):
+        """A snapshot of counters describing credential renewals: the number of
+        ``refreshes`` (and how many of them were ``background_refreshes``), the number of
+        ``refresh_failures``, the number of ``unauthorized_renewals`` caused by a 401, the
+        number of ``shared_tokens`` taken from the token store instead of being retrieved,
+        and the ``last_refresh_seconds`` and ``total_refresh_seconds`` spent retrieving
+        credentials."""
+        metrics = dict(self._metrics)
+        metrics["expires_at"] = self._expires_at
+        return metrics
+
+    def clear_credentials(self, credentials=None):
+        """Clears the credentials so that the next request retrieves new ones.
+
+        Args:
+            credentials (str, optional): The credentials that were rejected. When given,
+                they are only cleared if they are still the current credentials, so that
+                many requests rejected with the same expired credentials cause a single
+                renewal. Defaults to None, which always clears them.
+        """
         # Do not clear credentials while they are being retrieved
         with self._auth_lock:
+            if credentials is not None and credentials != self._credentials:
+                return
+            if self._credentials:
+                self._metrics["unauthorized_renewals"] += 1
+                self._rejected_credentials = self._credentials
             self._credentials = None
+            self._expires_at = None
 
     def get_credentials(self):
-        if not self._credentials:
-            with self._auth_lock:
-                if not self._credentials:
-                    self._credentials = self._credentials or self._get_credentials()
-        return self._credentials
+        credentials = self._credentials
+        if credentials and not self._expires_within(settings.token_refresh_margin):
+            return credentials
+        if credentials and not self._expires_within(_EXPIRY_SKEW):
+            self._start_background_refresh()
+            return credentials
+
+        with self._auth_lock:
+            if self._must_wait_for_credentials():
+                self._refresh()
+            return self._credentials
 
     def _get_credentials(self):
         raise NotImplementedError()
 
+    def _must_wait_for_credentials(self):
+        return not self._credentials or self._expires_within(_EXPIRY_SKEW)
+
+    def _get_expiration(self, credentials):
+        return get_jwt_expiration(credentials)
+
+    def _expires_within(self, seconds):
+        expires_at = self._expires_at
+        return expires_at is not None and time.time() >= expires_at - seconds
+
+    def _refresh(self, background=False):
+        # Must be called while holding the auth lock.
+        retrieved = []
+
+        def retrieve():
+            retrieved.append(self._retrieve_token(background))
+            return retrieved[0]
+
+        try:
+            if self._token_store is None:
+                token = retrieve()
+            else:
+                token = self._token_store.get_or_refresh(
+                    self._token_key, retrieve, self._is_shareable
+                )
+        except Exception:
+            self._metrics["refresh_failures"] += 1
+            raise
+
+        if not retrieved:
+            self._metrics["shared_tokens"] += 1
+            debug.logger.info("Using credentials from the token store.")
+        self._credentials = token["credentials"]
+        self._expires_at = token["expires_at"]
+
+    def _retrieve_token(self, background):
+        start = time.perf_counter()
+        credentials = self._get_credentials()
+        elapsed = time.perf_counter() - start
+
+        self._metrics["refreshes"] += 1
+        if background:
+            self._metrics["background_refreshes"] += 1
+        self._metrics["last_refresh_seconds"] = elapsed
+        self._metrics["total_refresh_seconds"] += elapsed
+        debug.logger.info("Retrieved new credentials in %.3f seconds.", elapsed)
+        return {
+            "credentials": credentials,
+            "expires_at": self._get_expiration(credentials),
+        }
+
+    def _is_shareable(self, token):
+        """Whether a token from the token store can be used instead of retrieving one."""
+        credentials = token.get("credentials")
+        if not credentials or credentials in (
+            self._credentials,
+            self._rejected_credentials,
+        ):
+            return False
+        expires_at = token.get("expires_at")
+        return expires_at is None or time.time() < (
+            expires_at - settings.token_refresh_margin
+        )
+
+    def _start_background_refresh(self):
+        if time.time() < self._background_retry_at:
+            return
+        # Only one background refresh at a time; the thread releases the lock.
+        if not self._background_lock.acquire(blocking=False):
+            return
+        try:
+            Thread(
+                target=self._refresh_in_background,
+                name="py42-credential-refresh",
+                daemon=True,
+            ).start()
+        except BaseException:
+            self._background_lock.release()
+            raise
+
+    def _refresh_in_background(self):
+        try:
+            with self._auth_lock:
+                # The credentials may have been renewed while this thread was starting.
+                if self._credentials and not self._expires_within(
+                    settings.token_refresh_margin
+                ):
+                    return
+                self._refresh(background=True)
+        except Exception as err:
+            self._background_retry_at = time.time() + _BACKGROUND_RETRY_DELAY
+            debug.logger.info(
+                "Failed to refresh credentials in the background: %s", err
+            )
+        finally:
+            self._background_lock.release()
+
 
 class BearerAuth(C42RenewableAuth):
-    def __init__(self, auth_connection, totp=None):
-        super().__init__()
+    def __init__(self, auth_connection, totp=None, token_store=None, token_key=None):
+        super().__init__(token_store=token_store, token_key=token_key)
         self._auth_connection = auth_connection
         self._totp = totp if callable(totp) else lambda: totp
 
@@ -44,21 +223,50 @@ class BearerAuth(C42RenewableAuth):
 
 
 class ApiClientAuth(C42RenewableAuth):
-    def __init__(self, auth_connnection):
-        super().__init__()
+    def __init__(self, auth_connnection, token_store=None, token_key=None):
+        super().__init__(token_store=token_store, token_key=token_key)
         self._auth_connection = auth_connnection
+        self._token_lifetime = None
+        self._requested_at = None
 
     def _get_credentials(self):
         uri = "/api/v3/oauth/token"
         params = {"grant_type": "client_credentials"}
+        self._requested_at = time.time()
         response = self._auth_connection.post(uri, params=params)
+        self._token_lifetime = response.data.get("expires_in")
         return f"Bearer {response['access_token']}"
 
+    def _get_expiration(self, credentials):
+        expires_at = super()._get_expiration(credentials)
+        if expires_at is None and isinstance(self._token_lifetime, (int, float)):
+            expires_at = self._requested_at + self._token_lifetime
+        return expires_at
+
 
 class CustomJWTAuth(C42RenewableAuth):
-    def __init__(self, jwt_provider):
-        super().__init__()
+    def __init__(self, jwt_provider, token_store=None, token_key=None):
+        super().__init__(token_store=token_store, token_key=token_key)
         self._jwt_provider = jwt_provider
 
     def _get_credentials(self):
         return f"Bearer {self._jwt_provider()}"
+
+
+def get_jwt_expiration(credentials):
+    """Returns the ``exp`` claim of a JWT (optionally prefixed with ``"Bearer "``) as a
+    POSIX time, or None if it is not a JWT with an expiration. The token's signature is not
+    verified."""
+    token = credentials.split(" ")[-1] if isinstance(credentials, str) else ""
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+    payload = parts[1] + "=" * (-len(parts[1]) % 4)
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+    except ValueError:
+        return None
+    expiration = claims.get("exp") if isinstance(claims, dict) else None
+    if isinstance(expiration, bool) or not isinstance(expiration, (int, float)):
+        return None
+    return float(expiration)
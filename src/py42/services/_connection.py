@@ -1,32 +1,89 @@
 import json as json_lib
+import logging
+import ssl
+import time
+from collections import OrderedDict
 from threading import Lock
 from urllib.parse import urljoin
 from urllib.parse import urlparse
 
-from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError
 from requests.exceptions import HTTPError
+from requests.exceptions import Timeout
+from requests.models import PreparedRequest
 from requests.models import Request
+from requests.models import Response
 from requests.sessions import Session
+from requests.structures import CaseInsensitiveDict
 
 import py42.settings as settings
+from py42.connectionpool import PoolingHTTPAdapter
 from py42.exceptions import Py42DeviceNotConnectedError
 from py42.exceptions import Py42Error
 from py42.exceptions import Py42FeatureUnavailableError
 from py42.exceptions import raise_py42_error
+from py42.jsoncodec import EncodedJson
+from py42.jsoncodec import get_codec
+from py42.jsoncodec import STDLIB as STDLIB_JSON_CODEC
 from py42.response import Py42Response
+from py42.retry import RetryPolicy
 from py42.services._auth import C42RenewableAuth
 from py42.settings import debug
 from py42.util import format_dict
 
-SESSION_ADAPTER = HTTPAdapter(pool_connections=200, pool_maxsize=4, pool_block=True)
 
-ROOT_SESSION = Session()
-ROOT_SESSION.mount("https://", SESSION_ADAPTER)
-ROOT_SESSION.mount("http://", SESSION_ADAPTER)
-ROOT_SESSION.headers = {
-    "Accept-Encoding": "gzip, deflate",
-    "Connection": "keep-alive",
-}
+class Py42Session(Session):
+    """A :class:`requests.Session` that reads ``py42.settings.proxies`` and
+    ``py42.settings.verify_ssl_certs`` for each request, instead of py42 setting them on
+    the session, so that threads sharing a session never change its state."""
+
+    def mount(self, prefix, adapter):
+        # Replace the adapters with an updated copy rather than changing them in place, so
+        # threads sending requests while an adapter is mounted are unaffected.
+        adapters = OrderedDict(self.adapters)
+        adapters[prefix] = adapter
+        # requests uses the first adapter whose prefix matches, so keep longer ones first.
+        for key in [key for key in adapters if len(key) < len(prefix)]:
+            adapters.move_to_end(key)
+        self.adapters = adapters
+
+    def merge_environment_settings(self, url, proxies, stream, verify, cert):
+        if not proxies and settings.proxies:
+            proxies = settings.proxies
+        if verify is None:
+            verify = settings.verify_ssl_certs
+        return super().merge_environment_settings(url, proxies, stream, verify, cert)
+
+
+def create_session(adapter=None):
+    """Returns a new session with the headers py42 sends and ``adapter`` mounted for both
+    schemes. Defaults to a new :class:`py42.connectionpool.PoolingHTTPAdapter`."""
+    adapter = adapter or PoolingHTTPAdapter()
+    session = Py42Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers = {
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive",
+    }
+    return session
+
+
+def get_pool_stats(session):
+    """Returns the connection pool statistics of the
+    :class:`py42.connectionpool.PoolingHTTPAdapter` objects mounted on ``session``, keyed by
+    host."""
+    stats = {}
+    adapters = {id(adapter): adapter for adapter in session.adapters.values()}
+    for adapter in adapters.values():
+        if isinstance(adapter, PoolingHTTPAdapter):
+            stats.update(adapter.get_stats())
+    return stats
+
+
+SESSION_ADAPTER = PoolingHTTPAdapter()
+ROOT_SESSION = create_session(SESSION_ADAPTER)
+DEFAULT_RETRY_POLICY = RetryPolicy()
 
 
 class HostResolver:
@@ -73,6 +130,25 @@ class MicroserviceKeyHostResolver(HostResolver):
         return self._kv_service.get_stored_value(self._key).text
 
 
+class CachedHostResolver(HostResolver):
+    """Looks up the host address in a :class:`py42.hostcache.FileHostCache` before asking
+    the wrapped resolver, and caches what the wrapped resolver returns."""
+
+    def __init__(self, host_resolver, host_cache, key):
+        self._host_resolver = host_resolver
+        self._host_cache = host_cache
+        self._key = key
+
+    def get_host_address(self):
+        host = self._host_cache.get(self._key)
+        if host:
+            return host
+        host = self._host_resolver.get_host_address()
+        if host:
+            self._host_cache.set(self._key, host)
+        return host
+
+
 class ConnectedServerHostResolver(HostResolver):
     """A connection used in Push Restores to verify the accepting device is connected
     to the Authority server."""
@@ -92,41 +168,173 @@ class ConnectedServerHostResolver(HostResolver):
 
 
 class Connection:
-    def __init__(self, host_resolver, auth=None, session=None):
+    def __init__(
+        self,
+        host_resolver,
+        auth=None,
+        session=None,
+        json_codec=None,
+        retry_policy=None,
+        rate_limiter=None,
+        circuit_breaker=None,
+        request_hooks=None,
+    ):
         self._host_resolver = host_resolver
         self._session = session or ROOT_SESSION
         self._headers = self._session.headers.copy()
         self._auth = auth
+        self._json_codec = get_codec(json_codec)
+        self._retry_policy = retry_policy or DEFAULT_RETRY_POLICY
+        self._rate_limiter = rate_limiter
+        self._circuit_breaker = circuit_breaker
+        self._request_hooks = tuple(request_hooks or ())
         self._resolve_lock = Lock()
         self._host_address = None
 
     @classmethod
-    def from_host_address(cls, host_address, auth=None, session=None):
+    def from_host_address(
+        cls,
+        host_address,
+        auth=None,
+        session=None,
+        json_codec=None,
+        retry_policy=None,
+        rate_limiter=None,
+        circuit_breaker=None,
+        request_hooks=None,
+    ):
         host_resolver = KnownUrlHostResolver(host_address)
-        return cls(host_resolver, auth=auth, session=session)
+        return cls(
+            host_resolver,
+            auth=auth,
+            session=session,
+            json_codec=json_codec,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            circuit_breaker=circuit_breaker,
+            request_hooks=request_hooks,
+        )
 
     @classmethod
-    def from_microservice_key(cls, kv_service, key, auth=None, session=None):
+    def from_microservice_key(
+        cls,
+        kv_service,
+        key,
+        auth=None,
+        session=None,
+        json_codec=None,
+        host_cache=None,
+        cache_key=None,
+        retry_policy=None,
+        rate_limiter=None,
+        circuit_breaker=None,
+        request_hooks=None,
+    ):
         host_resolver = MicroserviceKeyHostResolver(kv_service, key)
-        return cls(host_resolver, auth=auth, session=session)
+        if host_cache is not None:
+            host_resolver = CachedHostResolver(host_resolver, host_cache, cache_key)
+        return cls(
+            host_resolver,
+            auth=auth,
+            session=session,
+            json_codec=json_codec,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            circuit_breaker=circuit_breaker,
+            request_hooks=request_hooks,
+        )
 
     @classmethod
-    def from_microservice_prefix(cls, connection, prefix, auth=None, session=None):
+    def from_microservice_prefix(
+        cls,
+        connection,
+        prefix,
+        auth=None,
+        session=None,
+        json_codec=None,
+        host_cache=None,
+        cache_key=None,
+        retry_policy=None,
+        rate_limiter=None,
+        circuit_breaker=None,
+        request_hooks=None,
+    ):
         host_resolver = MicroservicePrefixHostResolver(connection, prefix)
-        return cls(host_resolver, auth=auth, session=session)
+        if host_cache is not None:
+            host_resolver = CachedHostResolver(host_resolver, host_cache, cache_key)
+        return cls(
+            host_resolver,
+            auth=auth,
+            session=session,
+            json_codec=json_codec,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            circuit_breaker=circuit_breaker,
+            request_hooks=request_hooks,
+        )
 
     @classmethod
     def from_device_connection(cls, connection, device_guid):
         host_resolver = ConnectedServerHostResolver(connection, device_guid)
-        return cls(host_resolver, auth=connection._auth)
+        return cls(
+            host_resolver,
+            auth=connection._auth,
+            session=connection.session,
+            json_codec=connection.json_codec,
+            retry_policy=connection.retry_policy,
+            rate_limiter=connection.rate_limiter,
+            circuit_breaker=connection.circuit_breaker,
+            request_hooks=connection.request_hooks,
+        )
 
     @property
     def host_address(self):
         return self._get_host_address()
 
+    @property
+    def json_codec(self):
+        """The :class:`py42.jsoncodec.JsonCodec` used for request and response bodies."""
+        return self._json_codec
+
+    @property
+    def session(self):
+        """The :class:`requests.Session` that sends the connection's requests."""
+        return self._session
+
+    @property
+    def retry_policy(self):
+        """The :class:`py42.retry.RetryPolicy` that failed requests are retried with."""
+        return self._retry_policy
+
+    @property
+    def rate_limiter(self):
+        """The :class:`py42.retry.RateLimiter` that limits the connection's requests, or
+        None."""
+        return self._rate_limiter
+
+    @property
+    def circuit_breaker(self):
+        """The :class:`py42.circuitbreaker.CircuitBreaker` that pauses requests to failing
+        hosts, or None."""
+        return self._circuit_breaker
+
+    @property
+    def request_hooks(self):
+        """The :class:`py42.instrumentation.RequestHook` objects called for each request."""
+        return self._request_hooks
+
     def clone(self, host_address):
         host_resolver = KnownUrlHostResolver(host_address)
-        return Connection(host_resolver, auth=self._auth)
+        return Connection(
+            host_resolver,
+            auth=self._auth,
+            session=self._session,
+            json_codec=self._json_codec,
+            retry_policy=self._retry_policy,
+            rate_limiter=self._rate_limiter,
+            circuit_breaker=self._circuit_breaker,
+            request_hooks=self._request_hooks,
+        )
 
     def get(self, url, **kwargs):
         return self.request("GET", url, **kwargs)
@@ -165,9 +373,94 @@ class Connection:
         timeout=180,
         cert=None,
         proxies=None,
+    ):
+        kwargs = {
+            "params": params,
+            "data": data,
+            "json": json,
+            "headers": headers,
+            "cookies": cookies,
+            "files": files,
+            "auth": auth,
+            "hooks": hooks,
+            "stream": stream,
+            "timeout": timeout,
+            "cert": cert,
+            "proxies": proxies,
+        }
+        if self._request_hooks:
+            return self._send_measured(method, url, kwargs)
+        return self._send(method, url, **kwargs)
+
+    def _send_measured(self, method, url, kwargs):
+        # Kept apart from `_send` so that requests cost nothing extra without hooks.
+        from py42.connectionpool import take_pool_wait
+        from py42.instrumentation import get_uri_template
+        from py42.instrumentation import RequestMetrics
+
+        uri_template = get_uri_template(url)
+        contexts = [
+            _call_hook(hook.request_started, method, uri_template)
+            for hook in self._request_hooks
+        ]
+        take_pool_wait()
+        trace = _RequestTrace()
+        start = time.perf_counter()
+        error = None
+        try:
+            return self._send(method, url, trace=trace, **kwargs)
+        except Exception as err:
+            error = err
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            response = trace.response
+            try:
+                host = urlparse(urljoin(self.host_address, url)).hostname
+            except Exception:
+                # Resolving the host failed, which is then why the request failed.
+                host = None
+            metrics = RequestMetrics(
+                method=method,
+                uri_template=uri_template,
+                host=host,
+                status_code=response.status_code if response is not None else None,
+                bytes_sent=trace.bytes_sent,
+                bytes_received=_get_received_size(response, kwargs["stream"]),
+                time_to_first_byte=response.elapsed.total_seconds()
+                if response is not None
+                else None,
+                duration=duration,
+                retries=trace.retries,
+                pool_wait=take_pool_wait(),
+                error=error,
+            )
+            for index, hook in enumerate(self._request_hooks):
+                _call_hook(hook.request_finished, contexts[index], metrics)
+
+    def _send(
+        self,
+        method,
+        url,
+        params=None,
+        data=None,
+        json=None,
+        headers=None,
+        cookies=None,
+        files=None,
+        auth=None,
+        hooks=None,
+        stream=False,
+        timeout=180,
+        cert=None,
+        proxies=None,
+        trace=None,
     ):
         response = None
-        for _ in range(2):
+        retries = 0
+        renewed = False
+        host = self._get_request_host(url)
+        while True:
             request = self._prepare_request(
                 method,
                 url,
@@ -180,36 +473,83 @@ class Connection:
                 auth=auth,
                 hooks=hooks,
             )
-            response = self._session.send(
-                request,
-                stream=stream,
-                timeout=timeout,
-                verify=settings.verify_ssl_certs,
-                cert=cert,
-                proxies=proxies or settings.proxies,
-            )
+            if trace is not None:
+                trace.retries = retries
+                trace.bytes_sent += _get_body_size(request.body)
+            if self._circuit_breaker is not None:
+                self._circuit_breaker.before_request(host)
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire(host)
+            try:
+                response = self._session.send(
+                    request,
+                    stream=stream,
+                    timeout=timeout,
+                    verify=settings.verify_ssl_certs,
+                    cert=cert,
+                    proxies=proxies or settings.proxies,
+                )
+            except (RequestsConnectionError, Timeout) as err:
+                if self._circuit_breaker is not None:
+                    self._circuit_breaker.on_failure(host)
+                # A read timeout may mean the request was processed, so it isn't retried.
+                delay = None
+                if isinstance(err, RequestsConnectionError):
+                    delay = self._retry_policy.get_error_delay(method, retries)
+                if delay is None:
+                    raise
+                _print_retry(method, url, delay, err)
+                time.sleep(delay)
+                retries += 1
+                continue
+
+            if response is None:
+                debug.logger.debug("Error! Could not retrieve response.")
+                break
+            if trace is not None:
+                trace.response = response
 
-            if response is not None:
-                debug.logger.info(f"Response status: {response.status_code}")
-                if not stream:
-                    # setting this manually speeds up read times
-                    response.encoding = "utf-8"
-                    debug.logger.debug(f"Response data: {response.text}")
+            if self._circuit_breaker is not None:
+                if response.status_code >= 500:
+                    self._circuit_breaker.on_failure(host)
                 else:
-                    debug.logger.debug("Response data: <streamed>")
-
-                if 200 <= response.status_code <= 399:
-                    return Py42Response(response)
+                    self._circuit_breaker.on_success(host)
+
+            if not stream:
+                # setting this manually speeds up read times
+                response.encoding = "utf-8"
+            _print_response(response, stream=stream)
+
+            if 200 <= response.status_code <= 399:
+                if self._rate_limiter is not None:
+                    self._rate_limiter.on_success(host)
+                return Py42Response(response, json_codec=self._json_codec)
+
+            if response.status_code == 401 and not renewed:
+                # Renew the credentials once, without counting it as a retry.
+                renewed = True
+                if isinstance(self._auth, C42RenewableAuth):
+                    self._auth.clear_credentials(request.headers.get("Authorization"))
+                continue
+
+            if response.status_code == 429 and self._rate_limiter is not None:
+                self._rate_limiter.on_throttle(host)
+            delay = self._retry_policy.get_response_delay(method, response, retries)
+            if delay is None:
+                break
+            _print_retry(method, url, delay, f"status {response.status_code}")
+            response.close()
+            time.sleep(delay)
+            retries += 1
 
-                if response.status_code == 401:
-                    if isinstance(self._auth, C42RenewableAuth):
-                        self._auth.clear_credentials()
-            else:
-                debug.logger.debug("Error! Could not retrieve response.")
-
-        # if nothing has been returned after two attempts, something went wrong
         _handle_error(method, url, response)
 
+    def _get_request_host(self, url):
+        # The host that rate limits and circuits are kept for. Only needed when they are.
+        if self._rate_limiter is None and self._circuit_breaker is None:
+            return None
+        return urlparse(urljoin(self.host_address, url)).hostname
+
     def _prepare_request(
         self,
         method,
@@ -224,8 +564,16 @@ class Connection:
         hooks=None,
     ):
         url = urljoin(self.host_address, url)
-        self._session.proxies = settings.proxies
-        self._session.verify = settings.verify_ssl_certs
+
+        _print_request(method, url, params=params, data=data, json=json)
+
+        if isinstance(json, EncodedJson):
+            data = json.encoded
+            json = None
+        # requests already encodes `json` with the stdlib, so only step in for other codecs.
+        elif json is not None and self._json_codec is not STDLIB_JSON_CODEC:
+            data = self._json_codec.dumps_bytes(json)
+            json = None
 
         headers = headers or {}
         headers.update(self._headers)
@@ -235,8 +583,6 @@ class Connection:
             headers.update({"Accept": "application/json"})
         headers = _create_user_headers(headers)
 
-        _print_request(method, url, params=params, data=data, json=json)
-
         if isinstance(data, str):
             data = data.encode("utf-8")
 
@@ -271,6 +617,273 @@ class Connection:
         self._host_address = host
 
 
+class AsyncConnection:
+    """An asyncio counterpart to :class:`Connection`. It uses the same host resolvers and
+    auth classes, but sends requests with an ``aiohttp`` client session so a single event
+    loop can keep many requests in flight. Requires the ``aiohttp`` package
+    (``pip install py42[async]``).
+
+    Blocking steps that only happen once (host resolution and token retrieval) run on the
+    event loop's default executor.
+    """
+
+    def __init__(
+        self, host_resolver, auth=None, session=None, limit=100, json_codec=None
+    ):
+        self._host_resolver = host_resolver
+        self._session = session
+        self._owns_session = session is None
+        self._limit = limit
+        self._headers = dict(ROOT_SESSION.headers)
+        self._auth = auth
+        self._json_codec = get_codec(json_codec)
+        self._resolve_lock = None
+        self._host_address = None
+
+    @classmethod
+    def from_host_address(cls, host_address, auth=None, **kwargs):
+        host_resolver = KnownUrlHostResolver(host_address)
+        return cls(host_resolver, auth=auth, **kwargs)
+
+    @classmethod
+    def from_microservice_key(cls, kv_service, key, auth=None, **kwargs):
+        host_resolver = MicroserviceKeyHostResolver(kv_service, key)
+        return cls(host_resolver, auth=auth, **kwargs)
+
+    @classmethod
+    def from_microservice_prefix(cls, connection, prefix, auth=None, **kwargs):
+        host_resolver = MicroservicePrefixHostResolver(connection, prefix)
+        return cls(host_resolver, auth=auth, **kwargs)
+
+    @classmethod
+    def from_connection(cls, connection, **kwargs):
+        """Creates an :class:`AsyncConnection` that talks to the same host as the given
+        synchronous :class:`Connection` and shares its auth, so credentials are only
+        retrieved once for both."""
+        host_resolver = _ConnectionHostResolver(connection)
+        kwargs.setdefault("json_codec", connection.json_codec)
+        return cls(host_resolver, auth=connection._auth, **kwargs)
+
+    @property
+    def json_codec(self):
+        """The :class:`py42.jsoncodec.JsonCodec` used for request and response bodies."""
+        return self._json_codec
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def close(self):
+        if self._session is not None and self._owns_session:
+            await self._session.close()
+            self._session = None
+
+    async def get_host_address(self):
+        if not self._host_address:
+            if self._resolve_lock is None:
+                self._resolve_lock = _import_asyncio().Lock()
+            async with self._resolve_lock:
+                if not self._host_address:
+                    host = await _run_blocking(self._host_resolver.get_host_address)
+                    self._init_host_info(host)
+        return self._host_address
+
+    async def get(self, url, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def options(self, url, **kwargs):
+        return await self.request("OPTIONS", url, **kwargs)
+
+    async def head(self, url, **kwargs):
+        return await self.request("HEAD", url, **kwargs)
+
+    async def post(self, url, data=None, json=None, **kwargs):
+        return await self.request("POST", url, data=data, json=json, **kwargs)
+
+    async def put(self, url, data=None, json=None, **kwargs):
+        return await self.request("PUT", url, data=data, json=json, **kwargs)
+
+    async def patch(self, url, data=None, json=None, **kwargs):
+        return await self.request("PATCH", url, data=data, json=json, **kwargs)
+
+    async def delete(self, url, **kwargs):
+        return await self.request("DELETE", url, **kwargs)
+
+    async def request(
+        self,
+        method,
+        url,
+        params=None,
+        data=None,
+        json=None,
+        headers=None,
+        auth=None,
+        timeout=180,
+        proxies=None,
+    ):
+        url = urljoin(await self.get_host_address(), url)
+        session = self._get_session()
+        _print_request(method, url, params=params, data=data, json=json)
+        if isinstance(json, EncodedJson):
+            data = json.encoded
+        elif json is not None:
+            data = self._json_codec.dumps_bytes(json)
+        elif isinstance(data, str):
+            data = data.encode("utf-8")
+        response = None
+        for _ in range(2):
+            request_headers = await self._prepare_headers(
+                headers, data, auth or self._auth
+            )
+            response = await self._send(
+                session,
+                method,
+                url,
+                params=params,
+                data=data,
+                headers=request_headers,
+                timeout=timeout,
+                proxies=proxies or settings.proxies,
+            )
+
+            _print_response(response)
+
+            if 200 <= response.status_code <= 399:
+                return Py42Response(response, json_codec=self._json_codec)
+
+            if response.status_code == 401:
+                if isinstance(self._auth, C42RenewableAuth):
+                    self._auth.clear_credentials(request_headers.get("Authorization"))
+
+        # if nothing has been returned after two attempts, something went wrong
+        _handle_error(method, url, response)
+
+    async def _prepare_headers(self, headers, data, auth):
+        headers = dict(headers or {})
+        headers.update(self._headers)
+        if data and "Content-Type" not in headers:
+            headers.update({"Content-Type": "application/json"})
+        if "Accept" not in headers:
+            headers.update({"Accept": "application/json"})
+        headers = _create_user_headers(headers)
+        if auth is None:
+            return headers
+
+        # Let the requests auth classes write their headers onto a stand-in request.
+        # Retrieving credentials blocks, so do it off the event loop when it must wait.
+        if isinstance(auth, C42RenewableAuth) and auth._must_wait_for_credentials():
+            await _run_blocking(auth.get_credentials)
+        carrier = PreparedRequest()
+        carrier.headers = CaseInsensitiveDict(headers)
+        auth(carrier)
+        return dict(carrier.headers)
+
+    async def _send(
+        self, session, method, url, params, data, headers, timeout, proxies
+    ):
+        aiohttp = _import_aiohttp()
+        async with session.request(
+            method,
+            url,
+            params=_to_query_params(params),
+            data=data,
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+            proxy=_get_proxy_for_url(url, proxies),
+            ssl=_get_ssl_option(settings.verify_ssl_certs),
+        ) as aio_response:
+            content = await aio_response.read()
+            response = Response()
+            response.status_code = aio_response.status
+            response.reason = aio_response.reason
+            response.headers = CaseInsensitiveDict(aio_response.headers)
+            response.url = str(aio_response.url)
+            response._content = content
+            response._content_consumed = True
+            # setting this manually speeds up read times
+            response.encoding = "utf-8"
+            return response
+
+    def _get_session(self):
+        if self._session is None:
+            aiohttp = _import_aiohttp()
+            connector = aiohttp.TCPConnector(limit=self._limit)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    def _init_host_info(self, host):
+        if not host.startswith("http://") and not host.startswith("https://"):
+            host = f"https://{host}"
+        parsed_host = urlparse(host)
+        self._headers["Host"] = parsed_host.netloc
+        self._host_address = host
+
+
+class _ConnectionHostResolver(HostResolver):
+    def __init__(self, connection):
+        self._connection = connection
+
+    def get_host_address(self):
+        return self._connection.host_address
+
+
+def _import_aiohttp():
+    try:
+        import aiohttp
+    except ImportError:
+        raise Py42Error(
+            "AsyncConnection requires the 'aiohttp' package. "
+            "Install it with `pip install py42[async]`."
+        )
+    return aiohttp
+
+
+def _import_asyncio():
+    # asyncio is slow to import and only needed by AsyncConnection, whose coroutines can only
+    # run once something else has imported it.
+    import asyncio
+
+    return asyncio
+
+
+async def _run_blocking(func):
+    loop = _import_asyncio().get_running_loop()
+    return await loop.run_in_executor(None, func)
+
+
+def _to_query_params(params):
+    # requests drops None values and stringifies everything else; aiohttp does neither.
+    if not params:
+        return None
+    query = []
+    for key, value in params.items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for item in values:
+            if item is None:
+                continue
+            if isinstance(item, bool) or not isinstance(item, (int, float)):
+                item = str(item)
+            query.append((key, item))
+    return query
+
+
+def _get_proxy_for_url(url, proxies):
+    if not proxies:
+        return None
+    scheme = urlparse(url).scheme
+    return proxies.get(scheme) or proxies.get("all")
+
+
+def _get_ssl_option(verify):
+    if verify is True:
+        return None
+    if not verify:
+        return False
+    return ssl.create_default_context(cafile=verify)
+
+
 def _create_user_headers(headers):
     user_headers = {"User-Agent": settings.get_user_agent_string()}
     if headers:
@@ -290,10 +903,67 @@ def _handle_error(method, url, response):
 
 
 def _print_request(method, url, params=None, data=None, json=None):
-    debug.logger.info(f"{method.ljust(8)}{url}")
+    # Check the level up front so nothing is formatted when logging is off.
+    if not debug.logger.isEnabledFor(logging.INFO):
+        return
+    debug.logger.info("%s%s", method.ljust(8), url)
+    if not debug.logger.isEnabledFor(logging.DEBUG):
+        return
     if params:
         debug.logger.debug(format_dict(params, "  params"))
     if json:
         debug.logger.debug(format_dict(json, "  json"))
     if data:
-        debug.logger.debug(data, "  data")
+        debug.logger.debug("  data %s", data)
+
+
+class _RequestTrace:
+    # What `Connection._send` observed, for measuring a request.
+    __slots__ = ("response", "retries", "bytes_sent")
+
+    def __init__(self):
+        self.response = None
+        self.retries = 0
+        self.bytes_sent = 0
+
+
+def _get_body_size(body):
+    return len(body) if isinstance(body, (bytes, str)) else 0
+
+
+def _get_received_size(response, stream):
+    if response is None:
+        return None
+    content_length = response.headers.get("Content-Length")
+    if content_length and content_length.isdigit():
+        return int(content_length)
+    # Only a streamed body is still unread.
+    return None if stream else len(response.content)
+
+
+def _call_hook(method, *args):
+    # A failing hook is logged rather than failing the request it measures.
+    try:
+        return method(*args)
+    except Exception:
+        debug.logger.exception("Request hook %r failed.", method)
+        return None
+
+
+def _print_retry(method, url, delay, reason):
+    debug.logger.info(
+        "Retrying %s %s in %.2f seconds (%s).", method, url, delay, reason
+    )
+
+
+def _print_response(response, stream=False):
+    # Decoding the body is the expensive part, so only touch `response.text` at DEBUG.
+    if not debug.logger.isEnabledFor(logging.INFO):
+        return
+    debug.logger.info("Response status: %s", response.status_code)
+    if not debug.logger.isEnabledFor(logging.DEBUG):
+        return
+    if stream:
+        debug.logger.debug("Response data: <streamed>")
+    else:
+        debug.logger.debug("Response data: %s", response.text)
@@ -1,9 +1,12 @@
 import json
 
 from py42 import settings
+from py42.sdk.queries import BaseQuery
 from py42.sdk.queries.query_filter import create_eq_filter_group
 from py42.services import BaseService
+from py42.services._connection import _import_asyncio
 from py42.services.util import get_all_pages
+from py42.services.util import get_all_pages_async
 
 # Incydr functionality is deprecated as of 2025-03.
 
@@ -28,10 +31,18 @@ class AlertService(BaseService):
         return self._connection.post(uri, json=query)
 
     def get_search_page(self, query, page_num, page_size):
-        query.page_number = page_num - 1
-        query.page_size = page_size
         uri = f"{self._uri_prefix}/v1/query-alerts"
+        if isinstance(query, BaseQuery):
+            # Only the paging fields change between pages, so reuse the serialized query,
+            # with the tenant ID filled in if the query does not set one.
+            tenant_id = self._user_context.get_current_tenant_id()
+            compiled_query = query.compile(tenantId=tenant_id)
+            query = compiled_query.page(page_number=page_num - 1, page_size=page_size)
+            return self._connection.post(uri, json=query)
+        # Page through a copy so concurrent page requests do not share the query state.
         query = self._add_tenant_id_if_missing(query)
+        query["pgNum"] = page_num - 1
+        query["pgSize"] = page_size
         return self._connection.post(uri, json=query)
 
     def search_all_pages(self, query):
@@ -43,11 +54,7 @@ class AlertService(BaseService):
         )
 
     def get_details(self, alert_ids):
-        if not isinstance(alert_ids, (list, tuple)):
-            alert_ids = [alert_ids]
-        tenant_id = self._user_context.get_current_tenant_id()
-        uri = f"{self._uri_prefix}/v1/query-details"
-        data = {"tenantId": tenant_id, "alertIds": alert_ids}
+        uri, data = self._get_details_request(alert_ids)
         results = self._connection.post(uri, json=data)
         return _convert_observation_json_strings_to_objects(results)
 
@@ -64,6 +71,14 @@ class AlertService(BaseService):
         }
         return self._connection.post(uri, json=data)
 
+    def _get_details_request(self, alert_ids):
+        if not isinstance(alert_ids, (list, tuple)):
+            alert_ids = [alert_ids]
+        tenant_id = self._user_context.get_current_tenant_id()
+        uri = f"{self._uri_prefix}/v1/query-details"
+        data = {"tenantId": tenant_id, "alertIds": alert_ids}
+        return uri, data
+
     def _add_tenant_id_if_missing(self, query):
         query_dict = dict(query)
         tenant_id = query_dict.get("tenantId", None)
@@ -143,6 +158,100 @@ class AlertService(BaseService):
         return response
 
 
+class AsyncAlertService(AlertService):
+    """An asyncio variant of :class:`AlertService` for use with an
+    :class:`~py42.services._connection.AsyncConnection`. Every method is a coroutine and
+    the ``*_all_*`` methods are async generators."""
+
+    async def search(self, query, page_num=1, page_size=None):
+        await self._load_tenant_id()
+        return await super().search(query, page_num=page_num, page_size=page_size)
+
+    async def get_search_page(self, query, page_num, page_size):
+        await self._load_tenant_id()
+        return await super().get_search_page(query, page_num, page_size)
+
+    def search_all_pages(self, query):
+        return get_all_pages_async(
+            self.get_search_page,
+            self._SEARCH_KEY,
+            query=query,
+            page_size=query.page_size,
+        )
+
+    async def get_details(self, alert_ids):
+        await self._load_tenant_id()
+        uri, data = self._get_details_request(alert_ids)
+        results = await self._connection.post(uri, json=data)
+        return _convert_observation_json_strings_to_objects(results)
+
+    async def update_state(self, state, alert_ids, note=None):
+        await self._load_tenant_id()
+        return await super().update_state(state, alert_ids, note=note)
+
+    async def get_rules_page(
+        self, page_num, groups=None, sort_key=None, sort_direction=None, page_size=None
+    ):
+        await self._load_tenant_id()
+        return await super().get_rules_page(
+            page_num,
+            groups=groups,
+            sort_key=sort_key,
+            sort_direction=sort_direction,
+            page_size=page_size,
+        )
+
+    def get_all_rules(self, sort_key=AlertService._CREATED_AT, sort_direction="DESC"):
+        return get_all_pages_async(
+            self.get_rules_page,
+            self._RULE_METADATA,
+            groups=None,
+            sort_key=sort_key,
+            sort_direction=sort_direction,
+        )
+
+    def get_all_rules_by_name(
+        self, rule_name, sort_key=AlertService._CREATED_AT, sort_direction="DESC"
+    ):
+        return get_all_pages_async(
+            self.get_rules_page,
+            self._RULE_METADATA,
+            groups=[json.loads(str(create_eq_filter_group("Name", rule_name)))],
+            sort_key=sort_key,
+            sort_direction=sort_direction,
+        )
+
+    async def get_rule_by_observer_id(
+        self, observer_id, sort_key=AlertService._CREATED_AT, sort_direction="DESC"
+    ):
+        results = get_all_pages_async(
+            self.get_rules_page,
+            self._RULE_METADATA,
+            groups=[
+                json.loads(str(create_eq_filter_group("ObserverRuleId", observer_id)))
+            ],
+            sort_key=sort_key,
+            sort_direction=sort_direction,
+        )
+        return await results.__anext__()
+
+    async def update_note(self, alert_id, note):
+        await self._load_tenant_id()
+        return await super().update_note(alert_id, note)
+
+    async def get_aggregate_data(self, alert_id):
+        uri = f"{self._uri_prefix}/v2/query-details-aggregate"
+        data = {"alertId": alert_id}
+        response = await self._connection.post(uri, json=data)
+        response.data["alert"]["ffsUrl"] = response.data["alert"].get("ffsUrlEndpoint")
+        return response
+
+    async def _load_tenant_id(self):
+        # The user context caches the tenant ID, so only the first call blocks.
+        loop = _import_asyncio().get_running_loop()
+        await loop.run_in_executor(None, self._user_context.get_current_tenant_id)
+
+
 def _convert_observation_json_strings_to_objects(results):
     for alert in results["alerts"]:
         if "observations" in alert:
@@ -1,6 +1,8 @@
 from py42 import settings
 from py42.services import BaseService
 from py42.services.util import get_all_pages
+from py42.services.util import get_all_pages_by_total
+from py42.services.util import iter_page_items
 
 
 class ArchiveService(BaseService):
@@ -36,21 +38,55 @@ class ArchiveService(BaseService):
         params = dict(pgNum=page_num, pgSize=page_size, **kwargs)
         return self._connection.get(uri, params=params)
 
-    def get_all_archives_from_value(self, id_value, id_type):
+    def get_all_archives_from_value(
+        self, id_value, id_type, concurrency=None, ordered=True
+    ):
         """Gets archive information from an ID, such as a User UID, Device GUID, or Destination GUID.
 
         Args:
             id_value (str): Query value for archive.
             id_type (str): API query value description (e.g backupSourceGuid,
                 userUid, destinationGuid)
+            concurrency (int, optional): When set, reads the total archive count from the
+                first page and requests the remaining pages in parallel, with at most this
+                many requests in flight. Defaults to None.
+            ordered (bool, optional): When `concurrency` is set, whether pages are returned
+                in page order (True) or as soon as each one completes (False). Defaults to
+                True.
 
         Returns:
             generator: An object that iterates over :class:`py42.response.Py42Response` objects
             that each contain a page of archives.
         """
         params = {id_type: id_value}
+        if concurrency:
+            return get_all_pages_by_total(
+                self.get_page,
+                "archives",
+                "totalCount",
+                max_workers=concurrency,
+                ordered=ordered,
+                **params,
+            )
         return get_all_pages(self.get_page, "archives", **params)
 
+    def iter_archives_from_value(
+        self, id_value, id_type, concurrency=None, ordered=True
+    ):
+        """Gets archive information from an ID, one archive at a time. Accepts the same
+        arguments as :meth:`get_all_archives_from_value`. Each page is released as soon as
+        its archives have been read from it.
+
+        Returns:
+            generator: An object that iterates over archive dicts.
+        """
+        return iter_page_items(
+            self.get_all_archives_from_value(
+                id_value, id_type, concurrency=concurrency, ordered=ordered
+            ),
+            "archives",
+        )
+
     def get_backup_sets(self, device_guid, destination_guid):
         uri = f"/api/v3/BackupSets/{device_guid}/{destination_guid}"
         return self._connection.get(uri)
@@ -1,6 +1,10 @@
 from py42 import settings
 from py42.services import BaseService
+from py42.services.util import get_all_items_streamed
 from py42.services.util import get_all_pages
+from py42.services.util import get_all_pages_async
+from py42.services.util import iter_page_items
+from py42.services.util import iter_page_items_async
 from py42.util import parse_timestamp_to_microseconds_precision
 from py42.util import to_list
 
@@ -36,6 +40,7 @@ class AuditLogsService(BaseService):
         affected_user_ids=None,
         affected_usernames=None,
         format=None,
+        stream=False,
         **kwargs
     ):
         date_range = {}
@@ -62,6 +67,8 @@ class AuditLogsService(BaseService):
         params.update(**kwargs)
 
         headers = HEADER_MAP.get(format.upper()) if format else None
+        if stream:
+            return self._connection.post(uri, json=params, headers=headers, stream=True)
         return self._connection.post(uri, json=params, headers=headers)
 
     def get_all(
@@ -89,3 +96,104 @@ class AuditLogsService(BaseService):
             affected_usernames=affected_usernames,
             **kwargs
         )
+
+    def iter_items(
+        self,
+        begin_time=None,
+        end_time=None,
+        event_types=None,
+        user_ids=None,
+        usernames=None,
+        user_ip_addresses=None,
+        affected_user_ids=None,
+        affected_usernames=None,
+        stream=False,
+        **kwargs
+    ):
+        if stream:
+            return get_all_items_streamed(
+                self.get_page,
+                "events",
+                begin_time=begin_time,
+                end_time=end_time,
+                event_types=event_types,
+                user_ids=user_ids,
+                usernames=usernames,
+                user_ip_addresses=user_ip_addresses,
+                affected_user_ids=affected_user_ids,
+                affected_usernames=affected_usernames,
+                **kwargs
+            )
+        return iter_page_items(
+            self.get_all(
+                begin_time=begin_time,
+                end_time=end_time,
+                event_types=event_types,
+                user_ids=user_ids,
+                usernames=usernames,
+                user_ip_addresses=user_ip_addresses,
+                affected_user_ids=affected_user_ids,
+                affected_usernames=affected_usernames,
+                **kwargs
+            ),
+            "events",
+        )
+
+
+class AsyncAuditLogsService(AuditLogsService):
+    """An asyncio variant of :class:`AuditLogsService` for use with an
+    :class:`~py42.services._connection.AsyncConnection`. :meth:`get_page` is a coroutine
+    and :meth:`get_all` and :meth:`iter_items` are async generators."""
+
+    def get_all(
+        self,
+        begin_time=None,
+        end_time=None,
+        event_types=None,
+        user_ids=None,
+        usernames=None,
+        user_ip_addresses=None,
+        affected_user_ids=None,
+        affected_usernames=None,
+        **kwargs
+    ):
+        return get_all_pages_async(
+            self.get_page,
+            "events",
+            begin_time=begin_time,
+            end_time=end_time,
+            event_types=event_types,
+            user_ids=user_ids,
+            usernames=usernames,
+            user_ip_addresses=user_ip_addresses,
+            affected_user_ids=affected_user_ids,
+            affected_usernames=affected_usernames,
+            **kwargs
+        )
+
+    def iter_items(
+        self,
+        begin_time=None,
+        end_time=None,
+        event_types=None,
+        user_ids=None,
+        usernames=None,
+        user_ip_addresses=None,
+        affected_user_ids=None,
+        affected_usernames=None,
+        **kwargs
+    ):
+        return iter_page_items_async(
+            self.get_all(
+                begin_time=begin_time,
+                end_time=end_time,
+                event_types=event_types,
+                user_ids=user_ids,
+                usernames=usernames,
+                user_ip_addresses=user_ip_addresses,
+                affected_user_ids=affected_user_ids,
+                affected_usernames=affected_usernames,
+                **kwargs
+            ),
+            "events",
+        )
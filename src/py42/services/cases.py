@@ -6,6 +6,7 @@ from py42.exceptions import Py42InvalidCaseUserError
 from py42.exceptions import Py42UpdateClosedCaseError
 from py42.services import BaseService
 from py42.services.util import get_all_pages
+from py42.services.util import iter_page_items
 
 
 class CasesService(BaseService):
@@ -90,6 +91,35 @@ class CasesService(BaseService):
             **kwargs,
         )
 
+    def iter_items(
+        self,
+        name=None,
+        status=None,
+        created_at=None,
+        updated_at=None,
+        subject=None,
+        assignee=None,
+        page_size=None,
+        sort_direction="asc",
+        sort_key="number",
+        **kwargs,
+    ):
+        return iter_page_items(
+            self.get_all(
+                name=name,
+                status=status,
+                created_at=created_at,
+                updated_at=updated_at,
+                subject=subject,
+                assignee=assignee,
+                page_size=page_size,
+                sort_direction=sort_direction,
+                sort_key=sort_key,
+                **kwargs,
+            ),
+            "cases",
+        )
+
     def get(self, case_number):
         return self._connection.get(f"{self._uri_prefix}/{case_number}")
 
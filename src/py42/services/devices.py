@@ -8,7 +8,12 @@ from py42.exceptions import Py42BadRequestError
 from py42.exceptions import Py42OrgNotFoundError
 from py42.services import BaseService
 from py42.services import handle_active_legal_hold_error
+from py42.services.util import get_all_items_streamed
 from py42.services.util import get_all_pages
+from py42.services.util import get_all_pages_async
+from py42.services.util import get_all_pages_by_total
+from py42.services.util import iter_page_items
+from py42.services.util import iter_page_items_async
 
 DeviceSettingsResponse = namedtuple(
     "DeviceSettingsResponse", ["error", "settings_response", "device_settings_response"]
@@ -30,6 +35,7 @@ class DeviceService(BaseService):
         include_counts=True,
         page_size=None,
         q=None,
+        stream=False,
     ):
         """Gets a page of devices.
 
@@ -52,6 +58,9 @@ class DeviceService(BaseService):
                 `py42.settings.items_per_page`.
             q (str, optional): Searches results flexibly by incomplete GUID, hostname,
                 computer name, etc. Defaults to None.
+            stream (bool, optional): Whether to stream the response body instead of reading
+                it all at once, for use with :meth:`py42.response.Py42Response.iter_items`.
+                Defaults to False.
 
         Returns:
             :class:`py42.response.Py42Response`
@@ -72,6 +81,8 @@ class DeviceService(BaseService):
             "q": q,
         }
         try:
+            if stream:
+                return self._connection.get(uri, params=params, stream=True)
             return self._connection.get(uri, params=params)
         except Py42BadRequestError as err:
             if "Unable to find org" in str(err.response.text):
@@ -88,6 +99,8 @@ class DeviceService(BaseService):
         include_backup_usage=None,
         include_counts=True,
         q=None,
+        concurrency=None,
+        ordered=True,
         **kwargs,
     ):
         """Gets all device information.
@@ -112,6 +125,12 @@ class DeviceService(BaseService):
                 and critical counts. Defaults to True.
             q (str, optional): Searches results flexibly by incomplete GUID, hostname,
                 computer name, etc. Defaults to None.
+            concurrency (int, optional): When set, reads the total device count from the
+                first page and requests the remaining pages in parallel, with at most this
+                many requests in flight. Requires `include_counts`. Defaults to None.
+            ordered (bool, optional): When `concurrency` is set, whether pages are returned
+                in page order (True) or as soon as each one completes (False). Defaults to
+                True.
 
         Returns:
             generator: An object that iterates over :class:`py42.response.Py42Response` objects
@@ -120,7 +139,23 @@ class DeviceService(BaseService):
             The devices returned by `get_all()` are based on the role and permissions of the user
             authenticating the py42 SDK.
         """
-
+        if concurrency:
+            return get_all_pages_by_total(
+                self.get_page,
+                "computers",
+                "totalCount",
+                max_workers=concurrency,
+                ordered=ordered,
+                active=active,
+                blocked=blocked,
+                org_uid=org_uid,
+                user_uid=user_uid,
+                destination_guid=destination_guid,
+                include_backup_usage=include_backup_usage,
+                include_counts=include_counts,
+                q=q,
+                **kwargs,
+            )
         return get_all_pages(
             self.get_page,
             "computers",
@@ -135,6 +170,65 @@ class DeviceService(BaseService):
             **kwargs,
         )
 
+    def iter_items(
+        self,
+        active=None,
+        blocked=None,
+        org_uid=None,
+        user_uid=None,
+        destination_guid=None,
+        include_backup_usage=None,
+        include_counts=True,
+        q=None,
+        concurrency=None,
+        ordered=True,
+        stream=False,
+        **kwargs,
+    ):
+        """Gets all device information, one device at a time.
+
+        Accepts the same arguments as :meth:`get_all`. Each page is released as soon as its
+        devices have been read from it, so only one page is held in memory at a time.
+
+        Args:
+            stream (bool, optional): When True, each page is streamed and its devices are
+                parsed as they arrive, so memory use does not grow with the page size.
+                `concurrency` and `ordered` are ignored when streaming. Defaults to False.
+
+        Returns:
+            generator: An object that iterates over device dicts.
+        """
+        if stream:
+            return get_all_items_streamed(
+                self.get_page,
+                "computers",
+                active=active,
+                blocked=blocked,
+                org_uid=org_uid,
+                user_uid=user_uid,
+                destination_guid=destination_guid,
+                include_backup_usage=include_backup_usage,
+                include_counts=include_counts,
+                q=q,
+                **kwargs,
+            )
+        return iter_page_items(
+            self.get_all(
+                active=active,
+                blocked=blocked,
+                org_uid=org_uid,
+                user_uid=user_uid,
+                destination_guid=destination_guid,
+                include_backup_usage=include_backup_usage,
+                include_counts=include_counts,
+                q=q,
+                concurrency=concurrency,
+                ordered=ordered,
+                **kwargs,
+            ),
+            "computers",
+        )
+
     def get_by_id(self, device_id, include_backup_usage=None, **kwargs):
         """Gets device information by ID.
 
@@ -301,3 +395,107 @@ class DeviceService(BaseService):
         """
         uri = "/api/v4/device-upgrade/upgrade-device"
         return self._connection.post(uri, json={"deviceGuid": guid})
+
+
+class AsyncDeviceService(DeviceService):
+    """An asyncio variant of :class:`DeviceService` for use with an
+    :class:`~py42.services._connection.AsyncConnection`. Every method is a coroutine and
+    :meth:`get_all` and :meth:`iter_items` are async generators."""
+
+    async def get_page(
+        self,
+        page_num,
+        active=None,
+        blocked=None,
+        org_uid=None,
+        user_uid=None,
+        destination_guid=None,
+        include_backup_usage=None,
+        include_counts=True,
+        page_size=None,
+        q=None,
+    ):
+        try:
+            return await super().get_page(
+                page_num,
+                active=active,
+                blocked=blocked,
+                org_uid=org_uid,
+                user_uid=user_uid,
+                destination_guid=destination_guid,
+                include_backup_usage=include_backup_usage,
+                include_counts=include_counts,
+                page_size=page_size,
+                q=q,
+            )
+        except Py42BadRequestError as err:
+            if "Unable to find org" in str(err.response.text):
+                raise Py42OrgNotFoundError(err, org_uid)
+            raise
+
+    def get_all(
+        self,
+        active=None,
+        blocked=None,
+        org_uid=None,
+        user_uid=None,
+        destination_guid=None,
+        include_backup_usage=None,
+        include_counts=True,
+        q=None,
+        **kwargs,
+    ):
+        return get_all_pages_async(
+            self.get_page,
+            "computers",
+            active=active,
+            blocked=blocked,
+            org_uid=org_uid,
+            user_uid=user_uid,
+            destination_guid=destination_guid,
+            include_backup_usage=include_backup_usage,
+            include_counts=include_counts,
+            q=q,
+            **kwargs,
+        )
+
+    def iter_items(
+        self,
+        active=None,
+        blocked=None,
+        org_uid=None,
+        user_uid=None,
+        destination_guid=None,
+        include_backup_usage=None,
+        include_counts=True,
+        q=None,
+        **kwargs,
+    ):
+        return iter_page_items_async(
+            self.get_all(
+                active=active,
+                blocked=blocked,
+                org_uid=org_uid,
+                user_uid=user_uid,
+                destination_guid=destination_guid,
+                include_backup_usage=include_backup_usage,
+                include_counts=include_counts,
+                q=q,
+                **kwargs,
+            ),
+            "computers",
+        )
+
+    async def deactivate(self, device_id):
+        try:
+            return await super().deactivate(device_id)
+        except Py42BadRequestError as ex:
+            handle_active_legal_hold_error(ex, "device", device_id)
+            raise
+
+    async def get_settings(self, guid):
+        settings = await self.get_by_guid(guid, incSettings=True)
+        if settings.data["service"].lower() == "crashplan":
+            return DeviceSettings(settings.data)
+        else:
+            return IncydrDeviceSettings(settings.data)
@@ -1,12 +1,12 @@
 import json
 from warnings import warn
 
-from requests.adapters import HTTPAdapter
 from urllib3 import Retry
 
 import py42.settings.debug as debug
 from py42.exceptions import Py42BadRequestError
 from py42.exceptions import Py42InvalidPageTokenError
+from py42.sdk.queries import BaseQuery
 from py42.services import BaseService
 
 
@@ -14,6 +14,9 @@ class FFSQueryRetryStrategy(Retry):
     """The forensic search service helpfully responds with a 'retry-after' header, telling us how long until the rate
     limiter is reset. We subclass :class:`urllib3.Retry` just to add a bit of logging so the user can tell why the
     request might look like it's hanging.
+
+    :class:`FileEventService` no longer mounts this strategy, since every request now follows the connection's
+    :class:`py42.retry.RetryPolicy`, which also honors the 'retry-after' header.
     """
 
     def get_retry_after(self, response):
@@ -39,11 +42,7 @@ class FileEventService(BaseService):
     to construct a query.
     """
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self._retry_adapter_mounted = False
-
-    def search(self, query):
+    def search(self, query, stream=False):
         """Searches for file events matching the query criteria.
         `REST Documentation <https://developer.code42.com/api/#operation/searchEventsUsingPOST>`__
 
@@ -54,6 +53,9 @@ class FileEventService(BaseService):
             query (:class:`~py42.sdk.queries.fileevents.v2.file_event_query.FileEventQuery` or str or unicode):
                 A composed :class:`~py42.sdk.queries.fileevents.v2.file_event_query.FileEventQuery`
                 object or the raw query as a JSON formatted string.
+            stream (bool, optional): Whether to stream the response body instead of reading
+                it all at once, for use with :meth:`py42.response.Py42Response.iter_items`.
+                Defaults to False.
 
         Returns:
             :class:`py42.response.Py42Response`: A response containing the query results.
@@ -63,20 +65,10 @@ class FileEventService(BaseService):
             DeprecationWarning,
             stacklevel=2,
         )
-        self._mount_retry_adapter()
-
-        # if string query
-        if isinstance(query, str):
-            query = json.loads(query)
-            # v2 fields are accessible via dot notation (exception of "@timestamp")
-            version = "v2" if "." in query["srtKey"] or "@" in query["srtKey"] else "v1"
-            uri = f"/forensic-search/queryservice/api/{version}/fileevent"
-        # else query object
-        else:
-            uri = f"/forensic-search/queryservice/api/{query.version}/fileevent"
-            query = dict(query)
-
+        uri, query = _get_search_request(query)
         try:
+            if stream:
+                return self._connection.post(uri, json=query, stream=True)
             return self._connection.post(uri, json=query)
         except Py42BadRequestError as err:
             if "INVALID_PAGE_TOKEN" in str(err.response.text):
@@ -100,31 +92,58 @@ class FileEventService(BaseService):
             stacklevel=2,
         )
 
-        self._mount_retry_adapter()
-
         uri = "/forensic-search/queryservice/api/v1/filelocations"
         return self._connection.get(uri, params={"sha256": checksum})
 
-    def _mount_retry_adapter(self):
-        """Sets custom Retry strategy for FFS url requests to gracefully handle being rate-limited on FFS queries."""
-        if not self._retry_adapter_mounted:
-            retry_strategy = FFSQueryRetryStrategy(
-                status=3,  # retry up to 3 times
-                backoff_factor=5,  # if `retry-after` header isn't present, use 5 second exponential backoff
-                allowed_methods=[
-                    "POST"
-                ],  # POST isn't a default allowed method due to it usually modifying resources
-                status_forcelist=[
-                    429
-                ],  # this only handles 429 errors, it won't retry on 5xx
-            )
-            file_event_adapter = HTTPAdapter(
-                pool_connections=200,
-                pool_maxsize=4,
-                pool_block=True,
-                max_retries=retry_strategy,
-            )
-            self._connection._session.mount(
-                self._connection.host_address, file_event_adapter
+
+class AsyncFileEventService(FileEventService):
+    """An asyncio variant of :class:`FileEventService` for use with an
+    :class:`~py42.services._connection.AsyncConnection`. Every method is a coroutine.
+
+    Unlike :class:`FileEventService`, rate-limited (429) searches are not retried.
+    """
+
+    async def search(self, query):
+        warn(
+            "Incydr functionality is deprecated. Use the Incydr SDK instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        uri, query = _get_search_request(query)
+        try:
+            return await self._connection.post(uri, json=query)
+        except Py42BadRequestError as err:
+            if "INVALID_PAGE_TOKEN" in str(err.response.text):
+                page_token = query.get("pgToken")
+                if page_token:
+                    raise Py42InvalidPageTokenError(err, page_token)
+            raise
+
+    async def get_file_location_detail_by_sha256(self, checksum):
+        warn(
+            "Incydr functionality is deprecated. Use the Incydr SDK instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        uri = "/forensic-search/queryservice/api/v1/filelocations"
+        return await self._connection.get(uri, params={"sha256": checksum})
+
+
+def _get_search_request(query):
+    # if string query
+    if isinstance(query, str):
+        query = json.loads(query)
+        # v2 fields are accessible via dot notation (exception of "@timestamp")
+        version = "v2" if "." in query["srtKey"] or "@" in query["srtKey"] else "v1"
+        uri = f"/forensic-search/queryservice/api/{version}/fileevent"
+    # else query object
+    else:
+        uri = f"/forensic-search/queryservice/api/{query.version}/fileevent"
+        if isinstance(query, BaseQuery):
+            # Only the paging fields change between pages, so reuse the serialized query.
+            query = query.compile().page(
+                page_number=query.page_number, page_token=query.page_token
             )
-            self._retry_adapter_mounted = True
+        else:
+            query = dict(query)
+    return uri, query
@@ -7,6 +7,8 @@ from py42.exceptions import Py42LegalHoldNotFoundOrPermissionDeniedError
 from py42.exceptions import Py42UserAlreadyAddedError
 from py42.services import BaseService
 from py42.services.util import get_all_pages
+from py42.services.util import get_all_pages_by_total
+from py42.services.util import iter_page_items
 from py42.util import parse_timestamp_to_milliseconds_precision
 
 
@@ -179,6 +181,26 @@ class LegalHoldService(BaseService):
             hold_ext_ref=hold_ext_ref,
         )
 
+    def iter_matters(
+        self, creator_user_uid=None, active=True, name=None, hold_ext_ref=None
+    ):
+        """Gets all existing Legal Hold Matters, one Matter at a time. Accepts the same
+        arguments as :meth:`get_all_matters`. Each page is released as soon as its Matters
+        have been read from it.
+
+        Returns:
+            generator: An object that iterates over Legal Hold Matter dicts.
+        """
+        return iter_page_items(
+            self.get_all_matters(
+                creator_user_uid=creator_user_uid,
+                active=active,
+                name=name,
+                hold_ext_ref=hold_ext_ref,
+            ),
+            "legalHolds",
+        )
+
     def get_custodians_page(
         self,
         page_num,
@@ -233,7 +255,13 @@ class LegalHoldService(BaseService):
             raise
 
     def get_all_matter_custodians(
-        self, legal_hold_uid=None, user_uid=None, user=None, active=True
+        self,
+        legal_hold_uid=None,
+        user_uid=None,
+        user=None,
+        active=True,
+        concurrency=None,
+        ordered=True,
     ):
         """Gets all Legal Hold memberships.
 
@@ -253,11 +281,29 @@ class LegalHoldService(BaseService):
             active (bool or None, optional): Find LegalHoldMemberships by their active state. True
                 returns active LegalHoldMemberships, False returns inactive LegalHoldMemberships,
                 None returns all LegalHoldMemberships regardless of state. Defaults to True.
+            concurrency (int, optional): When set, reads the total membership count from the
+                first page and requests the remaining pages in parallel, with at most this
+                many requests in flight. Defaults to None.
+            ordered (bool, optional): When `concurrency` is set, whether pages are returned
+                in page order (True) or as soon as each one completes (False). Defaults to
+                True.
 
         Returns:
             generator: An object that iterates over :class:`py42.response.Py42Response` objects
             that each contain a page of LegalHoldMembership objects.
         """
+        if concurrency:
+            return get_all_pages_by_total(
+                self.get_custodians_page,
+                "legalHoldMemberships",
+                "totalCount",
+                max_workers=concurrency,
+                ordered=ordered,
+                legal_hold_uid=legal_hold_uid,
+                user_uid=user_uid,
+                user=user,
+                active=active,
+            )
         return get_all_pages(
             self.get_custodians_page,
             "legalHoldMemberships",
@@ -267,6 +313,34 @@ class LegalHoldService(BaseService):
             active=active,
         )
 
+    def iter_matter_custodians(
+        self,
+        legal_hold_uid=None,
+        user_uid=None,
+        user=None,
+        active=True,
+        concurrency=None,
+        ordered=True,
+    ):
+        """Gets all Legal Hold memberships, one LegalHoldMembership at a time. Accepts the
+        same arguments as :meth:`get_all_matter_custodians`. Each page is released as soon as
+        its memberships have been read from it.
+
+        Returns:
+            generator: An object that iterates over LegalHoldMembership dicts.
+        """
+        return iter_page_items(
+            self.get_all_matter_custodians(
+                legal_hold_uid=legal_hold_uid,
+                user_uid=user_uid,
+                user=user,
+                active=active,
+                concurrency=concurrency,
+                ordered=ordered,
+            ),
+            "legalHoldMemberships",
+        )
+
     def get_events_page(
         self,
         legal_hold_uid=None,
@@ -337,6 +411,25 @@ class LegalHoldService(BaseService):
             max_event_date=max_event_date,
         )
 
+    def iter_events(
+        self, legal_hold_uid=None, min_event_date=None, max_event_date=None
+    ):
+        """Gets all Legal Hold events, one LegalHoldEvent at a time. Accepts the same
+        arguments as :meth:`get_all_events`. Each page is released as soon as its events
+        have been read from it.
+
+        Returns:
+            generator: An object that iterates over LegalHoldEvent dicts.
+        """
+        return iter_page_items(
+            self.get_all_events(
+                legal_hold_uid=legal_hold_uid,
+                min_event_date=min_event_date,
+                max_event_date=max_event_date,
+            ),
+            "legalHoldEvents",
+        )
+
     def add_to_matter(self, user_uid, legal_hold_uid):
         """Add a user (Custodian) to a Legal Hold Matter.
 
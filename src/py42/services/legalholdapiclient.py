@@ -9,6 +9,7 @@ from py42.exceptions import Py42LegalHoldNotFoundOrPermissionDeniedError
 from py42.exceptions import Py42UserAlreadyAddedError
 from py42.services import BaseService
 from py42.services.util import get_all_pages
+from py42.services.util import iter_page_items
 
 
 def _active_state_map(active):
@@ -200,6 +201,26 @@ class LegalHoldApiClientService(BaseService):
             hold_ext_ref=hold_ext_ref,
         )
 
+    def iter_matters(
+        self, creator_user_uid=None, active=True, name=None, hold_ext_ref=None
+    ):
+        """Gets all existing Legal Hold Matters, one Matter at a time. Accepts the same
+        arguments as :meth:`get_all_matters`. Each page is released as soon as its Matters
+        have been read from it.
+
+        Returns:
+            generator: An object that iterates over Legal Hold Matter dicts.
+        """
+        return iter_page_items(
+            self.get_all_matters(
+                creator_user_uid=creator_user_uid,
+                active=active,
+                name=name,
+                hold_ext_ref=hold_ext_ref,
+            ),
+            None,
+        )
+
     def get_custodians_page(
         self,
         page_num,
@@ -284,6 +305,26 @@ class LegalHoldApiClientService(BaseService):
             active=active,
         )
 
+    def iter_matter_custodians(
+        self, legal_hold_matter_uid=None, user_uid=None, user=None, active=True
+    ):
+        """Gets all Legal Hold memberships, one LegalHoldMembership at a time. Accepts the
+        same arguments as :meth:`get_all_matter_custodians`. Each page is released as soon as
+        its memberships have been read from it.
+
+        Returns:
+            generator: An object that iterates over LegalHoldMembership dicts.
+        """
+        return iter_page_items(
+            self.get_all_matter_custodians(
+                legal_hold_matter_uid=legal_hold_matter_uid,
+                user_uid=user_uid,
+                user=user,
+                active=active,
+            ),
+            None,
+        )
+
     def add_to_matter(self, user_uid, legal_hold_matter_uid):
         """Add a user (Custodian) to a Legal Hold Matter.
 
@@ -6,6 +6,7 @@ from py42.exceptions import Py42Error
 from py42.exceptions import Py42InternalServerError
 from py42.services import BaseService
 from py42.services.util import get_all_pages
+from py42.services.util import iter_page_items
 
 OrgSettingsResponse = namedtuple(
     "OrgSettingsResponse", ["error", "org_response", "org_settings_response"]
@@ -116,6 +117,15 @@ class OrgService(BaseService):
         """
         return get_all_pages(self.get_page, "orgs", **kwargs)
 
+    def iter_items(self, **kwargs):
+        """Gets all organizations, one organization at a time. Each page is released as soon
+        as its organizations have been read from it.
+
+        Returns:
+            generator: An object that iterates over organization dicts.
+        """
+        return iter_page_items(self.get_all(**kwargs), "orgs")
+
     def block(self, org_id):
         """Blocks the organization with the given org ID as well as its child organizations. A
         blocked organization will not allow any of its users or devices to log in. New
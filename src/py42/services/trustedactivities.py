@@ -8,6 +8,7 @@ from py42.exceptions import Py42TrustedActivityIdNotFound
 from py42.exceptions import Py42TrustedActivityInvalidCharacterError
 from py42.services import BaseService
 from py42.services.util import get_all_pages
+from py42.services.util import iter_page_items
 
 
 class TrustedActivitiesService(BaseService):
@@ -22,6 +23,11 @@ class TrustedActivitiesService(BaseService):
             self.get_page, "trustResources", type=type, page_size=page_size, **kwargs
         )
 
+    def iter_items(self, type=None, page_size=None, **kwargs):
+        return iter_page_items(
+            self.get_all(type=type, page_size=page_size, **kwargs), "trustResources"
+        )
+
     def get_page(self, page_num, page_size, type, **kwargs):
         page_size = page_size or settings.items_per_page
         params = {
@@ -8,6 +8,7 @@ from py42.exceptions import Py42NotFoundError
 from py42.exceptions import Py42UserRiskProfileNotFound
 from py42.services import BaseService
 from py42.services.util import get_all_pages
+from py42.services.util import iter_page_items
 
 _DATE_FORMAT = "%Y-%m-%d"
 
@@ -143,6 +144,37 @@ class UserRiskProfileService(BaseService):
             support_user=support_user,
         )
 
+    def iter_items(
+        self,
+        manager_id=None,
+        title=None,
+        division=None,
+        department=None,
+        employment_type=None,
+        country=None,
+        region=None,
+        locality=None,
+        active=None,
+        deleted=None,
+        support_user=None,
+    ):
+        return iter_page_items(
+            self.get_all(
+                manager_id=manager_id,
+                title=title,
+                division=division,
+                department=department,
+                employment_type=employment_type,
+                country=country,
+                region=region,
+                locality=locality,
+                active=active,
+                deleted=deleted,
+                support_user=support_user,
+            ),
+            "userRiskProfiles",
+        )
+
     def add_cloud_aliases(self, user_id, cloud_aliases):
         if not isinstance(cloud_aliases, (list, tuple)):
             cloud_aliases = [cloud_aliases]
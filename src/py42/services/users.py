@@ -11,6 +11,9 @@ from py42.exceptions import Py42UsernameMustBeEmailError
 from py42.services import BaseService
 from py42.services import handle_active_legal_hold_error
 from py42.services.util import get_all_pages
+from py42.services.util import get_all_pages_async
+from py42.services.util import iter_page_items
+from py42.services.util import iter_page_items_async
 
 
 class UserService(BaseService):
@@ -200,6 +203,29 @@ class UserService(BaseService):
             **kwargs,
         )
 
+    def iter_items(
+        self, active=None, email=None, org_uid=None, role_id=None, q=None, **kwargs
+    ):
+        """Gets all users, one user at a time.
+
+        Accepts the same arguments as :meth:`get_all`. Each page is released as soon as its
+        users have been read from it, so only one page is held in memory at a time.
+
+        Returns:
+            generator: An object that iterates over user dicts.
+        """
+        return iter_page_items(
+            self.get_all(
+                active=active,
+                email=email,
+                org_uid=org_uid,
+                role_id=role_id,
+                q=q,
+                **kwargs,
+            ),
+            "users",
+        )
+
     def get_scim_data_by_uid(self, user_uid):
         """Returns SCIM data such as division, department, and title for a given user.
 
@@ -419,3 +445,198 @@ class UserService(BaseService):
         uri = f"/api/v3/users/{self._get_user_uid_by_id(user_id)}/roles"
         data = {"roleIds": role_ids}
         return self._connection.put(uri, json=data)
+
+
+class AsyncUserService(UserService):
+    """An asyncio variant of :class:`UserService` for use with an
+    :class:`~py42.services._connection.AsyncConnection`. Every method is a coroutine and
+    :meth:`get_all` and :meth:`iter_items` are async generators."""
+
+    async def create_user(
+        self,
+        org_uid,
+        username,
+        email,
+        password=None,
+        first_name=None,
+        last_name=None,
+        notes=None,
+    ):
+        try:
+            return await super().create_user(
+                org_uid,
+                username,
+                email,
+                password=password,
+                first_name=first_name,
+                last_name=last_name,
+                notes=notes,
+            )
+        except Py42InternalServerError as err:
+            if "USER_DUPLICATE" in err.response.text:
+                raise Py42UserAlreadyExistsError(err)
+            raise
+
+    async def get_current(self, **kwargs):
+        try:
+            return await super().get_current(**kwargs)
+        except Py42NotFoundError as err:
+            raise Py42NotFoundError(
+                err,
+                message="User not found.  Please be aware that this method is incompatible with api client authentication.",
+            )
+
+    async def get_page(
+        self,
+        page_num,
+        active=None,
+        email=None,
+        org_uid=None,
+        role_id=None,
+        page_size=None,
+        q=None,
+        **kwargs,
+    ):
+        try:
+            return await super().get_page(
+                page_num,
+                active=active,
+                email=email,
+                org_uid=org_uid,
+                role_id=role_id,
+                page_size=page_size,
+                q=q,
+                **kwargs,
+            )
+        except Py42BadRequestError as err:
+            if "Organization was not found" in str(err.response.text):
+                raise Py42OrgNotFoundError(err, org_uid)
+            raise
+
+    def get_all(
+        self, active=None, email=None, org_uid=None, role_id=None, q=None, **kwargs
+    ):
+        return get_all_pages_async(
+            self.get_page,
+            "users",
+            active=active,
+            email=email,
+            org_uid=org_uid,
+            role_id=role_id,
+            q=q,
+            **kwargs,
+        )
+
+    def iter_items(
+        self, active=None, email=None, org_uid=None, role_id=None, q=None, **kwargs
+    ):
+        return iter_page_items_async(
+            self.get_all(
+                active=active,
+                email=email,
+                org_uid=org_uid,
+                role_id=role_id,
+                q=q,
+                **kwargs,
+            ),
+            "users",
+        )
+
+    async def block(self, user_id):
+        uri = f"/api/v3/users/{await self._get_user_uid_by_id(user_id)}/block"
+        return await self._connection.post(uri)
+
+    async def unblock(self, user_id):
+        uri = f"/api/v3/users/{await self._get_user_uid_by_id(user_id)}/unblock"
+        return await self._connection.post(uri)
+
+    async def deactivate(self, user_id, block_user=None):
+        uri = f"/api/v3/users/{await self._get_user_uid_by_id(user_id)}/deactivate"
+        data = {"block": block_user}
+        try:
+            return await self._connection.post(uri, json=data)
+        except Py42BadRequestError as ex:
+            handle_active_legal_hold_error(ex, "user", user_id)
+            raise
+
+    async def reactivate(self, user_id, unblock_user=None):
+        uri = f"/api/v3/users/{await self._get_user_uid_by_id(user_id)}/activate"
+        params = {"unblock": unblock_user}
+        return await self._connection.post(uri, json=params)
+
+    async def change_org_assignment(self, user_id, org_id):
+        uri = f"/api/v3/users/{await self._get_user_uid_by_id(user_id)}/move"
+        data = {"orgId": org_id}
+        return await self._connection.post(uri, json=data)
+
+    async def get_roles(self, user_id):
+        uri = f"/api/v3/users/{await self._get_user_uid_by_id(user_id)}/roles"
+        return await self._connection.get(uri)
+
+    async def add_role(self, user_id, role_name):
+        role_ids = await self._update_role_ids(
+            role_name, await self._get_role_ids(user_id), add=True
+        )
+        return await self._update_roles(user_id, role_ids)
+
+    async def remove_role(self, user_id, role_name):
+        role_ids = await self._update_role_ids(
+            role_name, await self._get_role_ids(user_id), add=False
+        )
+        return await self._update_roles(user_id, role_ids)
+
+    async def update_user(
+        self,
+        user_uid,
+        username=None,
+        email=None,
+        password=None,
+        first_name=None,
+        last_name=None,
+        notes=None,
+        archive_size_quota_bytes=None,
+    ):
+        try:
+            return await super().update_user(
+                user_uid,
+                username=username,
+                email=email,
+                password=password,
+                first_name=first_name,
+                last_name=last_name,
+                notes=notes,
+                archive_size_quota_bytes=archive_size_quota_bytes,
+            )
+        except Py42InternalServerError as err:
+            response_text = str(err.response.text)
+            if "USERNAME_NOT_AN_EMAIL" in response_text:
+                raise Py42UsernameMustBeEmailError(err)
+            elif "EMAIL_INVALID" in response_text:
+                raise Py42InvalidEmailError(email, err)
+            elif "NEW_PASSWORD_INVALID" in response_text:
+                raise Py42InvalidPasswordError(err)
+            elif "INVALID_USERNAME" in response_text:
+                raise Py42InvalidUsernameError(err)
+            raise
+
+    async def _get_user_uid_by_id(self, user_id):
+        return (await self.get_by_id(user_id))["userUid"]
+
+    async def _get_role_ids(self, user_id):
+        return [i["roleId"] for i in await self.get_roles(user_id)]
+
+    async def _update_role_ids(self, role_name, role_ids, add=True):
+        for role in await self.get_available_roles():
+            if (role["roleName"] == role_name) or (role["roleId"] == role_name):
+                if add:
+                    role_ids.append(role["roleId"])
+                else:
+                    role_ids.remove(role["roleId"])
+                break
+
+        return role_ids
+
+    async def _update_roles(self, user_id, role_ids):
+        uri = f"/api/v3/users/{await self._get_user_uid_by_id(user_id)}/roles"
+        data = {"roleIds": role_ids}
+        return await self._connection.put(uri, json=data)
@@ -1,20 +1,197 @@
+import math
 import re
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
 
 import py42.settings as settings
+from py42.exceptions import Py42Error
 
 
 def get_all_pages(func, key, *args, **kwargs):
     if kwargs.get("page_size") is None:
         kwargs["page_size"] = settings.items_per_page
 
+    if settings.page_prefetch_window > 0:
+        return get_all_pages_prefetched(
+            func, key, settings.page_prefetch_window, *args, **kwargs
+        )
+    return _get_all_pages(func, key, *args, **kwargs)
+
+
+def _get_all_pages(func, key, *args, **kwargs):
     item_count = page_size = kwargs["page_size"]
     page_num = 0
     while item_count >= page_size:
         page_num += 1
         response = func(*args, page_num=page_num, **kwargs)
         yield response
-        page_items = response[key] if key else response.data
-        item_count = len(page_items)
+        item_count = len(response[key] if key else response.data)
+        # Let the page go before requesting the next one.
+        response = None
+
+
+def get_all_pages_prefetched(func, key, window, *args, **kwargs):
+    """Like :func:`get_all_pages`, but keeps up to ``window`` upcoming pages in flight on a
+    thread pool while the caller consumes the current one. Pages are still yielded in
+    order and iteration stops at the first short page; requests already sent for pages
+    past the end are discarded. At most ``window`` responses are held besides the one
+    being consumed."""
+    if kwargs.get("page_size") is None:
+        kwargs["page_size"] = settings.items_per_page
+    page_size = kwargs["page_size"]
+
+    executor = ThreadPoolExecutor(max_workers=window)
+    pending = deque()
+    next_page_num = 1
+
+    def submit_next():
+        nonlocal next_page_num
+        pending.append(executor.submit(func, *args, page_num=next_page_num, **kwargs))
+        next_page_num += 1
+
+    try:
+        for _ in range(window):
+            submit_next()
+        while pending:
+            response = pending.popleft().result()
+            page_items = response[key] if key else response.data
+            is_last_page = len(page_items) < page_size
+            if not is_last_page:
+                submit_next()
+            yield response
+            if is_last_page:
+                return
+            response = page_items = None
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def get_all_pages_by_total(
+    func, key, total_key, *args, max_workers=4, ordered=True, **kwargs
+):
+    """Like :func:`get_all_pages`, for endpoints that report the total number of items on
+    each page. Reads the total from ``total_key`` on the first page and then requests every
+    remaining page in parallel, with at most ``max_workers`` requests in flight. When
+    ``ordered`` is True, pages are yielded in page order; otherwise they are yielded as they
+    complete. If the first page has no total, the remaining pages are fetched one at a
+    time."""
+    if kwargs.get("page_size") is None:
+        kwargs["page_size"] = settings.items_per_page
+    page_size = kwargs["page_size"]
+
+    response = func(*args, page_num=1, **kwargs)
+    yield response
+    total = _get_total(response, total_key)
+    if total is None:
+        page_num = 1
+        item_count = len(response[key] if key else response.data)
+        response = None
+        while item_count >= page_size:
+            page_num += 1
+            response = func(*args, page_num=page_num, **kwargs)
+            yield response
+            item_count = len(response[key] if key else response.data)
+            response = None
+        return
+
+    response = None
+    page_nums = iter(range(2, math.ceil(total / page_size) + 1))
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = deque()
+
+    def submit_next():
+        page_num = next(page_nums, None)
+        if page_num is not None:
+            pending.append(executor.submit(func, *args, page_num=page_num, **kwargs))
+
+    try:
+        for _ in range(max_workers):
+            submit_next()
+        while pending:
+            if ordered:
+                future = pending.popleft()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                future = done.pop()
+                pending.remove(future)
+            response = future.result()
+            submit_next()
+            yield response
+            response = future = None
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def get_all_items_streamed(func, key, *args, **kwargs):
+    """Like ``iter_page_items(get_all_pages(func, key, ...), key)``, but requests each page
+    with ``stream=True`` and parses its items incrementally as the body is read (see
+    :meth:`py42.response.Py42Response.iter_items`), so no page is ever held in memory as a
+    whole. ``func`` must accept a ``stream`` keyword argument."""
+    if kwargs.get("page_size") is None:
+        kwargs["page_size"] = settings.items_per_page
+
+    item_count = page_size = kwargs["page_size"]
+    page_num = 0
+    while item_count >= page_size:
+        page_num += 1
+        response = func(*args, page_num=page_num, stream=True, **kwargs)
+        item_count = 0
+        for item in response.iter_items(key):
+            item_count += 1
+            yield item
+        response = None
+
+
+def iter_page_items(pages, key):
+    """Flattens an iterable of page responses, such as one returned by
+    :func:`get_all_pages`, into the individual items stored under ``key`` on each page (or
+    the page's ``data`` when ``key`` is None). Only the current page's items are referenced
+    while they are being handed out; the page response itself, including its raw body, is
+    dropped as soon as its items have been read from it."""
+    for page in pages:
+        items = page[key] if key else page.data
+        del page
+        yield from items
+
+
+async def iter_page_items_async(pages, key):
+    """The asyncio counterpart of :func:`iter_page_items`, for async generators of pages
+    such as the one returned by :func:`get_all_pages_async`."""
+    async for page in pages:
+        items = page[key] if key else page.data
+        del page
+        for item in items:
+            yield item
+
+
+def _get_total(response, total_key):
+    try:
+        return int(response[total_key])
+    except (KeyError, TypeError, ValueError, Py42Error):
+        return None
+
+
+async def get_all_pages_async(func, key, *args, **kwargs):
+    """The asyncio counterpart to :func:`get_all_pages`, for use with services that are
+    backed by an :class:`~py42.services._connection.AsyncConnection`. ``func`` must be a
+    coroutine function."""
+    if kwargs.get("page_size") is None:
+        kwargs["page_size"] = settings.items_per_page
+
+    item_count = page_size = kwargs["page_size"]
+    page_num = 0
+    while item_count >= page_size:
+        page_num += 1
+        response = await func(*args, page_num=page_num, **kwargs)
+        yield response
+        item_count = len(response[key] if key else response.data)
+        response = None
 
 
 def escape_quote_chars(token):
@@ -6,6 +6,7 @@ from py42.exceptions import Py42WatchlistNotFound
 from py42.exceptions import Py42WatchlistOrUserNotFound
 from py42.services import BaseService
 from py42.services.util import get_all_pages
+from py42.services.util import iter_page_items
 
 
 class WatchlistsService(BaseService):
@@ -58,6 +59,9 @@ class WatchlistsService(BaseService):
     def get_all(self):
         return get_all_pages(self.get_page, "watchlists")
 
+    def iter_items(self):
+        return iter_page_items(self.get_all(), "watchlists")
+
     def create(self, watchlist_type, title=None, description=None):
         data = {
             "watchlistType": watchlist_type,
@@ -89,6 +93,11 @@ class WatchlistsService(BaseService):
             self.get_page_included_users, "includedUsers", watchlist_id=watchlist_id
         )
 
+    def iter_included_users(self, watchlist_id):
+        return iter_page_items(
+            self.get_all_included_users(watchlist_id), "includedUsers"
+        )
+
     def add_included_users_by_watchlist_id(self, user_ids, watchlist_id):
         if not isinstance(user_ids, (list, tuple)):
             user_ids = [user_ids]
@@ -151,6 +160,11 @@ class WatchlistsService(BaseService):
             watchlist_id=watchlist_id,
         )
 
+    def iter_watchlist_members(self, watchlist_id):
+        return iter_page_items(
+            self.get_all_watchlist_members(watchlist_id), "watchlistMembers"
+        )
+
     def get_watchlist_member(self, watchlist_id, user_id):
         uri = f"{self._uri_prefix}/{watchlist_id}/members/{user_id}"
         try:
@@ -11,6 +11,22 @@ verify_ssl_certs = True
 items_per_page = 500
 security_events_per_page = 500
 
+# The number of upcoming pages that `get_all` style methods request in the background
+# while the current page is being consumed. 0 fetches one page at a time.
+page_prefetch_window = 0
+
+# When True, responses release the raw HTTP body once it has been parsed as JSON, keeping
+# only the parsed data, status code, headers and URL.
+compact_responses = False
+
+# The most connections each SDK client keeps open to each host. Requests beyond that wait
+# for a connection. See py42.connectionpool to size pools per SDK client or host.
+pool_maxsize = 4
+
+# How many seconds before a token expires to start renewing it in the background, for
+# tokens whose expiration is known.
+token_refresh_margin = 60
+
 _custom_user_prefix = ""
 _custom_user_suffix = ""
 _python_version = f"{sys.version_info[0]}.{sys.version_info[1]}.{sys.version_info[2]}"
@@ -0,0 +1,186 @@
+"""Token stores that let SDK clients in different processes on one host share credentials.
+
+Pass a store to ``py42.sdk.from_api_client()`` or ``from_local_account()`` (``token_store=``)
+and every client created with the same store, host and account uses one token. When the
+token needs renewing, the first process to notice renews it while holding the store's
+lock; the others wait for the lock and then use the token it saved instead of requesting
+their own.
+
+Stored tokens grant access to the Code42 API, so the files are created readable only by
+their owner. Keep them on a local disk: file locks are not reliable on network file
+systems.
+"""
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileTokenStore:
+    """Stores tokens in a JSON file, keyed by host and account. Renewals are coordinated
+    with an exclusive lock on a ``.lock`` file next to it.
+
+    Args:
+        path (str): The path of the token file. It is created on the first save.
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._lock_path = f"{path}.lock"
+        self._thread_lock = threading.Lock()
+
+    def get_or_refresh(self, key, refresh, is_usable):
+        """Returns the token stored under ``key`` if ``is_usable`` accepts it. Otherwise calls
+        ``refresh`` for a new token, stores it and returns it. Other processes using the store
+        wait while this happens.
+
+        Args:
+            key (str): The key the token is stored under.
+            refresh (callable): Returns a new token dict, with ``credentials`` and
+                ``expires_at`` keys.
+            is_usable (callable): Accepts a stored token dict and returns whether it can be
+                used.
+
+        Returns:
+            dict: The token.
+        """
+        with self._locked():
+            tokens = self._read()
+            token = tokens.get(key)
+            if token is not None and is_usable(token):
+                return token
+            token = refresh()
+            tokens[key] = token
+            self._write(tokens)
+            return token
+
+    def delete(self, key):
+        """Removes the token stored under ``key``, if there is one."""
+        with self._locked():
+            tokens = self._read()
+            if tokens.pop(key, None) is not None:
+                self._write(tokens)
+
+    @contextmanager
+    def _locked(self):
+        with self._thread_lock:
+            fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                _lock_file(fd)
+                yield
+            finally:
+                # Closing the file releases the lock.
+                os.close(fd)
+
+    def _read(self):
+        try:
+            with open(self._path, encoding="utf-8") as token_file:
+                return json.load(token_file)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            # A corrupt file only costs a renewal.
+            return {}
+
+    def _write(self, tokens):
+        directory = os.path.dirname(os.path.abspath(self._path))
+        # mkstemp creates the file readable only by its owner.
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as temp_file:
+                json.dump(tokens, temp_file)
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+            os.replace(temp_path, self._path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+class SQLiteTokenStore:
+    """Stores tokens in a SQLite database, keyed by host and account. Renewals are
+    coordinated with the database's write lock.
+
+    Args:
+        path (str): The path of the database file. It is created if it does not exist.
+        timeout (int or float, optional): The most seconds to wait for another process to
+            finish renewing a token. Defaults to 60.
+    """
+
+    def __init__(self, path, timeout=60):
+        self._path = path
+        self._timeout = timeout
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        os.close(fd)
+        with self._transaction() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS py42_tokens "
+                "(key TEXT PRIMARY KEY, token TEXT NOT NULL)"
+            )
+
+    def get_or_refresh(self, key, refresh, is_usable):
+        """Returns the token stored under ``key`` if ``is_usable`` accepts it. Otherwise calls
+        ``refresh`` for a new token, stores it and returns it. Other processes using the store
+        wait while this happens.
+
+        Args:
+            key (str): The key the token is stored under.
+            refresh (callable): Returns a new token dict, with ``credentials`` and
+                ``expires_at`` keys.
+            is_usable (callable): Accepts a stored token dict and returns whether it can be
+                used.
+
+        Returns:
+            dict: The token.
+        """
+        with self._transaction() as connection:
+            row = connection.execute(
+                "SELECT token FROM py42_tokens WHERE key = ?", (key,)
+            ).fetchone()
+            token = json.loads(row[0]) if row else None
+            if token is not None and is_usable(token):
+                return token
+            token = refresh()
+            connection.execute(
+                "INSERT OR REPLACE INTO py42_tokens (key, token) VALUES (?, ?)",
+                (key, json.dumps(token)),
+            )
+            return token
+
+    def delete(self, key):
+        """Removes the token stored under ``key``, if there is one."""
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM py42_tokens WHERE key = ?", (key,))
+
+    @contextmanager
+    def _transaction(self):
+        # BEGIN IMMEDIATE takes the write lock up front, so only one process at a time
+        # reads a token and decides to renew it.
+        connection = sqlite3.connect(
+            self._path, timeout=self._timeout, isolation_level=None
+        )
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+        finally:
+            connection.close()
+
+
+def _lock_file(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+    else:  # Windows
+        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
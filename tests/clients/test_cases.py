@@ -107,6 +107,26 @@ class TestCasesClient:
             sort_key="number",
         )
 
+    def test_iter_items_converts_datetime_to_ranges_and_calls_service_with_expected_params(
+        self, mock_cases_service, mock_cases_file_event_service
+    ):
+        cases_client = CasesClient(mock_cases_service, mock_cases_file_event_service)
+        cases_client.iter_items(
+            min_create_time="2021-01-01 00:00:00",
+            max_create_time="2021-02-01 00:00:00",
+        )
+        mock_cases_service.iter_items.assert_called_once_with(
+            name=None,
+            status=None,
+            created_at="2021-01-01T00:00:00.000Z/2021-02-01T00:00:00.000Z",
+            updated_at=None,
+            subject=None,
+            assignee=None,
+            page_size=100,
+            sort_direction="asc",
+            sort_key="number",
+        )
+
     def test_get_all_converts_diff_types_to_ranges_and_calls_service_with_expected_params(
         self, mock_cases_service, mock_cases_file_event_service
     ):
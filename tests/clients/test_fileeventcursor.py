@@ -0,0 +1,204 @@
+import json
+import threading
+from itertools import islice
+
+import pytest
+from requests import HTTPError
+from tests.conftest import create_mock_response
+
+from py42.clients.fileeventcursor import FileCheckpointStore
+from py42.clients.fileeventcursor import FileEventCursor
+from py42.clients.fileeventcursor import get_query_fingerprint
+from py42.clients.fileeventcursor import SQLiteCheckpointStore
+from py42.exceptions import Py42Error
+from py42.exceptions import Py42InvalidPageTokenError
+from py42.sdk.queries.fileevents.file_event_query import (
+    FileEventQuery as FileEventQueryV1,
+)
+from py42.sdk.queries.fileevents.v2.file_event_query import FileEventQuery
+from py42.sdk.queries.fileevents.v2.filters.file import Category
+
+
+def create_event(event_id, second):
+    return {
+        "@timestamp": f"2022-01-01T00:00:{second:02d}.000Z",
+        "event": {"id": event_id},
+    }
+
+
+class FakeFileEventSearch:
+    """Serves pages of ``events`` at or after the query's ``@timestamp`` lower bound. Page
+    tokens are the ID of the last event on the previous page, as with the real service."""
+
+    def __init__(self, mocker, events, page_size=2):
+        self._mocker = mocker
+        self.events = list(events)
+        self._page_size = page_size
+        self.queries = []
+        self.invalid_tokens = set()
+
+    def __call__(self, query):
+        query_dict = dict(query)
+        self.queries.append(query_dict)
+        lower_bound = ""
+        for group in query_dict["groups"]:
+            for query_filter in group["filters"]:
+                if query_filter["term"] == "@timestamp":
+                    lower_bound = query_filter["value"]
+        matches = sorted(
+            (e for e in self.events if e["@timestamp"] >= lower_bound),
+            key=lambda e: e["@timestamp"],
+        )
+        token = query_dict["pgToken"]
+        if token in self.invalid_tokens:
+            error = self._mocker.MagicMock(spec=HTTPError)
+            error.response = create_mock_response(
+                self._mocker, "INVALID_PAGE_TOKEN", 400
+            )
+            raise Py42InvalidPageTokenError(error, token)
+        ids = [e["event"]["id"] for e in matches]
+        start = ids.index(token.replace('\\"', '"')) + 1 if token else 0
+        end = start + self._page_size
+        page = matches[start:end]
+        next_token = page[-1]["event"]["id"] if end < len(matches) else None
+        body = {
+            "totalCount": len(matches),
+            "fileEvents": page,
+            "nextPgToken": next_token,
+        }
+        return create_mock_response(self._mocker, json.dumps(body))
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "file":
+        return FileCheckpointStore(str(tmp_path / "checkpoints.json"))
+    return SQLiteCheckpointStore(str(tmp_path / "checkpoints.db"))
+
+
+@pytest.fixture
+def query():
+    return FileEventQuery.all(Category.is_in(["Document"]))
+
+
+EVENTS = [create_event(str(i), i) for i in range(5)]
+
+
+def test_cursor_yields_all_events_and_saves_high_water(mocker, store, query):
+    search = FakeFileEventSearch(mocker, EVENTS)
+    cursor = FileEventCursor(search, query, store, name="test")
+    assert list(cursor) == EVENTS
+    checkpoint = store.load("test")
+    assert checkpoint["high_water_timestamp"] == EVENTS[-1]["@timestamp"]
+    assert checkpoint["page_token"] is None
+    assert checkpoint["query_fingerprint"] == get_query_fingerprint(query)
+
+
+def test_cursor_sorts_by_timestamp_and_escapes_page_tokens(mocker, store, query):
+    events = [create_event('id"1', 1), create_event("id2", 2), create_event("id3", 3)]
+    search = FakeFileEventSearch(mocker, events, page_size=1)
+    list(FileEventCursor(search, query, store))
+    assert search.queries[0]["srtKey"] == "@timestamp"
+    assert search.queries[1]["pgToken"] == 'id\\"1'
+
+
+def test_new_cursor_resumes_where_stopped_cursor_left_off(mocker, store, query):
+    search = FakeFileEventSearch(mocker, EVENTS)
+    cursor = FileEventCursor(search, query, store)
+    events = cursor.__iter__()
+    first = list(islice(events, 3))
+    events.close()
+
+    resumed = list(FileEventCursor(search, query, store))
+    assert first + resumed == EVENTS
+
+
+def test_cursor_iterated_again_only_yields_new_events(mocker, store, query):
+    search = FakeFileEventSearch(mocker, EVENTS)
+    cursor = FileEventCursor(search, query, store)
+    list(cursor)
+    new_events = [create_event("same-second", 4), create_event("5", 5)]
+    search.events.extend(new_events)
+
+    assert list(FileEventCursor(search, query, store)) == new_events
+    last_query_groups = search.queries[-1]["groups"]
+    assert last_query_groups[-1]["filters"][0]["value"] == EVENTS[-1]["@timestamp"]
+
+
+def test_cursor_when_page_token_expired_continues_from_high_water(mocker, store, query):
+    search = FakeFileEventSearch(mocker, EVENTS)
+    events = FileEventCursor(search, query, store).__iter__()
+    first = list(islice(events, 3))
+    events.close()
+    search.invalid_tokens.add(store.load("default")["page_token"])
+
+    assert first + list(FileEventCursor(search, query, store)) == EVENTS
+
+
+def test_cursor_for_different_query_raises_py42_error(mocker, store, query):
+    search = FakeFileEventSearch(mocker, EVENTS)
+    list(FileEventCursor(search, query, store))
+    other_query = FileEventQuery.all(Category.is_in(["Image"]))
+    with pytest.raises(Py42Error):
+        FileEventCursor(search, other_query, store)
+
+
+def test_cursor_reset_starts_over(mocker, store, query):
+    search = FakeFileEventSearch(mocker, EVENTS)
+    cursor = FileEventCursor(search, query, store)
+    list(cursor)
+    cursor.reset()
+    assert store.load("default") is None
+    assert list(cursor) == EVENTS
+
+
+def test_cursor_follow_polls_for_new_events(mocker, store, query):
+    search = FakeFileEventSearch(mocker, EVENTS[:2])
+    sleep = mocker.patch("py42.clients.fileeventcursor.time.sleep")
+    sleep.side_effect = lambda _: search.events.extend(EVENTS[2:])
+    cursor = FileEventCursor(search, query, store)
+    assert list(islice(cursor.follow(poll_interval=5), 5)) == EVENTS
+    sleep.assert_called_once_with(5)
+
+
+def test_cursor_with_v1_query_raises_py42_error(mocker, store):
+    with pytest.raises(Py42Error):
+        FileEventCursor(mocker.MagicMock(), FileEventQueryV1.all(), store)
+
+
+def test_query_fingerprint_ignores_paging(query):
+    fingerprint = get_query_fingerprint(query)
+    query.page_token = "abc"
+    query.page_size = 10
+    assert get_query_fingerprint(query) == fingerprint
+    assert get_query_fingerprint(FileEventQuery.all()) != fingerprint
+
+
+def test_checkpoint_stores_save_load_and_delete(store):
+    assert store.load("a") is None
+    store.save("a", {"page_token": "1"})
+    store.save("b", {"page_token": "2"})
+    assert store.load("a") == {"page_token": "1"}
+    store.delete("a")
+    assert store.load("a") is None
+    assert store.load("b") == {"page_token": "2"}
+
+
+def test_file_stores_sharing_a_file_keep_each_others_checkpoints(tmp_path):
+    path = str(tmp_path / "checkpoints.json")
+
+    def save_all(prefix):
+        # A store of its own, as another process would have.
+        store = FileCheckpointStore(path)
+        for index in range(20):
+            store.save(f"{prefix}{index}", {"offset": index})
+
+    threads = [threading.Thread(target=save_all, args=(p,)) for p in "ab"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    store = FileCheckpointStore(path)
+    assert store.load("a19") == {"offset": 19}
+    assert store.load("b19") == {"offset": 19}
+    assert all(store.load(f"{p}{i}") for p in "ab" for i in range(20))
@@ -0,0 +1,147 @@
+import json
+import threading
+from datetime import datetime
+from datetime import timezone
+
+import pytest
+from tests.conftest import create_mock_response
+
+from py42.clients._fileeventexport import export_file_events
+from py42.exceptions import Py42Error
+from py42.sdk.queries.fileevents.file_event_query import (
+    FileEventQuery as FileEventQueryV1,
+)
+from py42.sdk.queries.fileevents.v2.file_event_query import FileEventQuery
+from py42.sdk.queries.fileevents.v2.filters.file import Category
+
+START = datetime(2022, 1, 1, tzinfo=timezone.utc)
+START_MS = int(START.timestamp() * 1000)
+
+
+def to_millis(timestamp_str):
+    date = datetime.strptime(timestamp_str, "%Y-%m-%dT%H:%M:%S.%fZ")
+    return int(date.replace(tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def create_event(event_id, millis):
+    date = datetime.fromtimestamp(millis / 1000, timezone.utc)
+    return {
+        "@timestamp": date.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z",
+        "event": {"id": event_id},
+    }
+
+
+class FakeFileEventSearch:
+    """Serves pages of ``events`` that fall within the query's ``@timestamp`` range."""
+
+    def __init__(self, mocker, events):
+        self._mocker = mocker
+        self._events = sorted(events, key=lambda e: e["@timestamp"])
+        self._lock = threading.Lock()
+        self.queries = []
+
+    def __call__(self, query):
+        query_dict = dict(query)
+        with self._lock:
+            self.queries.append(query_dict)
+        start, end = None, None
+        for group in query_dict["groups"]:
+            for query_filter in group["filters"]:
+                if query_filter["term"] == "@timestamp":
+                    if query_filter["operator"] == "ON_OR_AFTER":
+                        start = to_millis(query_filter["value"])
+                    else:
+                        end = to_millis(query_filter["value"])
+        matches = [
+            e for e in self._events if start <= to_millis(e["@timestamp"]) <= end
+        ]
+        offset = int(query_dict["pgToken"] or 0)
+        next_offset = min(offset + query_dict["pgSize"], len(matches))
+        page = matches[offset:next_offset]
+        body = {
+            "totalCount": len(matches),
+            "fileEvents": page,
+            "nextPgToken": str(next_offset) if next_offset < len(matches) else None,
+            "problems": None,
+        }
+        return create_mock_response(self._mocker, json.dumps(body))
+
+
+def create_events(count, spacing_ms=1000):
+    return [create_event(str(i), START_MS + i * spacing_ms) for i in range(count)]
+
+
+def export(search, query, end_offset_ms, concurrency=4, max_window_events=10000):
+    end = (START_MS + end_offset_ms) / 1000
+    events = export_file_events(
+        search,
+        query,
+        START,
+        end,
+        concurrency,
+        max_window_events=max_window_events,
+    )
+    return list(events)
+
+
+def test_export_file_events_yields_all_events_in_timestamp_order(mocker):
+    events = create_events(50)
+    search = FakeFileEventSearch(mocker, list(reversed(events)))
+    query = FileEventQuery.all(Category.is_in(["Document"]))
+    query.page_size = 7
+    assert export(search, query, 50 * 1000) == events
+
+
+def test_export_file_events_adds_window_range_to_query_groups(mocker):
+    search = FakeFileEventSearch(mocker, create_events(10))
+    query = FileEventQuery.all(Category.is_in(["Document"]))
+    export(search, query, 10 * 1000, concurrency=2)
+    for query_dict in search.queries:
+        assert query_dict["groups"][0] == dict(Category.is_in(["Document"]))
+        assert query_dict["srtKey"] == "@timestamp"
+        assert query_dict["srtDir"] == "asc"
+    assert len(query._filter_group_list) == 1
+
+
+def test_export_file_events_splits_windows_with_too_many_events(mocker):
+    # Dense at the start of the range, sparse afterwards.
+    events = create_events(40, spacing_ms=10) + [
+        create_event("late", START_MS + 60 * 1000)
+    ]
+    search = FakeFileEventSearch(mocker, events)
+    query = FileEventQuery.all()
+    exported = export(search, query, 60 * 1000, concurrency=2, max_window_events=10)
+    assert exported == events
+    window_sizes = [
+        to_millis(g["filters"][1]["value"]) - to_millis(g["filters"][0]["value"]) + 1
+        for g in (q["groups"][-1] for q in search.queries)
+    ]
+    assert min(window_sizes) < 30 * 1000
+
+
+def test_export_file_events_removes_duplicate_events(mocker):
+    events = create_events(5)
+    duplicate = dict(events[2])
+    search = FakeFileEventSearch(mocker, events + [duplicate])
+    query = FileEventQuery.all()
+    query.page_size = 2
+    assert export(search, query, 5 * 1000) == events
+
+
+def test_export_file_events_when_end_before_start_raises_py42_error(mocker):
+    search = FakeFileEventSearch(mocker, [])
+    with pytest.raises(Py42Error):
+        export_file_events(search, FileEventQuery.all(), START, START_MS / 1000 - 1, 2)
+
+
+def test_export_file_events_when_query_matches_any_group_raises_py42_error(mocker):
+    search = FakeFileEventSearch(mocker, [])
+    query = FileEventQuery.any(Category.is_in(["Document"]))
+    with pytest.raises(Py42Error):
+        export_file_events(search, query, START, START, 2)
+
+
+def test_export_file_events_when_query_is_v1_raises_py42_error(mocker):
+    search = FakeFileEventSearch(mocker, [])
+    with pytest.raises(Py42Error):
+        export_file_events(search, FileEventQueryV1.all(), START, START, 2)
@@ -0,0 +1,149 @@
+import io
+import json
+import sys
+
+import pytest
+from tests.conftest import create_mock_response
+
+from py42.clients.fileeventsinks import ArrowFileEventSink
+from py42.clients.fileeventsinks import FILE_EVENT_COLUMNS
+from py42.clients.fileeventsinks import flatten_file_event
+from py42.clients.fileeventsinks import iter_numpy_batches
+from py42.clients.fileeventsinks import NdjsonFileEventSink
+from py42.clients.fileeventsinks import ParquetFileEventSink
+from py42.exceptions import Py42Error
+from py42.sdk.queries.fileevents.v2.filters import file
+from py42.sdk.queries.fileevents.v2.filters import risk
+
+FILE_EVENT = {
+    "@timestamp": "2022-01-01T00:00:00.000Z",
+    "event": {"id": "event-1", "action": "file-modified"},
+    "user": {"email": "test@example.com"},
+    "file": {
+        "name": "report.docx",
+        "sizeInBytes": 1024,
+        "hash": {"md5": "md5-1", "sha256": "sha256-1"},
+        "classifications": [{"value": "CONFIDENTIAL", "vendor": "MIP"}],
+    },
+    "source": {"tabs": [{"url": "https://a.example.com"}, {"url": None}]},
+    "destination": {"email": {"recipients": ["a@example.com", "b@example.com"]}},
+    "risk": {
+        "indicators": [{"name": "Zip", "weight": 3}, {"name": "Remote", "weight": 5}],
+        "score": 8,
+        "trusted": False,
+    },
+}
+
+
+def create_page(mocker, events):
+    body = {"fileEvents": events, "nextPgToken": None, "totalCount": len(events)}
+    return create_mock_response(mocker, json.dumps(body))
+
+
+def create_events(count):
+    events = []
+    for i in range(count):
+        event = json.loads(json.dumps(FILE_EVENT))
+        event["event"]["id"] = f"event-{i}"
+        events.append(event)
+    return events
+
+
+def test_file_event_columns_match_filter_terms():
+    assert FILE_EVENT_COLUMNS[0] == "@timestamp"
+    assert file.MD5._term in FILE_EVENT_COLUMNS
+    assert risk.Indicators._term in FILE_EVENT_COLUMNS
+    assert len(FILE_EVENT_COLUMNS) == len(set(FILE_EVENT_COLUMNS))
+
+
+def test_flatten_file_event_flattens_nested_fields():
+    flattened = flatten_file_event(FILE_EVENT)
+    assert set(flattened) == set(FILE_EVENT_COLUMNS)
+    assert flattened["file.hash.md5"] == "md5-1"
+    assert flattened["file.sizeInBytes"] == 1024
+    assert flattened["risk.indicators.name"] == ["Zip", "Remote"]
+    assert flattened["risk.indicators.weight"] == [3, 5]
+    assert flattened["risk.trusted"] is False
+    assert flattened["source.tabs.url"] == ["https://a.example.com", None]
+    assert flattened["destination.email.recipients"] == [
+        "a@example.com",
+        "b@example.com",
+    ]
+    assert flattened["process.executable"] is None
+
+
+def test_flatten_file_event_serializes_objects_in_string_columns():
+    flattened = flatten_file_event(FILE_EVENT, columns=["file.hash", "event.id"])
+    assert flattened == {
+        "file.hash": '{"md5": "md5-1", "sha256": "sha256-1"}',
+        "event.id": "event-1",
+    }
+
+
+def test_ndjson_sink_writes_one_line_per_event(mocker):
+    output = io.StringIO()
+    with NdjsonFileEventSink(output) as sink:
+        sink.write_pages([create_page(mocker, create_events(3)), {"fileEvents": []}])
+    lines = output.getvalue().splitlines()
+    assert [json.loads(line)["event"]["id"] for line in lines] == [
+        "event-0",
+        "event-1",
+        "event-2",
+    ]
+    assert sink.event_count == 3
+
+
+def test_ndjson_sink_when_flatten_writes_flattened_events(tmp_path):
+    path = str(tmp_path / "events.ndjson")
+    with NdjsonFileEventSink(path, flatten=True, columns=["event.id"]) as sink:
+        sink.write_pages(create_events(2))
+    with open(path) as ndjson_file:
+        assert (
+            ndjson_file.read() == '{"event.id": "event-0"}\n{"event.id": "event-1"}\n'
+        )
+
+
+def test_parquet_sink_writes_row_groups_of_row_group_size(mocker, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "events.parquet")
+    with ParquetFileEventSink(path, row_group_size=4) as sink:
+        sink.write(create_page(mocker, create_events(6)))
+        sink.write(create_page(mocker, create_events(3)))
+    parquet_file = pq.ParquetFile(path)
+    assert parquet_file.metadata.num_rows == 9
+    assert parquet_file.metadata.num_row_groups == 3
+    table = parquet_file.read()
+    assert table.column_names == FILE_EVENT_COLUMNS
+    assert table.column("risk.indicators.name").to_pylist()[0] == ["Zip", "Remote"]
+    assert table.column("file.sizeInBytes").to_pylist()[0] == 1024
+
+
+def test_arrow_sink_writes_record_batches(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    path = str(tmp_path / "events.arrow")
+    with ArrowFileEventSink(path, row_group_size=2, columns=["event.id"]) as sink:
+        sink.write(create_events(3))
+    reader = pa.ipc.open_file(path)
+    assert reader.num_record_batches == 2
+    assert reader.read_all().column("event.id").to_pylist() == [
+        "event-0",
+        "event-1",
+        "event-2",
+    ]
+
+
+def test_iter_numpy_batches_yields_column_arrays(mocker):
+    np = pytest.importorskip("numpy")
+    pages = [create_page(mocker, create_events(3)), create_page(mocker, [{}])]
+    batches = list(iter_numpy_batches(pages, batch_size=3))
+    assert len(batches) == 2
+    assert list(batches[0]["event.id"]) == ["event-0", "event-1", "event-2"]
+    assert batches[0]["file.sizeInBytes"].dtype == np.float64
+    assert np.isnan(batches[1]["file.sizeInBytes"][0])
+    assert batches[1]["risk.indicators.name"][0] is None
+
+
+def test_parquet_sink_without_pyarrow_raises_py42_error(mocker, tmp_path):
+    mocker.patch.dict(sys.modules, {"pyarrow": None})
+    with pytest.raises(Py42Error):
+        ParquetFileEventSink(str(tmp_path / "events.parquet"))
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 import requests
 from tests.conftest import create_mock_response
@@ -6,6 +8,9 @@ from py42.clients.securitydata import SecurityDataClient
 from py42.exceptions import Py42ChecksumNotFoundError
 from py42.exceptions import Py42Error
 from py42.sdk.queries.fileevents.file_event_query import FileEventQuery
+from py42.sdk.queries.fileevents.v2.file_event_query import (
+    FileEventQuery as FileEventQueryV2,
+)
 from py42.services._connection import Connection
 from py42.services.fileevent import FileEventService
 from py42.services.preservationdata import PreservationDataService
@@ -492,3 +497,202 @@ class TestSecurityClient:
             storage_service_factory,
         )
         security_client.search_all_file_events(FileEventQuery.all(), page_token=None)
+
+    def test_iter_file_events_follows_page_tokens_and_yields_events(
+        self,
+        mocker,
+        preservation_data_service,
+        saved_search_service,
+        storage_service_factory,
+    ):
+        file_event_service = mocker.MagicMock(spec=FileEventService)
+        file_event_service.search.side_effect = [
+            create_mock_response(
+                mocker, '{"fileEvents": [{"id": 1}, {"id": 2}], "nextPgToken": "a"}'
+            ),
+            create_mock_response(
+                mocker, '{"fileEvents": [{"id": 3}], "nextPgToken": null}'
+            ),
+        ]
+        security_client = SecurityDataClient(
+            file_event_service,
+            preservation_data_service,
+            saved_search_service,
+            storage_service_factory,
+        )
+        query = FileEventQuery.all()
+        events = list(security_client.iter_file_events(query))
+        assert events == [{"id": 1}, {"id": 2}, {"id": 3}]
+        assert file_event_service.search.call_count == 2
+        assert file_event_service.search.call_args[1] == {"stream": True}
+        assert query.page_token == "a"
+
+    def test_export_file_events_searches_windows_and_yields_events(
+        self,
+        mocker,
+        preservation_data_service,
+        saved_search_service,
+        storage_service_factory,
+    ):
+        file_event_service = mocker.MagicMock(spec=FileEventService)
+        file_event_service.search.return_value = create_mock_response(
+            mocker,
+            '{"totalCount": 1, "fileEvents": [{"@timestamp": "2022-01-01T00:00:00.000Z", '
+            '"event": {"id": "1"}}], "nextPgToken": null}',
+        )
+        security_client = SecurityDataClient(
+            file_event_service,
+            preservation_data_service,
+            saved_search_service,
+            storage_service_factory,
+        )
+        events = list(
+            security_client.export_file_events(
+                FileEventQueryV2.all(), 1640995200, 1640995201, concurrency=1
+            )
+        )
+        assert events == [
+            {"@timestamp": "2022-01-01T00:00:00.000Z", "event": {"id": "1"}}
+        ]
+        query = file_event_service.search.call_args[0][0]
+        assert dict(query)["groups"][-1]["filters"][0]["value"] == (
+            "2022-01-01T00:00:00.000Z"
+        )
+
+    def test_download_files_by_sha256_searches_chunks_and_writes_files(
+        self, mocker, tmp_path, pds_config
+    ):
+        def search(query):
+            hashes = dict(query)["groups"][0]["filters"]
+            events = [
+                {
+                    "@timestamp": "2022-01-01T00:00:00.000Z",
+                    "user": {"deviceUid": "device-1"},
+                    "file": {
+                        "name": "name",
+                        "directory": "/dir/",
+                        "hash": {"md5": "md5", "sha256": f["value"]},
+                    },
+                }
+                for f in hashes
+                if f["value"] != "missing"
+            ]
+            return create_mock_response(
+                mocker, json.dumps({"fileEvents": events, "nextPgToken": None})
+            )
+
+        pds_config.file_event_service.search.side_effect = search
+        file_response = mocker.MagicMock()
+        file_response.iter_content.return_value = [b"file ", b"content"]
+        pds_config.exfiltration_client.get_file.return_value = file_response
+        security_client = SecurityDataClient(
+            pds_config.file_event_service,
+            pds_config.preservation_data_service,
+            pds_config.saved_search_service,
+            pds_config.storage_service_factory,
+        )
+
+        results = security_client.download_files_by_sha256(
+            ["sha-1", "missing", "sha-2"], str(tmp_path), chunk_size=2
+        )
+
+        assert list(results) == ["sha-1", "missing", "sha-2"]
+        assert results["sha-1"] == str(tmp_path / "sha-1")
+        assert (tmp_path / "sha-2").read_bytes() == b"file content"
+        assert isinstance(results["missing"], Py42ChecksumNotFoundError)
+        assert pds_config.file_event_service.search.call_count == 2
+        assert (
+            pds_config.storage_service_factory.create_exfiltrated_data_service.call_count
+            == 1
+        )
+
+    def test_download_files_by_sha256_when_hash_never_matches_stops_paging(
+        self, mocker, tmp_path, pds_config
+    ):
+        event = {
+            "@timestamp": "2022-01-01T00:00:00.000Z",
+            "user": {"deviceUid": "device-1"},
+            "file": {
+                "name": "name",
+                "directory": "/dir/",
+                "hash": {"md5": "md5", "sha256": "sha-1"},
+            },
+        }
+        # Every page has another after it.
+        pds_config.file_event_service.search.side_effect = lambda query: (
+            create_mock_response(
+                mocker, json.dumps({"fileEvents": [event], "nextPgToken": "next"})
+            )
+        )
+        file_response = mocker.MagicMock()
+        file_response.iter_content.return_value = [b"file content"]
+        pds_config.exfiltration_client.get_file.return_value = file_response
+        security_client = SecurityDataClient(
+            pds_config.file_event_service,
+            pds_config.preservation_data_service,
+            pds_config.saved_search_service,
+            pds_config.storage_service_factory,
+        )
+
+        results = security_client.download_files_by_sha256(
+            ["sha-1", "missing"], str(tmp_path)
+        )
+
+        assert pds_config.file_event_service.search.call_count == 2
+        assert results["sha-1"] == str(tmp_path / "sha-1")
+        assert isinstance(results["missing"], Py42ChecksumNotFoundError)
+
+    def test_download_files_by_sha256_when_stream_fails_removes_partial_file(
+        self, mocker, tmp_path, pds_config
+    ):
+        event = {
+            "@timestamp": "2022-01-01T00:00:00.000Z",
+            "user": {"deviceUid": "device-1"},
+            "file": {
+                "name": "name",
+                "directory": "/dir/",
+                "hash": {"md5": "md5", "sha256": "sha-1"},
+            },
+        }
+        pds_config.file_event_service.search.return_value = create_mock_response(
+            mocker, json.dumps({"fileEvents": [event], "nextPgToken": None})
+        )
+
+        def iter_content(chunk_size):
+            yield b"file "
+            raise OSError("connection reset")
+
+        file_response = mocker.MagicMock()
+        file_response.iter_content.side_effect = iter_content
+        pds_config.exfiltration_client.get_file.return_value = file_response
+        security_client = SecurityDataClient(
+            pds_config.file_event_service,
+            pds_config.preservation_data_service,
+            pds_config.saved_search_service,
+            pds_config.storage_service_factory,
+        )
+
+        results = security_client.download_files_by_sha256(["sha-1"], str(tmp_path))
+
+        assert isinstance(results["sha-1"], OSError)
+        assert not list(tmp_path.iterdir())
+
+    def test_download_files_by_md5_when_download_fails_returns_error(
+        self, mocker, tmp_path, pds_config
+    ):
+        pds_config.preservation_data_service.get_file_version_list.return_value = (
+            create_mock_response(mocker, XFC_NOT_FOUND_RESPONSE)
+        )
+        security_client = SecurityDataClient(
+            pds_config.file_event_service,
+            pds_config.preservation_data_service,
+            pds_config.saved_search_service,
+            pds_config.storage_service_factory,
+        )
+
+        results = security_client.download_files_by_md5(["testmd5-2"], str(tmp_path))
+
+        assert isinstance(results["testmd5-2"], Py42Error)
+        query = pds_config.file_event_service.search.call_args[0][0]
+        assert dict(query)["groups"][0]["filters"][0]["term"] == "file.hash.md5"
+        assert not list(tmp_path.iterdir())
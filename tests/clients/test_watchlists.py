@@ -37,6 +37,14 @@ class TestWatchlistsClient:
         watchlists_client.get_all()
         assert mock_watchlists_service.get_all.call_count == 1
 
+    def test_iter_items_calls_service_with_expected_params(
+        self,
+        mock_watchlists_service,
+    ):
+        watchlists_client = WatchlistsClient(mock_watchlists_service)
+        watchlists_client.iter_items()
+        assert mock_watchlists_service.iter_items.call_count == 1
+
     def test_create_calls_service_with_expected_params(
         self,
         mock_watchlists_service,
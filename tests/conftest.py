@@ -9,6 +9,7 @@ from py42.exceptions import Py42NotFoundError
 from py42.exceptions import Py42UnauthorizedError
 from py42.response import Py42Response
 from py42.sdk.queries.query_filter import QueryFilter
+from py42.services._connection import AsyncConnection
 from py42.services._connection import Connection
 from py42.usercontext import UserContext
 
@@ -188,6 +189,11 @@ def mock_connection(mocker):
     return connection
 
 
+@pytest.fixture
+def mock_async_connection(mocker):
+    return mocker.MagicMock(spec=AsyncConnection)
+
+
 @pytest.fixture
 def mock_successful_connection(mock_connection, successful_response):
     mock_connection.get.return_value = successful_response
@@ -1,3 +1,5 @@
+import json
+
 from py42.sdk.queries.fileevents.file_event_query import FileEventQuery
 from py42.sdk.queries.fileevents.v2.file_event_query import (
     FileEventQuery as FileEventQueryV2,
@@ -170,3 +172,31 @@ def test_file_event_str_gives_correct_json_representation_when_using_v2_data(
         str(query)
         == '{"groupClause":"AND", "groups":[], "srtDir":"asc", "srtKey":"event.id", "pgNum":1, "pgSize":500}'
     )
+
+
+def test_file_event_query_compile_page_gives_expected_dict_representation(
+    event_filter_group,
+):
+    query = FileEventQueryV2(event_filter_group)
+    page = query.compile().page(page_number=3)
+    query.page_number = 3
+    assert page == dict(query)
+    assert json.loads(page.encoded) == dict(query)
+    page = query.compile().page(page_token='a"b')
+    query.page_token = 'a"b'
+    assert page == dict(query)
+    assert json.loads(page.encoded) == dict(query)
+
+
+def test_file_event_query_compile_returns_same_object_until_query_changes(
+    event_filter_group,
+):
+    query = FileEventQueryV2(event_filter_group)
+    compiled = query.compile()
+    query.page_token = "abc"
+    assert query.compile() is compiled
+    query.sort_direction = "desc"
+    assert query.compile() is not compiled
+    compiled = query.compile()
+    event_filter_group.filter_clause = "OR"
+    assert query.compile() is not compiled
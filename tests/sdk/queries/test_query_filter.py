@@ -1,3 +1,4 @@
+import pickle
 from datetime import datetime
 
 import pytest
@@ -402,6 +403,51 @@ def test_filter_group_when_changed_filter_clause_has_correct_json_representation
     )
 
 
+def test_query_filter_with_equal_args_returns_same_object():
+    query_filter = QueryFilter("term", "IS", "value")
+    assert QueryFilter("term", "IS", "value") is query_filter
+    assert QueryFilter.from_dict(dict(query_filter)) is query_filter
+    assert QueryFilter("term", "IS", 1) is not QueryFilter("term", "IS", True)
+
+
+def test_query_filter_with_unhashable_value_returns_new_object():
+    query_filter = QueryFilter("term", "IS", ["value"])
+    assert QueryFilter("term", "IS", ["value"]) is not query_filter
+    assert QueryFilter("term", "IS", ["value"]) == query_filter
+
+
+def test_query_filter_is_immutable():
+    query_filter = QueryFilter("term", "IS", "value")
+    with pytest.raises(AttributeError):
+        query_filter._value = "other"
+    with pytest.raises(AttributeError):
+        query_filter.value = "other"
+    assert str(query_filter) == '{"operator":"IS", "term":"term", "value":"value"}'
+
+
+def test_query_filter_pickles_to_same_object():
+    query_filter = QueryFilter("term", "IS", "value")
+    assert pickle.loads(pickle.dumps(query_filter)) is query_filter
+
+
+def test_filter_group_str_is_reused():
+    group = create_is_in_filter_group("term", [f"value{i}" for i in range(100)])
+    assert str(group) is str(group)
+
+
+def test_filter_group_after_filter_list_changed_has_correct_json_representation():
+    group = create_filter_group([QueryFilter("term", "IS", "value")], "AND")
+    assert "other" not in str(group)
+    group.filter_list.append(QueryFilter("term", "IS", "other"))
+    assert '"value":"other"' in str(group)
+    assert QueryFilter("term", "IS", "other") in group
+    group.filter_list[:] = [QueryFilter("term", "IS", "replaced")]
+    assert str(group) == (
+        '{"filterClause":"AND", "filters":'
+        '[{"operator":"IS", "term":"term", "value":"replaced"}]}'
+    )
+
+
 class Test_QueryFilterTimestampField:
     @pytest.mark.parametrize(
         "timestamp",
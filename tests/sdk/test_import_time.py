@@ -0,0 +1,69 @@
+"""Guards SDK startup cost by importing py42 in a fresh interpreter with ``-X importtime``
+and checking which modules were loaded."""
+import subprocess
+import sys
+
+# Creating an SDK client should import no more than these py42 modules.
+STARTUP_MODULES = {
+    "py42",
+    "py42.__version__",
+    "py42._jsonstream",
+    "py42.connectionpool",
+    "py42.exceptions",
+    "py42.jsoncodec",
+    "py42.response",
+    "py42.retry",
+    "py42.sdk",
+    "py42.services",
+    "py42.services._auth",
+    "py42.services._connection",
+    "py42.services._keyvaluestore",
+    "py42.settings",
+    "py42.settings.debug",
+    "py42.usercontext",
+    "py42.util",
+}
+
+CREATE_CLIENT = (
+    "import py42.sdk\n"
+    "from py42.services._connection import Connection\n"
+    "connection = Connection.from_host_address('https://example.com')\n"
+    "sdk = py42.sdk.SDKClient(connection, None)\n"
+)
+
+
+def get_imported_modules(code):
+    """Returns the cumulative import time, in microseconds, of each module imported by
+    ``code``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def test_creating_sdk_client_imports_only_startup_modules():
+    modules = get_imported_modules(CREATE_CLIENT)
+    py42_modules = {name for name in modules if name.split(".")[0] == "py42"}
+    assert py42_modules <= STARTUP_MODULES
+
+
+def test_creating_sdk_client_does_not_import_asyncio():
+    assert "asyncio" not in get_imported_modules(CREATE_CLIENT)
+
+
+def test_using_a_client_imports_only_its_modules():
+    modules = get_imported_modules(CREATE_CLIENT + "sdk.users\n")
+    assert "py42.services.users" in modules
+    assert "py42.services.alerts" not in modules
+    assert "py42.clients.securitydata" not in modules
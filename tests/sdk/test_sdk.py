@@ -1,12 +1,21 @@
+import threading
+
 import pytest
 from requests import Session
 from tests.conftest import create_mock_response
 
+import py42.sdk
+from py42.circuitbreaker import CircuitBreaker
 from py42.clients.alerts import AlertsClient
 from py42.clients.archive import ArchiveClient
 from py42.clients.auditlogs import AuditLogsClient
 from py42.clients.cases import CasesClient
+from py42.connectionpool import PoolingHTTPAdapter
+from py42.exceptions import Py42FeatureUnavailableError
 from py42.exceptions import Py42UnauthorizedError
+from py42.hostcache import FileHostCache
+from py42.retry import RateLimiter
+from py42.retry import RetryPolicy
 from py42.sdk import from_local_account
 from py42.sdk import SDKClient
 from py42.services import administration
@@ -17,6 +26,8 @@ from py42.services import orgs
 from py42.services import users
 from py42.services._auth import C42RenewableAuth
 from py42.services._connection import Connection
+from py42.services._connection import create_session
+from py42.services._connection import ROOT_SESSION
 from py42.usercontext import UserContext
 
 
@@ -88,6 +99,147 @@ class TestSDK:
         client = SDKClient(py42_connection, mock_auth)
         assert type(client.cases) == CasesClient
 
+    def test_clients_are_created_once(self, py42_connection, mock_auth):
+        client = SDKClient(py42_connection, mock_auth)
+        assert client.alerts is client.alerts
+        assert client.alerts._alert_rules_client is client.alerts.rules
+
+    def test_services_shared_by_clients_are_created_once(
+        self, py42_connection, mock_auth
+    ):
+        client = SDKClient(py42_connection, mock_auth)
+        assert client.userriskprofile._user_service is client.users
+
+    def test_clients_created_on_many_threads_are_created_once(
+        self, py42_connection, mock_auth
+    ):
+        client = SDKClient(py42_connection, mock_auth)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(client.securitydata))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert all(result is results[0] for result in results)
+
+    def test_auth_metrics_returns_auth_metrics(self, py42_connection, mock_auth):
+        mock_auth.metrics = {"refreshes": 1}
+        client = SDKClient(py42_connection, mock_auth)
+        assert client.auth_metrics == {"refreshes": 1}
+
+    def test_warm_up_resolves_microservice_hosts_concurrently(
+        self, mocker, py42_connection, mock_auth
+    ):
+        # Each of the 8 microservice lookups waits for all of the others to start.
+        barrier = threading.Barrier(8, timeout=5)
+
+        def get_host_address(resolver):
+            barrier.wait()
+            if resolver._key == "CASES_API-URL":
+                raise Py42FeatureUnavailableError(mocker.MagicMock())
+            return f"https://{resolver._key}.example.com"
+
+        mocker.patch(
+            "py42.services._connection.MicroserviceKeyHostResolver.get_host_address",
+            get_host_address,
+        )
+        py42_connection.host_address = HOST_ADDRESS
+        client = SDKClient(py42_connection, mock_auth)
+        hosts = client.warm_up()
+        assert hosts["alerts"] == "https://AlertService-API_URL.example.com"
+        assert hosts["savedsearch"] == "https://FORENSIC_SEARCH-API_URL.example.com"
+        assert hosts["users"] == HOST_ADDRESS
+        assert isinstance(hosts["cases"], Py42FeatureUnavailableError)
+        assert isinstance(hosts["casesfileevents"], Py42FeatureUnavailableError)
+
+    def test_warm_up_with_host_cache_uses_cached_hosts(
+        self, mock_session, mock_auth, tmp_path
+    ):
+        cache = FileHostCache(str(tmp_path / "hosts.json"))
+        cache.set(f"{HOST_ADDRESS}|AlertService-API_URL", "https://alerts.example.com")
+        connection = Connection.from_host_address(HOST_ADDRESS, session=mock_session)
+        mock_session.send.side_effect = Exception("offline")
+        client = SDKClient(connection, mock_auth, host_cache=cache)
+        hosts = client.warm_up(max_workers=2)
+        assert hosts["alerts"] == "https://alerts.example.com"
+        assert isinstance(hosts["fileevents"], Exception)
+
+    def test_from_api_client_with_token_store_shares_token_by_host_and_client_id(
+        self, mocker
+    ):
+        api_client_auth = mocker.patch("py42.sdk.ApiClientAuth")
+        mocker.patch("py42.sdk._init_services", return_value=({}, None))
+        mocker.patch("py42.sdk._init_clients")
+        store = mocker.MagicMock()
+        SDKClient.from_api_client(
+            HOST_ADDRESS, "client-id", "secret", token_store=store
+        )
+        kwargs = api_client_auth.call_args[1]
+        assert kwargs["token_store"] is store
+        assert kwargs["token_key"] == f"api-client|{HOST_ADDRESS}|client-id"
+
+    def test_from_api_client_with_http_adapter_sends_requests_with_adapter(
+        self, mocker
+    ):
+        mocker.patch("py42.sdk.ApiClientAuth")
+        mocker.patch("py42.sdk._init_services", return_value=({}, None))
+        mocker.patch("py42.sdk._init_clients")
+        adapter = PoolingHTTPAdapter(maxsize=16)
+        SDKClient.from_api_client(
+            HOST_ADDRESS, "client-id", "secret", http_adapter=adapter
+        )
+        main_connection = py42.sdk._init_services.call_args[0][0]
+        assert main_connection.session.get_adapter(HOST_ADDRESS) is adapter
+        assert main_connection.session is not ROOT_SESSION
+
+    def test_from_api_client_creates_a_session_for_each_client(self, mocker):
+        mocker.patch("py42.sdk.ApiClientAuth")
+        mocker.patch("py42.sdk._init_services", return_value=({}, None))
+        mocker.patch("py42.sdk._init_clients")
+        SDKClient.from_api_client(HOST_ADDRESS, "client-id", "secret")
+        SDKClient.from_api_client(HOST_ADDRESS, "other-client-id", "secret")
+        first, second = [
+            call[0][0].session for call in py42.sdk._init_services.call_args_list
+        ]
+        assert first is not second
+        assert ROOT_SESSION not in (first, second)
+        assert first.get_adapter(HOST_ADDRESS) is not second.get_adapter(HOST_ADDRESS)
+
+    def test_from_api_client_shares_resilience_settings_with_all_connections(
+        self, mocker
+    ):
+        mocker.patch("py42.sdk.ApiClientAuth")
+        policy = RetryPolicy(max_retries=1)
+        limiter = RateLimiter(rate=10)
+        breaker = CircuitBreaker()
+        client = SDKClient.from_api_client(
+            HOST_ADDRESS,
+            "client-id",
+            "secret",
+            retry_policy=policy,
+            rate_limiter=limiter,
+            circuit_breaker=breaker,
+        )
+        for connection in client._services.connections.values():
+            assert connection.retry_policy is policy
+            assert connection.rate_limiter is limiter
+            assert connection.circuit_breaker is breaker
+
+    def test_connection_pool_stats_returns_stats_of_each_host(self, mock_auth):
+        adapter = PoolingHTTPAdapter(maxsize=16)
+        connection = Connection.from_host_address(
+            HOST_ADDRESS, session=create_session(adapter)
+        )
+        pool = adapter.poolmanager.connection_from_url(HOST_ADDRESS)
+        pool._put_conn(pool._get_conn())
+        client = SDKClient(connection, mock_auth)
+        stats = client.connection_pool_stats[pool.host]
+        assert stats["maxsize"] == 16
+        assert stats["checkouts"] == 1
+
     def test_from_local_account_when_unauthorized_calls_loginConfig_and_returns_config_value_on_raised_exception_text(
         self, mocker, mock_session, mock_auth, unauthorized_response
     ):
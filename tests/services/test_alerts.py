@@ -1,3 +1,6 @@
+import asyncio
+import json
+
 import pytest
 from requests import Response
 from tests.conftest import create_mock_response
@@ -8,6 +11,7 @@ from py42.sdk.queries.alerts.alert_query import AlertQuery
 from py42.sdk.queries.alerts.filters import AlertState
 from py42.services._connection import Connection
 from py42.services.alerts import AlertService
+from py42.services.alerts import AsyncAlertService
 
 
 TEST_RESPONSE = """
@@ -461,6 +465,43 @@ class TestAlertService:
             and post_data["groups"][0]["filters"][0]["value"] == "OPEN"
         )
 
+    def test_search_all_pages_posts_encoded_query_for_each_page(
+        self, mocker, mock_connection, user_context
+    ):
+        mock_connection.post.side_effect = [
+            create_mock_response(mocker, '{"alerts": [{"id": 1}]}'),
+            create_mock_response(mocker, '{"alerts": []}'),
+        ]
+        alert_service = AlertService(mock_connection, user_context)
+        query = AlertQuery(AlertState.eq("OPEN"))
+        query.page_size = 1
+
+        pages = list(alert_service.search_all_pages(query))
+
+        assert len(pages) == 2
+        bodies = [call[1]["json"] for call in mock_connection.post.call_args_list]
+        assert [json.loads(body.encoded)["pgNum"] for body in bodies] == [0, 1]
+        assert json.loads(bodies[1].encoded) == bodies[1]
+        assert bodies[1]["tenantId"] == TENANT_ID_FROM_RESPONSE
+
+    def test_search_all_pages_when_query_sets_tenant_id_keeps_it(
+        self, mock_connection, user_context
+    ):
+        class TenantAlertQuery(AlertQuery):
+            def __iter__(self):
+                for key, value in super().__iter__():
+                    yield key, "other-tenant" if key == "tenantId" else value
+
+        alert_service = AlertService(mock_connection, user_context)
+        query = TenantAlertQuery(AlertState.eq("OPEN"))
+
+        for _ in alert_service.search_all_pages(query):
+            break
+
+        post_data = mock_connection.post.call_args[1]["json"]
+        assert post_data["tenantId"] == "other-tenant"
+        assert json.loads(post_data.encoded)["tenantId"] == "other-tenant"
+
     def test_search_posts_expected_data_overwrites_default_option_when_passed_page_num_and_page_size(
         self, mock_connection, user_context
     ):
@@ -512,3 +553,40 @@ class TestAlertService:
             == "https://ffs-url-test.example.com"
             == response["alert"]["ffsUrlEndpoint"]
         )
+
+
+class TestAsyncAlertService:
+    def test_search_posts_expected_data(self, mock_async_connection, user_context):
+        alert_service = AsyncAlertService(mock_async_connection, user_context)
+        query = AlertQuery(AlertState.eq("OPEN"))
+        asyncio.run(alert_service.search(query))
+        uri = mock_async_connection.post.call_args[0][0]
+        post_data = mock_async_connection.post.call_args[1]["json"]
+        assert uri == "/svc/api/v1/query-alerts"
+        assert post_data["tenantId"] == TENANT_ID_FROM_RESPONSE
+        assert post_data["groups"][0]["filters"][0]["value"] == "OPEN"
+
+    def test_get_details_converts_json_observation_strings_to_objects(
+        self, mocker, mock_async_connection, user_context
+    ):
+        response = create_mock_response(mocker, TEST_PARSEABLE_ALERT_DETAIL_RESPONSE)
+        mock_async_connection.post.return_value = response
+        alert_service = AsyncAlertService(mock_async_connection, user_context)
+        response = asyncio.run(alert_service.get_details("alert-id"))
+        observation_data = response["alerts"][0]["observations"][0]["data"]
+        assert observation_data["example_key"] == "example_string_value"
+
+    def test_get_all_rules_yields_pages(
+        self, mocker, mock_async_connection, user_context
+    ):
+        mock_async_connection.post.return_value = create_mock_response(
+            mocker, TEST_RESPONSE
+        )
+        alert_service = AsyncAlertService(mock_async_connection, user_context)
+
+        async def collect():
+            return [page async for page in alert_service.get_all_rules()]
+
+        pages = asyncio.run(collect())
+        assert len(pages) == 1
+        assert mock_async_connection.post.call_args[1]["json"]["pgNum"] == 0
@@ -0,0 +1,156 @@
+import asyncio
+
+import pytest
+
+from py42.exceptions import Py42InternalServerError
+from py42.exceptions import Py42UnauthorizedError
+from py42.services._auth import C42RenewableAuth
+from py42.services._connection import AsyncConnection
+from py42.services._connection import Connection
+from py42.services._connection import HostResolver
+
+pytest.importorskip("aiohttp")
+
+HOST_ADDRESS = "http://example.com"
+URL = "/api/resource"
+TEST_RESPONSE_CONTENT = b'{"key": "test_response_content"}'
+
+
+class MockAioResponse:
+    def __init__(self, status, content=TEST_RESPONSE_CONTENT):
+        self.status = status
+        self.reason = "REASON"
+        self.headers = {"Content-Type": "application/json"}
+        self.url = HOST_ADDRESS + URL
+        self._content = content
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def read(self):
+        return self._content
+
+
+@pytest.fixture
+def mock_host_resolver(mocker):
+    mock = mocker.MagicMock(spec=HostResolver)
+    mock.get_host_address.return_value = HOST_ADDRESS
+    return mock
+
+
+@pytest.fixture
+def mock_auth(mocker):
+    auth = mocker.MagicMock(spec=C42RenewableAuth)
+    auth._credentials = "Bearer TOKEN"
+    auth.side_effect = lambda r: r
+    return auth
+
+
+def create_session(mocker, *statuses):
+    session = mocker.MagicMock()
+    session.request.side_effect = [MockAioResponse(status) for status in statuses]
+    return session
+
+
+class TestAsyncConnection:
+    def test_get_sends_request_to_resolved_host(
+        self, mocker, mock_host_resolver, mock_auth
+    ):
+        session = create_session(mocker, 200)
+        connection = AsyncConnection(mock_host_resolver, mock_auth, session=session)
+        asyncio.run(connection.get(URL))
+        assert session.request.call_args[0] == ("GET", HOST_ADDRESS + URL)
+
+    def test_request_returns_py42_response(self, mocker, mock_host_resolver, mock_auth):
+        session = create_session(mocker, 200)
+        connection = AsyncConnection(mock_host_resolver, mock_auth, session=session)
+        response = asyncio.run(connection.get(URL))
+        assert response["key"] == "test_response_content"
+        assert response.status_code == 200
+
+    def test_request_drops_none_params_and_stringifies_bools(
+        self, mocker, mock_host_resolver, mock_auth
+    ):
+        session = create_session(mocker, 200)
+        connection = AsyncConnection(mock_host_resolver, mock_auth, session=session)
+        params = {"active": True, "q": None, "pgNum": 1}
+        asyncio.run(connection.get(URL, params=params))
+        assert session.request.call_args[1]["params"] == [
+            ("active", "True"),
+            ("pgNum", 1),
+        ]
+
+    def test_request_when_has_data_includes_content_type_header(
+        self, mocker, mock_host_resolver, mock_auth
+    ):
+        session = create_session(mocker, 200)
+        connection = AsyncConnection(mock_host_resolver, mock_auth, session=session)
+        asyncio.run(connection.put(URL, data='{"foo":"bar"}'))
+        kwargs = session.request.call_args[1]
+        assert kwargs["headers"]["Content-Type"] == "application/json"
+        assert kwargs["data"] == b'{"foo":"bar"}'
+
+    def test_request_applies_auth_header(self, mocker, mock_host_resolver):
+        auth = mocker.MagicMock(spec=C42RenewableAuth)
+        auth._credentials = None
+
+        def set_header(r):
+            r.headers["Authorization"] = "Bearer TOKEN"
+            return r
+
+        auth.side_effect = set_header
+        session = create_session(mocker, 200)
+        connection = AsyncConnection(mock_host_resolver, auth, session=session)
+        asyncio.run(connection.get(URL))
+        assert auth.get_credentials.call_count == 1
+        headers = session.request.call_args[1]["headers"]
+        assert headers["Authorization"] == "Bearer TOKEN"
+
+    def test_request_when_unauthorized_clears_credentials_and_retries(
+        self, mocker, mock_host_resolver, mock_auth
+    ):
+        session = create_session(mocker, 401, 200)
+        connection = AsyncConnection(mock_host_resolver, mock_auth, session=session)
+        response = asyncio.run(connection.get(URL))
+        assert response.status_code == 200
+        assert session.request.call_count == 2
+        assert mock_auth.clear_credentials.call_count == 1
+
+    def test_request_when_renewal_results_in_401_raises_unauthorized_error(
+        self, mocker, mock_host_resolver, mock_auth
+    ):
+        session = create_session(mocker, 401, 401)
+        connection = AsyncConnection(mock_host_resolver, mock_auth, session=session)
+        with pytest.raises(Py42UnauthorizedError):
+            asyncio.run(connection.get(URL))
+
+    def test_request_with_error_status_code_raises_py42_error(
+        self, mocker, mock_host_resolver, mock_auth
+    ):
+        session = create_session(mocker, 500, 500)
+        connection = AsyncConnection(mock_host_resolver, mock_auth, session=session)
+        with pytest.raises(Py42InternalServerError):
+            asyncio.run(connection.get(URL))
+
+    def test_host_is_only_resolved_once(self, mocker, mock_host_resolver, mock_auth):
+        session = create_session(mocker, 200, 200)
+        connection = AsyncConnection(mock_host_resolver, mock_auth, session=session)
+
+        async def run():
+            await asyncio.gather(connection.get(URL), connection.get(URL))
+
+        asyncio.run(run())
+        assert mock_host_resolver.get_host_address.call_count == 1
+
+    def test_from_connection_uses_connection_host_and_auth(
+        self, mocker, mock_host_resolver, mock_auth
+    ):
+        sync_connection = Connection(mock_host_resolver, mock_auth)
+        session = create_session(mocker, 200)
+        connection = AsyncConnection.from_connection(sync_connection, session=session)
+        asyncio.run(connection.get(URL))
+        assert session.request.call_args[0] == ("GET", HOST_ADDRESS + URL)
+        assert connection._auth is mock_auth
@@ -1,5 +1,9 @@
+import asyncio
 from datetime import datetime as dt
 
+from tests.conftest import create_mock_response
+
+from py42.services.auditlogs import AsyncAuditLogsService
 from py42.services.auditlogs import AuditLogsService
 
 
@@ -413,3 +417,24 @@ class TestAuditLogService:
         mock_connection.post.assert_called_once_with(
             "/rpc/search/search-audit-log", json=expected_data, headers=None
         )
+
+
+class TestAsyncAuditLogService:
+    def test_get_all_awaits_expected_uri_and_params(
+        self, mocker, mock_async_connection
+    ):
+        mock_async_connection.post.return_value = create_mock_response(
+            mocker, '{"events": []}'
+        )
+        service = AsyncAuditLogsService(mock_async_connection)
+
+        async def collect():
+            return [
+                page async for page in service.get_all(usernames="test@example.com")
+            ]
+
+        pages = asyncio.run(collect())
+        assert len(pages) == 1
+        post_data = mock_async_connection.post.call_args[1]["json"]
+        assert post_data["actorNames"] == ["test@example.com"]
+        assert post_data["page"] == 0
@@ -1,10 +1,40 @@
+import base64
+import json
+import threading
+import time
+
 import pytest
 from requests import Request
 from tests.conftest import create_mock_response
 
+from py42.exceptions import Py42Error
 from py42.services._auth import ApiClientAuth
 from py42.services._auth import BearerAuth
 from py42.services._auth import CustomJWTAuth
+from py42.services._auth import get_jwt_expiration
+from py42.tokenstore import FileTokenStore
+
+
+def create_jwt(expires_at):
+    claims = json.dumps({"sub": "test", "exp": expires_at}).encode("utf-8")
+    payload = base64.urlsafe_b64encode(claims).decode("ascii").rstrip("=")
+    return f"eyJhbGciOiJIUzI1NiJ9.{payload}.c2lnbmF0dXJl"
+
+
+class JWTProvider:
+    """Returns a new JWT that expires ``lifetime`` seconds from now on each call."""
+
+    def __init__(self, lifetime, delay=0):
+        self.lifetime = lifetime
+        self._delay = delay
+        self.tokens = []
+
+    def __call__(self):
+        time.sleep(self._delay)
+        token = create_jwt(int(time.time()) + self.lifetime)
+        token = f"{token}{len(self.tokens)}"
+        self.tokens.append(token)
+        return token
 
 
 @pytest.fixture
@@ -130,3 +160,112 @@ class TestApiClientAuth:
         auth.clear_credentials()
         auth(mock_request)
         assert mock_api_client_conn.post.call_count == 2
+
+
+class TestCredentialExpiration:
+    def test_get_jwt_expiration_returns_exp_claim(self):
+        assert get_jwt_expiration(f"Bearer {create_jwt(1700000000)}") == 1700000000
+
+    @pytest.mark.parametrize(
+        "credentials",
+        ["Bearer token-string", "Bearer a.!!!.c", None, "Bearer a.bnVsbA.c"],
+    )
+    def test_get_jwt_expiration_when_not_a_jwt_returns_none(self, credentials):
+        assert get_jwt_expiration(credentials) is None
+
+    def test_get_credentials_when_far_from_expiry_does_not_refresh(self):
+        provider = JWTProvider(lifetime=3600)
+        auth = CustomJWTAuth(provider)
+        first = auth.get_credentials()
+        assert auth.get_credentials() == first
+        assert len(provider.tokens) == 1
+        assert auth.expires_at > time.time() + 3000
+
+    def test_get_credentials_when_expired_refreshes_once_for_waiting_threads(self):
+        provider = JWTProvider(lifetime=0, delay=0.05)
+        auth = CustomJWTAuth(provider)
+        auth.get_credentials()
+        provider.lifetime = 3600
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(auth.get_credentials()))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(provider.tokens) == 2
+        assert results == [f"Bearer {provider.tokens[1]}"] * 8
+
+    def test_get_credentials_within_refresh_margin_refreshes_in_background(self):
+        provider = JWTProvider(lifetime=30, delay=0.05)
+        auth = CustomJWTAuth(provider)
+        first = auth.get_credentials()
+        results = [auth.get_credentials() for _ in range(5)]
+        assert results == [first] * 5
+
+        deadline = time.time() + 5
+        while auth.metrics["background_refreshes"] == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        assert auth.get_credentials() == f"Bearer {provider.tokens[1]}"
+        assert len(provider.tokens) == 2
+
+    def test_failed_background_refresh_keeps_current_credentials(self, mocker):
+        provider = JWTProvider(lifetime=30)
+        auth = CustomJWTAuth(provider)
+        first = auth.get_credentials()
+        auth._jwt_provider = mocker.MagicMock(side_effect=Exception("unavailable"))
+        thread = mocker.patch("py42.services._auth.Thread")
+        thread.return_value.start.side_effect = auth._refresh_in_background
+        assert auth.get_credentials() == first
+        assert auth.get_credentials() == first
+        assert auth.metrics["refresh_failures"] == 1
+        assert thread.call_count == 1
+
+    def test_clear_credentials_with_stale_credentials_does_not_clear(self):
+        provider = JWTProvider(lifetime=3600)
+        auth = CustomJWTAuth(provider)
+        stale = auth.get_credentials()
+        auth.clear_credentials(stale)
+        current = auth.get_credentials()
+        auth.clear_credentials(stale)
+        assert auth.get_credentials() == current
+        assert len(provider.tokens) == 2
+        assert auth.metrics["unauthorized_renewals"] == 1
+
+    def test_metrics_count_refreshes(self, mock_custom_auth_function):
+        auth = CustomJWTAuth(mock_custom_auth_function)
+        auth.get_credentials()
+        auth.clear_credentials()
+        auth.get_credentials()
+        metrics = auth.metrics
+        assert metrics["refreshes"] == 2
+        assert metrics["background_refreshes"] == 0
+        assert metrics["unauthorized_renewals"] == 1
+        assert metrics["last_refresh_seconds"] >= 0
+        assert metrics["total_refresh_seconds"] >= metrics["last_refresh_seconds"]
+        assert metrics["expires_at"] is None
+
+    def test_api_client_auth_without_jwt_uses_expires_in(
+        self, mock_api_client_conn, mock_request
+    ):
+        auth = ApiClientAuth(mock_api_client_conn)
+        before = time.time()
+        auth(mock_request)
+        assert before + 900 <= auth.expires_at <= time.time() + 900
+
+    def test_token_store_without_token_key_raises_py42_error(
+        self, mock_custom_auth_function, tmp_path
+    ):
+        store = FileTokenStore(str(tmp_path / "tokens.json"))
+        with pytest.raises(Py42Error):
+            CustomJWTAuth(mock_custom_auth_function, token_store=store)
+
+    def test_token_store_token_within_refresh_margin_is_not_shared(self, tmp_path):
+        provider = JWTProvider(lifetime=30)
+        store = FileTokenStore(str(tmp_path / "tokens.json"))
+        CustomJWTAuth(provider, token_store=store, token_key="key").get_credentials()
+        auth = CustomJWTAuth(provider, token_store=store, token_key="key")
+        assert auth.get_credentials() == f"Bearer {provider.tokens[1]}"
+        assert auth.metrics["shared_tokens"] == 0
@@ -1,22 +1,43 @@
+import logging
+from datetime import timedelta
+
 import pytest
 from requests import Response
+from requests import Session
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import HTTPError
+from requests.exceptions import ReadTimeout
 from tests.conftest import TEST_DEVICE_GUID
 
 import py42.settings as settings
+from py42.circuitbreaker import CircuitBreaker
+from py42.connectionpool import PoolingHTTPAdapter
+from py42.exceptions import Py42CircuitOpenError
 from py42.exceptions import Py42DeviceNotConnectedError
 from py42.exceptions import Py42Error
 from py42.exceptions import Py42FeatureUnavailableError
 from py42.exceptions import Py42InternalServerError
+from py42.exceptions import Py42NotFoundError
+from py42.exceptions import Py42TooManyRequestsError
 from py42.exceptions import Py42UnauthorizedError
+from py42.hostcache import FileHostCache
+from py42.instrumentation import RequestHook
+from py42.jsoncodec import EncodedJson
+from py42.jsoncodec import JsonCodec
 from py42.response import Py42Response
+from py42.retry import RateLimiter
+from py42.retry import RetryPolicy
 from py42.services._auth import C42RenewableAuth
+from py42.services._connection import CachedHostResolver
 from py42.services._connection import ConnectedServerHostResolver
 from py42.services._connection import Connection
+from py42.services._connection import create_session
 from py42.services._connection import HostResolver
 from py42.services._connection import KnownUrlHostResolver
 from py42.services._connection import MicroserviceKeyHostResolver
 from py42.services._connection import MicroservicePrefixHostResolver
 from py42.services._keyvaluestore import KeyValueStoreService
+from py42.settings import debug
 
 default_kwargs = {
     "timeout": 60,
@@ -94,6 +115,16 @@ def proxy_set():
     settings.proxies = None
 
 
+def create_status_response(mocker, status_code, headers=None):
+    response = mocker.MagicMock(spec=Response)
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.text = ""
+    if status_code >= 400:
+        response.raise_for_status.side_effect = HTTPError(response=response)
+    return response
+
+
 class MockPreparedRequest:
     def __init__(self, method, url, data=None, json=None):
         self._method = method
@@ -147,6 +178,34 @@ class TestMicroservicePrefixHostResolver:
         mock_server_env_conn.get.assert_called_once_with("/api/v1/ServerEnv")
 
 
+class TestCachedHostResolver:
+    def test_get_host_address_when_not_cached_resolves_and_caches(
+        self, mock_key_value_service, tmp_path
+    ):
+        mock_key_value_service.get_stored_value.return_value.text = HOST_ADDRESS
+        cache = FileHostCache(str(tmp_path / "hosts.json"))
+        resolver = CachedHostResolver(
+            MicroserviceKeyHostResolver(mock_key_value_service, "TEST_KEY"),
+            cache,
+            "CACHE_KEY",
+        )
+        assert resolver.get_host_address() == HOST_ADDRESS
+        assert cache.get("CACHE_KEY") == HOST_ADDRESS
+
+    def test_get_host_address_when_cached_does_not_resolve(
+        self, mock_key_value_service, tmp_path
+    ):
+        cache = FileHostCache(str(tmp_path / "hosts.json"))
+        cache.set("CACHE_KEY", HOST_ADDRESS)
+        resolver = CachedHostResolver(
+            MicroserviceKeyHostResolver(mock_key_value_service, "TEST_KEY"),
+            cache,
+            "CACHE_KEY",
+        )
+        assert resolver.get_host_address() == HOST_ADDRESS
+        assert not mock_key_value_service.get_stored_value.call_count
+
+
 class TestConnectedServerHostResolver:
     def test_get_host_address_returns_expected_value(self, mock_connected_server_conn):
         resolver = ConnectedServerHostResolver(
@@ -248,6 +307,45 @@ class TestConnection:
         )
         success_requests_session.prepare_request.assert_called_once_with(expected)
 
+    def test_connection_post_with_json_when_codec_set_prepares_request_with_encoded_data(
+        self, mock_host_resolver, mock_auth, success_requests_session
+    ):
+        codec = JsonCodec()
+        codec.dumps_bytes = lambda obj: b"ENCODED"
+        connection = Connection(
+            mock_host_resolver, mock_auth, success_requests_session, json_codec=codec
+        )
+        connection.post(URL, json=JSON_VALUE)
+        request = success_requests_session.prepare_request.call_args[0][0]
+        assert request.data == b"ENCODED"
+        assert request.json is None
+        assert request.headers["Content-Type"] == "application/json"
+
+    def test_connection_post_with_encoded_json_prepares_request_with_encoded_data(
+        self, mock_host_resolver, mock_auth, success_requests_session
+    ):
+        connection = Connection(mock_host_resolver, mock_auth, success_requests_session)
+        connection.post(URL, json=EncodedJson({"foo": "bar"}, b"ENCODED"))
+        request = success_requests_session.prepare_request.call_args[0][0]
+        assert request.data == b"ENCODED"
+        assert request.json is None
+        assert request.headers["Content-Type"] == "application/json"
+
+    def test_connection_request_returns_response_with_connection_codec(
+        self, mock_host_resolver, mock_auth, success_requests_session
+    ):
+        codec = JsonCodec()
+        connection = Connection(
+            mock_host_resolver, mock_auth, success_requests_session, json_codec=codec
+        )
+        response = connection.get(URL)
+        assert response._json_codec is codec
+
+    def test_connection_clone_keeps_codec(self, mock_host_resolver, mock_auth):
+        codec = JsonCodec()
+        connection = Connection(mock_host_resolver, mock_auth, json_codec=codec)
+        assert connection.clone(HOST_ADDRESS).json_codec is codec
+
     def test_connection_request_returns_utf8_response(
         self, mock_host_resolver, mock_auth, success_requests_session
     ):
@@ -255,6 +353,34 @@ class TestConnection:
         response = connection.request("GET", URL, data=DATA_VALUE, json=JSON_VALUE)
         assert response.encoding == "utf-8"
 
+    def test_connection_request_when_logging_disabled_does_not_read_response_text(
+        self, mocker, mock_host_resolver, mock_auth, success_requests_session
+    ):
+        response = success_requests_session.send.return_value
+        text = mocker.PropertyMock(return_value=TEST_RESPONSE_CONTENT)
+        type(response).text = text
+        format_dict = mocker.patch("py42.services._connection.format_dict")
+        debug.level = debug.NONE
+        connection = Connection(mock_host_resolver, mock_auth, success_requests_session)
+        connection.post(URL, json=JSON_VALUE, params={"key": "value"})
+        assert text.call_count == 0
+        assert format_dict.call_count == 0
+
+    def test_connection_request_when_logging_at_debug_logs_response_text(
+        self, caplog, mock_host_resolver, mock_auth, success_requests_session
+    ):
+        debug.level = debug.DEBUG
+        try:
+            connection = Connection(
+                mock_host_resolver, mock_auth, success_requests_session
+            )
+            with caplog.at_level(logging.DEBUG, logger="py42"):
+                connection.get(URL)
+        finally:
+            debug.level = debug.NONE
+        response_text = success_requests_session.send.return_value.text
+        assert f"Response data: {response_text}" in caplog.text
+
     def test_connection_request_when_streamed_doesnt_not_set_encoding_on_response(
         self, mock_host_resolver, mock_auth, success_requests_session
     ):
@@ -292,6 +418,15 @@ class TestConnection:
         assert renewed_requests_session.prepare_request.call_count == 2
         assert mock_auth.clear_credentials.call_count == 1
 
+    def test_connection_request_when_response_unauthorized_clears_rejected_credentials(
+        self, mock_host_resolver, mock_auth, renewed_requests_session
+    ):
+        prepared = renewed_requests_session.prepare_request.return_value
+        prepared.headers = {"Authorization": "Bearer REJECTED"}
+        connection = Connection(mock_host_resolver, mock_auth, renewed_requests_session)
+        connection.get(URL)
+        mock_auth.clear_credentials.assert_called_once_with("Bearer REJECTED")
+
     def test_connection_request_raises_unauthorized_error_when_renewal_results_in_401(
         self, mock_host_resolver, mock_auth, unauthorized_requests_session
     ):
@@ -405,3 +540,401 @@ class TestConnection:
         connection.delete(url)
         for call in success_requests_session.send.call_args_list:
             assert call[1]["proxies"] == {"https": "http://localhost:9999"}
+
+    def test_connection_request_does_not_change_session(
+        self, proxy_set, mocker, mock_host_resolver, mock_auth, successful_response
+    ):
+        session = create_session()
+        send = mocker.patch.object(session, "send", return_value=successful_response)
+        connection = Connection(mock_host_resolver, mock_auth, session=session)
+        connection.get(URL)
+        assert session.proxies == {}
+        assert session.verify is True
+        assert send.call_args[1]["proxies"] == settings.proxies
+
+
+class TestConnectionRetries:
+    @pytest.fixture
+    def sleep(self, mocker):
+        return mocker.patch("py42.services._connection.time.sleep")
+
+    @pytest.fixture
+    def session(self, mocker):
+        session = mocker.MagicMock(spec=Session)
+        session.headers = {}
+        return session
+
+    @pytest.fixture
+    def policy(self):
+        return RetryPolicy(jitter=False)
+
+    def test_request_retries_get_when_service_unavailable(
+        self, mocker, session, sleep, policy, mock_host_resolver, mock_auth
+    ):
+        session.send.side_effect = [
+            create_status_response(mocker, 503),
+            create_status_response(mocker, 200),
+        ]
+        connection = Connection(
+            mock_host_resolver, mock_auth, session=session, retry_policy=policy
+        )
+        response = connection.get(URL)
+        assert response.status_code == 200
+        assert session.send.call_count == 2
+        sleep.assert_called_once_with(0.5)
+
+    def test_request_does_not_retry_post_when_service_unavailable(
+        self, mocker, session, sleep, policy, mock_host_resolver, mock_auth
+    ):
+        session.send.return_value = create_status_response(mocker, 503)
+        connection = Connection(
+            mock_host_resolver, mock_auth, session=session, retry_policy=policy
+        )
+        with pytest.raises(Py42InternalServerError):
+            connection.post(URL, json=JSON_VALUE)
+        assert session.send.call_count == 1
+        assert not sleep.call_count
+
+    def test_request_retries_throttled_post_after_retry_after(
+        self, mocker, session, sleep, policy, mock_host_resolver, mock_auth
+    ):
+        session.send.side_effect = [
+            create_status_response(mocker, 429, {"Retry-After": "2"}),
+            create_status_response(mocker, 200),
+        ]
+        connection = Connection(
+            mock_host_resolver, mock_auth, session=session, retry_policy=policy
+        )
+        connection.post(URL, json=JSON_VALUE)
+        sleep.assert_called_once_with(2)
+
+    def test_request_when_retries_exhausted_raises_last_error(
+        self, mocker, session, sleep, mock_host_resolver, mock_auth
+    ):
+        session.send.return_value = create_status_response(mocker, 429)
+        policy = RetryPolicy(max_retries=2, jitter=False)
+        connection = Connection(
+            mock_host_resolver, mock_auth, session=session, retry_policy=policy
+        )
+        with pytest.raises(Py42TooManyRequestsError):
+            connection.get(URL)
+        assert session.send.call_count == 3
+        assert [call[0][0] for call in sleep.call_args_list] == [0.5, 1]
+
+    def test_request_does_not_retry_server_errors_not_in_policy(
+        self, session, sleep, mock_host_resolver, mock_auth, error_response
+    ):
+        session.send.return_value = error_response.response
+        connection = Connection(mock_host_resolver, mock_auth, session=session)
+        with pytest.raises(Py42InternalServerError):
+            connection.get(URL)
+        assert session.send.call_count == 1
+
+    def test_request_retries_get_when_connection_fails(
+        self, mocker, session, sleep, policy, mock_host_resolver, mock_auth
+    ):
+        session.send.side_effect = [
+            RequestsConnectionError("reset"),
+            create_status_response(mocker, 200),
+        ]
+        connection = Connection(
+            mock_host_resolver, mock_auth, session=session, retry_policy=policy
+        )
+        assert connection.get(URL).status_code == 200
+
+    def test_request_does_not_retry_post_when_connection_fails(
+        self, session, sleep, policy, mock_host_resolver, mock_auth
+    ):
+        session.send.side_effect = RequestsConnectionError("reset")
+        connection = Connection(
+            mock_host_resolver, mock_auth, session=session, retry_policy=policy
+        )
+        with pytest.raises(RequestsConnectionError):
+            connection.post(URL, json=JSON_VALUE)
+        assert session.send.call_count == 1
+
+    def test_request_with_rate_limiter_reports_throttles_and_successes(
+        self, mocker, session, sleep, policy, mock_host_resolver, mock_auth
+    ):
+        limiter = mocker.MagicMock(spec=RateLimiter)
+        session.send.side_effect = [
+            create_status_response(mocker, 429),
+            create_status_response(mocker, 200),
+        ]
+        connection = Connection(
+            mock_host_resolver,
+            mock_auth,
+            session=session,
+            retry_policy=policy,
+            rate_limiter=limiter,
+        )
+        connection.get(URL)
+        assert limiter.acquire.call_count == 2
+        limiter.acquire.assert_called_with("example.com")
+        limiter.on_throttle.assert_called_once_with("example.com")
+        limiter.on_success.assert_called_once_with("example.com")
+
+    def test_clone_keeps_retry_policy_and_rate_limiter(
+        self, mocker, policy, mock_host_resolver
+    ):
+        limiter = RateLimiter(rate=5)
+        connection = Connection(
+            mock_host_resolver, retry_policy=policy, rate_limiter=limiter
+        )
+        clone = connection.clone("https://other.example.com")
+        assert clone.retry_policy is policy
+        assert clone.rate_limiter is limiter
+
+
+class TestConnectionCircuitBreaker:
+    @pytest.fixture
+    def session(self, mocker):
+        session = mocker.MagicMock(spec=Session)
+        session.headers = {}
+        return session
+
+    @pytest.fixture
+    def breaker(self):
+        return CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+
+    @pytest.fixture
+    def no_retries(self):
+        return RetryPolicy(max_retries=0)
+
+    def test_request_when_host_keeps_timing_out_fails_fast(
+        self, session, breaker, no_retries, mock_host_resolver, mock_auth
+    ):
+        session.send.side_effect = ReadTimeout("timed out")
+        connection = Connection(
+            mock_host_resolver,
+            mock_auth,
+            session=session,
+            retry_policy=no_retries,
+            circuit_breaker=breaker,
+        )
+        for _ in range(2):
+            with pytest.raises(ReadTimeout):
+                connection.get(URL)
+        with pytest.raises(Py42CircuitOpenError) as err:
+            connection.get(URL)
+        assert err.value.host == "example.com"
+        assert session.send.call_count == 2
+
+    def test_request_counts_server_errors_as_failures(
+        self, mocker, session, breaker, no_retries, mock_host_resolver, mock_auth
+    ):
+        session.send.return_value = create_status_response(mocker, 503)
+        connection = Connection(
+            mock_host_resolver,
+            mock_auth,
+            session=session,
+            retry_policy=no_retries,
+            circuit_breaker=breaker,
+        )
+        for _ in range(2):
+            with pytest.raises(Py42InternalServerError):
+                connection.get(URL)
+        assert breaker.get_states()["example.com"]["state"] == "open"
+
+    def test_request_when_client_error_closes_circuit(
+        self, mocker, session, breaker, no_retries, mock_host_resolver, mock_auth
+    ):
+        session.send.side_effect = [
+            create_status_response(mocker, 503),
+            create_status_response(mocker, 404),
+        ]
+        connection = Connection(
+            mock_host_resolver,
+            mock_auth,
+            session=session,
+            retry_policy=no_retries,
+            circuit_breaker=breaker,
+        )
+        with pytest.raises(Py42InternalServerError):
+            connection.get(URL)
+        with pytest.raises(Py42NotFoundError):
+            connection.get(URL)
+        assert breaker.get_states()["example.com"]["consecutive_failures"] == 0
+
+    def test_request_when_circuit_opens_during_retries_stops_retrying(
+        self, mocker, session, breaker, mock_host_resolver, mock_auth
+    ):
+        mocker.patch("py42.services._connection.time.sleep")
+        session.send.return_value = create_status_response(mocker, 503)
+        connection = Connection(
+            mock_host_resolver,
+            mock_auth,
+            session=session,
+            retry_policy=RetryPolicy(max_retries=5),
+            circuit_breaker=breaker,
+        )
+        with pytest.raises(Py42CircuitOpenError):
+            connection.get(URL)
+        assert session.send.call_count == 2
+
+
+class RecordingHook(RequestHook):
+    def __init__(self):
+        self.started = []
+        self.metrics = []
+
+    def request_started(self, method, uri_template):
+        self.started.append((method, uri_template))
+        return len(self.started)
+
+    def request_finished(self, context, metrics):
+        self.metrics.append((context, metrics))
+
+
+class TestConnectionRequestHooks:
+    @pytest.fixture
+    def session(self, mocker):
+        session = mocker.MagicMock(spec=Session)
+        session.headers = {}
+        return session
+
+    def create_response(self, mocker, status_code, content=b'{"a": 1}'):
+        response = create_status_response(mocker, status_code)
+        response.headers = {}
+        response.content = content
+        response.elapsed = timedelta(milliseconds=20)
+        return response
+
+    def test_request_calls_hooks_with_metrics(
+        self, mocker, session, mock_host_resolver, mock_auth
+    ):
+        session.send.return_value = self.create_response(mocker, 200)
+        session.prepare_request.return_value.body = b'{"key": "value"}'
+        hook = RecordingHook()
+        connection = Connection(
+            mock_host_resolver, mock_auth, session=session, request_hooks=[hook]
+        )
+        connection.post("/api/v1/Computer/1234", json=JSON_VALUE)
+        assert hook.started == [("POST", "/api/v1/Computer/{id}")]
+        context, metrics = hook.metrics[0]
+        assert context == 1
+        assert metrics.method == "POST"
+        assert metrics.uri_template == "/api/v1/Computer/{id}"
+        assert metrics.host == "example.com"
+        assert metrics.status_code == 200
+        assert metrics.bytes_sent == 16
+        assert metrics.bytes_received == 8
+        assert metrics.time_to_first_byte == 0.02
+        assert metrics.duration > 0
+        assert metrics.retries == 0
+        assert metrics.error is None
+
+    def test_request_hooks_receive_retries_and_error(
+        self, mocker, session, mock_host_resolver, mock_auth
+    ):
+        mocker.patch("py42.services._connection.time.sleep")
+        session.send.return_value = self.create_response(mocker, 503)
+        hook = RecordingHook()
+        connection = Connection(
+            mock_host_resolver,
+            mock_auth,
+            session=session,
+            retry_policy=RetryPolicy(max_retries=2),
+            request_hooks=[hook],
+        )
+        with pytest.raises(Py42InternalServerError) as err:
+            connection.get(URL)
+        metrics = hook.metrics[0][1]
+        assert metrics.retries == 2
+        assert metrics.status_code == 503
+        assert metrics.error is err.value
+
+    def test_request_when_host_resolution_fails_raises_original_error(
+        self, mocker, session, mock_auth
+    ):
+        host_resolver = mocker.MagicMock()
+        host_resolver.get_host_address.side_effect = Py42Error("no host")
+        hook = RecordingHook()
+        connection = Connection(
+            host_resolver, mock_auth, session=session, request_hooks=[hook]
+        )
+        with pytest.raises(Py42Error, match="no host") as err:
+            connection.get(URL)
+        metrics = hook.metrics[0][1]
+        assert metrics.host is None
+        assert metrics.error is err.value
+
+    def test_request_when_hook_fails_still_returns_response(
+        self, mocker, session, mock_host_resolver, mock_auth
+    ):
+        session.send.return_value = self.create_response(mocker, 200)
+        hook = mocker.MagicMock(spec=RequestHook)
+        hook.request_finished.side_effect = ValueError("metrics backend down")
+        recorder = RecordingHook()
+        connection = Connection(
+            mock_host_resolver,
+            mock_auth,
+            session=session,
+            request_hooks=[hook, recorder],
+        )
+        assert connection.get(URL).status_code == 200
+        assert len(recorder.metrics) == 1
+
+    def test_request_without_hooks_does_not_measure(
+        self, mocker, success_requests_session, mock_host_resolver, mock_auth
+    ):
+        take_pool_wait = mocker.patch("py42.connectionpool.take_pool_wait")
+        connection = Connection(mock_host_resolver, mock_auth, success_requests_session)
+        connection.get(URL)
+        assert not take_pool_wait.call_count
+
+    def test_clone_keeps_request_hooks(self, mock_host_resolver):
+        hook = RecordingHook()
+        connection = Connection(mock_host_resolver, request_hooks=[hook])
+        assert connection.clone("https://other.example.com").request_hooks == (hook,)
+
+
+class TestPy42Session:
+    @pytest.fixture
+    def ssl_verification_disabled(self):
+        settings.verify_ssl_certs = False
+        yield
+        settings.verify_ssl_certs = True
+
+    def test_merge_environment_settings_uses_proxies_setting(self, proxy_set):
+        session = create_session()
+        merged = session.merge_environment_settings(
+            "https://example.com", {}, False, None, None
+        )
+        assert merged["proxies"]["https"] == "http://localhost:9999"
+
+    def test_merge_environment_settings_uses_verify_ssl_certs_setting(
+        self, ssl_verification_disabled
+    ):
+        session = create_session()
+        merged = session.merge_environment_settings(
+            "https://example.com", {}, False, None, None
+        )
+        assert merged["verify"] is False
+
+    def test_merge_environment_settings_prefers_given_proxies_and_verify(
+        self, proxy_set, ssl_verification_disabled
+    ):
+        session = create_session()
+        proxies = {"https": "http://localhost:8888"}
+        merged = session.merge_environment_settings(
+            "https://example.com", proxies, False, "ca.pem", None
+        )
+        assert merged["proxies"]["https"] == "http://localhost:8888"
+        assert merged["verify"] == "ca.pem"
+
+    def test_mount_replaces_adapters_instead_of_changing_them(self, mocker):
+        session = create_session()
+        adapters = session.adapters
+        adapter = mocker.MagicMock(spec=PoolingHTTPAdapter)
+        session.mount("https://ffs.example.com", adapter)
+        assert session.adapters is not adapters
+        assert "https://ffs.example.com" not in adapters
+        assert session.get_adapter("https://ffs.example.com/search") is adapter
+        assert session.get_adapter("https://example.com") is adapters["https://"]
+        assert list(session.adapters)[0] == "https://ffs.example.com"
+
+    def test_sessions_do_not_share_adapters(self):
+        first = create_session()
+        second = create_session()
+        assert first.get_adapter("https://") is not second.get_adapter("https://")
@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 from requests import HTTPError
 from requests import Response
@@ -11,6 +13,7 @@ from py42.exceptions import Py42ActiveLegalHoldError
 from py42.exceptions import Py42BadRequestError
 from py42.exceptions import Py42OrgNotFoundError
 from py42.response import Py42Response
+from py42.services.devices import AsyncDeviceService
 from py42.services.devices import DeviceService
 
 COMPUTER_URI = "/api/v1/Computer"
@@ -239,3 +242,83 @@ class TestDeviceService:
         client.update_settings(settings)
         uri = f"/api/v1/Computer/{device_id}"
         mock_connection.put.assert_called_once_with(uri, json=settings)
+
+    def test_get_all_when_given_concurrency_requests_remaining_pages_from_total(
+        self, mocker, mock_connection
+    ):
+        page = create_mock_response(
+            mocker, '{"totalCount": 5, "computers": ["foo", "bar"]}'
+        )
+        mock_connection.get.return_value = page
+        service = DeviceService(mock_connection)
+        pages = list(service.get_all(page_size=2, concurrency=2))
+        assert len(pages) == 3
+        page_nums = sorted(
+            c[1]["params"]["pgNum"] for c in mock_connection.get.call_args_list
+        )
+        assert page_nums == [1, 2, 3]
+
+    def test_iter_items_yields_each_device(self, mocker, mock_connection):
+        mock_connection.get.side_effect = [
+            create_mock_response(mocker, '{"computers": ["foo", "bar"]}'),
+            create_mock_response(mocker, '{"computers": ["baz"]}'),
+        ]
+        service = DeviceService(mock_connection)
+        assert list(service.iter_items(page_size=2)) == ["foo", "bar", "baz"]
+
+    def test_iter_items_when_streamed_requests_streamed_pages(
+        self, mocker, mock_connection
+    ):
+        mock_connection.get.side_effect = [
+            create_mock_response(mocker, '{"computers": ["foo", "bar"]}'),
+            create_mock_response(mocker, '{"computers": []}'),
+        ]
+        service = DeviceService(mock_connection)
+        devices = list(service.iter_items(page_size=2, stream=True))
+        assert devices == ["foo", "bar"]
+        assert mock_connection.get.call_args_list[0][1]["stream"] is True
+
+
+class TestAsyncDeviceService:
+    def test_get_all_yields_pages_until_short_page(self, mocker, mock_async_connection):
+        full_page = create_mock_response(mocker, '{"computers": ["foo", "bar"]}')
+        short_page = create_mock_response(mocker, '{"computers": ["baz"]}')
+        mock_async_connection.get.side_effect = [full_page, short_page]
+        service = AsyncDeviceService(mock_async_connection)
+
+        async def collect():
+            return [page async for page in service.get_all(page_size=2)]
+
+        pages = asyncio.run(collect())
+        assert pages == [full_page, short_page]
+        assert mock_async_connection.get.call_args_list[1][1]["params"]["pgNum"] == 2
+
+    def test_iter_items_yields_each_device(self, mocker, mock_async_connection):
+        mock_async_connection.get.side_effect = [
+            create_mock_response(mocker, '{"computers": ["foo", "bar"]}'),
+            create_mock_response(mocker, '{"computers": ["baz"]}'),
+        ]
+        service = AsyncDeviceService(mock_async_connection)
+
+        async def collect():
+            return [item async for item in service.iter_items(page_size=2)]
+
+        assert asyncio.run(collect()) == ["foo", "bar", "baz"]
+
+    def test_get_page_when_org_not_found_raises_expected_error(
+        self, mocker, mock_async_connection
+    ):
+        text = '[{"name":"SYSTEM","description":"Unable to find org"}]'
+        mock_async_connection.get.side_effect = create_mock_error(
+            Py42BadRequestError, mocker, text
+        )
+        service = AsyncDeviceService(mock_async_connection)
+        with pytest.raises(Py42OrgNotFoundError):
+            asyncio.run(service.get_page(1, org_uid="TEST_ORG_ID"))
+
+    def test_get_by_id_awaits_get_with_uri(self, mock_async_connection):
+        service = AsyncDeviceService(mock_async_connection)
+        asyncio.run(service.get_by_id(42))
+        mock_async_connection.get.assert_awaited_once_with(
+            f"{COMPUTER_URI}/42", params={"incBackupUsage": None}
+        )
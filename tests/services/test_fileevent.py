@@ -1,3 +1,4 @@
+import asyncio
 import json
 
 import pytest
@@ -15,6 +16,8 @@ from py42.sdk.queries.fileevents.v2.file_event_query import (
 )
 from py42.sdk.queries.fileevents.v2.filters.file import Name
 from py42.services._connection import Connection
+from py42.services._connection import create_session
+from py42.services.fileevent import AsyncFileEventService
 from py42.services.fileevent import FileEventService
 
 FILE_EVENT_URI = "/forensic-search/queryservice/api/v1/fileevent"
@@ -136,3 +139,48 @@ class TestFileEventService:
         service.search(query)
         expected = json.loads(query)
         connection.post.assert_called_once_with(FILE_EVENT_URI_V2, json=expected)
+
+    def test_search_does_not_mount_adapters_on_session(
+        self, mocker, successful_response
+    ):
+        session = create_session()
+        adapters = session.adapters
+        connection = Connection.from_host_address(
+            "https://ffs.example.com", session=session
+        )
+        mocker.patch.object(connection, "post", return_value=successful_response)
+        FileEventService(connection).search(_create_v2_test_query())
+        assert session.adapters is adapters
+
+    def test_search_posts_query_encoded_once_per_page(self, connection):
+        query = _create_v2_test_query()
+        service = FileEventService(connection)
+        service.search(query)
+        query.page_token = "abc"
+        service.search(query)
+        body = connection.post.call_args[1]["json"]
+        assert body == dict(query)
+        assert json.loads(body.encoded) == dict(query)
+        assert query.compile() is query.compile()
+
+
+class TestAsyncFileEventService:
+    def test_search_awaits_post_with_uri_and_query(self, mock_async_connection):
+        service = AsyncFileEventService(mock_async_connection)
+        query = _create_v2_test_query()
+        asyncio.run(service.search(query))
+        mock_async_connection.post.assert_awaited_once_with(
+            FILE_EVENT_URI_V2, json=dict(query)
+        )
+
+    def test_search_when_given_page_token_and_invalid_page_token_occurs_raises_invalid_page_token_error(
+        self, mocker, mock_async_connection
+    ):
+        mock_async_connection.post.side_effect = create_mock_error(
+            Py42BadRequestError, mocker, "INVALID_PAGE_TOKEN"
+        )
+        query = _create_v2_test_query()
+        query.page_token = "test_page_token"
+        service = AsyncFileEventService(mock_async_connection)
+        with pytest.raises(Py42InvalidPageTokenError):
+            asyncio.run(service.search(query))
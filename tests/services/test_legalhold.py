@@ -124,6 +124,23 @@ class TestLegalHoldService:
         py42.settings.items_per_page = 500
         assert mock_connection.get.call_count == 3
 
+    def test_iter_matter_custodians_yields_each_membership(
+        self,
+        mock_connection,
+        mock_get_all_matter_custodians_response,
+        mock_get_all_matter_custodians_empty_response,
+    ):
+        py42.settings.items_per_page = 1
+        service = LegalHoldService(mock_connection)
+        mock_connection.get.side_effect = [
+            mock_get_all_matter_custodians_response,
+            mock_get_all_matter_custodians_response,
+            mock_get_all_matter_custodians_empty_response,
+        ]
+        memberships = list(service.iter_matter_custodians(user="test"))
+        py42.settings.items_per_page = 500
+        assert memberships == ["foo", "foo"]
+
     def test_get_all_events_calls_get_expected_number_of_times(
         self,
         mock_connection,
@@ -1,3 +1,4 @@
+import asyncio
 import json
 from unittest.mock import patch
 
@@ -16,6 +17,7 @@ from py42.exceptions import Py42NotFoundError
 from py42.exceptions import Py42OrgNotFoundError
 from py42.exceptions import Py42UserAlreadyExistsError
 from py42.exceptions import Py42UsernameMustBeEmailError
+from py42.services.users import AsyncUserService
 from py42.services.users import UserService
 
 USER_URI = "/api/v1/User"
@@ -252,6 +254,14 @@ class TestUserService:
         py42.settings.items_per_page = 500
         assert mock_connection.get.call_count == 3
 
+    def test_iter_items_yields_each_user(self, mocker, mock_connection):
+        mock_connection.get.side_effect = [
+            create_mock_response(mocker, '{"users": ["foo", "bar"]}'),
+            create_mock_response(mocker, '{"users": []}'),
+        ]
+        service = UserService(mock_connection)
+        assert list(service.iter_items(page_size=2)) == ["foo", "bar"]
+
     def test_get_scim_data_by_uid_calls_get_with_expected_uri_and_params(
         self, mock_connection
     ):
@@ -626,3 +636,47 @@ class TestUserService:
         assert (
             "User not found.  Please be aware that this method is incompatible with api client authentication."
         ) in str(err.value)
+
+
+class TestAsyncUserService:
+    def test_block_looks_up_uid_and_posts_to_expected_uri(
+        self, mocker, mock_async_connection
+    ):
+        mock_async_connection.get.return_value = create_mock_response(
+            mocker, f'{{"userUid": "{TEST_USER_UID}"}}'
+        )
+        service = AsyncUserService(mock_async_connection)
+        asyncio.run(service.block(12345))
+        uri = f"{USER_URI_V3}/{TEST_USER_UID}/block"
+        mock_async_connection.post.assert_awaited_once_with(uri)
+
+    def test_add_role_puts_existing_and_new_role_ids(
+        self, mocker, mock_async_connection
+    ):
+        mock_async_connection.get.side_effect = [
+            create_mock_response(mocker, f'{{"userUid": "{TEST_USER_UID}"}}'),
+            create_mock_response(mocker, '[{"roleId": "desktop-user"}]'),
+            create_mock_response(
+                mocker, '[{"roleId": "security-center-user", "roleName": "SC"}]'
+            ),
+            create_mock_response(mocker, f'{{"userUid": "{TEST_USER_UID}"}}'),
+        ]
+        service = AsyncUserService(mock_async_connection)
+        asyncio.run(service.add_role(12345, "SC"))
+        mock_async_connection.put.assert_awaited_once_with(
+            f"{USER_URI_V3}/{TEST_USER_UID}/roles",
+            json={"roleIds": ["desktop-user", "security-center-user"]},
+        )
+
+    def test_get_current_raises_error_about_api_clients_if_user_not_found(
+        self, mocker, mock_async_connection
+    ):
+        mock_async_connection.get.side_effect = create_mock_error(
+            Py42NotFoundError,
+            mocker,
+            """[{"name":"SYSTEM","description":"User not found"}]""",
+        )
+        service = AsyncUserService(mock_async_connection)
+        with pytest.raises(Py42NotFoundError) as err:
+            asyncio.run(service.get_current())
+        assert "incompatible with api client authentication" in str(err.value)
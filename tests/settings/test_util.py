@@ -1,8 +1,21 @@
+import asyncio
+import gc
+import json
+import threading
+import time
+import weakref
+
 import pytest
 from tests.conftest import create_mock_response
 
 import py42.settings as settings
+from py42.exceptions import Py42Error
+from py42.services.util import get_all_items_streamed
 from py42.services.util import get_all_pages
+from py42.services.util import get_all_pages_by_total
+from py42.services.util import get_all_pages_prefetched
+from py42.services.util import iter_page_items
+from py42.services.util import iter_page_items_async
 
 
 @pytest.fixture
@@ -61,3 +74,160 @@ def test_get_all_pages_with_input_page_size_greater_than_default_calls_callback_
 
     settings.items_per_page = 500
     verify_calls(get_three_three_item_pages, 3)
+
+
+def create_page_func(mocker, page_count, page_size):
+    full_page = create_mock_response(mocker, f'{{"items": {list(range(page_size))}}}')
+    short_page = create_mock_response(mocker, '{"items": [1]}')
+    empty_page = create_mock_response(mocker, '{"items": []}')
+    requested = []
+    lock = threading.Lock()
+
+    def get_page(page_num, page_size):
+        with lock:
+            requested.append(page_num)
+        if page_num < page_count:
+            return full_page
+        if page_num == page_count:
+            return short_page
+        return empty_page
+
+    get_page.requested = requested
+    return get_page, full_page, short_page
+
+
+def test_get_all_pages_prefetched_yields_pages_in_order_and_stops_at_short_page(
+    mocker,
+):
+    get_page, full_page, short_page = create_page_func(mocker, 5, 3)
+    pages = list(get_all_pages_prefetched(get_page, "items", 2, page_size=3))
+    assert pages == [full_page, full_page, full_page, full_page, short_page]
+
+
+def test_get_all_pages_prefetched_requests_at_most_window_pages_ahead(mocker):
+    get_page, _, _ = create_page_func(mocker, 10, 3)
+    pages = get_all_pages_prefetched(get_page, "items", 2, page_size=3)
+    next(pages)
+    time.sleep(0.05)
+    assert max(get_page.requested) <= 3
+    pages.close()
+
+
+def test_get_all_pages_prefetched_raises_page_errors_in_order(mocker):
+    full_page = create_mock_response(mocker, '{"items": [1, 2]}')
+    func = mocker.MagicMock(
+        side_effect=[full_page, Py42Error("page 2")] + [full_page] * 5
+    )
+    pages = get_all_pages_prefetched(func, "items", 1, page_size=2)
+    assert next(pages) == full_page
+    with pytest.raises(Py42Error):
+        next(pages)
+
+
+def test_get_all_pages_when_prefetch_window_set_prefetches_pages(mocker):
+    get_page, full_page, short_page = create_page_func(mocker, 3, 3)
+    settings.page_prefetch_window = 4
+    try:
+        pages = list(get_all_pages(get_page, "items", page_size=3))
+    finally:
+        settings.page_prefetch_window = 0
+    assert pages == [full_page, full_page, short_page]
+    assert max(get_page.requested) > 3
+
+
+def create_total_page_func(mocker, total, page_size):
+    def get_page(page_num, page_size):
+        start = (page_num - 1) * page_size
+        items = list(range(start, min(start + page_size, total)))
+        return create_mock_response(
+            mocker, json.dumps({"totalCount": total, "items": items})
+        )
+
+    return mocker.MagicMock(side_effect=get_page)
+
+
+def test_get_all_pages_by_total_requests_each_page_once_in_order(mocker):
+    func = create_total_page_func(mocker, 10, 3)
+    pages = list(get_all_pages_by_total(func, "items", "totalCount", page_size=3))
+    items = [item for page in pages for item in page["items"]]
+    assert items == list(range(10))
+    assert sorted(c[1]["page_num"] for c in func.call_args_list) == [1, 2, 3, 4]
+
+
+def test_get_all_pages_by_total_when_unordered_yields_every_page(mocker):
+    func = create_total_page_func(mocker, 10, 3)
+    pages = get_all_pages_by_total(
+        func, "items", "totalCount", max_workers=2, ordered=False, page_size=3
+    )
+    items = sorted(item for page in pages for item in page["items"])
+    assert items == list(range(10))
+
+
+def test_get_all_pages_by_total_when_no_total_falls_back_to_serial_paging(
+    get_three_three_item_pages,
+):
+    pages = list(
+        get_all_pages_by_total(
+            get_three_three_item_pages, "items", "totalCount", page_size=3
+        )
+    )
+    assert len(pages) == 4
+    verify_calls(get_three_three_item_pages, 3)
+
+
+class Page(dict):
+    pass
+
+
+def test_iter_page_items_yields_items_from_each_page(get_three_three_item_pages):
+    items = list(
+        iter_page_items(
+            get_all_pages(get_three_three_item_pages, "items", page_size=3), "items"
+        )
+    )
+    assert items == [1, 2, 3, 1, 2, 3, 1, 2, 3]
+
+
+def test_iter_page_items_when_key_is_none_yields_items_from_data(mocker):
+    page = mocker.MagicMock()
+    page.data = ["foo", "bar"]
+    assert list(iter_page_items([page], None)) == ["foo", "bar"]
+
+
+def test_iter_page_items_releases_page_before_requesting_next_one():
+    page_refs = []
+
+    def get_page(page_num, page_size):
+        page = Page(items=[page_num] * page_size if page_num < 3 else [])
+        page_refs.append(weakref.ref(page))
+        return page
+
+    items = iter_page_items(get_all_pages(get_page, "items", page_size=2), "items")
+    assert next(items) == 1
+    assert next(items) == 1
+    assert next(items) == 2
+    gc.collect()
+    assert page_refs[0]() is None
+    assert page_refs[1]() is not None
+
+
+def test_iter_page_items_async_yields_items_from_each_page():
+    async def pages():
+        yield Page(items=[1, 2])
+        yield Page(items=[3])
+
+    async def collect():
+        return [item async for item in iter_page_items_async(pages(), "items")]
+
+    assert asyncio.run(collect()) == [1, 2, 3]
+
+
+def test_get_all_items_streamed_requests_streamed_pages_until_short_page(mocker):
+    pages = [
+        create_mock_response(mocker, '{"items": [1, 2]}'),
+        create_mock_response(mocker, '{"items": [3]}'),
+    ]
+    func = mocker.MagicMock(side_effect=pages)
+    assert list(get_all_items_streamed(func, "items", page_size=2)) == [1, 2, 3]
+    assert func.call_count == 2
+    assert func.call_args_list[1][1] == {"page_num": 2, "page_size": 2, "stream": True}
@@ -0,0 +1,202 @@
+import gzip
+import json
+from datetime import timedelta
+
+import pytest
+from requests.adapters import BaseAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+from py42.cassette import Cassette
+from py42.cassette import Exchange
+from py42.cassette import RecordingAdapter
+from py42.cassette import redact_body
+from py42.cassette import redact_url
+from py42.cassette import ReplayAdapter
+from py42.exceptions import Py42Error
+from py42.services._connection import Connection
+from py42.services._connection import create_session
+
+HOST = "https://example.com"
+
+
+class CannedAdapter(BaseAdapter):
+    """Answers each request with the next of ``bodies``."""
+
+    def __init__(self, *bodies, headers=None):
+        super().__init__()
+        self._bodies = list(bodies)
+        self._headers = headers or {}
+
+    def send(self, request, **kwargs):
+        response = Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = request.url
+        response.request = request
+        response.headers = CaseInsensitiveDict(
+            {"Content-Type": "application/json", **self._headers}
+        )
+        response.elapsed = timedelta(seconds=0.25)
+        response._content = self._bodies.pop(0)
+        return response
+
+    def close(self):
+        pass
+
+
+def create_connection(adapter):
+    return Connection.from_host_address(HOST, session=create_session(adapter))
+
+
+def create_exchange(url=f"{HOST}/api/v1/Computer", body=b'{"data": 1}', **kwargs):
+    values = {
+        "method": "GET",
+        "url": url,
+        "request_body": None,
+        "status_code": 200,
+        "reason": "OK",
+        "headers": {"Content-Type": "application/json"},
+        "body": body,
+        "elapsed": 0.5,
+    }
+    values.update(kwargs)
+    return Exchange(**values)
+
+
+def test_redact_url_replaces_redacted_query_parameters():
+    url = f"{HOST}/api/v3/auth?password=hunter2&useBody=true"
+    assert redact_url(url) == f"{HOST}/api/v3/auth?password=REDACTED&useBody=true"
+    assert redact_url(f"{HOST}/api/v1/User?pgNum=1") == f"{HOST}/api/v1/User?pgNum=1"
+
+
+def test_redact_body_replaces_nested_redacted_fields():
+    body = (
+        b'{"data": {"v3_user_token": "secret", "users": [{"password": "x", "id": 1}]}}'
+    )
+    assert json.loads(redact_body(body)) == {
+        "data": {
+            "v3_user_token": "REDACTED",
+            "users": [{"password": "REDACTED", "id": 1}],
+        }
+    }
+
+
+def test_redact_body_returns_other_bodies_unchanged():
+    body = b'{"data": {"users": []}}'
+    assert redact_body(body) is body
+    assert redact_body(b"password: not json") == b"password: not json"
+
+
+class TestRecordingAdapter:
+    def test_send_records_redacted_exchange(self):
+        canned = CannedAdapter(
+            b'{"access_token": "secret", "expires_in": 900}',
+            headers={"Set-Cookie": "session=abc", "Content-Encoding": "gzip"},
+        )
+        recorder = RecordingAdapter(canned)
+        connection = create_connection(recorder)
+        response = connection.post(
+            "/api/v3/oauth/token", json={"password": "hunter2", "user": "me"}
+        )
+        assert response["access_token"] == "secret"
+        [exchange] = recorder.cassette.exchanges
+        assert exchange.method == "POST"
+        assert exchange.url == f"{HOST}/api/v3/oauth/token"
+        assert json.loads(exchange.request_body) == {
+            "password": "REDACTED",
+            "user": "me",
+        }
+        assert json.loads(exchange.body) == {
+            "access_token": "REDACTED",
+            "expires_in": 900,
+        }
+        assert exchange.headers == {"Content-Type": "application/json"}
+        assert exchange.elapsed == 0.25
+
+    def test_send_records_to_given_empty_cassette(self):
+        cassette = Cassette()
+        recorder = RecordingAdapter(CannedAdapter(b"{}"), cassette=cassette)
+        create_connection(recorder).get("/api/v1/Computer")
+        assert len(cassette) == 1
+
+
+class TestCassette:
+    def test_save_and_load_round_trip(self, tmp_path):
+        path = str(tmp_path / "test.cassette")
+        exchanges = [
+            create_exchange(),
+            create_exchange(body=b"\x89PNG\x00\xff", method="POST", request_body="{}"),
+        ]
+        Cassette(exchanges, redacted_fields={"secret"}).save(path)
+        cassette = Cassette.load(path)
+        assert cassette.exchanges == exchanges
+        assert cassette.redacted_fields == {"secret"}
+
+    def test_load_when_file_is_not_cassette_raises_py42_error(self, tmp_path):
+        path = tmp_path / "test.cassette"
+        path.write_text("not a cassette")
+        with pytest.raises(Py42Error):
+            Cassette.load(str(path))
+        with gzip.open(str(path), "wt") as cassette_file:
+            cassette_file.write('{"version": 99}\n')
+        with pytest.raises(Py42Error):
+            Cassette.load(str(path))
+
+
+class TestReplayAdapter:
+    def test_send_returns_recorded_responses_in_order_then_repeats_last(self):
+        cassette = Cassette(
+            [create_exchange(body=b'{"data": 1}'), create_exchange(body=b'{"data": 2}')]
+        )
+        connection = create_connection(ReplayAdapter(cassette))
+        assert [connection.get("/api/v1/Computer").data for _ in range(3)] == [1, 2, 2]
+
+    def test_send_matches_request_body(self):
+        cassette = Cassette(
+            [
+                create_exchange(method="POST", request_body='{"pgToken": "a"}'),
+                create_exchange(
+                    method="POST", request_body='{"pgToken": "b"}', body=b'{"data": 2}'
+                ),
+            ]
+        )
+        connection = create_connection(ReplayAdapter(cassette))
+        response = connection.post("/api/v1/Computer", data='{"pgToken": "b"}')
+        assert response.data == 2
+
+    def test_send_matches_redacted_request(self):
+        recorder = RecordingAdapter(CannedAdapter(b'{"data": "ok"}'))
+        create_connection(recorder).post("/api/v1/DataKeyToken", json={"password": "a"})
+        connection = create_connection(ReplayAdapter(recorder.cassette))
+        response = connection.post("/api/v1/DataKeyToken", json={"password": "b"})
+        assert response.data == "ok"
+
+    def test_send_when_request_not_recorded_raises_py42_error(self):
+        connection = create_connection(ReplayAdapter(Cassette([create_exchange()])))
+        with pytest.raises(Py42Error) as err:
+            connection.get("/api/v1/User")
+        assert f"GET {HOST}/api/v1/User" in str(err.value)
+
+    def test_send_waits_for_scaled_latency(self, mocker):
+        sleep = mocker.patch("py42.cassette.time.sleep")
+        connection = create_connection(
+            ReplayAdapter(Cassette([create_exchange()]), latency_scale=2)
+        )
+        connection.get("/api/v1/Computer")
+        sleep.assert_called_once_with(1.0)
+
+    def test_send_by_default_does_not_wait(self, mocker):
+        sleep = mocker.patch("py42.cassette.time.sleep")
+        connection = create_connection(ReplayAdapter(Cassette([create_exchange()])))
+        connection.get("/api/v1/Computer")
+        sleep.assert_not_called()
+
+    def test_send_returns_streamable_response(self):
+        body = b'{"data": {"computers": [{"id": 1}, {"id": 2}]}}'
+        connection = create_connection(
+            ReplayAdapter(Cassette([create_exchange(body=body)]))
+        )
+        response = connection.get("/api/v1/Computer", stream=True)
+        assert response.headers["Content-Length"] == str(len(body))
+        assert list(response.iter_items("computers")) == [{"id": 1}, {"id": 2}]
@@ -0,0 +1,118 @@
+import pytest
+
+from py42.circuitbreaker import CircuitBreaker
+from py42.exceptions import Py42CircuitOpenError
+
+HOST = "alerts.example.com"
+
+
+@pytest.fixture
+def clock(mocker):
+    now = [1000.0]
+    mocker.patch("py42.circuitbreaker.time.monotonic", side_effect=lambda: now[0])
+
+    def advance(seconds):
+        now[0] += seconds
+
+    return advance
+
+
+def fail(breaker, times, host=HOST):
+    for _ in range(times):
+        breaker.before_request(host)
+        breaker.on_failure(host)
+
+
+def test_before_request_when_failures_below_threshold_does_not_raise(clock):
+    breaker = CircuitBreaker(failure_threshold=3)
+    fail(breaker, 2)
+    breaker.before_request(HOST)
+    assert breaker.get_states()[HOST]["state"] == "closed"
+
+
+def test_before_request_when_threshold_reached_raises_circuit_open_error(clock):
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=10)
+    fail(breaker, 3)
+    clock(4)
+    with pytest.raises(Py42CircuitOpenError) as err:
+        breaker.before_request(HOST)
+    assert err.value.host == HOST
+    assert err.value.retry_after == 6
+    assert "6.0 more seconds" in str(err.value)
+
+
+def test_on_success_resets_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3)
+    fail(breaker, 2)
+    breaker.on_success(HOST)
+    fail(breaker, 2)
+    breaker.before_request(HOST)
+    assert breaker.get_states()[HOST]["consecutive_failures"] == 2
+
+
+def test_circuits_are_kept_per_host(clock):
+    breaker = CircuitBreaker(failure_threshold=1)
+    fail(breaker, 1)
+    breaker.before_request("cases.example.com")
+
+
+def test_before_request_after_recovery_timeout_lets_one_probe_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10)
+    fail(breaker, 1)
+    clock(10)
+    breaker.before_request(HOST)
+    assert breaker.get_states()[HOST]["state"] == "half_open"
+    with pytest.raises(Py42CircuitOpenError):
+        breaker.before_request(HOST)
+
+
+def test_successful_probe_closes_circuit(clock):
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10)
+    fail(breaker, 1)
+    clock(10)
+    breaker.before_request(HOST)
+    breaker.on_success(HOST)
+    breaker.before_request(HOST)
+    breaker.before_request(HOST)
+    assert breaker.get_states()[HOST]["state"] == "closed"
+
+
+def test_failed_probe_reopens_circuit_for_twice_as_long(clock):
+    breaker = CircuitBreaker(
+        failure_threshold=1, recovery_timeout=10, max_recovery_timeout=30
+    )
+    fail(breaker, 1)
+    for expected_timeout in (20, 30, 30):
+        clock(100)
+        fail(breaker, 1)
+        assert breaker.get_states()[HOST]["retry_after"] == expected_timeout
+    assert breaker.get_states()[HOST]["opened"] == 4
+
+
+def test_probe_that_never_finishes_is_replaced_after_recovery_timeout(clock):
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10)
+    fail(breaker, 1)
+    clock(10)
+    breaker.before_request(HOST)
+    clock(10)
+    breaker.before_request(HOST)
+
+
+def test_get_states_reports_each_host(clock):
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=10)
+    fail(breaker, 2)
+    fail(breaker, 1, host="cases.example.com")
+    assert breaker.get_states() == {
+        HOST: {
+            "state": "open",
+            "consecutive_failures": 2,
+            "opened": 1,
+            "retry_after": 10,
+        },
+        "cases.example.com": {
+            "state": "closed",
+            "consecutive_failures": 1,
+            "opened": 0,
+            "retry_after": 0,
+        },
+    }
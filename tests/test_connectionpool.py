@@ -0,0 +1,145 @@
+import pickle
+import threading
+
+import pytest
+
+import py42.settings as settings
+from py42.connectionpool import _reset_adapters_after_fork
+from py42.connectionpool import PoolingHTTPAdapter
+from py42.connectionpool import take_pool_wait
+from py42.services._connection import create_session
+from py42.services._connection import get_pool_stats
+
+
+def get_pool(adapter, url="https://alerts.example.com"):
+    return adapter.poolmanager.connection_from_url(url)
+
+
+@pytest.fixture
+def pool_maxsize():
+    original = settings.pool_maxsize
+    yield
+    settings.pool_maxsize = original
+
+
+def test_pool_size_defaults_to_setting(pool_maxsize):
+    settings.pool_maxsize = 7
+    adapter = PoolingHTTPAdapter()
+    assert get_pool(adapter).pool.maxsize == 7
+
+
+def test_pool_size_uses_maxsize():
+    adapter = PoolingHTTPAdapter(maxsize=12)
+    assert get_pool(adapter).pool.maxsize == 12
+
+
+def test_pool_size_uses_first_matching_host_pattern():
+    adapter = PoolingHTTPAdapter(
+        maxsize=2, host_maxsize={"alerts.example.com": 16, "*.example.com": 8}
+    )
+    assert get_pool(adapter).pool.maxsize == 16
+    assert get_pool(adapter, "https://cases.example.com").pool.maxsize == 8
+    assert get_pool(adapter, "https://example.org").pool.maxsize == 2
+
+
+def test_get_stats_records_checkouts_and_returns():
+    adapter = PoolingHTTPAdapter(maxsize=4)
+    pool = get_pool(adapter)
+    first = pool._get_conn()
+    second = pool._get_conn()
+    pool._put_conn(first)
+
+    stats = adapter.get_stats()["alerts.example.com"]
+    assert stats["maxsize"] == 4
+    assert stats["checkouts"] == 2
+    assert stats["in_use"] == 1
+    assert stats["max_in_use"] == 2
+    assert stats["waits"] == 0
+    assert stats["utilization"] == 0.25
+    pool._put_conn(second)
+
+
+def test_get_stats_records_waits_for_full_pool():
+    adapter = PoolingHTTPAdapter(maxsize=1)
+    pool = get_pool(adapter)
+    conn = pool._get_conn()
+    timer = threading.Timer(0.05, pool._put_conn, args=(conn,))
+    timer.start()
+    pool._put_conn(pool._get_conn(timeout=5))
+    timer.join()
+
+    stats = adapter.get_stats()["alerts.example.com"]
+    assert stats["waits"] == 1
+    assert stats["total_wait_seconds"] > 0
+    assert stats["max_wait_seconds"] == stats["total_wait_seconds"]
+    assert stats["grown"] == 0
+    assert pool.pool.maxsize == 1
+
+
+def test_take_pool_wait_returns_wait_of_current_thread_once():
+    adapter = PoolingHTTPAdapter(maxsize=1)
+    pool = get_pool(adapter)
+    take_pool_wait()
+    conn = pool._get_conn()
+    timer = threading.Timer(0.05, pool._put_conn, args=(conn,))
+    timer.start()
+    pool._put_conn(pool._get_conn(timeout=5))
+    timer.join()
+    assert take_pool_wait() > 0
+    assert take_pool_wait() == 0
+
+
+def test_autoscale_grows_pool_when_checkout_waits():
+    adapter = PoolingHTTPAdapter(maxsize=1, autoscale_maxsize=3, autoscale_wait=0.01)
+    pool = get_pool(adapter)
+    conn = pool._get_conn()
+    timer = threading.Timer(0.05, pool._put_conn, args=(conn,))
+    timer.start()
+    waiting = pool._get_conn(timeout=5)
+    timer.join()
+
+    assert pool.pool.maxsize == 2
+    # The pool has room for a second connection without waiting.
+    other = pool._get_conn(timeout=0.01)
+    stats = adapter.get_stats()["alerts.example.com"]
+    assert stats["maxsize"] == 2
+    assert stats["grown"] == 1
+    assert stats["in_use"] == 2
+    pool._put_conn(waiting)
+    pool._put_conn(other)
+
+
+def test_autoscale_does_not_grow_past_autoscale_maxsize():
+    adapter = PoolingHTTPAdapter(maxsize=2, autoscale_maxsize=3, autoscale_wait=0)
+    pool = get_pool(adapter)
+    adapter._record_checkout(pool, True, 1)
+    adapter._record_checkout(pool, True, 1)
+    assert pool.pool.maxsize == 3
+    assert adapter.get_stats()["alerts.example.com"]["grown"] == 1
+
+
+def test_get_pool_stats_returns_stats_of_session_adapter():
+    adapter = PoolingHTTPAdapter(maxsize=4)
+    session = create_session(adapter)
+    pool = get_pool(adapter)
+    pool._put_conn(pool._get_conn())
+    assert get_pool_stats(session)["alerts.example.com"]["checkouts"] == 1
+
+
+def test_adapter_can_be_pickled():
+    adapter = PoolingHTTPAdapter(maxsize=3, host_maxsize={"*.example.com": 9})
+    restored = pickle.loads(pickle.dumps(adapter))
+    assert get_pool(restored).pool.maxsize == 9
+    assert get_pool(restored, "https://example.org").pool.maxsize == 3
+    assert restored.get_stats() == {}
+
+
+def test_reset_after_fork_replaces_pools_and_stats():
+    adapter = PoolingHTTPAdapter(maxsize=4)
+    pool = get_pool(adapter)
+    conn = pool._get_conn()
+    _reset_adapters_after_fork()
+    assert adapter.get_stats() == {}
+    assert get_pool(adapter) is not pool
+    assert get_pool(adapter).pool.qsize() == 4
+    pool._put_conn(conn)
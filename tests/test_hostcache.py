@@ -0,0 +1,46 @@
+import pytest
+
+from py42.hostcache import FileHostCache
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "hosts.json")
+
+
+def test_get_returns_host_set_by_another_cache(cache_path):
+    FileHostCache(cache_path).set("key", "https://alerts.example.com")
+    assert FileHostCache(cache_path).get("key") == "https://alerts.example.com"
+
+
+def test_get_when_key_missing_returns_none(cache_path):
+    FileHostCache(cache_path).set("key", "https://alerts.example.com")
+    assert FileHostCache(cache_path).get("other") is None
+
+
+def test_get_when_entry_expired_returns_none(mocker, cache_path):
+    time = mocker.patch("py42.hostcache.time.time")
+    time.return_value = 1000
+    cache = FileHostCache(cache_path, ttl=60)
+    cache.set("key", "https://alerts.example.com")
+    time.return_value = 1059
+    assert cache.get("key") == "https://alerts.example.com"
+    time.return_value = 1060
+    assert cache.get("key") is None
+
+
+def test_get_when_file_corrupt_returns_none(cache_path):
+    with open(cache_path, "w") as cache_file:
+        cache_file.write("{not json")
+    cache = FileHostCache(cache_path)
+    assert cache.get("key") is None
+    cache.set("key", "https://alerts.example.com")
+    assert cache.get("key") == "https://alerts.example.com"
+
+
+def test_clear_removes_all_entries(cache_path):
+    cache = FileHostCache(cache_path)
+    cache.set("key", "https://alerts.example.com")
+    cache.clear()
+    cache.clear()
+    assert cache.get("key") is None
@@ -0,0 +1,130 @@
+import builtins
+
+import pytest
+
+from py42.exceptions import Py42Error
+from py42.instrumentation import get_uri_template
+from py42.instrumentation import LatencyHistogram
+from py42.instrumentation import OpenTelemetryHook
+from py42.instrumentation import RequestMetrics
+
+
+def create_metrics(duration=0.1, **kwargs):
+    values = {
+        "method": "GET",
+        "uri_template": "/api/v1/Computer/{id}",
+        "host": "example.com",
+        "status_code": 200,
+        "bytes_sent": 0,
+        "bytes_received": 100,
+        "time_to_first_byte": 0.05,
+        "duration": duration,
+        "retries": 0,
+        "pool_wait": 0.0,
+        "error": None,
+    }
+    values.update(kwargs)
+    return RequestMetrics(**values)
+
+
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        ("/api/v1/Computer/123456", "/api/v1/Computer/{id}"),
+        (
+            "/api/v1/cases/42/fileevent/4e0c2bc1-6e38-4d0b-bd1b-67e4b1d1f2a1",
+            "/api/v1/cases/{id}/fileevent/{id}",
+        ),
+        (
+            "/api/v1/files/38acb15d02d5ac0f2a2789602e9df950c380d2799b4bdb59394e4eeabdd3a662",
+            "/api/v1/files/{id}",
+        ),
+        ("https://example.com/api/v1/Org/my-org?page=2", "/api/v1/Org/my-org"),
+        ("/api/v2/alerts", "/api/v2/alerts"),
+    ],
+)
+def test_get_uri_template_replaces_ids(url, expected):
+    assert get_uri_template(url) == expected
+
+
+class TestLatencyHistogram:
+    def test_get_stats_aggregates_each_endpoint(self):
+        histogram = LatencyHistogram()
+        histogram.request_finished(None, create_metrics(0.1, retries=2))
+        histogram.request_finished(None, create_metrics(0.3, status_code=503))
+        histogram.request_finished(None, create_metrics(method="POST"))
+        stats = histogram.get_stats()
+        assert set(stats) == {"GET /api/v1/Computer/{id}", "POST /api/v1/Computer/{id}"}
+        get_stats = stats["GET /api/v1/Computer/{id}"]
+        assert get_stats["count"] == 2
+        assert get_stats["errors"] == 1
+        assert get_stats["total_seconds"] == pytest.approx(0.4)
+        assert get_stats["mean_seconds"] == pytest.approx(0.2)
+        assert get_stats["max_seconds"] == 0.3
+        assert get_stats["mean_time_to_first_byte"] == 0.05
+        assert get_stats["bytes_received"] == 200
+        assert get_stats["retries"] == 2
+
+    def test_get_stats_estimates_quantiles_from_buckets(self):
+        histogram = LatencyHistogram(buckets=(0.1, 1, 10))
+        for _ in range(98):
+            histogram.request_finished(None, create_metrics(0.05))
+        histogram.request_finished(None, create_metrics(0.5))
+        histogram.request_finished(None, create_metrics(20))
+        stats = histogram.get_stats()["GET /api/v1/Computer/{id}"]
+        assert stats["p50_seconds"] == 0.1
+        assert stats["p90_seconds"] == 0.1
+        assert stats["p99_seconds"] == 1
+        assert stats["buckets"] == {0.1: 98, 1: 1, 10: 0, float("inf"): 1}
+
+    def test_get_stats_caps_quantiles_at_slowest_request(self):
+        histogram = LatencyHistogram(buckets=(1,))
+        histogram.request_finished(None, create_metrics(0.2))
+        stats = histogram.get_stats()["GET /api/v1/Computer/{id}"]
+        assert stats["p99_seconds"] == 0.2
+
+    def test_get_stats_counts_raised_errors(self):
+        histogram = LatencyHistogram()
+        metrics = create_metrics(status_code=None, error=OSError("reset"))
+        histogram.request_finished(None, metrics)
+        stats = histogram.get_stats()["GET /api/v1/Computer/{id}"]
+        assert stats["errors"] == 1
+        assert stats["mean_time_to_first_byte"] == 0.05
+
+    def test_reset_discards_stats(self):
+        histogram = LatencyHistogram()
+        histogram.request_finished(None, create_metrics())
+        histogram.reset()
+        assert histogram.get_stats() == {}
+
+
+class TestOpenTelemetryHook:
+    def test_init_when_opentelemetry_missing_raises_py42_error(self, mocker):
+        real_import = builtins.__import__
+
+        def import_without_opentelemetry(name, *args, **kwargs):
+            if name.startswith("opentelemetry"):
+                raise ImportError(name)
+            return real_import(name, *args, **kwargs)
+
+        mocker.patch("builtins.__import__", side_effect=import_without_opentelemetry)
+        with pytest.raises(Py42Error) as err:
+            OpenTelemetryHook()
+        assert "pip install py42[opentelemetry]" in str(err.value)
+
+    def test_request_finished_records_span_attributes(self, mocker):
+        pytest.importorskip("opentelemetry")
+        tracer = mocker.MagicMock()
+        meter = mocker.MagicMock()
+        hook = OpenTelemetryHook(tracer=tracer, meter=meter)
+        span = hook.request_started("GET", "/api/v1/Computer/{id}")
+        hook.request_finished(span, create_metrics(status_code=404, retries=1))
+        assert tracer.start_span.call_args[0][0] == "GET /api/v1/Computer/{id}"
+        attributes = span.set_attributes.call_args[0][0]
+        assert attributes["http.response.status_code"] == 404
+        assert attributes["error.type"] == "404"
+        span.set_attribute.assert_called_once_with("http.request.resend_count", 1)
+        span.end.assert_called_once_with()
+        meter.create_histogram.return_value.record.assert_called_once_with(
+            0.1, attributes
+        )
@@ -0,0 +1,76 @@
+import pickle
+
+import pytest
+
+from py42.exceptions import Py42Error
+from py42.jsoncodec import EncodedJson
+from py42.jsoncodec import get_codec
+from py42.jsoncodec import JsonCodec
+from py42.jsoncodec import STDLIB
+
+DOCUMENT = {"items": [{"name": "foo/bar", "size": 1}], "total": 1}
+
+
+def test_get_codec_when_none_returns_stdlib_codec():
+    assert get_codec() is STDLIB
+
+
+def test_get_codec_when_json_returns_stdlib_codec():
+    assert get_codec("json") is STDLIB
+
+
+def test_get_codec_when_given_codec_returns_it():
+    codec = JsonCodec()
+    assert get_codec(codec) is codec
+
+
+def test_get_codec_when_unknown_name_raises_py42_error():
+    with pytest.raises(Py42Error) as err:
+        get_codec("simplejson")
+    assert "Unknown JSON codec 'simplejson'" in str(err.value)
+
+
+def test_get_codec_when_package_missing_raises_py42_error(mocker):
+    mocker.patch("py42.jsoncodec._codecs", {})
+    mocker.patch("importlib.import_module", side_effect=ImportError)
+    with pytest.raises(Py42Error) as err:
+        get_codec("ujson")
+    assert "pip install ujson" in str(err.value)
+
+
+def test_stdlib_codec_loads_bytes():
+    assert STDLIB.loads(b'{"foo": "bar"}') == {"foo": "bar"}
+
+
+def test_stdlib_codec_dumps_bytes_returns_utf8_json():
+    assert STDLIB.dumps_bytes({"foo": "bär"}) == b'{"foo": "b\\u00e4r"}'
+
+
+def test_orjson_codec_round_trips_document():
+    pytest.importorskip("orjson")
+    codec = get_codec("orjson")
+    assert codec.loads(codec.dumps_bytes(DOCUMENT)) == DOCUMENT
+    assert codec.loads(codec.dumps(DOCUMENT)) == DOCUMENT
+
+
+def test_ujson_codec_round_trips_document():
+    pytest.importorskip("ujson")
+    codec = get_codec("ujson")
+    assert codec.loads(codec.dumps_bytes(DOCUMENT)) == DOCUMENT
+    assert "foo/bar" in codec.dumps(DOCUMENT)
+
+
+def test_encoded_json_cannot_be_changed():
+    body = EncodedJson({"pgNum": 1}, b'{"pgNum":1}')
+    assert body == {"pgNum": 1}
+    with pytest.raises(TypeError):
+        body["pgNum"] = 2
+    with pytest.raises(TypeError):
+        body.update(pgNum=2)
+    assert body.encoded == b'{"pgNum":1}'
+
+
+def test_encoded_json_pickles():
+    body = pickle.loads(pickle.dumps(EncodedJson({"pgNum": 1}, b'{"pgNum":1}')))
+    assert body == {"pgNum": 1}
+    assert body.encoded == b'{"pgNum":1}'
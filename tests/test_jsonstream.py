@@ -0,0 +1,86 @@
+import io
+import json
+
+import pytest
+
+from py42._jsonstream import iter_array_items
+
+FILE_EVENT_PAGE = {
+    "totalCount": 3,
+    "fileEvents": [
+        {"event": {"id": "1"}, "file": {"name": "résumé.pdf", "sizeInBytes": 1024}},
+        {"event": {"id": "2"}, "file": {"name": "b.txt", "sizeInBytes": -1.5e3}},
+        {"event": {"id": "3"}, "file": None},
+    ],
+    "nextPgToken": 'token"with"quotes',
+    "problems": None,
+}
+
+
+def chunk(document, size):
+    stream = io.BytesIO(json.dumps(document, indent=2).encode("utf-8"))
+    return list(iter(lambda: stream.read(size), b""))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5, 64, 100000])
+def test_iter_array_items_yields_items_for_any_chunk_size(chunk_size):
+    items = list(iter_array_items(chunk(FILE_EVENT_PAGE, chunk_size), "fileEvents"))
+    assert items == FILE_EVENT_PAGE["fileEvents"]
+
+
+def test_iter_array_items_fills_fields_with_other_members():
+    fields = {}
+    for _ in iter_array_items(chunk(FILE_EVENT_PAGE, 7), "fileEvents", fields):
+        pass
+    assert fields == {
+        "totalCount": 3,
+        "nextPgToken": 'token"with"quotes',
+        "problems": None,
+    }
+
+
+def test_iter_array_items_looks_inside_data_member():
+    document = {"data": {"events": [1, 22, 333], "totalCount": 3}}
+    fields = {}
+    items = list(iter_array_items(chunk(document, 1), "events", fields))
+    assert items == [1, 22, 333]
+    assert fields == {"totalCount": 3}
+
+
+def test_iter_array_items_when_key_is_none_yields_items_of_root_list():
+    assert list(iter_array_items(chunk([{"a": 1}, 2.5], 3))) == [{"a": 1}, 2.5]
+
+
+def test_iter_array_items_when_key_is_none_yields_items_of_data_list():
+    assert list(iter_array_items(chunk({"data": ["a", "b"]}, 3))) == ["a", "b"]
+
+
+def test_iter_array_items_when_list_is_empty_yields_nothing():
+    assert list(iter_array_items([b'{"computers": []}'], "computers")) == []
+
+
+def test_iter_array_items_accepts_str_chunks():
+    assert list(iter_array_items(['{"items": [1,', " 2]}"], "items")) == [1, 2]
+
+
+def test_iter_array_items_when_key_missing_raises_key_error():
+    with pytest.raises(KeyError):
+        list(iter_array_items([b'{"computers": []}'], "users"))
+
+
+def test_iter_array_items_when_body_truncated_raises_decode_error():
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_array_items([b'{"items": [1, 2'], "items"))
+
+
+def test_iter_array_items_when_items_not_delimited_raises_decode_error():
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_array_items([b'{"items": [1 2]}'], "items"))
+
+
+def test_iter_array_items_yields_items_before_body_is_complete():
+    def chunks():
+        yield b'{"items": [{"id": 1}, '
+        raise AssertionError("read past the first item")
+
+    assert next(iter_array_items(chunks(), "items")) == {"id": 1}
@@ -1,7 +1,10 @@
+import io
+
 import pytest
 from requests import Response
 
 from py42.exceptions import Py42Error
+from py42.jsoncodec import JsonCodec
 from py42.response import Py42Response
 
 JSON_LIST_WITH_DATA_NODE = (
@@ -16,6 +19,16 @@ JSON_DICT_EMPTY_DATA_NODE = '{"data": []}'
 PLAIN_TEXT = "TEST_PLAIN_TEXT"
 
 
+def create_requests_response(content=JSON_DICT_NO_DATA_NODE):
+    response = Response()
+    response.status_code = 200
+    response.url = "https://example.com/api/v1/Computer"
+    response.encoding = "utf-8"
+    response.headers["Content-Type"] = "application/json"
+    response._content = content.encode("utf-8")
+    return response
+
+
 class TestPy42Response:
     @pytest.fixture
     def mock_response_list_data_node(self, mocker):
@@ -226,3 +239,129 @@ class TestPy42Response:
     def test_data_no_data_node_returns_dict_keys(self, mock_response_dict_no_data_node):
         response = Py42Response(mock_response_dict_no_data_node)
         assert type(response.data["item_list_key"]) == dict
+
+    def test_data_is_parsed_from_content_bytes(self, mocker):
+        mock_response = mocker.MagicMock(spec=Response)
+        mock_response.content = JSON_DICT_NO_DATA_NODE.encode("utf-8")
+        text = mocker.PropertyMock(return_value=JSON_DICT_NO_DATA_NODE)
+        type(mock_response).text = text
+        response = Py42Response(mock_response)
+        assert response["item_list_key"]["foo"] == "foo_val"
+        assert text.call_count == 0
+
+    def test_data_is_parsed_with_given_codec(self, mock_response_dict_no_data_node):
+        codec = JsonCodec()
+        codec.loads = lambda s: {"parsed": s}
+        response = Py42Response(mock_response_dict_no_data_node, json_codec=codec)
+        assert response["parsed"] == JSON_DICT_NO_DATA_NODE.encode("utf-8")
+
+    def test_text_after_data_changed_through_earlier_reference_reflects_new_value(
+        self, mock_response_dict_no_data_node
+    ):
+        response = Py42Response(mock_response_dict_no_data_node)
+        data = response.data
+        assert "new_key" not in response.text
+        data["new_key"] = "new_value"
+        assert '"new_key": "new_value"' in response.text
+
+    def test_text_after_setitem_reflects_new_value(
+        self, mock_response_dict_no_data_node
+    ):
+        response = Py42Response(mock_response_dict_no_data_node)
+        assert "new_key" not in response.text
+        response["new_key"] = "new_value"
+        assert '"new_key": "new_value"' in response.text
+
+    def test_text_after_data_changed_reflects_new_value(
+        self, mock_response_dict_no_data_node
+    ):
+        response = Py42Response(mock_response_dict_no_data_node)
+        assert "new_key" not in response.text
+        response.data["item_list_key"]["new_key"] = "new_value"
+        assert '"new_key": "new_value"' in response.text
+
+    def test_iter_items_when_not_streamed_yields_items_of_parsed_data(
+        self, mock_response_list_no_data_node
+    ):
+        response = Py42Response(mock_response_list_no_data_node)
+        items = list(response.iter_items("item_list_key"))
+        assert items == [{"foo": "foo_val"}, {"bar": "bar_val"}]
+
+    def test_iter_items_when_streamed_parses_items_from_content_chunks(self, mocker):
+        body = b'{"nextPgToken": "abc", "fileEvents": [{"id": 1}, {"id": 2}]}'
+        mock_response = mocker.MagicMock(spec=Response)
+        mock_response._content_consumed = False
+        mock_response.iter_content.return_value = [body[:20], body[20:35], body[35:]]
+        response = Py42Response(mock_response)
+        items = list(response.iter_items("fileEvents", chunk_size=16))
+        assert items == [{"id": 1}, {"id": 2}]
+        mock_response.iter_content.assert_called_once_with(chunk_size=16)
+        assert response["nextPgToken"] == "abc"
+
+    def test_compact_response_releases_raw_response_once_parsed(self):
+        response = Py42Response(create_requests_response(), compact=True)
+        raw_response = response._response
+        assert response["item_list_key"]["foo"] == "foo_val"
+        assert response._response is None
+        assert response.status_code == raw_response.status_code == 200
+        assert response.url == raw_response.url
+        assert response.headers is raw_response.headers
+        assert response.encoding == "utf-8"
+        assert "foo_val" in response.text
+
+    def test_compact_response_content_after_parse_raises_py42_error(self):
+        response = Py42Response(create_requests_response(), compact=True)
+        assert response.data
+        with pytest.raises(Py42Error):
+            response.content
+        with pytest.raises(Py42Error):
+            response.raw_text
+
+    def test_compact_response_when_body_is_not_json_keeps_text(self):
+        raw_response = create_requests_response(PLAIN_TEXT)
+        response = Py42Response(raw_response, compact=True)
+        assert response.data == PLAIN_TEXT
+        assert response._response is None
+        assert response.text == PLAIN_TEXT
+        assert str(response) == PLAIN_TEXT
+        assert response.status_code == 200
+
+    @pytest.mark.parametrize("content", ['{"data": null}', "null"])
+    def test_compact_response_when_data_is_null_can_be_read_again(self, content):
+        response = Py42Response(create_requests_response(content), compact=True)
+        assert response.data is None
+        assert response._response is None
+        assert response.data is None
+        assert response.text == "null"
+        assert str(response) == "None"
+        assert "data=None" in repr(response)
+        with pytest.raises(Py42Error):
+            response["key"]
+
+    def test_compact_response_releases_raw_response_after_streamed_iter_items(
+        self,
+    ):
+        raw_response = create_requests_response()
+        raw_response._content = False
+        raw_response._content_consumed = False
+        raw_response.raw = io.BytesIO(b'{"items": [1, 2], "total": 2}')
+        response = Py42Response(raw_response, compact=True)
+        assert list(response.iter_items("items")) == [1, 2]
+        assert response._response is None
+        assert response["total"] == 2
+        assert response.status_code == 200
+
+    def test_compact_defaults_to_setting(self, mocker):
+        mocker.patch("py42.settings.compact_responses", True)
+        response = Py42Response(create_requests_response())
+        assert response.data
+        assert response._response is None
+
+    def test_response_does_not_release_raw_response_by_default(self):
+        response = Py42Response(create_requests_response())
+        assert response.data
+        assert response.raw_text == JSON_DICT_NO_DATA_NODE
+
+    def test_response_has_no_instance_dict(self, mock_response_dict_no_data_node):
+        response = Py42Response(mock_response_dict_no_data_node)
+        assert not hasattr(response, "__dict__")
@@ -0,0 +1,171 @@
+import threading
+from email.utils import formatdate
+
+import pytest
+from requests import Response
+
+from py42.retry import get_retry_after
+from py42.retry import RateLimiter
+from py42.retry import RetryPolicy
+
+
+def create_response(mocker, status_code, retry_after=None):
+    response = mocker.MagicMock(spec=Response)
+    response.status_code = status_code
+    response.headers = {"Retry-After": retry_after} if retry_after else {}
+    return response
+
+
+@pytest.fixture
+def clock(mocker):
+    now = [1000.0]
+    mocker.patch("py42.retry.time.monotonic", side_effect=lambda: now[0])
+    sleep = mocker.patch("py42.retry.time.sleep")
+
+    def advance(seconds):
+        now[0] += seconds
+
+    sleep.side_effect = advance
+    return sleep
+
+
+class TestRetryPolicy:
+    @pytest.mark.parametrize("status_code", [429, 502, 503, 504])
+    def test_get_response_delay_retries_get_with_retry_statuses(
+        self, mocker, status_code
+    ):
+        policy = RetryPolicy(jitter=False)
+        response = create_response(mocker, status_code)
+        assert policy.get_response_delay("GET", response, 0) == 0.5
+
+    @pytest.mark.parametrize("status_code", [400, 401, 404, 500])
+    def test_get_response_delay_does_not_retry_other_statuses(
+        self, mocker, status_code
+    ):
+        response = create_response(mocker, status_code)
+        assert RetryPolicy().get_response_delay("GET", response, 0) is None
+
+    def test_get_response_delay_retries_throttled_post(self, mocker):
+        response = create_response(mocker, 429)
+        assert RetryPolicy().get_response_delay("POST", response, 0) is not None
+
+    def test_get_response_delay_does_not_retry_post_after_server_error(self, mocker):
+        response = create_response(mocker, 503)
+        assert RetryPolicy().get_response_delay("POST", response, 0) is None
+
+    def test_get_response_delay_retries_post_when_idempotent_method(self, mocker):
+        policy = RetryPolicy(idempotent_methods=["get", "post"])
+        response = create_response(mocker, 503)
+        assert policy.get_response_delay("POST", response, 0) is not None
+
+    def test_get_response_delay_stops_after_max_retries(self, mocker):
+        policy = RetryPolicy(max_retries=2)
+        response = create_response(mocker, 503)
+        assert policy.get_response_delay("GET", response, 1) is not None
+        assert policy.get_response_delay("GET", response, 2) is None
+
+    def test_get_response_delay_uses_retry_after_seconds(self, mocker):
+        response = create_response(mocker, 429, retry_after="7")
+        assert RetryPolicy().get_response_delay("GET", response, 0) == 7
+
+    def test_get_response_delay_when_retry_after_too_long_returns_none(self, mocker):
+        policy = RetryPolicy(max_retry_after=60)
+        response = create_response(mocker, 429, retry_after="61")
+        assert policy.get_response_delay("GET", response, 0) is None
+
+    def test_get_backoff_doubles_up_to_max_backoff(self):
+        policy = RetryPolicy(backoff_factor=1, max_backoff=5, jitter=False)
+        assert [policy.get_backoff(retries) for retries in range(4)] == [1, 2, 4, 5]
+
+    def test_get_backoff_with_jitter_is_at_most_backoff(self):
+        policy = RetryPolicy(backoff_factor=1)
+        assert all(0 <= policy.get_backoff(2) <= 4 for _ in range(100))
+
+    def test_get_error_delay_retries_only_idempotent_methods(self):
+        policy = RetryPolicy(jitter=False)
+        assert policy.get_error_delay("DELETE", 0) == 0.5
+        assert policy.get_error_delay("PATCH", 0) is None
+        assert policy.get_error_delay("GET", 3) is None
+
+
+class TestGetRetryAfter:
+    def test_returns_none_when_no_header(self, mocker):
+        assert get_retry_after(create_response(mocker, 429)) is None
+
+    def test_returns_seconds_until_http_date(self, mocker):
+        mocker.patch("py42.retry.time.time", return_value=1000000000)
+        retry_at = formatdate(1000000030, usegmt=True)
+        response = create_response(mocker, 429, retry_after=retry_at)
+        assert get_retry_after(response) == 30
+
+    def test_returns_none_when_header_invalid(self, mocker):
+        response = create_response(mocker, 429, retry_after="soon")
+        assert get_retry_after(response) is None
+
+
+class TestRateLimiter:
+    def test_acquire_allows_burst_without_waiting(self, clock):
+        limiter = RateLimiter(rate=5)
+        for _ in range(5):
+            limiter.acquire("example.com")
+        assert clock.call_count == 0
+
+    def test_acquire_spaces_requests_after_burst(self, clock):
+        limiter = RateLimiter(rate=4, burst=1)
+        limiter.acquire("example.com")
+        limiter.acquire("example.com")
+        limiter.acquire("example.com")
+        assert [call[0][0] for call in clock.call_args_list] == [0.25, 0.25]
+
+    def test_acquire_limits_each_host_separately(self, clock):
+        limiter = RateLimiter(rate=1)
+        limiter.acquire("alerts.example.com")
+        limiter.acquire("cases.example.com")
+        assert clock.call_count == 0
+
+    def test_host_rates_use_first_matching_pattern(self, clock):
+        limiter = RateLimiter(rate=10, host_rates={"*forensic*": 2})
+        limiter.acquire("forensic-search.example.com")
+        limiter.acquire("alerts.example.com")
+        assert limiter.get_rates() == {
+            "forensic-search.example.com": 2,
+            "alerts.example.com": 10,
+        }
+
+    def test_on_throttle_halves_rate_down_to_min_rate(self, clock):
+        limiter = RateLimiter(rate=8, min_rate=3)
+        limiter.on_throttle("example.com")
+        assert limiter.get_rates()["example.com"] == 4
+        limiter.on_throttle("example.com")
+        assert limiter.get_rates()["example.com"] == 3
+
+    def test_on_success_raises_rate_up_to_configured_rate(self, clock):
+        limiter = RateLimiter(rate=20)
+        limiter.on_throttle("example.com")
+        limiter.on_success("example.com")
+        assert limiter.get_rates()["example.com"] == 11
+        for _ in range(20):
+            limiter.on_success("example.com")
+        assert limiter.get_rates()["example.com"] == 20
+
+    def test_when_not_adaptive_throttles_do_not_change_rate(self, clock):
+        limiter = RateLimiter(rate=8, adaptive=False)
+        limiter.acquire("example.com")
+        limiter.on_throttle("example.com")
+        assert limiter.get_rates()["example.com"] == 8
+
+    def test_acquire_from_many_threads_spaces_all_requests(self, clock):
+        # Every thread reserves its slot before any of them has waited.
+        clock.side_effect = None
+        limiter = RateLimiter(rate=10, burst=1)
+        threads = [
+            threading.Thread(target=limiter.acquire, args=("example.com",))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        delays = sorted(call[0][0] for call in clock.call_args_list)
+        assert len(delays) == 7
+        assert delays[-1] == pytest.approx(0.7)
@@ -0,0 +1,122 @@
+import os
+import stat
+import threading
+import time
+
+import pytest
+
+from py42.exceptions import Py42Error
+from py42.services._auth import CustomJWTAuth
+from py42.tokenstore import FileTokenStore
+from py42.tokenstore import SQLiteTokenStore
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def store_factory(request, tmp_path):
+    # Each call returns a new store object for the same file, as separate processes have.
+    if request.param == "file":
+        return lambda: FileTokenStore(str(tmp_path / "tokens.json"))
+    return lambda: SQLiteTokenStore(str(tmp_path / "tokens.db"))
+
+
+class TokenProvider:
+    def __init__(self, delay=0):
+        self._delay = delay
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def __call__(self):
+        time.sleep(self._delay)
+        with self._lock:
+            self.count += 1
+            return f"token-{self.count}"
+
+
+def test_get_or_refresh_stores_refreshed_token(store_factory):
+    store = store_factory()
+    token = {"credentials": "a", "expires_at": None}
+    assert store.get_or_refresh("key", lambda: token, lambda t: True) == token
+    assert store_factory().get_or_refresh("key", None, lambda t: True) == token
+
+
+def test_get_or_refresh_when_stored_token_unusable_refreshes(store_factory):
+    store = store_factory()
+    old = {"credentials": "a", "expires_at": None}
+    new = {"credentials": "b", "expires_at": None}
+    store.get_or_refresh("key", lambda: old, lambda t: True)
+    assert store.get_or_refresh("key", lambda: new, lambda t: False) == new
+    assert store.get_or_refresh("key", None, lambda t: True) == new
+
+
+def test_get_or_refresh_keeps_tokens_per_key(store_factory):
+    store = store_factory()
+    first = {"credentials": "a", "expires_at": None}
+    second = {"credentials": "b", "expires_at": None}
+    store.get_or_refresh("first", lambda: first, lambda t: True)
+    store.get_or_refresh("second", lambda: second, lambda t: True)
+    assert store.get_or_refresh("first", None, lambda t: True) == first
+
+
+def test_delete_removes_token(store_factory):
+    store = store_factory()
+    old = {"credentials": "a", "expires_at": None}
+    new = {"credentials": "b", "expires_at": None}
+    store.get_or_refresh("key", lambda: old, lambda t: True)
+    store.delete("key")
+    assert store.get_or_refresh("key", lambda: new, lambda t: True) == new
+
+
+def test_get_or_refresh_when_refresh_fails_keeps_stored_token(store_factory):
+    store = store_factory()
+    token = {"credentials": "a", "expires_at": None}
+    store.get_or_refresh("key", lambda: token, lambda t: True)
+
+    def fail():
+        raise Py42Error("unavailable")
+
+    with pytest.raises(Py42Error, match="unavailable"):
+        store.get_or_refresh("key", fail, lambda t: False)
+    assert store.get_or_refresh("key", None, lambda t: True) == token
+
+
+def test_token_files_are_only_readable_by_owner(store_factory, tmp_path):
+    store_factory().get_or_refresh(
+        "key", lambda: {"credentials": "a", "expires_at": None}, lambda t: True
+    )
+    for name in os.listdir(tmp_path):
+        mode = stat.S_IMODE(os.stat(tmp_path / name).st_mode)
+        assert mode & 0o077 == 0
+
+
+def test_auths_sharing_a_store_retrieve_one_token(store_factory):
+    provider = TokenProvider(delay=0.05)
+    auths = [
+        CustomJWTAuth(provider, token_store=store_factory(), token_key="key")
+        for _ in range(8)
+    ]
+    results = []
+    threads = [
+        threading.Thread(target=lambda a=auth: results.append(a.get_credentials()))
+        for auth in auths
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert provider.count == 1
+    assert results == ["Bearer token-1"] * 8
+    assert sum(auth.metrics["shared_tokens"] for auth in auths) == 7
+
+
+def test_auths_sharing_a_store_renew_rejected_token_once(store_factory):
+    provider = TokenProvider()
+    first = CustomJWTAuth(provider, token_store=store_factory(), token_key="key")
+    second = CustomJWTAuth(provider, token_store=store_factory(), token_key="key")
+    rejected = first.get_credentials()
+    assert second.get_credentials() == rejected
+
+    first.clear_credentials(rejected)
+    second.clear_credentials(rejected)
+    assert first.get_credentials() == "Bearer token-2"
+    assert second.get_credentials() == "Bearer token-2"
+    assert provider.count == 2